@@ -8,17 +8,113 @@ Provides commands for rendering, configuration, and testing.
 
 import sys
 import os
+
+
+def _daemon_socket_path() -> str:
+    """Mirror of statusline.daemon.default_socket_path without importing the package"""
+    override = os.environ.get('CLAUDE_STATUSLINE_SOCKET')
+    if override:
+        return override
+    
+    runtime_dir = os.environ.get('XDG_RUNTIME_DIR') or os.environ.get('TMPDIR') or '/tmp'
+    return os.path.join(runtime_dir, f"claude-statusline-{os.getuid()}.sock")
+
+
+def _terminal_width() -> int:
+    """Width of the controlling terminal; stdout is usually a pipe inside $(...)"""
+    for fd in (2, 1, 0):
+        try:
+            return os.get_terminal_size(fd).columns
+        except OSError:
+            continue
+    try:
+        return int(os.environ.get('COLUMNS', 80))
+    except ValueError:
+        return 80
+
+
+def _daemon_request(command: str, timeout: float = 2.0):
+    """Open a daemon connection and send one request; None if no daemon is running"""
+    import socket
+    
+    if not hasattr(socket, 'AF_UNIX'):
+        return None
+    
+    path = _daemon_socket_path()
+    if not os.path.exists(path):
+        return None
+    
+    connection = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    connection.settimeout(timeout)
+    try:
+        connection.connect(path)
+        connection.sendall(f"{command}\t{_terminal_width()}\t{os.getcwd()}\n".encode('utf-8'))
+    except OSError:
+        connection.close()
+        return None
+    return connection
+
+
+def _daemon_render() -> bool:
+    """Thin client: print a pre-rendered line from the daemon"""
+    connection = _daemon_request('render')
+    if connection is None:
+        return False
+    
+    chunks = []
+    try:
+        with connection:
+            while not chunks or not chunks[-1].endswith(b'\n'):
+                chunk = connection.recv(65536)
+                if not chunk:
+                    break
+                chunks.append(chunk)
+    except OSError:
+        return False
+    
+    line = b''.join(chunks).decode('utf-8', 'replace')
+    if not line.endswith('\n') or line.startswith('error\t'):
+        return False
+    sys.stdout.write(line)
+    return True
+
+
+def _daemon_attach() -> bool:
+    """Thin client: draw every line the daemon pushes on the top terminal row"""
+    connection = _daemon_request('subscribe', timeout=None)
+    if connection is None:
+        return False
+    
+    try:
+        with connection, connection.makefile('rb') as lines:
+            for line in lines:
+                sys.stdout.write(f"\033[s\033[1;1H{line.decode('utf-8', 'replace').rstrip()}\033[K\033[u")
+                sys.stdout.flush()
+    except KeyboardInterrupt:
+        pass
+    except OSError:
+        return False
+    return True
+
+
+# The prompt hook runs `render` on every prompt: answer it from a running
+# daemon before importing the renderer and its segments.
+if __name__ == '__main__' and sys.argv[1:] in (['render'], ['attach']):
+    if (_daemon_render if sys.argv[1] == 'render' else _daemon_attach)():
+        sys.exit(0)
+
+
 import argparse
 import json
 import time
 from typing import Optional, Dict, Any
 
 # Add the core directory to Python path
-sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(__file__)), 'core'))
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'src', 'core'))
 
 from statusline import (
     StatuslineRenderer, StatuslineConfig, 
-    ConfigManager, ThemeManager
+    ConfigManager, ThemeManager, StatuslineDaemon
 )
 
 
@@ -57,6 +153,8 @@ class StatuslineCLI:
 Examples:
   %(prog)s render                    # Render statusline once
   %(prog)s render --live             # Start live statusline updates
+  %(prog)s daemon                    # Serve pre-rendered lines to all terminals
+  %(prog)s attach                    # Draw lines pushed by the daemon
   %(prog)s config --example          # Show example configuration
   %(prog)s test                      # Test all segments
   %(prog)s theme list                # List available themes
@@ -103,6 +201,34 @@ Examples:
         )
         render_parser.set_defaults(func=self._cmd_render)
         
+        # Daemon command
+        daemon_parser = subparsers.add_parser('daemon', help='Run the statusline daemon')
+        daemon_parser.add_argument(
+            '--socket',
+            help='Unix socket path (default: $XDG_RUNTIME_DIR/claude-statusline-<uid>.sock)'
+        )
+        daemon_parser.add_argument(
+            '--interval', '-i',
+            type=float,
+            help='Collection interval in seconds (default: update_interval from config)'
+        )
+        daemon_group = daemon_parser.add_mutually_exclusive_group()
+        daemon_group.add_argument(
+            '--status',
+            action='store_true',
+            help='Show statistics of the running daemon'
+        )
+        daemon_group.add_argument(
+            '--stop',
+            action='store_true',
+            help='Stop the running daemon'
+        )
+        daemon_parser.set_defaults(func=self._cmd_daemon)
+        
+        # Attach command
+        attach_parser = subparsers.add_parser('attach', help='Draw statusline updates pushed by the daemon')
+        attach_parser.set_defaults(func=self._cmd_attach)
+        
         # Config command
         config_parser = subparsers.add_parser('config', help='Configuration management')
         config_group = config_parser.add_mutually_exclusive_group(required=True)
@@ -224,6 +350,44 @@ Examples:
                 # Single render
                 output = renderer.render()
                 print(output)
+                
+                if renderer.has_pending():
+                    # Segment workers are joined at interpreter exit, so a
+                    # segment past its deadline would still hold the prompt
+                    sys.stdout.flush()
+                    sys.stderr.flush()
+                    os._exit(0)
+    
+    def _cmd_daemon(self, args):
+        """Run or control the statusline daemon"""
+        if args.socket:
+            os.environ['CLAUDE_STATUSLINE_SOCKET'] = args.socket
+        
+        if args.status or args.stop:
+            connection = _daemon_request('stats' if args.status else 'shutdown')
+            if connection is None:
+                print("Statusline daemon is not running")
+                sys.exit(1)
+            with connection, connection.makefile('rb') as response:
+                reply = response.readline().decode('utf-8', 'replace').strip()
+            if args.status:
+                print(json.dumps(json.loads(reply), indent=2))
+            else:
+                print("Statusline daemon stopped")
+            return
+        
+        config = self._load_config(args)
+        daemon = StatuslineDaemon(config, socket_path=args.socket, interval=args.interval)
+        try:
+            daemon.serve_forever()
+        except KeyboardInterrupt:
+            pass
+    
+    def _cmd_attach(self, args):
+        """Draw statusline updates pushed by the daemon"""
+        if not _daemon_attach():
+            print("Statusline daemon is not running; start it with: statusline.py daemon", file=sys.stderr)
+            sys.exit(1)
     
     def _cmd_config(self, args):
         """Configuration management command"""
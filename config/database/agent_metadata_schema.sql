@@ -378,6 +378,12 @@ CREATE INDEX IF NOT EXISTS idx_agent_capabilities_context ON agent_capabilities
 CREATE OR REPLACE FUNCTION update_agent_stats()
 RETURNS TRIGGER AS $$
 BEGIN
+    -- Batched writers (AsyncAgentMetadataDB.record_executions) update
+    -- stats with one set-based statement per batch instead
+    IF current_setting('agent_metadata.batched_stats', true) = 'on' THEN
+        RETURN NEW;
+    END IF;
+    
     IF NEW.status = 'completed' AND OLD.status != 'completed' THEN
         UPDATE agents 
         SET 
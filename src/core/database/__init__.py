@@ -12,7 +12,10 @@ This module provides:
 
 Components:
 - agent_metadata_db: Core database interface and ORM models
+- sqlite_metadata_db: Embedded SQLite backend with the same async interface
+- execution_recorder: Batched write-behind recording of agent executions
 - agent_selector: Intelligent agent recommendation engine
+- agent_catalog: In-process agent catalog with an inverted term index
 - performance_monitor: Real-time monitoring and health checks  
 - migration_manager: Schema evolution and backup/restore
 
@@ -35,6 +38,7 @@ from .agent_metadata_db import (
     # Data models
     Agent,
     ExecutionRecord,
+    ExecutionCompletion,
     AgentRecommendation,
     
     # Enums
@@ -47,10 +51,15 @@ from .agent_metadata_db import (
     create_database_manager
 )
 
+from .sqlite_metadata_db import SQLiteAgentMetadataDB
+
+from .execution_recorder import ExecutionRecorder
+
 from .agent_selector import (
     # Main classes
     AgentSelectionEngine,
     KeywordExtractor,
+    SelectionCache,
     
     # Data models
     SelectionContext,
@@ -60,6 +69,15 @@ from .agent_selector import (
     create_agent_selector
 )
 
+from .agent_catalog import (
+    # Main classes
+    AgentCatalog,
+    InMemoryAgentSource,
+    
+    # Data models
+    CatalogEntry
+)
+
 from .performance_monitor import (
     # Main classes  
     PerformanceMonitor,
@@ -99,6 +117,7 @@ __author__ = "Claude Code Agent System"
 __all__ = [
     # Database core
     "AsyncAgentMetadataDB",
+    "SQLiteAgentMetadataDB",
     "AgentMetadataDB", 
     "DatabaseConfig",
     "create_database_manager",
@@ -106,9 +125,11 @@ __all__ = [
     # Data models
     "Agent",
     "ExecutionRecord", 
+    "ExecutionCompletion",
     "AgentRecommendation",
     "SelectionContext",
     "AgentScore",
+    "CatalogEntry",
     "PerformanceMetric",
     "AgentHealthStatus",
     "SystemHealthReport",
@@ -124,8 +145,12 @@ __all__ = [
     "CommunicationType",
     
     # Main systems
+    "ExecutionRecorder",
     "AgentSelectionEngine",
     "KeywordExtractor",
+    "SelectionCache",
+    "AgentCatalog",
+    "InMemoryAgentSource",
     "PerformanceMonitor",
     "MetricsCollector",
     "DashboardQueries",
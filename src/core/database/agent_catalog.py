@@ -0,0 +1,286 @@
+#!/usr/bin/env python3
+"""
+Agent Catalog
+Memory-resident snapshot of active agents with an inverted term index
+"""
+
+import re
+import time
+import asyncio
+import logging
+from collections import Counter
+from dataclasses import dataclass, replace
+from typing import Any, Callable, Dict, FrozenSet, Iterable, List, Optional, Set
+
+from .agent_metadata_db import Agent, AgentStatus
+
+
+# ========== TERM NORMALIZATION ==========
+
+_TOKEN_PATTERN = re.compile(r'[a-z0-9]+(?:-[a-z0-9]+)*')
+_SUFFIXES = ('ations', 'ation', 'ings', 'ing', 'ers', 'er', 'es', 'ed', 'e', 's')
+
+
+def stem_term(term: str) -> str:
+    """Light suffix stripping so 'optimizing' and 'optimization' meet at 'optimiz'"""
+    for suffix in _SUFFIXES:
+        if term.endswith(suffix) and len(term) - len(suffix) >= 4:
+            return term[:-len(suffix)]
+    return term
+
+
+def index_terms(text: str) -> List[str]:
+    """Stemmed search terms in text; hyphenated words also yield their parts"""
+    terms = []
+    for token in _TOKEN_PATTERN.findall(text.lower()):
+        terms.append(stem_term(token))
+        if '-' in token:
+            terms.extend(stem_term(part) for part in token.split('-') if part)
+    return terms
+
+
+# ========== CATALOG ==========
+
+@dataclass
+class CatalogEntry:
+    """Selection-ready view of one agent with its derived sets precomputed"""
+    agent: Agent
+    terms: FrozenSet[str]          # keywords and specializations, as stored
+    search_terms: FrozenSet[str]   # stemmed name, description, specializations and keywords
+
+
+class AgentCatalog:
+    """
+    In-process catalog of active agents for selection
+    
+    Loaded once from the source and served from memory afterwards. An
+    inverted index maps stemmed terms from each agent's name, description,
+    specializations and keywords to the agents carrying them, so candidate
+    lookup costs one dictionary probe per query term. A completed execution
+    only refreshes the agent it ran on; any other change signalled through a
+    listener, or a move of the source's catalog version, reloads the whole
+    snapshot. The version is checked at most once per `refresh_interval`
+    seconds.
+    
+    The source needs `list_active_agents()` and `get_catalog_version()`
+    coroutines and may offer `add_change_listener(callback)` and
+    `get_agent(agent_id)`. Reload listeners are told which agent IDs
+    changed, appeared or disappeared.
+    """
+    
+    def __init__(self, source: Any, refresh_interval: float = 30.0):
+        self.source = source
+        self.refresh_interval = refresh_interval
+        self.logger = logging.getLogger(__name__)
+        
+        self.entries: List[CatalogEntry] = []   # in search_agents order
+        self.version: Any = None
+        self.refresh_count = 0
+        self.agent_refresh_count = 0
+        self._by_id: Dict[str, CatalogEntry] = {}
+        self._positions: Dict[str, int] = {}
+        self._index: Dict[str, Set[str]] = {}
+        self._stale = True
+        self._dirty: Set[str] = set()
+        self._checked_at = 0.0
+        self._lock: Optional[asyncio.Lock] = None
+        self._reload_listeners: List[Callable[[Set[str], Set[str]], None]] = []
+        
+        if hasattr(source, 'add_change_listener'):
+            source.add_change_listener(self.invalidate)
+    
+    def add_reload_listener(self, callback: Callable[[Set[str], Set[str]], None]):
+        """Call `callback(changed_ids, added_ids)` after each reload that altered agents
+        
+        `changed_ids` covers agents whose data or stats changed and agents
+        that left the catalog; `added_ids` covers agents new to it or whose
+        search terms changed.
+        """
+        self._reload_listeners.append(callback)
+    
+    def invalidate(self, event: str = None, agent_id: Optional[str] = None):
+        """Mark the snapshot, or only the agent an execution completed on, stale"""
+        if event == 'execution_completed' and agent_id and hasattr(self.source, 'get_agent'):
+            self._dirty.add(agent_id)
+        else:
+            self._stale = True
+    
+    async def ensure_fresh(self):
+        """Reload what was invalidated, or everything if the source version moved"""
+        if (not self._stale and not self._dirty and
+                time.monotonic() - self._checked_at < self.refresh_interval):
+            return
+        
+        if self._lock is None:
+            self._lock = asyncio.Lock()
+        async with self._lock:
+            if self._stale or time.monotonic() - self._checked_at >= self.refresh_interval:
+                # Cleared first, so a change signalled during the reload is not lost
+                forced, self._stale = self._stale, False
+                dirty, self._dirty = self._dirty, set()
+                version = await self.source.get_catalog_version()
+                if forced or version != self.version:
+                    self._build(await self.source.list_active_agents(), version)
+                elif dirty:
+                    await self._refresh_agents(dirty)
+                self._checked_at = time.monotonic()
+            elif self._dirty:
+                dirty, self._dirty = self._dirty, set()
+                await self._refresh_agents(dirty)
+    
+    async def refresh(self):
+        """Reload the snapshot unconditionally"""
+        self.invalidate()
+        await self.ensure_fresh()
+    
+    def get(self, agent_id: str) -> Optional[CatalogEntry]:
+        """Get the catalog entry for an agent ID"""
+        return self._by_id.get(agent_id)
+    
+    def search(self, keywords: List[str], limit: int = 10) -> List[Agent]:
+        """Rank agents by how many query terms they match
+        
+        Ties, and the whole ranking when there are no keywords, follow the
+        order search_agents uses: most executions, then most successes.
+        """
+        if not keywords:
+            return [entry.agent for entry in self.entries[:limit]]
+        
+        matches = Counter()
+        for term in {stem_term(keyword.lower()) for keyword in keywords}:
+            matches.update(self._index.get(term, ()))
+        
+        positions = self._positions
+        ranked = sorted(matches, key=lambda agent_id: (-matches[agent_id], positions[agent_id]))
+        return [self._by_id[agent_id].agent for agent_id in ranked[:limit]]
+    
+    async def _refresh_agents(self, agent_ids: Set[str]):
+        """Re-read only the given agents and patch them into the snapshot"""
+        previous = {agent_id: self._by_id.get(agent_id) for agent_id in agent_ids}
+        for agent_id in agent_ids:
+            agent = await self.source.get_agent(agent_id)
+            self._remove_entry(agent_id)
+            if agent is not None and agent.status == AgentStatus.ACTIVE:
+                self._add_entry(agent)
+        
+        self._order()
+        self.agent_refresh_count += 1
+        self._notify_reload(previous, agent_ids)
+    
+    def _build(self, agents: List[Agent], version: Any):
+        previous = self._by_id
+        self._by_id = {}
+        self._index = {}
+        for agent in agents:
+            self._add_entry(agent)
+        
+        self._order()
+        self.version = version
+        self.refresh_count += 1
+        self.logger.debug(f"Agent catalog loaded {len(self.entries)} agents ({len(self._index)} terms)")
+        
+        if self.refresh_count > 1:
+            self._notify_reload(previous, previous.keys() | self._by_id.keys())
+    
+    def _add_entry(self, agent: Agent):
+        searchable = ' '.join([agent.name, agent.display_name, agent.description or '',
+                               *agent.specializations, *agent.keywords])
+        entry = CatalogEntry(
+            agent=agent,
+            terms=frozenset(agent.keywords) | frozenset(agent.specializations),
+            search_terms=frozenset(index_terms(searchable))
+        )
+        self._by_id[agent.id] = entry
+        for term in entry.search_terms:
+            self._index.setdefault(term, set()).add(agent.id)
+    
+    def _remove_entry(self, agent_id: str):
+        entry = self._by_id.pop(agent_id, None)
+        if entry is None:
+            return
+        for term in entry.search_terms:
+            holders = self._index.get(term)
+            if holders is not None:
+                holders.discard(agent_id)
+                if not holders:
+                    del self._index[term]
+    
+    def _order(self):
+        # Sorted like search_agents, so positions double as the tie-break
+        self.entries = sorted(
+            self._by_id.values(),
+            key=lambda entry: (-entry.agent.total_executions, -entry.agent.success_count)
+        )
+        self._positions = {entry.agent.id: position for position, entry in enumerate(self.entries)}
+    
+    def _notify_reload(self, previous: Dict[str, Optional[CatalogEntry]], agent_ids: Iterable[str]):
+        """Tell reload listeners how the given agents differ from `previous`"""
+        if not self._reload_listeners:
+            return
+        
+        changed_ids, added_ids = set(), set()
+        for agent_id in agent_ids:
+            before, entry = previous.get(agent_id), self._by_id.get(agent_id)
+            if entry is None:
+                if before is not None:
+                    changed_ids.add(agent_id)
+            elif before is None:
+                added_ids.add(agent_id)
+            elif before.agent != entry.agent:
+                # New search terms can match queries the agent never took part in
+                if before.search_terms != entry.search_terms:
+                    added_ids.add(agent_id)
+                else:
+                    changed_ids.add(agent_id)
+        if changed_ids or added_ids:
+            for callback in self._reload_listeners:
+                callback(changed_ids, added_ids)
+
+
+# ========== IN-MEMORY SOURCE ==========
+
+class InMemoryAgentSource:
+    """Agent source backed by a dictionary, for tests and embedded use"""
+    
+    def __init__(self, agents: Optional[List[Agent]] = None):
+        self._agents: Dict[str, Agent] = {agent.id: agent for agent in agents or []}
+        self._version = 0
+        self._listeners: List[Callable[..., None]] = []
+    
+    def add_change_listener(self, callback: Callable[..., None]):
+        """Call `callback(event, agent_id)` after every change"""
+        self._listeners.append(callback)
+    
+    def put_agent(self, agent: Agent):
+        """Add or replace an agent"""
+        self._agents[agent.id] = agent
+        self._changed('agent_updated', agent.id)
+    
+    def remove_agent(self, agent_id: str):
+        """Remove an agent"""
+        if self._agents.pop(agent_id, None) is not None:
+            self._changed('agent_removed', agent_id)
+    
+    def record_execution(self, agent_id: str, success: bool = True):
+        """Count a completed execution, like the databases' stats triggers do"""
+        agent = self._agents[agent_id]
+        self._agents[agent_id] = replace(
+            agent,
+            total_executions=agent.total_executions + 1,
+            success_count=agent.success_count + (1 if success else 0)
+        )
+        self._changed('execution_completed', agent_id)
+    
+    async def get_agent(self, agent_id: str) -> Optional[Agent]:
+        return self._agents.get(agent_id)
+    
+    async def list_active_agents(self) -> List[Agent]:
+        return [agent for agent in self._agents.values() if agent.status == AgentStatus.ACTIVE]
+    
+    async def get_catalog_version(self) -> int:
+        return self._version
+    
+    def _changed(self, event: str, agent_id: str):
+        self._version += 1
+        for callback in self._listeners:
+            callback(event, agent_id)
@@ -9,14 +9,19 @@ import json
 import logging
 import hashlib
 from datetime import datetime, timedelta
-from typing import Dict, List, Optional, Any, Tuple, Union
+from typing import Callable, Dict, List, Optional, Any, Tuple, Union
 from dataclasses import dataclass, asdict
 from enum import Enum
 import uuid
+import os
 
-import asyncpg
-import psycopg2
-from psycopg2.extras import RealDictCursor, Json
+# Only the Postgres backend needs the drivers; SQLite installs run without them
+try:
+    import asyncpg
+    import psycopg2
+    from psycopg2.extras import RealDictCursor, Json
+except ImportError:
+    asyncpg = psycopg2 = RealDictCursor = Json = None
 from contextlib import asynccontextmanager, contextmanager
 import time
 
@@ -95,6 +100,17 @@ class ExecutionRecord:
     user_satisfaction_rating: Optional[int]
     retry_count: int
 
+@dataclass
+class ExecutionCompletion:
+    """Outcome of an execution whose start is already stored"""
+    execution_id: str
+    status: ExecutionStatus
+    completed_at: datetime
+    output_summary: Dict[str, Any]
+    error_details: Optional[str]
+    tokens_used: Optional[int]
+    user_satisfaction_rating: Optional[int]
+
 @dataclass
 class AgentRecommendation:
     """Agent recommendation with scoring"""
@@ -123,12 +139,20 @@ class DatabaseConfig:
     pool_min_size: int = 5
     pool_max_size: int = 20
     command_timeout: int = 30
+    backend: str = "postgres"  # 'postgres' or 'sqlite'
+    sqlite_path: str = os.path.join(os.path.expanduser('~'), '.claude', 'agent_metadata.db')
     
     @classmethod
     def from_env(cls) -> 'DatabaseConfig':
-        """Load configuration from environment variables"""
-        import os
+        """Load configuration from environment variables
+        
+        AGENT_DB_BACKEND picks the backend; without it, SQLite is used when
+        the Postgres drivers are not installed.
+        """
+        default_backend = 'postgres' if asyncpg is not None else 'sqlite'
         return cls(
+            backend=os.getenv('AGENT_DB_BACKEND', default_backend).lower(),
+            sqlite_path=os.getenv('AGENT_DB_SQLITE_PATH', cls.sqlite_path),
             host=os.getenv('POSTGRES_HOST', 'localhost'),
             port=int(os.getenv('POSTGRES_PORT', 5432)),
             database=os.getenv('POSTGRES_DB', 'claude_agent_metadata'),
@@ -152,9 +176,13 @@ class AsyncAgentMetadataDB:
         self.config = config
         self.pool: Optional[asyncpg.Pool] = None
         self.logger = logging.getLogger(__name__)
+        self._change_listeners: List[Callable[[str, Optional[str]], None]] = []
         
     async def initialize(self):
         """Initialize database connection pool"""
+        if asyncpg is None or psycopg2 is None:
+            raise ImportError("The Postgres backend requires asyncpg and psycopg2 (pip install asyncpg psycopg2-binary)")
+        
         try:
             self.pool = await asyncpg.create_pool(
                 host=self.config.host,
@@ -186,6 +214,17 @@ class AsyncAgentMetadataDB:
         async with self.pool.acquire() as conn:
             yield conn
     
+    def add_change_listener(self, callback: Callable[[str, Optional[str]], None]):
+        """Call `callback(event, agent_id)` after writes that change agent data or stats"""
+        self._change_listeners.append(callback)
+    
+    def _notify_change(self, event: str, agent_id: Optional[str] = None):
+        for callback in self._change_listeners:
+            try:
+                callback(event, agent_id)
+            except Exception as e:
+                self.logger.warning(f"Change listener failed for {event}: {e}")
+    
     # ========== AGENT MANAGEMENT ==========
     
     async def create_agent(self, agent_data: Dict[str, Any]) -> str:
@@ -218,6 +257,7 @@ class AsyncAgentMetadataDB:
             )
             
         self.logger.info(f"Created agent {agent_data['name']} with ID {agent_id}")
+        self._notify_change('agent_created', str(agent_id))
         return str(agent_id)
     
     async def get_agent(self, agent_id: str) -> Optional[Agent]:
@@ -230,27 +270,7 @@ class AsyncAgentMetadataDB:
             row = await conn.fetchrow(query, uuid.UUID(agent_id))
             
         if row:
-            return Agent(
-                id=str(row['id']),
-                name=row['name'],
-                display_name=row['display_name'],
-                description=row['description'],
-                tier=AgentTier(row['tier']),
-                status=AgentStatus(row['status']),
-                specializations=row['specializations'],
-                tools_available=row['tools_available'],
-                supported_file_types=row['supported_file_types'],
-                keywords=row['keywords'],
-                preferred_model=row['preferred_model'],
-                configuration=row['configuration'],
-                created_at=row['created_at'],
-                updated_at=row['updated_at'],
-                last_active_at=row['last_active_at'],
-                version=row['version'],
-                total_executions=row['total_executions'],
-                success_count=row['success_count'],
-                avg_execution_time_ms=row['avg_execution_time_ms']
-            )
+            return self._row_to_agent(row)
         return None
     
     async def get_agent_by_name(self, name: str) -> Optional[Agent]:
@@ -263,27 +283,7 @@ class AsyncAgentMetadataDB:
             row = await conn.fetchrow(query, name)
             
         if row:
-            return Agent(
-                id=str(row['id']),
-                name=row['name'],
-                display_name=row['display_name'],
-                description=row['description'],
-                tier=AgentTier(row['tier']),
-                status=AgentStatus(row['status']),
-                specializations=row['specializations'],
-                tools_available=row['tools_available'],
-                supported_file_types=row['supported_file_types'],
-                keywords=row['keywords'],
-                preferred_model=row['preferred_model'],
-                configuration=row['configuration'],
-                created_at=row['created_at'],
-                updated_at=row['updated_at'],
-                last_active_at=row['last_active_at'],
-                version=row['version'],
-                total_executions=row['total_executions'],
-                success_count=row['success_count'],
-                avg_execution_time_ms=row['avg_execution_time_ms']
-            )
+            return self._row_to_agent(row)
         return None
     
     async def search_agents(self, 
@@ -331,30 +331,54 @@ class AsyncAgentMetadataDB:
                 params.insert(0, None)
             rows = await conn.fetch(query, *params)
         
-        return [
-            Agent(
-                id=str(row['id']),
-                name=row['name'],
-                display_name=row['display_name'],
-                description=row['description'],
-                tier=AgentTier(row['tier']),
-                status=AgentStatus(row['status']),
-                specializations=row['specializations'],
-                tools_available=row['tools_available'],
-                supported_file_types=row['supported_file_types'],
-                keywords=row['keywords'],
-                preferred_model=row['preferred_model'],
-                configuration=row['configuration'],
-                created_at=row['created_at'],
-                updated_at=row['updated_at'],
-                last_active_at=row['last_active_at'],
-                version=row['version'],
-                total_executions=row['total_executions'],
-                success_count=row['success_count'],
-                avg_execution_time_ms=row['avg_execution_time_ms']
-            )
-            for row in rows
-        ]
+        return [self._row_to_agent(row) for row in rows]
+    
+    async def list_active_agents(self) -> List[Agent]:
+        """Get every active agent, for in-process catalogs"""
+        async with self.get_connection() as conn:
+            rows = await conn.fetch("SELECT * FROM agents WHERE status = 'active'")
+        
+        return [self._row_to_agent(row) for row in rows]
+    
+    async def get_catalog_version(self) -> tuple:
+        """Cheap fingerprint of the agents table that moves whenever an agent or its stats change
+        
+        The stats trigger updates total_executions and last_active_at
+        without touching updated_at, so all three are part of it.
+        """
+        query = """
+        SELECT COUNT(*), MAX(updated_at), SUM(total_executions), MAX(last_active_at)
+        FROM agents
+        """
+        
+        async with self.get_connection() as conn:
+            row = await conn.fetchrow(query)
+        
+        return tuple(row)
+    
+    @staticmethod
+    def _row_to_agent(row) -> Agent:
+        return Agent(
+            id=str(row['id']),
+            name=row['name'],
+            display_name=row['display_name'],
+            description=row['description'],
+            tier=AgentTier(row['tier']),
+            status=AgentStatus(row['status']),
+            specializations=row['specializations'],
+            tools_available=row['tools_available'],
+            supported_file_types=row['supported_file_types'],
+            keywords=row['keywords'],
+            preferred_model=row['preferred_model'],
+            configuration=row['configuration'],
+            created_at=row['created_at'],
+            updated_at=row['updated_at'],
+            last_active_at=row['last_active_at'],
+            version=row['version'],
+            total_executions=row['total_executions'],
+            success_count=row['success_count'],
+            avg_execution_time_ms=row['avg_execution_time_ms']
+        )
     
     # ========== AGENT RECOMMENDATION ENGINE ==========
     
@@ -577,10 +601,11 @@ class AsyncAgentMetadataDB:
             tokens_used = $5,
             user_satisfaction_rating = $6
         WHERE id = $1
+        RETURNING agent_id
         """
         
         async with self.get_connection() as conn:
-            await conn.execute(
+            agent_id = await conn.fetchval(
                 query,
                 uuid.UUID(execution_id),
                 status.value,
@@ -589,6 +614,154 @@ class AsyncAgentMetadataDB:
                 tokens_used,
                 user_satisfaction
             )
+        
+        if agent_id:
+            self._notify_change('execution_completed', str(agent_id))
+    
+    async def record_executions(self,
+                                records: List[ExecutionRecord],
+                                completions: List[ExecutionCompletion]) -> List[str]:
+        """Write a batch of buffered executions in one transaction
+        
+        New executions are bulk-loaded with COPY, already in their final
+        state if they finished before the batch was written; completions of
+        earlier executions are applied with one UPDATE. The per-row stats
+        trigger is muted for the transaction and agent counters and daily
+        aggregates are updated with one set-based statement each instead.
+        Returns the IDs of agents whose stats changed.
+        """
+        
+        complete_query = """
+        UPDATE execution_history AS e
+        SET 
+            completed_at = c.completed_at,
+            duration_ms = EXTRACT(EPOCH FROM (c.completed_at - e.started_at)) * 1000,
+            status = c.status,
+            output_summary = c.output_summary,
+            error_details = c.error_details,
+            tokens_used = c.tokens_used,
+            user_satisfaction_rating = c.user_satisfaction_rating
+        FROM unnest($1::uuid[], $2::execution_status[], $3::timestamptz[], $4::jsonb[],
+                    $5::text[], $6::int[], $7::int[])
+            AS c(id, status, completed_at, output_summary, error_details, tokens_used, user_satisfaction_rating)
+        WHERE e.id = c.id AND e.status IN ('pending', 'running')
+        RETURNING e.agent_id, e.started_at, e.completed_at, e.status::text, e.duration_ms, e.tokens_used
+        """
+        
+        outcomes_cte = """
+        WITH outcome AS (
+            SELECT * FROM unnest($1::uuid[], $2::timestamptz[], $3::timestamptz[], $4::text[], $5::int[], $6::int[])
+                AS o(agent_id, started_at, completed_at, status, duration_ms, tokens_used)
+            WHERE status IN ('completed', 'failed')
+        )
+        """
+        
+        agent_stats_query = outcomes_cte + """
+        , stats AS (
+            SELECT 
+                agent_id,
+                COUNT(*) as executions,
+                COUNT(*) FILTER (WHERE status = 'completed') as successes,
+                COALESCE(SUM(duration_ms) FILTER (WHERE status = 'completed'), 0) as success_duration_ms,
+                MAX(CASE WHEN status = 'completed' THEN completed_at
+                         ELSE COALESCE(completed_at, started_at) END) as last_active_at
+            FROM outcome
+            GROUP BY agent_id
+        )
+        UPDATE agents AS a
+        SET 
+            total_executions = a.total_executions + stats.executions,
+            success_count = a.success_count + stats.successes,
+            avg_execution_time_ms = CASE WHEN stats.successes > 0 THEN
+                ((a.avg_execution_time_ms::bigint * a.total_executions + stats.success_duration_ms)
+                 / (a.total_executions + stats.successes))::int
+                ELSE a.avg_execution_time_ms END,
+            last_active_at = GREATEST(a.last_active_at, stats.last_active_at)
+        FROM stats
+        WHERE a.id = stats.agent_id
+        RETURNING a.id
+        """
+        
+        daily_query = outcomes_cte + """
+        INSERT INTO agent_performance_daily (
+            agent_id, date, execution_count, success_count, failure_count, avg_duration_ms, total_tokens_used
+        )
+        SELECT 
+            agent_id,
+            DATE(started_at),
+            COUNT(*),
+            COUNT(*) FILTER (WHERE status = 'completed'),
+            COUNT(*) FILTER (WHERE status = 'failed'),
+            AVG(duration_ms) FILTER (WHERE status = 'completed'),
+            SUM(COALESCE(tokens_used, 0))
+        FROM outcome
+        GROUP BY agent_id, DATE(started_at)
+        ON CONFLICT (agent_id, date) DO UPDATE SET
+            avg_duration_ms = CASE WHEN EXCLUDED.success_count > 0 THEN
+                (COALESCE(agent_performance_daily.avg_duration_ms, 0) * agent_performance_daily.execution_count
+                 + EXCLUDED.avg_duration_ms * EXCLUDED.success_count)
+                / (agent_performance_daily.execution_count + EXCLUDED.success_count)
+                ELSE agent_performance_daily.avg_duration_ms END,
+            execution_count = agent_performance_daily.execution_count + EXCLUDED.execution_count,
+            success_count = agent_performance_daily.success_count + EXCLUDED.success_count,
+            failure_count = agent_performance_daily.failure_count + EXCLUDED.failure_count,
+            total_tokens_used = agent_performance_daily.total_tokens_used + EXCLUDED.total_tokens_used,
+            updated_at = NOW()
+        """
+        
+        outcomes = [
+            (uuid.UUID(record.agent_id), record.started_at, record.completed_at,
+             record.status.value, record.duration_ms, record.tokens_used)
+            for record in records if record.completed_at
+        ]
+        
+        async with self.get_connection() as conn:
+            async with conn.transaction():
+                await conn.execute("SET LOCAL agent_metadata.batched_stats = 'on'")
+                
+                if records:
+                    await conn.copy_records_to_table(
+                        'execution_history',
+                        columns=[
+                            'id', 'agent_id', 'session_id', 'execution_type', 'started_at',
+                            'completed_at', 'duration_ms', 'status', 'input_context',
+                            'output_summary', 'error_details', 'tokens_used', 'user_satisfaction_rating'
+                        ],
+                        records=[
+                            (uuid.UUID(record.id), uuid.UUID(record.agent_id),
+                             uuid.UUID(record.session_id) if record.session_id else None,
+                             record.execution_type, record.started_at, record.completed_at,
+                             record.duration_ms, record.status.value, json.dumps(record.input_context),
+                             json.dumps(record.output_summary), record.error_details,
+                             record.tokens_used, record.user_satisfaction_rating)
+                            for record in records
+                        ]
+                    )
+                
+                if completions:
+                    rows = await conn.fetch(
+                        complete_query,
+                        [uuid.UUID(completion.execution_id) for completion in completions],
+                        [completion.status.value for completion in completions],
+                        [completion.completed_at for completion in completions],
+                        [json.dumps(completion.output_summary) for completion in completions],
+                        [completion.error_details for completion in completions],
+                        [completion.tokens_used for completion in completions],
+                        [completion.user_satisfaction_rating for completion in completions]
+                    )
+                    outcomes.extend(tuple(row) for row in rows)
+                
+                if not outcomes:
+                    return []
+                
+                columns = [list(column) for column in zip(*outcomes)]
+                updated = await conn.fetch(agent_stats_query, *columns)
+                await conn.execute(daily_query, *columns)
+        
+        agent_ids = [str(row['id']) for row in updated]
+        for agent_id in agent_ids:
+            self._notify_change('execution_completed', agent_id)
+        return agent_ids
     
     # ========== PERFORMANCE ANALYTICS ==========
     
@@ -673,7 +846,8 @@ class AsyncAgentMetadataDB:
         
         async with self.get_connection() as conn:
             result = await conn.execute(query)
-            
+        
+        self._notify_change('performance_updated')
         return result
 
 
@@ -780,9 +954,23 @@ class AgentMetadataDB:
 
 # ========== FACTORY AND UTILITIES ==========
 
-def create_database_manager(async_mode: bool = True) -> Union[AsyncAgentMetadataDB, AgentMetadataDB]:
-    """Factory function to create database manager"""
+def create_database_manager(async_mode: bool = True,
+                            backend: Optional[str] = None) -> Union[AsyncAgentMetadataDB, AgentMetadataDB]:
+    """Factory function to create database manager
+    
+    `backend` overrides the configured one. The SQLite backend implements
+    the async interface only.
+    """
     config = DatabaseConfig.from_env()
+    backend = (backend or config.backend).lower()
+    
+    if backend == 'sqlite':
+        if not async_mode:
+            raise ValueError("The SQLite backend only provides the async interface")
+        from .sqlite_metadata_db import SQLiteAgentMetadataDB
+        return SQLiteAgentMetadataDB(config.sqlite_path)
+    if backend != 'postgres':
+        raise ValueError(f"Unknown database backend: {backend}")
     
     if async_mode:
         return AsyncAgentMetadataDB(config)
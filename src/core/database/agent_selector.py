@@ -12,13 +12,14 @@ import re
 from datetime import datetime, timedelta
 from typing import Dict, List, Optional, Any, Tuple, Set
 from dataclasses import dataclass, asdict
-from collections import defaultdict, Counter
+from collections import defaultdict, Counter, OrderedDict
 import math
 
 from .agent_metadata_db import (
     AsyncAgentMetadataDB, AgentMetadataDB, DatabaseConfig,
     Agent, AgentRecommendation, create_database_manager
 )
+from .agent_catalog import AgentCatalog, stem_term
 
 
 # ========== SELECTION CONTEXT ==========
@@ -46,6 +47,20 @@ class SelectionContext:
         }
         context_str = json.dumps(context_data, sort_keys=True)
         return hashlib.md5(context_str.encode()).hexdigest()
+    
+    def to_cache_key(self) -> Tuple:
+        """Normalized key under which near-identical contexts share a selection
+        
+        Keywords are stemmed and de-duplicated, so word order, repetition and
+        inflection do not matter. The time of day is left out because it does
+        not affect scoring; preferences are kept because they do.
+        """
+        return (
+            tuple(sorted({stem_term(keyword.lower()) for keyword in self.keywords})),
+            tuple(sorted(set(self.file_types))),
+            self.project_phase,
+            json.dumps(self.user_preferences, sort_keys=True, default=str)
+        )
 
 
 @dataclass
@@ -71,6 +86,96 @@ class AgentScore:
     estimated_success_probability: float
 
 
+# ========== SELECTION CACHE ==========
+
+class SelectionCache:
+    """
+    Size-bounded LRU cache of selections with a time-to-live
+    
+    Each entry remembers the agents that were scored to produce it, so a
+    change to one agent's stats only evicts the selections it took part in.
+    """
+    
+    def __init__(self, max_size: int = 256, ttl: timedelta = timedelta(minutes=15)):
+        self.max_size = max_size
+        self.ttl = ttl
+        self._entries: 'OrderedDict[Tuple, Tuple[AgentScore, datetime, Set[str]]]' = OrderedDict()
+        self._keys_by_agent: Dict[str, Set[Tuple]] = defaultdict(set)
+        
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.invalidations = 0
+    
+    def get(self, key: Tuple) -> Optional[AgentScore]:
+        """Get a live selection, refreshing its recency"""
+        entry = self._entries.get(key)
+        if entry is None:
+            self.misses += 1
+            return None
+        
+        if datetime.now() - entry[1] >= self.ttl:
+            self._remove(key)
+            self.misses += 1
+            return None
+        
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return entry[0]
+    
+    def put(self, key: Tuple, selection: AgentScore, candidate_ids: Set[str]):
+        """Store a selection along with the IDs of every agent scored for it"""
+        if key in self._entries:
+            self._remove(key)
+        
+        self._entries[key] = (selection, datetime.now(), candidate_ids)
+        for agent_id in candidate_ids:
+            self._keys_by_agent[agent_id].add(key)
+        
+        while len(self._entries) > self.max_size:
+            self._remove(next(iter(self._entries)))
+            self.evictions += 1
+    
+    def invalidate_agents(self, agent_ids: Set[str], added_ids: Set[str] = frozenset()):
+        """Drop selections that scored any of the agents; new agents invalidate everything"""
+        if added_ids:
+            self.invalidations += len(self._entries)
+            self.clear()
+            return
+        
+        for agent_id in agent_ids:
+            for key in list(self._keys_by_agent.get(agent_id, ())):
+                self._remove(key)
+                self.invalidations += 1
+    
+    def clear(self):
+        """Drop every selection"""
+        self._entries.clear()
+        self._keys_by_agent.clear()
+    
+    def get_stats(self) -> Dict[str, Any]:
+        """Get cache size and hit/miss metrics"""
+        lookups = self.hits + self.misses
+        return {
+            'size': len(self._entries),
+            'max_size': self.max_size,
+            'hits': self.hits,
+            'misses': self.misses,
+            'hit_rate': self.hits / lookups if lookups else 0.0,
+            'evictions': self.evictions,
+            'invalidations': self.invalidations
+        }
+    
+    def _remove(self, key: Tuple):
+        _, _, candidate_ids = self._entries.pop(key)
+        for agent_id in candidate_ids:
+            keys = self._keys_by_agent.get(agent_id)
+            if keys is not None:
+                keys.discard(key)
+                if not keys:
+                    del self._keys_by_agent[agent_id]
+
+
 # ========== KEYWORD EXTRACTION ==========
 
 class KeywordExtractor:
@@ -197,10 +302,28 @@ class KeywordExtractor:
 class AgentSelectionEngine:
     """
     Intelligent agent selection engine with machine learning capabilities
+    
+    Candidates come from an in-process AgentCatalog rather than a database
+    query per selection; the catalog reloads itself when the database
+    reports agent or execution changes. Selections are cached per
+    normalized context and evicted when a scored agent's stats change.
     """
     
-    def __init__(self, db: AsyncAgentMetadataDB):
+    # Phase mapping to agent specializations
+    PHASE_SPECIALIZATIONS = {
+        'planning': frozenset(['analysis', 'strategy', 'requirements', 'business-analyst']),
+        'design': frozenset(['architecture', 'design', 'modeling', 'ui-ux']),
+        'implementation': frozenset(['development', 'coding', 'backend', 'frontend']),
+        'testing': frozenset(['testing', 'qa', 'automation', 'validation']),
+        'deployment': frozenset(['devops', 'deployment', 'infrastructure', 'ci-cd']),
+        'optimization': frozenset(['performance', 'optimization', 'monitoring']),
+        'maintenance': frozenset(['maintenance', 'monitoring', 'support'])
+    }
+    
+    def __init__(self, db: AsyncAgentMetadataDB, catalog: Optional[AgentCatalog] = None,
+                 cache_size: int = 256):
         self.db = db
+        self.catalog = catalog or AgentCatalog(db)
         self.keyword_extractor = KeywordExtractor()
         self.logger = logging.getLogger(__name__)
         
@@ -216,8 +339,8 @@ class AgentSelectionEngine:
         }
         
         # Cache for recent selections
-        self._selection_cache = {}
-        self._cache_duration = timedelta(minutes=15)
+        self._selection_cache = SelectionCache(max_size=cache_size, ttl=timedelta(minutes=15))
+        self.catalog.add_reload_listener(self._selection_cache.invalidate_agents)
     
     async def select_best_agent(self, 
                                user_query: str,
@@ -230,12 +353,14 @@ class AgentSelectionEngine:
             user_query, session_history, user_preferences, performance_requirements
         )
         
+        # Reloading the catalog evicts selections that involved changed agents
+        await self.catalog.ensure_fresh()
+        
         # Check cache first
-        cache_key = context.to_fingerprint()
-        if cache_key in self._selection_cache:
-            cached_result, timestamp = self._selection_cache[cache_key]
-            if datetime.now() - timestamp < self._cache_duration:
-                return cached_result
+        cache_key = context.to_cache_key()
+        cached_result = self._selection_cache.get(cache_key)
+        if cached_result is not None:
+            return cached_result
         
         # Get candidate agents
         candidates = await self._get_candidate_agents(context)
@@ -250,13 +375,17 @@ class AgentSelectionEngine:
         
         # Cache result
         if best_agent:
-            self._selection_cache[cache_key] = (best_agent, datetime.now())
+            self._selection_cache.put(cache_key, best_agent, {agent.id for agent in candidates})
             
             # Record selection pattern for learning
             await self._record_selection_pattern(context, best_agent)
         
         return best_agent
     
+    def get_cache_stats(self) -> Dict[str, Any]:
+        """Get selection cache size and hit/miss metrics"""
+        return self._selection_cache.get_stats()
+    
     async def get_top_recommendations(self,
                                     user_query: str,
                                     count: int = 5,
@@ -318,26 +447,19 @@ class AgentSelectionEngine:
                                   limit: int = 10) -> List[Agent]:
         """Get candidate agents for selection"""
         
-        # Start with text search if we have keywords
-        if context.keywords:
-            candidates = await self.db.search_agents(
-                query_text=' '.join(context.keywords[:5]),  # Top 5 keywords
-                limit=limit
-            )
-        else:
-            # Fallback to getting active agents
-            candidates = await self.db.search_agents(limit=limit)
+        await self.catalog.ensure_fresh()
+        
+        # Text search on the top 5 keywords; without keywords, the most used active agents
+        candidates = self.catalog.search(context.keywords[:5], limit=limit)
         
         # Filter by specialization if we detected specific domains
         if context.keywords:
-            specialized_candidates = []
-            for agent in candidates:
-                # Check if agent specializations overlap with context keywords
-                specialization_overlap = set(agent.specializations) & set(context.keywords)
-                keyword_overlap = set(agent.keywords) & set(context.keywords)
-                
-                if specialization_overlap or keyword_overlap:
-                    specialized_candidates.append(agent)
+            # Check if agent specializations or keywords overlap with context keywords
+            context_keywords = set(context.keywords)
+            specialized_candidates = [
+                agent for agent in candidates
+                if self.catalog.get(agent.id).terms & context_keywords
+            ]
             
             # Use specialized candidates if we found any, otherwise use all
             if specialized_candidates:
@@ -348,9 +470,14 @@ class AgentSelectionEngine:
     async def _score_agents(self, 
                            candidates: List[Agent],
                            context: SelectionContext) -> List[AgentScore]:
-        """Score agents based on selection context"""
+        """Score agents based on selection context
+        
+        All candidates are scored in one pass over in-memory data against
+        a single clock reading; nothing here waits on the database.
+        """
         
         scored_agents = []
+        now = datetime.now()
         
         for agent in candidates:
             # Calculate individual scores
@@ -358,8 +485,8 @@ class AgentSelectionEngine:
             phase_score = self._calculate_phase_score(agent, context)
             success_score = self._calculate_success_score(agent)
             expertise_score = self._calculate_expertise_score(agent, context)
-            availability_score = await self._calculate_availability_score(agent)
-            collaboration_score = await self._calculate_collaboration_score(agent, context)
+            availability_score = self._calculate_availability_score(agent, now)
+            collaboration_score = self._calculate_collaboration_score(agent, context)
             preference_score = self._calculate_user_preference_score(agent, context)
             
             # Calculate total weighted score
@@ -439,24 +566,10 @@ class AgentSelectionEngine:
         if not context.project_phase:
             return 0.5
         
-        # Phase mapping to agent specializations
-        phase_specializations = {
-            'planning': ['analysis', 'strategy', 'requirements', 'business-analyst'],
-            'design': ['architecture', 'design', 'modeling', 'ui-ux'],
-            'implementation': ['development', 'coding', 'backend', 'frontend'],
-            'testing': ['testing', 'qa', 'automation', 'validation'],
-            'deployment': ['devops', 'deployment', 'infrastructure', 'ci-cd'],
-            'optimization': ['performance', 'optimization', 'monitoring'],
-            'maintenance': ['maintenance', 'monitoring', 'support']
-        }
-        
-        relevant_specializations = phase_specializations.get(context.project_phase, [])
+        relevant_specializations = self.PHASE_SPECIALIZATIONS.get(context.project_phase, frozenset())
         
         # Check if agent has relevant specializations for this phase
-        agent_specializations = set(agent.specializations)
-        phase_specializations_set = set(relevant_specializations)
-        
-        overlap = len(agent_specializations & phase_specializations_set)
+        overlap = len(relevant_specializations.intersection(agent.specializations))
         
         if overlap > 0:
             return min(1.0, overlap * 0.4 + 0.6)  # 0.6 base + up to 0.4 bonus
@@ -483,12 +596,12 @@ class AgentSelectionEngine:
         
         return min(1.0, base_expertise + relevance_boost)
     
-    async def _calculate_availability_score(self, agent: Agent) -> float:
+    def _calculate_availability_score(self, agent: Agent, now: Optional[datetime] = None) -> float:
         """Calculate agent availability score"""
         if not agent.last_active_at:
             return 1.0  # Assume available if never used
         
-        hours_since_active = (datetime.now() - agent.last_active_at.replace(tzinfo=None)).total_seconds() / 3600
+        hours_since_active = ((now or datetime.now()) - agent.last_active_at.replace(tzinfo=None)).total_seconds() / 3600
         
         # Score based on time since last activity
         if hours_since_active < 1:
@@ -498,7 +611,7 @@ class AgentSelectionEngine:
         else:
             return 1.0  # Not used recently, fully available
     
-    async def _calculate_collaboration_score(self, agent: Agent, context: SelectionContext) -> float:
+    def _calculate_collaboration_score(self, agent: Agent, context: SelectionContext) -> float:
         """Calculate collaboration effectiveness score"""
         # This would require querying collaboration patterns from the database
         # For now, return a base score
@@ -641,7 +754,10 @@ async def create_agent_selector() -> AgentSelectionEngine:
     """Create and initialize agent selection engine"""
     db = create_database_manager(async_mode=True)
     await db.initialize()
-    return AgentSelectionEngine(db)
+    
+    selector = AgentSelectionEngine(db)
+    await selector.catalog.ensure_fresh()
+    return selector
 
 
 # ========== EXAMPLE USAGE ==========
@@ -0,0 +1,197 @@
+#!/usr/bin/env python3
+"""
+Agent Metadata Backend Benchmark
+Measures search_agents, start_execution and complete_execution on the
+embedded SQLite backend and, when asked to, on the configured Postgres
+database, and compares per-call execution writes with the batched
+ExecutionRecorder under the same burst.
+
+Usage:
+    python benchmark_backends.py --agents 200 --operations 500
+    python benchmark_backends.py --postgres   # also runs against POSTGRES_* settings
+"""
+
+import sys
+import time
+import uuid
+import random
+import asyncio
+import shutil
+import tempfile
+import statistics
+from pathlib import Path
+from typing import Any, Dict, List
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from database import (
+    AsyncAgentMetadataDB, SQLiteAgentMetadataDB, DatabaseConfig, ExecutionRecorder, ExecutionStatus
+)
+
+
+DOMAINS = ['database', 'frontend', 'backend', 'testing', 'deployment', 'security', 'performance', 'design']
+SKILLS = ['schema', 'react', 'api', 'pytest', 'docker', 'encryption', 'caching', 'architecture',
+          'graphql', 'kubernetes', 'migration', 'profiling', 'accessibility', 'oauth', 'indexing']
+QUERIES = ['database schema', 'react component', 'api performance', 'docker deployment',
+           'security encryption', 'caching', 'testing pytest', 'graphql api']
+
+
+def generate_agents(prefix: str, count: int, seed: int = 7) -> List[Dict[str, Any]]:
+    """Synthetic agent records with overlapping domains and keywords"""
+    rng = random.Random(seed)
+    agents = []
+    
+    for index in range(count):
+        domain = DOMAINS[index % len(DOMAINS)]
+        keywords = [domain] + rng.sample(SKILLS, 3)
+        agents.append({
+            'name': f"{prefix}-{domain}-{index:04d}",
+            'display_name': f"{domain.title()} Agent {index}",
+            'description': f"Handles {domain} work including {', '.join(keywords[1:])}",
+            'tier': str(index % 5 + 1),
+            'specializations': [domain, rng.choice(SKILLS)],
+            'keywords': keywords
+        })
+    
+    return agents
+
+
+def _percentile(samples: List[float], fraction: float) -> float:
+    ordered = sorted(samples)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * fraction))]
+
+
+async def _time_calls(calls) -> Dict[str, float]:
+    """Await each zero-argument coroutine factory in turn, returning latency stats in ms"""
+    samples = []
+    for call in calls:
+        start = time.perf_counter()
+        await call()
+        samples.append((time.perf_counter() - start) * 1000)
+    return {'median_ms': statistics.median(samples), 'p95_ms': _percentile(samples, 0.95)}
+
+
+async def benchmark_backend(db, agent_count: int, operations: int, concurrency: int) -> Dict[str, Any]:
+    """Run the three operations against an initialized backend"""
+    prefix = f"bench-{uuid.uuid4().hex[:8]}"
+    agent_ids = [await db.create_agent(agent) for agent in generate_agents(prefix, agent_count)]
+    rng = random.Random(11)
+    
+    try:
+        results = {
+            'search_agents': await _time_calls(
+                (lambda query=rng.choice(QUERIES): db.search_agents(query_text=query, limit=10))
+                for _ in range(operations)
+            )
+        }
+        
+        execution_ids = []
+        
+        async def start():
+            execution_ids.append(await db.start_execution(rng.choice(agent_ids), 'user_request', {'bench': True}))
+        
+        results['start_execution'] = await _time_calls(start for _ in range(operations))
+        results['complete_execution'] = await _time_calls(
+            (lambda execution_id=execution_id: db.complete_execution(execution_id, ExecutionStatus.COMPLETED))
+            for execution_id in execution_ids
+        )
+        
+        # Throughput with overlapping callers: start and complete in one round trip pair,
+        # then the same burst through the recorder, which writes it in a few transactions
+        semaphore = asyncio.Semaphore(concurrency)
+        
+        async def burst(recorder) -> float:
+            async def lifecycle():
+                async with semaphore:
+                    execution_id = await recorder.start_execution(rng.choice(agent_ids), 'user_request', {})
+                    await asyncio.sleep(0)
+                    await recorder.complete_execution(execution_id, ExecutionStatus.COMPLETED)
+            
+            start_time = time.perf_counter()
+            await asyncio.gather(*[lifecycle() for _ in range(operations)])
+            if recorder is not db:
+                await recorder.close()
+            return operations / (time.perf_counter() - start_time)
+        
+        results['lifecycles_per_second'] = await burst(db)
+        results['write_transactions'] = 2 * operations
+        
+        recorder = ExecutionRecorder(db, flush_interval=0.05)
+        await recorder.start()
+        results['recorded_lifecycles_per_second'] = await burst(recorder)
+        results['recorded_write_transactions'] = recorder.get_stats()['flushes']
+        return results
+    finally:
+        if isinstance(db, AsyncAgentMetadataDB):
+            await _remove_postgres_agents(db, prefix)
+
+
+async def _remove_postgres_agents(db: AsyncAgentMetadataDB, prefix: str):
+    """Delete the benchmark's agents and everything that references them"""
+    async with db.get_connection() as conn:
+        agent_ids = [row['id'] for row in await conn.fetch(
+            "SELECT id FROM agents WHERE name LIKE $1", f"{prefix}-%"
+        )]
+        for table in ('execution_history', 'agent_performance_daily', 'agent_recommendations'):
+            await conn.execute(f"DELETE FROM {table} WHERE agent_id = ANY($1)", agent_ids)
+        await conn.execute("DELETE FROM agents WHERE id = ANY($1)", agent_ids)
+
+
+async def run_benchmark(agent_count: int = 200, operations: int = 500,
+                        concurrency: int = 16, postgres: bool = False) -> Dict[str, Dict[str, Any]]:
+    """Benchmark SQLite, and Postgres when requested"""
+    results = {}
+    work_dir = Path(tempfile.mkdtemp(prefix="agent_backend_bench_"))
+    
+    try:
+        sqlite_db = SQLiteAgentMetadataDB(str(work_dir / "agents.db"))
+        await sqlite_db.initialize()
+        try:
+            results['sqlite'] = await benchmark_backend(sqlite_db, agent_count, operations, concurrency)
+        finally:
+            await sqlite_db.close()
+    finally:
+        shutil.rmtree(work_dir, ignore_errors=True)
+    
+    if postgres:
+        postgres_db = AsyncAgentMetadataDB(DatabaseConfig.from_env())
+        await postgres_db.initialize()
+        try:
+            results['postgres'] = await benchmark_backend(postgres_db, agent_count, operations, concurrency)
+        finally:
+            await postgres_db.close()
+    
+    return results
+
+
+def main():
+    """Benchmark entry point"""
+    import argparse
+    
+    parser = argparse.ArgumentParser(description="Agent metadata backend benchmark")
+    parser.add_argument('--agents', type=int, default=200, help='Number of generated agents')
+    parser.add_argument('--operations', type=int, default=500, help='Calls per measured operation')
+    parser.add_argument('--concurrency', type=int, default=16, help='Overlapping callers for the throughput run')
+    parser.add_argument('--postgres', action='store_true', help='Also benchmark the configured Postgres database')
+    args = parser.parse_args()
+    
+    results = asyncio.run(run_benchmark(args.agents, args.operations, args.concurrency, args.postgres))
+    
+    print(f"Agent metadata backend benchmark ({args.agents} agents, {args.operations} calls each)")
+    print("=" * 72)
+    print(f"{'Operation':<22}" + ''.join(f"{backend + ' median/p95 ms':>25}" for backend in results))
+    for operation in ('search_agents', 'start_execution', 'complete_execution'):
+        cells = ''.join(
+            f"{stats[operation]['median_ms']:>15.3f} / {stats[operation]['p95_ms']:<7.3f}"
+            for stats in results.values()
+        )
+        print(f"{operation:<22}{cells}")
+    for label, key in (('lifecycles/second', 'lifecycles_per_second'),
+                       ('write transactions', 'write_transactions'),
+                       ('batched lifecycles/s', 'recorded_lifecycles_per_second'),
+                       ('batched transactions', 'recorded_write_transactions')):
+        print(f"{label:<22}" + ''.join(f"{stats[key]:>25.0f}" for stats in results.values()))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,239 @@
+#!/usr/bin/env python3
+"""
+Execution Recorder
+Buffers agent execution events and writes them to the database in batches
+"""
+
+import time
+import uuid
+import asyncio
+import logging
+import sqlite3
+from collections import deque
+from datetime import datetime
+from typing import Any, Deque, Dict, Optional, Union
+
+from .agent_metadata_db import ExecutionCompletion, ExecutionRecord, ExecutionStatus, asyncpg
+
+# Errors meaning the database refused a row, as opposed to being unreachable
+REJECTED_ROW_ERRORS = (sqlite3.IntegrityError, sqlite3.DataError, ValueError, TypeError)
+if asyncpg is not None:
+    REJECTED_ROW_ERRORS += (asyncpg.IntegrityConstraintViolationError, asyncpg.DataError)
+
+
+class ExecutionRecorder:
+    """
+    Write-behind buffer for start_execution / complete_execution
+    
+    Offers the same two coroutines as the database managers, but they only
+    append to memory; the buffer is written with one `record_executions`
+    transaction every `flush_interval` seconds, or as soon as it holds
+    `max_batch` events. An execution that finishes before its start was
+    written is stored once, already complete, so a short run costs one
+    row in a bulk insert instead of two round trips. Agent counters are
+    then updated once per batch rather than by the per-row trigger.
+    
+    IDs and timestamps are taken here, when the event happens, so batching
+    does not skew durations. Events still in the buffer are lost if the
+    process dies before they are flushed; `close()` flushes what is left.
+    
+    Recording never raises: a failed write is retried by the next flush.
+    When a batch fails it is retried one event at a time, and events the
+    database rejects on their own (an unknown agent, say) are moved to
+    `dead_letters` so they cannot block the rest.
+    """
+    
+    def __init__(self, db: Any, flush_interval: float = 1.0, max_batch: int = 500,
+                 max_dead_letters: int = 1000):
+        self.db = db
+        self.flush_interval = flush_interval
+        self.max_batch = max_batch
+        self.logger = logging.getLogger(__name__)
+        
+        # Executions not yet written, and completions of executions already written
+        self._records: Dict[str, ExecutionRecord] = {}
+        self._completions: Dict[str, ExecutionCompletion] = {}
+        self._flush_lock: Optional[asyncio.Lock] = None
+        self._flusher: Optional[asyncio.Task] = None
+        
+        # Events the database refused, newest last
+        self.dead_letters: Deque[Union[ExecutionRecord, ExecutionCompletion]] = deque(maxlen=max_dead_letters)
+        
+        self.events_recorded = 0
+        self.rows_written = 0
+        self.flushes = 0
+        self.failed_flushes = 0
+        self.rejected_events = 0
+        self.last_flush_ms = 0.0
+    
+    async def start(self):
+        """Start flushing in the background every `flush_interval` seconds"""
+        if self._flusher is None or self._flusher.done():
+            self._flusher = asyncio.create_task(self._flush_periodically())
+    
+    async def close(self):
+        """Stop the background flush and write whatever is still buffered"""
+        if self._flusher is not None:
+            self._flusher.cancel()
+            try:
+                await self._flusher
+            except asyncio.CancelledError:
+                pass
+            self._flusher = None
+        await self.flush()
+    
+    async def start_execution(self,
+                             agent_id: str,
+                             execution_type: str,
+                             input_context: Dict[str, Any],
+                             session_id: str = None) -> str:
+        """Buffer the start of an agent execution and return its ID"""
+        execution_id = str(uuid.uuid4())
+        self._records[execution_id] = ExecutionRecord(
+            id=execution_id,
+            agent_id=agent_id,
+            session_id=session_id,
+            execution_type=execution_type,
+            started_at=_now(),
+            completed_at=None,
+            duration_ms=None,
+            status=ExecutionStatus.RUNNING,
+            input_context=input_context,
+            output_summary={},
+            error_details=None,
+            tokens_used=None,
+            memory_peak_mb=None,
+            cpu_time_ms=None,
+            user_satisfaction_rating=None,
+            retry_count=0
+        )
+        await self._record_event()
+        return execution_id
+    
+    async def complete_execution(self,
+                               execution_id: str,
+                               status: ExecutionStatus,
+                               output_summary: Dict[str, Any] = None,
+                               error_details: str = None,
+                               tokens_used: int = None,
+                               user_satisfaction: int = None) -> None:
+        """Buffer the outcome of an agent execution"""
+        completed_at = _now()
+        record = self._records.get(execution_id)
+        
+        if record is not None:
+            # Not written yet: write it once, in its final state
+            record.completed_at = completed_at
+            record.duration_ms = int((completed_at - record.started_at).total_seconds() * 1000)
+            record.status = status
+            record.output_summary = output_summary or {}
+            record.error_details = error_details
+            record.tokens_used = tokens_used
+            record.user_satisfaction_rating = user_satisfaction
+        else:
+            self._completions[execution_id] = ExecutionCompletion(
+                execution_id=execution_id,
+                status=status,
+                completed_at=completed_at,
+                output_summary=output_summary or {},
+                error_details=error_details,
+                tokens_used=tokens_used,
+                user_satisfaction_rating=user_satisfaction
+            )
+        await self._record_event()
+    
+    async def flush(self) -> int:
+        """Write everything buffered in one transaction; returns the rows written
+        
+        If the batch fails it is written again one event at a time: events
+        the database rejects are dead-lettered, and once an event fails for
+        any other reason (the database being unreachable) it and everything
+        not yet written go back into the buffer and the error is raised.
+        """
+        if self._flush_lock is None:
+            self._flush_lock = asyncio.Lock()
+        
+        async with self._flush_lock:
+            if not self._records and not self._completions:
+                return 0
+            
+            records, self._records = self._records, {}
+            completions, self._completions = self._completions, {}
+            start = time.perf_counter()
+            
+            try:
+                await self.db.record_executions(list(records.values()), list(completions.values()))
+                written = len(records) + len(completions)
+            except Exception as e:
+                self.failed_flushes += 1
+                self.logger.warning(f"Execution batch of {len(records) + len(completions)} failed, "
+                                    f"writing events one at a time: {e}")
+                written = await self._flush_each(records, completions)
+            
+            self.last_flush_ms = (time.perf_counter() - start) * 1000
+            self.flushes += 1
+            self.rows_written += written
+            return written
+    
+    async def _flush_each(self,
+                          records: Dict[str, ExecutionRecord],
+                          completions: Dict[str, ExecutionCompletion]) -> int:
+        """Write a failed batch event by event, isolating rejected events"""
+        written = 0
+        events = [(execution_id, record, None) for execution_id, record in records.items()]
+        events += [(execution_id, None, completion) for execution_id, completion in completions.items()]
+        
+        for position, (execution_id, record, completion) in enumerate(events):
+            try:
+                await self.db.record_executions([record] if record else [], [completion] if completion else [])
+                written += 1
+            except REJECTED_ROW_ERRORS as e:
+                self.rejected_events += 1
+                self.dead_letters.append(record or completion)
+                self.logger.error(f"Execution event for {execution_id} rejected, dropping it: {e}")
+            except Exception:
+                # A completion buffered meanwhile may target a record put
+                # back here; both are retried together next time
+                for pending_id, pending_record, pending_completion in events[position:]:
+                    if pending_record is not None:
+                        self._records.setdefault(pending_id, pending_record)
+                    else:
+                        self._completions.setdefault(pending_id, pending_completion)
+                raise
+        
+        return written
+    
+    def get_stats(self) -> Dict[str, Any]:
+        """Buffer and write statistics"""
+        return {
+            'events_recorded': self.events_recorded,
+            'rows_written': self.rows_written,
+            'flushes': self.flushes,
+            'failed_flushes': self.failed_flushes,
+            'rejected_events': self.rejected_events,
+            'pending_events': len(self._records) + len(self._completions),
+            'events_per_flush': self.events_recorded / self.flushes if self.flushes else 0.0,
+            'last_flush_ms': self.last_flush_ms
+        }
+    
+    async def _record_event(self):
+        self.events_recorded += 1
+        if len(self._records) + len(self._completions) >= self.max_batch:
+            try:
+                await self.flush()
+            except Exception as e:
+                # The event is buffered; the background flush retries it
+                self.logger.error(f"Execution batch flush failed, will retry: {e}")
+    
+    async def _flush_periodically(self):
+        while True:
+            await asyncio.sleep(self.flush_interval)
+            try:
+                await self.flush()
+            except Exception as e:
+                self.logger.error(f"Execution batch flush failed, will retry: {e}")
+
+
+def _now() -> datetime:
+    # Timezone-aware, so both backends read it unambiguously
+    return datetime.now().astimezone()
@@ -0,0 +1,885 @@
+#!/usr/bin/env python3
+"""
+Embedded Agent Metadata Database
+SQLite implementation of the AsyncAgentMetadataDB interface for single-machine installs
+"""
+
+import os
+import re
+import json
+import uuid
+import queue
+import hashlib
+import logging
+import sqlite3
+import asyncio
+import threading
+import contextvars
+from datetime import datetime, timedelta
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import asynccontextmanager, contextmanager
+from typing import Any, Callable, Dict, List, Optional
+
+from .agent_metadata_db import (
+    Agent, AgentRecommendation, AgentStatus, AgentTier, DatabaseConfig,
+    ExecutionCompletion, ExecutionRecord, ExecutionStatus
+)
+
+
+# Pooled connections checked out by the current task through get_connection()
+_held_connections = contextvars.ContextVar('held_connections', default=0)
+
+_JSON_COLUMNS = ('specializations', 'tools_available', 'supported_file_types', 'keywords')
+_SEARCH_TOKEN = re.compile(r'\w+')
+
+
+# ========== SCHEMA ==========
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS agents (
+    id TEXT PRIMARY KEY,
+    name TEXT UNIQUE NOT NULL,
+    display_name TEXT NOT NULL,
+    description TEXT,
+    -- Mirror the Postgres agent_tier and agent_status enums
+    tier TEXT NOT NULL CHECK (tier IN ('1', '2', '3', '4', '5')),
+    status TEXT NOT NULL DEFAULT 'active'
+        CHECK (status IN ('active', 'inactive', 'maintenance', 'deprecated', 'developing')),
+
+    -- JSON arrays
+    specializations TEXT NOT NULL DEFAULT '[]',
+    tools_available TEXT NOT NULL DEFAULT '[]',
+    supported_file_types TEXT NOT NULL DEFAULT '[]',
+    keywords TEXT NOT NULL DEFAULT '[]',
+
+    preferred_model TEXT DEFAULT 'sonnet',
+    configuration TEXT NOT NULL DEFAULT '{}',
+
+    created_at TEXT NOT NULL,
+    updated_at TEXT NOT NULL,
+    last_active_at TEXT,
+    version TEXT DEFAULT '1.0.0',
+
+    total_executions INTEGER NOT NULL DEFAULT 0,
+    success_count INTEGER NOT NULL DEFAULT 0,
+    avg_execution_time_ms INTEGER NOT NULL DEFAULT 0
+);
+
+CREATE INDEX IF NOT EXISTS idx_agents_status_usage
+    ON agents(status, total_executions DESC, success_count DESC);
+
+-- Full-text index over the same fields as the Postgres search_vector
+CREATE VIRTUAL TABLE IF NOT EXISTS agents_fts USING fts5(
+    name, display_name, description, specializations, keywords,
+    content='agents', content_rowid='rowid', tokenize='porter unicode61'
+);
+
+CREATE TRIGGER IF NOT EXISTS tr_agents_fts_insert AFTER INSERT ON agents BEGIN
+    INSERT INTO agents_fts(rowid, name, display_name, description, specializations, keywords)
+    VALUES (new.rowid, new.name, new.display_name, new.description, new.specializations, new.keywords);
+END;
+
+CREATE TRIGGER IF NOT EXISTS tr_agents_fts_delete AFTER DELETE ON agents BEGIN
+    INSERT INTO agents_fts(agents_fts, rowid, name, display_name, description, specializations, keywords)
+    VALUES ('delete', old.rowid, old.name, old.display_name, old.description, old.specializations, old.keywords);
+END;
+
+CREATE TRIGGER IF NOT EXISTS tr_agents_fts_update
+AFTER UPDATE OF name, display_name, description, specializations, keywords ON agents BEGIN
+    INSERT INTO agents_fts(agents_fts, rowid, name, display_name, description, specializations, keywords)
+    VALUES ('delete', old.rowid, old.name, old.display_name, old.description, old.specializations, old.keywords);
+    INSERT INTO agents_fts(rowid, name, display_name, description, specializations, keywords)
+    VALUES (new.rowid, new.name, new.display_name, new.description, new.specializations, new.keywords);
+END;
+
+CREATE TABLE IF NOT EXISTS execution_history (
+    id TEXT PRIMARY KEY,
+    agent_id TEXT NOT NULL REFERENCES agents(id),
+    session_id TEXT,
+    execution_type TEXT NOT NULL,
+
+    started_at TEXT NOT NULL,
+    completed_at TEXT,
+    duration_ms INTEGER,
+    status TEXT NOT NULL DEFAULT 'pending',
+
+    input_context TEXT NOT NULL DEFAULT '{}',
+    output_summary TEXT NOT NULL DEFAULT '{}',
+    error_details TEXT,
+
+    tokens_used INTEGER,
+    user_satisfaction_rating INTEGER CHECK (user_satisfaction_rating BETWEEN 1 AND 5),
+    retry_count INTEGER NOT NULL DEFAULT 0
+);
+
+CREATE INDEX IF NOT EXISTS idx_execution_history_agent_time
+    ON execution_history(agent_id, started_at DESC);
+CREATE INDEX IF NOT EXISTS idx_execution_history_started
+    ON execution_history(started_at);
+
+-- Agent stats maintenance, as update_agent_stats() does in Postgres. A row in
+-- agent_stats_batch mutes it for a record_executions transaction, which
+-- applies the batch's stats in one statement instead.
+CREATE TABLE IF NOT EXISTS agent_stats_batch (active INTEGER PRIMARY KEY);
+
+DROP TRIGGER IF EXISTS tr_update_agent_stats_completed;
+CREATE TRIGGER tr_update_agent_stats_completed
+AFTER UPDATE OF status ON execution_history
+WHEN new.status = 'completed' AND old.status != 'completed'
+     AND NOT EXISTS (SELECT 1 FROM agent_stats_batch) BEGIN
+    UPDATE agents SET
+        total_executions = total_executions + 1,
+        success_count = success_count + 1,
+        last_active_at = new.completed_at,
+        avg_execution_time_ms = (avg_execution_time_ms * total_executions + COALESCE(new.duration_ms, 0))
+                                / (total_executions + 1)
+    WHERE id = new.agent_id;
+END;
+
+DROP TRIGGER IF EXISTS tr_update_agent_stats_failed;
+CREATE TRIGGER tr_update_agent_stats_failed
+AFTER UPDATE OF status ON execution_history
+WHEN new.status = 'failed' AND old.status != 'failed'
+     AND NOT EXISTS (SELECT 1 FROM agent_stats_batch) BEGIN
+    UPDATE agents SET
+        total_executions = total_executions + 1,
+        last_active_at = COALESCE(new.completed_at, new.started_at)
+    WHERE id = new.agent_id;
+END;
+
+CREATE TABLE IF NOT EXISTS agent_recommendations (
+    agent_id TEXT NOT NULL REFERENCES agents(id),
+    keyword_match_score REAL NOT NULL,
+    phase_alignment_score REAL NOT NULL,
+    recent_success_score REAL NOT NULL,
+    domain_expertise_score REAL NOT NULL,
+    availability_score REAL NOT NULL,
+    total_score REAL NOT NULL,
+    context_hash TEXT NOT NULL,
+    context_data TEXT NOT NULL DEFAULT '{}',
+    created_at TEXT NOT NULL,
+    expires_at TEXT NOT NULL,
+    PRIMARY KEY (agent_id, context_hash)
+);
+"""
+
+
+# ========== STATEMENTS ==========
+# Constant SQL text, so every pooled connection compiles each statement once
+# and reuses it from its statement cache.
+
+INSERT_AGENT = """
+INSERT INTO agents (
+    id, name, display_name, description, tier, status, specializations,
+    tools_available, supported_file_types, keywords, preferred_model,
+    configuration, version, created_at, updated_at
+) VALUES (
+    :id, :name, :display_name, :description, :tier, :status, :specializations,
+    :tools_available, :supported_file_types, :keywords, :preferred_model,
+    :configuration, :version, :now, :now
+)
+"""
+
+SELECT_AGENT = "SELECT * FROM agents WHERE id = ? AND status != 'deprecated'"
+
+SELECT_AGENT_BY_NAME = "SELECT * FROM agents WHERE name = ? AND status != 'deprecated'"
+
+SELECT_ACTIVE_AGENTS = "SELECT * FROM agents WHERE status = 'active'"
+
+SEARCH_FILTERS = """
+    AND (:specializations IS NULL OR EXISTS (
+        SELECT 1 FROM json_each(a.specializations) AS have, json_each(:specializations) AS want
+        WHERE have.value = want.value
+    ))
+    AND (:tier IS NULL OR a.tier = :tier)
+"""
+
+SEARCH_AGENTS_TEXT = f"""
+SELECT a.* FROM agents_fts
+JOIN agents a ON a.rowid = agents_fts.rowid
+WHERE agents_fts MATCH :query AND a.status = 'active'
+{SEARCH_FILTERS}
+ORDER BY bm25(agents_fts), a.total_executions DESC, a.success_count DESC
+LIMIT :limit
+"""
+
+SEARCH_AGENTS = f"""
+SELECT a.* FROM agents a
+WHERE a.status = 'active'
+{SEARCH_FILTERS}
+ORDER BY a.total_executions DESC, a.success_count DESC
+LIMIT :limit
+"""
+
+SELECT_CATALOG_VERSION = """
+SELECT COUNT(*), MAX(updated_at), SUM(total_executions), MAX(last_active_at) FROM agents
+"""
+
+SELECT_RECOMMENDATIONS = """
+SELECT * FROM agent_recommendations
+WHERE context_hash = ? AND expires_at > ?
+ORDER BY total_score DESC
+LIMIT ?
+"""
+
+UPSERT_RECOMMENDATION = """
+INSERT INTO agent_recommendations (
+    agent_id, keyword_match_score, phase_alignment_score, recent_success_score,
+    domain_expertise_score, availability_score, total_score, context_hash,
+    context_data, created_at, expires_at
+) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+ON CONFLICT (agent_id, context_hash) DO UPDATE SET
+    keyword_match_score = excluded.keyword_match_score,
+    phase_alignment_score = excluded.phase_alignment_score,
+    recent_success_score = excluded.recent_success_score,
+    domain_expertise_score = excluded.domain_expertise_score,
+    availability_score = excluded.availability_score,
+    total_score = excluded.total_score,
+    context_data = excluded.context_data,
+    created_at = excluded.created_at,
+    expires_at = excluded.expires_at
+"""
+
+INSERT_EXECUTION = """
+INSERT INTO execution_history (
+    id, agent_id, session_id, execution_type, input_context, status, started_at
+) VALUES (?, ?, ?, ?, ?, 'running', ?)
+"""
+
+COMPLETE_EXECUTION = """
+UPDATE execution_history
+SET
+    completed_at = :now,
+    duration_ms = CAST(ROUND((julianday(:now) - julianday(started_at)) * 86400000) AS INTEGER),
+    status = :status,
+    output_summary = :output_summary,
+    error_details = :error_details,
+    tokens_used = :tokens_used,
+    user_satisfaction_rating = :user_satisfaction
+WHERE id = :id
+RETURNING agent_id
+"""
+
+INSERT_EXECUTION_RECORD = """
+INSERT INTO execution_history (
+    id, agent_id, session_id, execution_type, started_at, completed_at, duration_ms, status,
+    input_context, output_summary, error_details, tokens_used, user_satisfaction_rating
+) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+"""
+
+# Batches arrive as one JSON array parameter, one positional array per row
+COMPLETE_EXECUTIONS = """
+UPDATE execution_history
+SET
+    completed_at = c.completed_at,
+    duration_ms = CAST(ROUND((julianday(c.completed_at) - julianday(execution_history.started_at))
+                             * 86400000) AS INTEGER),
+    status = c.status,
+    output_summary = c.output_summary,
+    error_details = c.error_details,
+    tokens_used = c.tokens_used,
+    user_satisfaction_rating = c.user_satisfaction_rating
+FROM (
+    SELECT
+        json_extract(value, '$[0]') AS id,
+        json_extract(value, '$[1]') AS status,
+        json_extract(value, '$[2]') AS completed_at,
+        json_extract(value, '$[3]') AS output_summary,
+        json_extract(value, '$[4]') AS error_details,
+        json_extract(value, '$[5]') AS tokens_used,
+        json_extract(value, '$[6]') AS user_satisfaction_rating
+    FROM json_each(?)
+) AS c
+WHERE execution_history.id = c.id AND execution_history.status IN ('pending', 'running')
+RETURNING agent_id, started_at, completed_at, status, duration_ms
+"""
+
+APPLY_AGENT_STATS = """
+WITH outcome AS (
+    SELECT
+        json_extract(value, '$[0]') AS agent_id,
+        json_extract(value, '$[1]') AS started_at,
+        json_extract(value, '$[2]') AS completed_at,
+        json_extract(value, '$[3]') AS status,
+        json_extract(value, '$[4]') AS duration_ms
+    FROM json_each(?)
+    WHERE json_extract(value, '$[3]') IN ('completed', 'failed')
+), stats AS (
+    SELECT
+        agent_id,
+        COUNT(*) AS executions,
+        SUM(status = 'completed') AS successes,
+        SUM(CASE WHEN status = 'completed' THEN COALESCE(duration_ms, 0) ELSE 0 END) AS success_duration_ms,
+        MAX(CASE WHEN status = 'completed' THEN completed_at
+                 ELSE COALESCE(completed_at, started_at) END) AS last_active_at
+    FROM outcome
+    GROUP BY agent_id
+)
+UPDATE agents
+SET
+    total_executions = agents.total_executions + stats.executions,
+    success_count = agents.success_count + stats.successes,
+    avg_execution_time_ms = CASE WHEN stats.successes > 0
+        THEN (agents.avg_execution_time_ms * agents.total_executions + stats.success_duration_ms)
+             / (agents.total_executions + stats.successes)
+        ELSE agents.avg_execution_time_ms END,
+    last_active_at = MAX(COALESCE(agents.last_active_at, ''), stats.last_active_at)
+FROM stats
+WHERE agents.id = stats.agent_id
+RETURNING agents.id
+"""
+
+SELECT_AGENT_PERFORMANCE = """
+SELECT
+    COUNT(*) AS total_executions,
+    COUNT(CASE WHEN status = 'completed' THEN 1 END) AS successful_executions,
+    COUNT(CASE WHEN status = 'failed' THEN 1 END) AS failed_executions,
+    AVG(duration_ms) AS avg_duration_ms,
+    MIN(duration_ms) AS min_duration_ms,
+    MAX(duration_ms) AS max_duration_ms,
+    AVG(tokens_used) AS avg_tokens_used,
+    AVG(user_satisfaction_rating) AS avg_satisfaction,
+    COUNT(DISTINCT session_id) AS unique_sessions
+FROM execution_history
+WHERE agent_id = ? AND started_at >= ?
+"""
+
+SELECT_SYSTEM_HEALTH = """
+SELECT
+    (SELECT COUNT(*) FROM agents WHERE status = 'active'),
+    (SELECT COUNT(*) FROM execution_history WHERE started_at >= :today),
+    (SELECT AVG(success_count * 100.0 / MAX(total_executions, 1))
+     FROM agents WHERE status = 'active' AND total_executions > 0),
+    (SELECT COUNT(*) FROM agent_recommendations WHERE expires_at > :now)
+"""
+
+BULK_UPDATE_PERFORMANCE = """
+WITH stats AS (
+    SELECT
+        agent_id,
+        COUNT(*) AS total_exec,
+        COUNT(CASE WHEN status = 'completed' THEN 1 END) AS success_exec,
+        CAST(AVG(duration_ms) AS INTEGER) AS avg_duration,
+        MAX(completed_at) AS last_active
+    FROM execution_history
+    WHERE started_at >= :since
+    GROUP BY agent_id
+)
+UPDATE agents
+SET
+    total_executions = stats.total_exec,
+    success_count = stats.success_exec,
+    avg_execution_time_ms = COALESCE(stats.avg_duration, 0),
+    last_active_at = stats.last_active,
+    updated_at = :now
+FROM stats
+WHERE agents.id = stats.agent_id
+"""
+
+
+def _timestamp(moment: Optional[datetime] = None) -> str:
+    moment = moment or datetime.now()
+    if moment.tzinfo is not None:
+        # Stored as naive local time, like the timestamps taken here
+        moment = moment.astimezone().replace(tzinfo=None)
+    return moment.isoformat(' ', timespec='milliseconds')
+
+
+def _parse_timestamp(value: Optional[str]) -> Optional[datetime]:
+    return datetime.fromisoformat(value) if value else None
+
+
+# ========== SQLITE DATABASE MANAGER ==========
+
+class SQLiteAgentMetadataDB:
+    """
+    Embedded drop-in for AsyncAgentMetadataDB on a local SQLite file
+    
+    Exposes the same coroutine interface. Calls run on a thread pool and
+    each worker checks a connection out of a pool sized to the thread
+    count, so a connection is always free for a running call. The
+    database runs in WAL mode, letting readers proceed while a write
+    commits; writes from this process are serialized on a lock instead
+    of contending through SQLite's busy handler. search_agents uses an
+    FTS5 index kept in sync by triggers, and the agent stats trigger
+    mirrors the Postgres one.
+    """
+    
+    def __init__(self, path: str = DatabaseConfig.sqlite_path, pool_size: Optional[int] = None,
+                 busy_timeout_ms: int = 5000):
+        self.path = path
+        # An in-memory database lives in its one connection
+        self.in_memory = path == ':memory:'
+        self.pool_size = 1 if self.in_memory else pool_size or min(32, (os.cpu_count() or 1) + 4)
+        self.busy_timeout_ms = busy_timeout_ms
+        self.logger = logging.getLogger(__name__)
+        
+        self.pool: Optional[queue.LifoQueue] = None
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._connections: List[sqlite3.Connection] = []
+        self._write_lock = threading.Lock()
+        self._change_listeners: List[Callable[[str, Optional[str]], None]] = []
+    
+    async def initialize(self):
+        """Create the schema and open the connection pool"""
+        if not self.in_memory:
+            os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+        
+        self.pool = queue.LifoQueue()
+        for _ in range(self.pool_size):
+            conn = self._connect()
+            self._connections.append(conn)
+            self.pool.put(conn)
+        self._executor = ThreadPoolExecutor(max_workers=self.pool_size, thread_name_prefix='agent-metadata')
+        
+        await self._run(self._create_schema)
+        self.logger.info(f"SQLite agent metadata database ready at {self.path} ({self.pool_size} connections)")
+    
+    async def close(self):
+        """Close the thread pool and every connection"""
+        if self._executor:
+            self._executor.shutdown(wait=True)
+            self._executor = None
+        for conn in self._connections:
+            conn.close()
+        self._connections.clear()
+        self.pool = None
+        self.logger.info("SQLite agent metadata database closed")
+    
+    @asynccontextmanager
+    async def get_connection(self):
+        """Check a raw sqlite3 connection out of the pool
+        
+        The connection is held until the block exits, and other methods of
+        this database need one of their own. With a single connection (as
+        for ':memory:') they cannot get one, so calling them inside the
+        block raises RuntimeError instead of deadlocking.
+        """
+        if not self.pool:
+            raise RuntimeError("Database not initialized")
+        
+        # Waits on the default executor: blocking a worker of our own pool
+        # would take it away from calls that may be about to free a connection
+        conn = await asyncio.get_running_loop().run_in_executor(None, self.pool.get)
+        held = _held_connections.set(_held_connections.get() + 1)
+        try:
+            yield conn
+        finally:
+            _held_connections.reset(held)
+            self.pool.put(conn)
+    
+    def add_change_listener(self, callback: Callable[[str, Optional[str]], None]):
+        """Call `callback(event, agent_id)` after writes that change agent data or stats"""
+        self._change_listeners.append(callback)
+    
+    def _notify_change(self, event: str, agent_id: Optional[str] = None):
+        for callback in self._change_listeners:
+            try:
+                callback(event, agent_id)
+            except Exception as e:
+                self.logger.warning(f"Change listener failed for {event}: {e}")
+    
+    # ========== AGENT MANAGEMENT ==========
+    
+    async def create_agent(self, agent_data: Dict[str, Any]) -> str:
+        """Create a new agent record"""
+        agent_id = str(uuid.uuid4())
+        params = {
+            'id': agent_id,
+            'name': agent_data['name'],
+            'display_name': agent_data['display_name'],
+            'description': agent_data.get('description'),
+            # Rejected here like the Postgres enums would, not on every later read
+            'tier': AgentTier(agent_data['tier']).value,
+            'status': AgentStatus(agent_data.get('status', 'active')).value,
+            'specializations': json.dumps(agent_data.get('specializations', [])),
+            'tools_available': json.dumps(agent_data.get('tools_available', [])),
+            'supported_file_types': json.dumps(agent_data.get('supported_file_types', [])),
+            'keywords': json.dumps(agent_data.get('keywords', [])),
+            'preferred_model': agent_data.get('preferred_model', 'sonnet'),
+            'configuration': json.dumps(agent_data.get('configuration', {})),
+            'version': agent_data.get('version', '1.0.0'),
+            'now': _timestamp()
+        }
+        
+        def insert(conn):
+            with self._transaction(conn):
+                conn.execute(INSERT_AGENT, params)
+        
+        await self._run(insert)
+        self.logger.info(f"Created agent {agent_data['name']} with ID {agent_id}")
+        self._notify_change('agent_created', agent_id)
+        return agent_id
+    
+    async def get_agent(self, agent_id: str) -> Optional[Agent]:
+        """Get agent by ID"""
+        row = await self._run(lambda conn: conn.execute(SELECT_AGENT, (agent_id,)).fetchone())
+        return self._row_to_agent(row) if row else None
+    
+    async def get_agent_by_name(self, name: str) -> Optional[Agent]:
+        """Get agent by name"""
+        row = await self._run(lambda conn: conn.execute(SELECT_AGENT_BY_NAME, (name,)).fetchone())
+        return self._row_to_agent(row) if row else None
+    
+    async def search_agents(self,
+                           query_text: str = None,
+                           specializations: List[str] = None,
+                           tier: AgentTier = None,
+                           limit: int = 10) -> List[Agent]:
+        """Search agents with full-text search and filtering
+        
+        Like plainto_tsquery, every word of `query_text` must match;
+        words are stemmed and ranked with BM25.
+        """
+        params = {
+            'specializations': json.dumps(specializations) if specializations else None,
+            'tier': tier.value if tier else None,
+            'limit': limit
+        }
+        
+        words = _SEARCH_TOKEN.findall(query_text or '')
+        if words:
+            params['query'] = ' '.join(f'"{word}"' for word in words)
+            statement = SEARCH_AGENTS_TEXT
+        else:
+            statement = SEARCH_AGENTS
+        
+        rows = await self._run(lambda conn: conn.execute(statement, params).fetchall())
+        return [self._row_to_agent(row) for row in rows]
+    
+    async def list_active_agents(self) -> List[Agent]:
+        """Get every active agent, for in-process catalogs"""
+        rows = await self._run(lambda conn: conn.execute(SELECT_ACTIVE_AGENTS).fetchall())
+        return [self._row_to_agent(row) for row in rows]
+    
+    async def get_catalog_version(self) -> tuple:
+        """Cheap fingerprint of the agents table that moves whenever an agent or its stats change"""
+        return tuple(await self._run(lambda conn: conn.execute(SELECT_CATALOG_VERSION).fetchone()))
+    
+    # ========== AGENT RECOMMENDATION ENGINE ==========
+    
+    async def generate_agent_recommendations(self,
+                                           context: Dict[str, Any],
+                                           limit: int = 5) -> List[AgentRecommendation]:
+        """Generate agent recommendations based on context"""
+        context_str = json.dumps(context, sort_keys=True)
+        context_hash = hashlib.md5(context_str.encode()).hexdigest()
+        
+        existing = await self._run(
+            lambda conn: conn.execute(SELECT_RECOMMENDATIONS, (context_hash, _timestamp(), limit)).fetchall()
+        )
+        if existing:
+            return [
+                AgentRecommendation(
+                    agent_id=row['agent_id'],
+                    keyword_match_score=row['keyword_match_score'],
+                    phase_alignment_score=row['phase_alignment_score'],
+                    recent_success_score=row['recent_success_score'],
+                    domain_expertise_score=row['domain_expertise_score'],
+                    availability_score=row['availability_score'],
+                    total_score=row['total_score'],
+                    context_hash=row['context_hash'],
+                    context_data=context,
+                    expires_at=_parse_timestamp(row['expires_at'])
+                )
+                for row in existing
+            ]
+        
+        return await self._calculate_agent_recommendations(context, context_hash, limit)
+    
+    async def _calculate_agent_recommendations(self,
+                                             context: Dict[str, Any],
+                                             context_hash: str,
+                                             limit: int) -> List[AgentRecommendation]:
+        """Score active agents with the same formula as the Postgres backend"""
+        keywords = set(context.get('keywords', []))
+        phase = context.get('phase', '')
+        now = datetime.now()
+        expires_at = now + timedelta(hours=1)
+        
+        recommendations = []
+        for agent in await self.list_active_agents():
+            keyword_score = len(keywords & set(agent.keywords)) / len(keywords) if keywords else 0.5
+            if not phase:
+                phase_score = 0.5
+            else:
+                phase_score = 1.0 if phase in agent.specializations else 0.3
+            if agent.total_executions == 0:
+                success_score = 0.5
+            else:
+                success_score = min(1.0, agent.success_count / agent.total_executions)
+            if agent.total_executions >= 50:
+                expertise_score = 1.0
+            elif agent.total_executions >= 10:
+                expertise_score = 0.8
+            else:
+                expertise_score = 0.6 if agent.total_executions > 0 else 0.4
+            if agent.last_active_at is None:
+                availability_score = 1.0
+            elif agent.last_active_at > now - timedelta(hours=1):
+                availability_score = 0.7
+            elif agent.last_active_at > now - timedelta(hours=24):
+                availability_score = 0.9
+            else:
+                availability_score = 1.0
+            
+            recommendations.append(AgentRecommendation(
+                agent_id=agent.id,
+                keyword_match_score=keyword_score,
+                phase_alignment_score=phase_score,
+                recent_success_score=success_score,
+                domain_expertise_score=expertise_score,
+                availability_score=availability_score,
+                total_score=(keyword_score * 0.35 + phase_score * 0.25 + success_score * 0.20 +
+                             expertise_score * 0.15 + availability_score * 0.05),
+                context_hash=context_hash,
+                context_data=context,
+                expires_at=expires_at
+            ))
+        
+        recommendations.sort(key=lambda recommendation: recommendation.total_score, reverse=True)
+        recommendations = recommendations[:limit]
+        
+        if recommendations:
+            context_json = json.dumps(context)
+            rows = [
+                (r.agent_id, r.keyword_match_score, r.phase_alignment_score, r.recent_success_score,
+                 r.domain_expertise_score, r.availability_score, r.total_score, context_hash,
+                 context_json, _timestamp(now), _timestamp(expires_at))
+                for r in recommendations
+            ]
+            
+            def store(conn):
+                with self._transaction(conn):
+                    conn.executemany(UPSERT_RECOMMENDATION, rows)
+            
+            await self._run(store)
+        
+        return recommendations
+    
+    # ========== EXECUTION TRACKING ==========
+    
+    async def start_execution(self,
+                             agent_id: str,
+                             execution_type: str,
+                             input_context: Dict[str, Any],
+                             session_id: str = None) -> str:
+        """Start tracking an agent execution"""
+        execution_id = str(uuid.uuid4())
+        params = (execution_id, agent_id, session_id, execution_type, json.dumps(input_context), _timestamp())
+        
+        def insert(conn):
+            with self._transaction(conn):
+                conn.execute(INSERT_EXECUTION, params)
+        
+        await self._run(insert)
+        return execution_id
+    
+    async def complete_execution(self,
+                               execution_id: str,
+                               status: ExecutionStatus,
+                               output_summary: Dict[str, Any] = None,
+                               error_details: str = None,
+                               tokens_used: int = None,
+                               user_satisfaction: int = None) -> None:
+        """Complete an agent execution with results"""
+        params = {
+            'id': execution_id,
+            'now': _timestamp(),
+            'status': status.value,
+            'output_summary': json.dumps(output_summary or {}),
+            'error_details': error_details,
+            'tokens_used': tokens_used,
+            'user_satisfaction': user_satisfaction
+        }
+        
+        def update(conn):
+            with self._transaction(conn):
+                rows = conn.execute(COMPLETE_EXECUTION, params).fetchall()
+            return rows[0][0] if rows else None
+        
+        agent_id = await self._run(update)
+        if agent_id:
+            self._notify_change('execution_completed', agent_id)
+    
+    async def record_executions(self,
+                                records: List[ExecutionRecord],
+                                completions: List[ExecutionCompletion]) -> List[str]:
+        """Write a batch of buffered executions in one transaction
+        
+        New executions go in with one executemany, already in their final
+        state if they finished before the batch was written; completions of
+        earlier executions are applied with one UPDATE. The stats triggers
+        are muted for the transaction and agent counters are updated with
+        one set-based statement instead. Returns the IDs of agents whose
+        stats changed.
+        """
+        rows = [
+            (record.id, record.agent_id, record.session_id, record.execution_type,
+             _timestamp(record.started_at),
+             _timestamp(record.completed_at) if record.completed_at else None,
+             record.duration_ms, record.status.value, json.dumps(record.input_context),
+             json.dumps(record.output_summary), record.error_details,
+             record.tokens_used, record.user_satisfaction_rating)
+            for record in records
+        ]
+        outcomes = [
+            [record.agent_id, row[4], row[5], record.status.value, record.duration_ms]
+            for record, row in zip(records, rows) if record.completed_at
+        ]
+        completed = json.dumps([
+            [completion.execution_id, completion.status.value, _timestamp(completion.completed_at),
+             json.dumps(completion.output_summary), completion.error_details,
+             completion.tokens_used, completion.user_satisfaction_rating]
+            for completion in completions
+        ])
+        
+        def record(conn):
+            with self._transaction(conn):
+                conn.execute("INSERT INTO agent_stats_batch VALUES (1)")
+                conn.executemany(INSERT_EXECUTION_RECORD, rows)
+                if completions:
+                    outcomes.extend(list(row) for row in conn.execute(COMPLETE_EXECUTIONS, (completed,)))
+                updated = conn.execute(APPLY_AGENT_STATS, (json.dumps(outcomes),)).fetchall() if outcomes else []
+                conn.execute("DELETE FROM agent_stats_batch")
+            return [row[0] for row in updated]
+        
+        agent_ids = await self._run(record)
+        for agent_id in agent_ids:
+            self._notify_change('execution_completed', agent_id)
+        return agent_ids
+    
+    # ========== PERFORMANCE ANALYTICS ==========
+    
+    async def get_agent_performance(self,
+                                  agent_id: str,
+                                  days: int = 30) -> Dict[str, Any]:
+        """Get detailed performance metrics for an agent"""
+        since = _timestamp(datetime.now() - timedelta(days=days))
+        row = await self._run(lambda conn: conn.execute(SELECT_AGENT_PERFORMANCE, (agent_id, since)).fetchone())
+        
+        return {
+            'total_executions': row['total_executions'],
+            'successful_executions': row['successful_executions'],
+            'failed_executions': row['failed_executions'],
+            'success_rate': (row['successful_executions'] / max(row['total_executions'], 1)) * 100,
+            'avg_duration_ms': float(row['avg_duration_ms']) if row['avg_duration_ms'] else 0,
+            'min_duration_ms': row['min_duration_ms'],
+            'max_duration_ms': row['max_duration_ms'],
+            'avg_tokens_used': float(row['avg_tokens_used']) if row['avg_tokens_used'] else 0,
+            'avg_satisfaction': float(row['avg_satisfaction']) if row['avg_satisfaction'] else 0,
+            'unique_sessions': row['unique_sessions']
+        }
+    
+    async def get_system_health(self) -> Dict[str, Any]:
+        """Get overall system health metrics"""
+        now = datetime.now()
+        params = {'today': _timestamp(now.replace(hour=0, minute=0, second=0, microsecond=0)), 'now': _timestamp(now)}
+        agents, executions_today, success_rate, recommendations = await self._run(
+            lambda conn: conn.execute(SELECT_SYSTEM_HEALTH, params).fetchone()
+        )
+        
+        health_metrics = {
+            'total_agents': {'value': float(agents), 'status': 'OK'},
+            'total_executions_today': {'value': float(executions_today), 'status': 'OK'},
+            'active_recommendations': {'value': float(recommendations), 'status': 'OK'}
+        }
+        if success_rate is not None:
+            health_metrics['avg_success_rate'] = {
+                'value': round(success_rate, 2),
+                'status': 'OK' if success_rate >= 80 else 'WARNING'
+            }
+        return health_metrics
+    
+    # ========== BULK OPERATIONS ==========
+    
+    async def bulk_update_agent_performance(self):
+        """Bulk update agent performance statistics"""
+        now = datetime.now()
+        params = {'since': _timestamp(now - timedelta(days=30)), 'now': _timestamp(now)}
+        
+        def update(conn):
+            with self._transaction(conn):
+                conn.execute(BULK_UPDATE_PERFORMANCE, params)
+                # rowcount is not reported for statements starting with WITH
+                return conn.execute("SELECT changes()").fetchone()[0]
+        
+        updated = await self._run(update)
+        self._notify_change('performance_updated')
+        return f"UPDATE {updated}"
+    
+    # ========== CONNECTION HANDLING ==========
+    
+    def _connect(self) -> sqlite3.Connection:
+        conn = sqlite3.connect(
+            self.path,
+            isolation_level=None,  # Transactions are explicit, see _transaction
+            check_same_thread=False,
+            cached_statements=256
+        )
+        conn.row_factory = sqlite3.Row
+        conn.execute(f"PRAGMA busy_timeout = {int(self.busy_timeout_ms)}")
+        conn.execute("PRAGMA foreign_keys = ON")
+        if not self.in_memory:
+            conn.execute("PRAGMA journal_mode = WAL")
+            conn.execute("PRAGMA synchronous = NORMAL")
+        return conn
+    
+    def _create_schema(self, conn: sqlite3.Connection):
+        with self._write_lock:
+            conn.executescript(SCHEMA)
+    
+    async def _run(self, operation: Callable[[sqlite3.Connection], Any]) -> Any:
+        if not self.pool:
+            raise RuntimeError("Database not initialized")
+        if _held_connections.get() >= self.pool_size:
+            raise RuntimeError("Every pooled connection is held by this task's get_connection()")
+        return await asyncio.get_running_loop().run_in_executor(self._executor, self._with_connection, operation)
+    
+    def _with_connection(self, operation: Callable[[sqlite3.Connection], Any]) -> Any:
+        conn = self.pool.get()
+        try:
+            return operation(conn)
+        finally:
+            self.pool.put(conn)
+    
+    @contextmanager
+    def _transaction(self, conn: sqlite3.Connection):
+        # BEGIN IMMEDIATE takes the write lock up front, so a transaction never
+        # fails upgrading from a read lock when another process writes
+        with self._write_lock:
+            conn.execute("BEGIN IMMEDIATE")
+            try:
+                yield conn
+            except BaseException:
+                conn.execute("ROLLBACK")
+                raise
+            conn.execute("COMMIT")
+    
+    @staticmethod
+    def _row_to_agent(row: sqlite3.Row) -> Agent:
+        values = dict(row)
+        for column in _JSON_COLUMNS:
+            values[column] = json.loads(values[column])
+        
+        return Agent(
+            id=values['id'],
+            name=values['name'],
+            display_name=values['display_name'],
+            description=values['description'],
+            tier=AgentTier(values['tier']),
+            status=AgentStatus(values['status']),
+            specializations=values['specializations'],
+            tools_available=values['tools_available'],
+            supported_file_types=values['supported_file_types'],
+            keywords=values['keywords'],
+            preferred_model=values['preferred_model'],
+            configuration=json.loads(values['configuration']),
+            created_at=_parse_timestamp(values['created_at']),
+            updated_at=_parse_timestamp(values['updated_at']),
+            last_active_at=_parse_timestamp(values['last_active_at']),
+            version=values['version'],
+            total_executions=values['total_executions'],
+            success_count=values['success_count'],
+            avg_execution_time_ms=values['avg_execution_time_ms']
+        )
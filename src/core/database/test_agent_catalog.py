@@ -0,0 +1,118 @@
+#!/usr/bin/env python3
+"""
+Agent Catalog Test Suite
+Index lookup, ranking and change-driven reloads of the in-process agent catalog.
+"""
+
+import sys
+import unittest
+from datetime import datetime
+from pathlib import Path
+from unittest.mock import patch
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from database import Agent, AgentCatalog, AgentStatus, AgentTier, InMemoryAgentSource
+
+
+def make_agent(agent_id, name, keywords, specializations=(), description='',
+               total_executions=0, success_count=0, status=AgentStatus.ACTIVE):
+    now = datetime.now()
+    return Agent(
+        id=agent_id, name=name, display_name=name.replace('-', ' ').title(),
+        description=description, tier=AgentTier.TIER_3, status=status,
+        specializations=list(specializations), tools_available=[], supported_file_types=[],
+        keywords=list(keywords), preferred_model='sonnet', configuration={},
+        created_at=now, updated_at=now, last_active_at=None, version='1.0.0',
+        total_executions=total_executions, success_count=success_count, avg_execution_time_ms=0
+    )
+
+
+class CatalogTestCase(unittest.IsolatedAsyncioTestCase):
+    """Base class with a catalog over an in-memory source"""
+
+    async def asyncSetUp(self):
+        self.source = InMemoryAgentSource([
+            make_agent('db', 'database-architect', ['database', 'schema'], ['data-modeling'],
+                       'Optimizing database performance', total_executions=5, success_count=5),
+            make_agent('api', 'backend-services', ['api', 'database'], ['rest'],
+                       total_executions=9, success_count=8),
+            make_agent('ops', 'devops-engineer', ['deployment'], ['kubernetes'],
+                       total_executions=9, success_count=9),
+            make_agent('old', 'legacy-agent', ['database'], status=AgentStatus.INACTIVE)
+        ])
+        self.catalog = AgentCatalog(self.source)
+        self.reloads = []
+        self.catalog.add_reload_listener(lambda changed, added: self.reloads.append((changed, added)))
+        await self.catalog.ensure_fresh()
+
+
+class TestIndexLookup(CatalogTestCase):
+    """Candidate lookup through the inverted term index"""
+
+    async def test_terms_are_stemmed(self):
+        self.assertEqual([agent.id for agent in self.catalog.search(['optimization'])], ['db'])
+        self.assertEqual([agent.id for agent in self.catalog.search(['modeling'])], ['db'])
+        self.assertEqual([agent.id for agent in self.catalog.search(['Kubernetes'])], ['ops'])
+
+    async def test_inactive_agents_are_not_indexed(self):
+        self.assertIsNone(self.catalog.get('old'))
+        self.assertNotIn('old', [agent.id for agent in self.catalog.search(['database'])])
+
+    async def test_more_matching_terms_rank_first(self):
+        ranked = self.catalog.search(['database', 'schema'])
+        self.assertEqual([agent.id for agent in ranked], ['db', 'api'])
+        self.assertEqual(self.catalog.search(['unknown']), [])
+
+
+class TestTieOrder(CatalogTestCase):
+    """Ties follow search_agents: most executions, then most successes"""
+
+    async def test_ties_break_on_executions_then_successes(self):
+        self.assertEqual([agent.id for agent in self.catalog.search(['database'])], ['api', 'db'])
+        self.assertEqual([agent.id for agent in self.catalog.search([])], ['ops', 'api', 'db'])
+        self.assertEqual([agent.id for agent in self.catalog.search([], limit=1)], ['ops'])
+
+
+class TestListenerDrivenReload(CatalogTestCase):
+    """Source changes reach the catalog through its change listener"""
+
+    async def test_completed_execution_refreshes_only_that_agent(self):
+        for _ in range(5):
+            self.source.record_execution('db')
+
+        with patch.object(self.source, 'list_active_agents') as list_active_agents:
+            await self.catalog.ensure_fresh()
+            list_active_agents.assert_not_called()
+
+        self.assertEqual(self.catalog.refresh_count, 1)
+        self.assertEqual(self.catalog.agent_refresh_count, 1)
+        self.assertEqual(self.catalog.get('db').agent.total_executions, 10)
+        self.assertEqual([agent.id for agent in self.catalog.search(['database'])], ['db', 'api'])
+        self.assertEqual(self.reloads, [({'db'}, set())])
+
+    async def test_agent_changes_reload_the_snapshot(self):
+        self.source.put_agent(make_agent('new', 'security-auditor', ['security', 'database']))
+        await self.catalog.ensure_fresh()
+
+        self.assertEqual(self.catalog.refresh_count, 2)
+        self.assertEqual([agent.id for agent in self.catalog.search(['security'])], ['new'])
+        self.assertEqual(self.reloads, [(set(), {'new'})])
+
+        self.source.remove_agent('api')
+        await self.catalog.ensure_fresh()
+        self.assertEqual([agent.id for agent in self.catalog.search(['api'])], [])
+        self.assertEqual(self.reloads[-1], ({'api'}, set()))
+
+    async def test_version_drift_reloads_without_a_signal(self):
+        self.catalog.refresh_interval = 0
+        self.source._agents['ops'] = make_agent('ops', 'devops-engineer', ['deployment', 'docker'])
+        self.source._version += 1
+
+        await self.catalog.ensure_fresh()
+        self.assertEqual(self.catalog.refresh_count, 2)
+        self.assertEqual([agent.id for agent in self.catalog.search(['docker'])], ['ops'])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,353 @@
+#!/usr/bin/env python3
+"""
+SQLite Agent Metadata Backend Test Suite
+Runs the AsyncAgentMetadataDB method surface against the embedded SQLite backend.
+"""
+
+import sys
+import sqlite3
+import asyncio
+import inspect
+import shutil
+import tempfile
+import unittest
+from pathlib import Path
+from unittest.mock import patch
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from database import (
+    AsyncAgentMetadataDB, SQLiteAgentMetadataDB, AgentSelectionEngine, ExecutionRecorder,
+    AgentTier, ExecutionStatus, create_database_manager
+)
+
+
+SAMPLE_AGENTS = [
+    {
+        'name': 'database-architect',
+        'display_name': 'Database Architecture Specialist',
+        'description': 'Expert in database design, optimization, and scaling strategies',
+        'tier': '3',
+        'specializations': ['database-design', 'performance-optimization', 'data-modeling'],
+        'keywords': ['database', 'schema', 'performance', 'optimization'],
+        'preferred_model': 'opus'
+    },
+    {
+        'name': 'backend-services',
+        'display_name': 'Backend Services Developer',
+        'description': 'Develops and maintains backend APIs and services',
+        'tier': '3',
+        'specializations': ['api-development', 'microservices', 'rest'],
+        'keywords': ['backend', 'api', 'services', 'rest']
+    },
+    {
+        'name': 'smart-orchestrator',
+        'display_name': 'Smart Agent Orchestrator',
+        'description': 'Coordinates and routes requests between agents',
+        'tier': '2',
+        'specializations': ['orchestration', 'routing'],
+        'keywords': ['orchestration', 'coordination']
+    }
+]
+
+
+class SQLiteBackendTestCase(unittest.IsolatedAsyncioTestCase):
+    """Base class opening a SQLite backend over a temporary database with sample agents"""
+    
+    async def asyncSetUp(self):
+        self.temp_dir = Path(tempfile.mkdtemp())
+        self.db = SQLiteAgentMetadataDB(str(self.temp_dir / "agents.db"), pool_size=4)
+        await self.db.initialize()
+        
+        self.agent_ids = {}
+        for agent_data in SAMPLE_AGENTS:
+            self.agent_ids[agent_data['name']] = await self.db.create_agent(agent_data)
+    
+    async def asyncTearDown(self):
+        await self.db.close()
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+
+
+class TestMethodSurface(unittest.TestCase):
+    """The SQLite backend is a drop-in for the Postgres one"""
+    
+    def test_public_coroutines_match(self):
+        for name, method in inspect.getmembers(AsyncAgentMetadataDB, inspect.iscoroutinefunction):
+            if name.startswith('_'):
+                continue
+            with self.subTest(method=name):
+                self.assertTrue(hasattr(SQLiteAgentMetadataDB, name))
+                self.assertEqual(
+                    list(inspect.signature(method).parameters),
+                    list(inspect.signature(getattr(SQLiteAgentMetadataDB, name)).parameters)
+                )
+    
+    def test_factory_selects_sqlite(self):
+        self.assertIsInstance(create_database_manager(backend='sqlite'), SQLiteAgentMetadataDB)
+        with self.assertRaises(ValueError):
+            create_database_manager(async_mode=False, backend='sqlite')
+        with self.assertRaises(ValueError):
+            create_database_manager(backend='oracle')
+
+
+class TestAgentManagement(SQLiteBackendTestCase):
+    """Agent CRUD and search"""
+    
+    async def test_get_agent_round_trips_fields(self):
+        agent = await self.db.get_agent(self.agent_ids['database-architect'])
+        
+        self.assertEqual(agent.name, 'database-architect')
+        self.assertEqual(agent.tier, AgentTier.TIER_3)
+        self.assertEqual(agent.keywords, ['database', 'schema', 'performance', 'optimization'])
+        self.assertEqual(agent.preferred_model, 'opus')
+        self.assertEqual(agent.configuration, {})
+        self.assertIsNone(agent.last_active_at)
+        
+        by_name = await self.db.get_agent_by_name('database-architect')
+        self.assertEqual(by_name, agent)
+        self.assertIsNone(await self.db.get_agent_by_name('missing'))
+    
+    async def test_search_stems_and_requires_every_word(self):
+        results = await self.db.search_agents(query_text='optimizing databases')
+        self.assertEqual([agent.name for agent in results], ['database-architect'])
+        
+        self.assertEqual(await self.db.search_agents(query_text='database routing'), [])
+    
+    async def test_search_filters(self):
+        results = await self.db.search_agents(specializations=['routing', 'unknown'])
+        self.assertEqual([agent.name for agent in results], ['smart-orchestrator'])
+        
+        results = await self.db.search_agents(tier=AgentTier.TIER_3)
+        self.assertEqual({agent.name for agent in results}, {'database-architect', 'backend-services'})
+        
+        self.assertEqual(len(await self.db.search_agents(limit=2)), 2)
+    
+    async def test_search_ignores_inactive_agents(self):
+        await self.db.create_agent({
+            'name': 'legacy-database', 'display_name': 'Legacy Database', 'tier': '4',
+            'status': 'inactive', 'keywords': ['database']
+        })
+        
+        results = await self.db.search_agents(query_text='database')
+        self.assertNotIn('legacy-database', [agent.name for agent in results])
+        self.assertEqual(len(await self.db.list_active_agents()), len(SAMPLE_AGENTS))
+
+
+    async def test_invalid_tier_and_status_are_rejected(self):
+        with self.assertRaises(ValueError):
+            await self.db.create_agent({'name': 'core-agent', 'display_name': 'Core', 'tier': 'core'})
+        with self.assertRaises(ValueError):
+            await self.db.create_agent({'name': 'paused-agent', 'display_name': 'Paused', 'tier': '2',
+                                        'status': 'paused'})
+        self.assertEqual(len(await self.db.list_active_agents()), len(SAMPLE_AGENTS))
+        
+        # Writers bypassing create_agent hit the same rule in the schema
+        async with self.db.get_connection() as conn:
+            with self.assertRaises(sqlite3.IntegrityError):
+                conn.execute("UPDATE agents SET tier = 'core'")
+    
+    async def test_nested_call_on_single_connection_raises(self):
+        db = SQLiteAgentMetadataDB(':memory:')
+        await db.initialize()
+        try:
+            async with db.get_connection():
+                with self.assertRaises(RuntimeError):
+                    await asyncio.wait_for(db.get_agent('missing'), timeout=5)
+            self.assertIsNone(await db.get_agent('missing'))
+        finally:
+            await db.close()
+
+
+class TestExecutionTracking(SQLiteBackendTestCase):
+    """Execution lifecycle and the stats trigger"""
+    
+    async def test_completion_updates_agent_stats(self):
+        agent_id = self.agent_ids['backend-services']
+        events = []
+        self.db.add_change_listener(lambda event, changed_id: events.append((event, changed_id)))
+        version = await self.db.get_catalog_version()
+        
+        succeeded = await self.db.start_execution(agent_id, 'user_request', {'query': 'build api'})
+        failed = await self.db.start_execution(agent_id, 'user_request', {'query': 'build api'})
+        await self.db.complete_execution(succeeded, ExecutionStatus.COMPLETED, tokens_used=120)
+        await self.db.complete_execution(failed, ExecutionStatus.FAILED, error_details='boom')
+        
+        agent = await self.db.get_agent(agent_id)
+        self.assertEqual(agent.total_executions, 2)
+        self.assertEqual(agent.success_count, 1)
+        self.assertIsNotNone(agent.last_active_at)
+        self.assertEqual(events, [('execution_completed', agent_id)] * 2)
+        self.assertNotEqual(await self.db.get_catalog_version(), version)
+        
+        performance = await self.db.get_agent_performance(agent_id)
+        self.assertEqual(performance['total_executions'], 2)
+        self.assertEqual(performance['successful_executions'], 1)
+        self.assertEqual(performance['failed_executions'], 1)
+        self.assertEqual(performance['success_rate'], 50.0)
+        self.assertEqual(performance['avg_tokens_used'], 120.0)
+    
+    async def test_concurrent_executions(self):
+        agent_id = self.agent_ids['database-architect']
+        
+        execution_ids = await asyncio.gather(*[
+            self.db.start_execution(agent_id, 'auto_trigger', {'index': index}) for index in range(40)
+        ])
+        await asyncio.gather(*[
+            self.db.complete_execution(execution_id, ExecutionStatus.COMPLETED) for execution_id in execution_ids
+        ])
+        
+        agent = await self.db.get_agent(agent_id)
+        self.assertEqual(agent.total_executions, 40)
+        self.assertEqual(agent.success_count, 40)
+    
+    async def test_start_execution_requires_known_agent(self):
+        with self.assertRaises(sqlite3.IntegrityError):
+            await self.db.start_execution('missing-agent', 'user_request', {})
+    
+    async def test_bulk_update_and_health(self):
+        agent_id = self.agent_ids['smart-orchestrator']
+        execution_id = await self.db.start_execution(agent_id, 'delegation', {})
+        await self.db.complete_execution(execution_id, ExecutionStatus.COMPLETED)
+        
+        self.assertEqual(await self.db.bulk_update_agent_performance(), 'UPDATE 1')
+        agent = await self.db.get_agent(agent_id)
+        self.assertEqual((agent.total_executions, agent.success_count), (1, 1))
+        
+        health = await self.db.get_system_health()
+        self.assertEqual(health['total_agents']['value'], len(SAMPLE_AGENTS))
+        self.assertEqual(health['total_executions_today']['value'], 1)
+        self.assertEqual(health['avg_success_rate'], {'value': 100.0, 'status': 'OK'})
+
+
+class TestExecutionRecorder(SQLiteBackendTestCase):
+    """Buffered execution recording and batched stats updates"""
+    
+    async def asyncSetUp(self):
+        await super().asyncSetUp()
+        self.recorder = ExecutionRecorder(self.db, flush_interval=60)
+    
+    async def _count_executions(self):
+        async with self.db.get_connection() as conn:
+            return conn.execute("SELECT COUNT(*) FROM execution_history").fetchone()[0]
+    
+    async def test_batch_matches_per_call_stats(self):
+        agent_id = self.agent_ids['backend-services']
+        events = []
+        self.db.add_change_listener(lambda event, changed_id: events.append((event, changed_id)))
+        
+        # Completed before the flush: stored once, already final
+        finished = await self.recorder.start_execution(agent_id, 'user_request', {'query': 'api'})
+        await self.recorder.complete_execution(finished, ExecutionStatus.COMPLETED, tokens_used=80)
+        running = await self.recorder.start_execution(agent_id, 'user_request', {})
+        self.assertEqual(await self._count_executions(), 0)
+        
+        self.assertEqual(await self.recorder.flush(), 2)
+        self.assertEqual(events, [('execution_completed', agent_id)])
+        agent = await self.db.get_agent(agent_id)
+        self.assertEqual((agent.total_executions, agent.success_count), (1, 1))
+        
+        # Completed after its start was written: applied as a batched UPDATE
+        await self.recorder.complete_execution(running, ExecutionStatus.FAILED, error_details='boom')
+        await self.recorder.complete_execution(running, ExecutionStatus.FAILED, error_details='boom')
+        await self.recorder.flush()
+        
+        agent = await self.db.get_agent(agent_id)
+        self.assertEqual((agent.total_executions, agent.success_count), (2, 1))
+        self.assertIsNotNone(agent.last_active_at)
+        performance = await self.db.get_agent_performance(agent_id)
+        self.assertEqual(performance['failed_executions'], 1)
+        self.assertEqual(performance['avg_tokens_used'], 80.0)
+        
+        # The per-row triggers are back on after a batch
+        execution_id = await self.db.start_execution(agent_id, 'user_request', {})
+        await self.db.complete_execution(execution_id, ExecutionStatus.COMPLETED)
+        self.assertEqual((await self.db.get_agent(agent_id)).total_executions, 3)
+    
+    async def test_burst_is_written_in_few_transactions(self):
+        agent_ids = list(self.agent_ids.values())
+        self.recorder.max_batch = 50
+        
+        async def run(index):
+            execution_id = await self.recorder.start_execution(agent_ids[index % 3], 'auto_trigger', {})
+            await asyncio.sleep(0)
+            await self.recorder.complete_execution(execution_id, ExecutionStatus.COMPLETED)
+        
+        await asyncio.gather(*[run(index) for index in range(120)])
+        await self.recorder.close()
+        
+        stats = self.recorder.get_stats()
+        self.assertEqual(stats['events_recorded'], 240)
+        self.assertEqual(stats['pending_events'], 0)
+        self.assertLessEqual(stats['flushes'], 24)
+        self.assertEqual(await self._count_executions(), 120)
+        for agent_id in agent_ids:
+            agent = await self.db.get_agent(agent_id)
+            self.assertEqual((agent.total_executions, agent.success_count), (40, 40))
+    
+    async def test_rejected_event_is_isolated(self):
+        agent_id = self.agent_ids['smart-orchestrator']
+        self.recorder.max_batch = 2
+        
+        # The unknown agent fails the batch, but recording never raises
+        rejected = await self.recorder.start_execution('missing-agent', 'user_request', {})
+        first = await self.recorder.start_execution(agent_id, 'user_request', {})
+        
+        stats = self.recorder.get_stats()
+        self.assertEqual((stats['failed_flushes'], stats['rejected_events'], stats['pending_events']), (1, 1, 0))
+        self.assertEqual([event.id for event in self.recorder.dead_letters], [rejected])
+        self.assertEqual(await self._count_executions(), 1)
+        
+        # Nothing from the rolled-back batch leaks into later writes
+        async with self.db.get_connection() as conn:
+            self.assertEqual(conn.execute("SELECT COUNT(*) FROM agent_stats_batch").fetchone()[0], 0)
+        await self.recorder.complete_execution(first, ExecutionStatus.COMPLETED)
+        self.assertEqual(await self.recorder.flush(), 1)
+        self.assertEqual((await self.db.get_agent(agent_id)).success_count, 1)
+    
+    async def test_unavailable_database_keeps_events(self):
+        agent_id = self.agent_ids['smart-orchestrator']
+        execution_id = await self.recorder.start_execution(agent_id, 'user_request', {})
+        
+        with patch.object(self.db, 'record_executions', side_effect=sqlite3.OperationalError('database is locked')):
+            with self.assertRaises(sqlite3.OperationalError):
+                await self.recorder.flush()
+        self.assertEqual(self.recorder.get_stats()['pending_events'], 1)
+        self.assertEqual(len(self.recorder.dead_letters), 0)
+        
+        await self.recorder.complete_execution(execution_id, ExecutionStatus.COMPLETED)
+        self.assertEqual(await self.recorder.flush(), 1)
+        self.assertEqual((await self.db.get_agent(agent_id)).success_count, 1)
+
+
+class TestRecommendationsAndSelection(SQLiteBackendTestCase):
+    """Recommendation scoring and the selection engine on top of SQLite"""
+    
+    async def test_recommendations_are_stored_and_reused(self):
+        context = {'keywords': ['database', 'schema'], 'phase': 'database-design'}
+        
+        recommendations = await self.db.generate_agent_recommendations(context, limit=2)
+        self.assertEqual(recommendations[0].agent_id, self.agent_ids['database-architect'])
+        self.assertEqual(recommendations[0].keyword_match_score, 1.0)
+        self.assertEqual(recommendations[0].phase_alignment_score, 1.0)
+        
+        cached = await self.db.generate_agent_recommendations(context, limit=2)
+        self.assertEqual([r.agent_id for r in cached], [r.agent_id for r in recommendations])
+        self.assertAlmostEqual(cached[0].total_score, recommendations[0].total_score)
+        
+        health = await self.db.get_system_health()
+        self.assertEqual(health['active_recommendations']['value'], 2)
+    
+    async def test_selection_engine_runs_on_sqlite(self):
+        selector = AgentSelectionEngine(self.db)
+        
+        best = await selector.select_best_agent("Optimize the PostgreSQL database schema performance")
+        self.assertEqual(best.agent_name, 'database-architect')
+        
+        execution_id = await self.db.start_execution(best.agent_id, 'user_request', {})
+        await self.db.complete_execution(execution_id, ExecutionStatus.COMPLETED)
+        await selector.select_best_agent("Optimize the PostgreSQL database schema performance")
+        self.assertEqual(selector.get_cache_stats()['invalidations'], 1)
+
+
+if __name__ == '__main__':
+    unittest.main()
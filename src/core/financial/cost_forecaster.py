@@ -0,0 +1,238 @@
+#!/usr/bin/env python3
+"""
+Claude Token Cost Forecaster
+Vectorized Holt-Winters forecasting of hourly cost series per agent and model
+"""
+
+import sqlite3
+from datetime import datetime, timedelta
+from itertools import product
+from typing import Dict, List, Optional, Any, Tuple
+
+import numpy as np
+
+class CostForecaster:
+    """
+    Forecasts hourly cost for every agent, every model and the total at once
+    
+    All series are read from the hourly rollups in one query into a
+    (series x hours) matrix. Additive Holt-Winters with a damped trend and
+    a daily season is then run over the whole matrix for every smoothing
+    parameter combination in the grid simultaneously, so the cost is one
+    pass over the history regardless of how many agents there are;
+    combinations without trend and season are plain EWMA.
+    
+    Usage is bursty, so models are not chosen by one-step-ahead error,
+    which every smoothing constant scores alike before a burst. Instead
+    each combination forecasts the next day's total from every day
+    boundary of the history and is charged its miss on that total. The
+    plain mean rate competes on the same terms, wins ties, and is used
+    outright for intermittent series, where what was spent says more
+    about the next month than when it was spent.
+    """
+    
+    SEASON_LENGTH = 24  # hours
+    # Mean days between days with spend above which a series is
+    # intermittent (the Syntetos-Boylan cut-off)
+    INTERMITTENT_INTERVAL = 1.32
+    
+    def __init__(self, alphas: Tuple[float, ...] = (0.05, 0.2, 0.5),
+                 betas: Tuple[float, ...] = (0.0, 0.05),
+                 gammas: Tuple[float, ...] = (0.0, 0.1, 0.3),
+                 damping: float = 0.98):
+        self.grid = np.array(list(product(alphas, betas, gammas)), dtype=float)
+        self.damping = damping
+    
+    def forecast(self, conn: sqlite3.Connection, history_days: int = 7,
+                 horizon_days: int = 30, now: Optional[datetime] = None) -> Dict[str, Any]:
+        """Fit on the last `history_days` of complete hours and forecast `horizon_days` ahead"""
+        end_hour = (now or datetime.now()).replace(minute=0, second=0, microsecond=0)
+        start_hour = end_hour - timedelta(days=history_days)
+        names, matrix = self.load_series(conn, start_hour, end_hour)
+        horizon = horizon_days * 24
+        
+        if not matrix.any():
+            fitted = {
+                'forecast': np.zeros((len(names), horizon)),
+                'sigma': np.zeros(len(names)),
+                'params': np.zeros((len(names), 3)),
+                'model': np.full(len(names), 'mean')
+            }
+        else:
+            fitted = self.fit(matrix, horizon)
+        
+        projection = fitted['forecast'].sum(axis=1)
+        margin = 1.96 * fitted['sigma'] * np.sqrt(horizon / 24)
+        
+        def describe(index: int) -> Dict[str, Any]:
+            alpha, beta, gamma = fitted['params'][index]
+            return {
+                'projection': float(projection[index]),
+                'lower': float(max(0.0, projection[index] - margin[index])),
+                'upper': float(projection[index] + margin[index]),
+                'model': str(fitted['model'][index]),
+                'params': {'alpha': float(alpha), 'beta': float(beta), 'gamma': float(gamma)}
+            }
+        
+        by_kind = {'agent': [], 'model': []}
+        for index, (kind, name) in enumerate(names[:-1]):
+            by_kind[kind].append({f'{kind}_name': name, **describe(index)})
+        for entries in by_kind.values():
+            entries.sort(key=lambda entry: entry['projection'], reverse=True)
+        
+        total = describe(len(names) - 1)
+        total['daily'] = self.daily_totals(fitted['forecast'][-1], end_hour)
+        
+        return {
+            'generated_at': end_hour.isoformat(),
+            'history_days': history_days,
+            'horizon_days': horizon_days,
+            'total': total,
+            'by_agent': by_kind['agent'],
+            'by_model': by_kind['model']
+        }
+    
+    @staticmethod
+    def daily_totals(hourly: np.ndarray, first_hour: datetime) -> List[Dict[str, Any]]:
+        """Sum an hourly forecast starting at `first_hour` into calendar days
+        
+        Days run midnight to midnight, so unless the forecast starts at
+        midnight the first and last entries cover only part of their day;
+        'hours' says how much.
+        """
+        day_index = (first_hour.hour + np.arange(len(hourly))) // 24
+        costs = np.bincount(day_index, weights=hourly)
+        hours = np.bincount(day_index)
+        first_day = first_hour.date()
+        return [
+            {'date': (first_day + timedelta(days=day)).isoformat(), 'cost': float(costs[day]), 'hours': int(hours[day])}
+            for day in range(len(costs))
+        ]
+    
+    def load_series(self, conn: sqlite3.Connection, start_hour: datetime,
+                    end_hour: datetime) -> Tuple[List[Tuple[str, str]], np.ndarray]:
+        """Read hourly cost per agent and per model into a matrix
+        
+        Rows are ('agent', name) and ('model', name) series followed by the
+        total; columns are the hours in [start_hour, end_hour).
+        """
+        hour_count = int((end_hour - start_hour).total_seconds() // 3600)
+        rows = conn.execute('''
+            SELECT hour, agent_name, model_name, SUM(total_cost)
+            FROM usage_rollups_hourly
+            WHERE hour >= ? AND hour < ?
+            GROUP BY hour, agent_name, model_name
+        ''', (start_hour.strftime('%Y-%m-%d %H:00'), end_hour.strftime('%Y-%m-%d %H:00'))).fetchall()
+        
+        agents = sorted({row[1] for row in rows})
+        models = sorted({row[2] for row in rows})
+        names = [('agent', name) for name in agents] + [('model', name) for name in models] + [('total', 'total')]
+        
+        agent_index = {name: position for position, name in enumerate(agents)}
+        model_index = {name: len(agents) + position for position, name in enumerate(models)}
+        hour_index = {
+            (start_hour + timedelta(hours=offset)).strftime('%Y-%m-%d %H:00'): offset
+            for offset in range(hour_count)
+        }
+        columns = np.array([hour_index[row[0]] for row in rows], dtype=int)
+        costs = np.array([row[3] or 0.0 for row in rows], dtype=float)
+        
+        matrix = np.zeros((len(names), hour_count))
+        if rows:
+            np.add.at(matrix, (np.array([agent_index[row[1]] for row in rows]), columns), costs)
+            np.add.at(matrix, (np.array([model_index[row[2]] for row in rows]), columns), costs)
+            np.add.at(matrix, (np.full(len(rows), len(names) - 1), columns), costs)
+        return names, matrix
+    
+    def fit(self, matrix: np.ndarray, horizon: int) -> Dict[str, np.ndarray]:
+        """Fit every series for every grid point in one pass and forecast `horizon` steps
+        
+        'sigma' is the standard error of one day's total under the chosen
+        model: its day-ahead error for Holt-Winters, the spread of the daily
+        totals for the mean rate.
+        """
+        series_count, hour_count = matrix.shape
+        season_length = self.SEASON_LENGTH
+        grid = self.grid
+        if hour_count < 2 * season_length:
+            # Not enough history to estimate a season: trend/level only
+            grid = grid[grid[:, 2] == 0]
+        alpha, beta, gamma = (grid[:, column][None, :] for column in range(3))
+        phi = self.damping
+        
+        # Initial state from the first seasons
+        if hour_count >= 2 * season_length:
+            first = matrix[:, :season_length]
+            level = first.mean(axis=1)
+            trend = (matrix[:, season_length:2 * season_length].mean(axis=1) - level) / season_length
+            season = first - level[:, None]
+        else:
+            level = matrix[:, 0].copy()
+            trend = np.zeros(series_count)
+            season = np.zeros((series_count, season_length))
+        
+        # A component whose smoothing parameter is zero starts at zero and
+        # stays there, so a beta = gamma = 0 combination really is EWMA
+        combos = grid.shape[0]
+        level = np.repeat(level[:, None], combos, axis=1)
+        trend = trend[:, None] * (beta > 0)
+        season = season[:, None, :] * (gamma > 0)[:, :, None]
+        
+        # Day-ahead totals are forecast from every day boundary after the
+        # seasons the initial state was taken from
+        origins = range(2 * season_length, hour_count - season_length + 1, season_length)
+        day_trend = np.cumsum(phi ** np.arange(1, season_length + 1)).sum()
+        day_forecasts = []
+        
+        for step in range(hour_count):
+            if step in origins:
+                day_forecasts.append(season_length * level + day_trend * trend + season.sum(axis=2))
+            
+            slot = step % season_length
+            observed = matrix[:, step][:, None]
+            previous_season = season[:, :, slot]
+            
+            new_level = alpha * (observed - previous_season) + (1 - alpha) * (level + phi * trend)
+            trend = beta * (new_level - level) + (1 - beta) * phi * trend
+            season[:, :, slot] = gamma * (observed - new_level) + (1 - gamma) * previous_season
+            level = new_level
+        
+        rows = np.arange(series_count)
+        mean_rate = matrix.mean(axis=1)
+        day_count = hour_count // season_length
+        if day_count:
+            daily = matrix[:, hour_count - day_count * season_length:].reshape(series_count, day_count, season_length).sum(axis=2)
+        else:
+            daily = matrix.sum(axis=1)[:, None]
+        intermittent = (daily > 0).sum(axis=1) * self.INTERMITTENT_INTERVAL < daily.shape[1]
+        
+        if day_forecasts:
+            actual = np.stack([matrix[:, origin:origin + season_length].sum(axis=1) for origin in origins], axis=1)
+            predicted = np.clip(np.stack(day_forecasts, axis=2), 0.0, None)
+            model_error = ((predicted - actual[:, None, :]) ** 2).mean(axis=2)
+            mean_predicted = np.stack([matrix[:, :origin].mean(axis=1) * season_length for origin in origins], axis=1)
+            mean_error = ((mean_predicted - actual) ** 2).mean(axis=1)
+            best = model_error.argmin(axis=1)
+            use_mean = intermittent | (mean_error <= model_error[rows, best])
+            model_sigma = np.sqrt(model_error[rows, best])
+        else:
+            best = np.zeros(series_count, dtype=int)
+            use_mean = np.ones(series_count, dtype=bool)
+            model_sigma = np.zeros(series_count)
+        
+        level, trend, season = level[rows, best], trend[rows, best], season[rows, best]
+        steps = np.arange(1, horizon + 1)
+        damped_steps = np.cumsum(phi ** steps)
+        slots = (hour_count + steps - 1) % season_length
+        forecast = level[:, None] + damped_steps[None, :] * trend[:, None] + season[:, slots]
+        forecast = np.where(use_mean[:, None], mean_rate[:, None], forecast)
+        
+        params = np.where(use_mean[:, None], 0.0, grid[best])
+        model = np.where(use_mean, 'mean', np.where(params[:, 1:].any(axis=1), 'holt_winters', 'ewma'))
+        
+        return {
+            'forecast': np.clip(forecast, 0.0, None),
+            'sigma': np.where(use_mean, daily.std(axis=1), model_sigma),
+            'params': params,
+            'model': model
+        }
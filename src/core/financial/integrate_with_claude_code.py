@@ -275,7 +275,7 @@ class TokenTrackingHook:
     """Hook for automatic token usage tracking"""
     
     def __init__(self):
-        self.calculator = TokenCostCalculator() if CALCULATOR_AVAILABLE else None
+        self.calculator = TokenCostCalculator(buffered=True) if CALCULATOR_AVAILABLE else None
         self.enabled = CALCULATOR_AVAILABLE
     
     def on_agent_start(self, agent_name: str, session_id: str, context: dict):
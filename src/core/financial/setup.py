@@ -190,7 +190,7 @@ class TokenCalculatorSetup:
             "reporting": {
                 "default_format": "html",
                 "include_charts": True,
-                "export_formats": ["csv", "json", "excel"]
+                "export_formats": ["csv", "json", "ndjson", "parquet", "excel"]
             },
             "optimization": {
                 "auto_recommendations": True,
@@ -0,0 +1,130 @@
+#!/usr/bin/env python3
+"""
+Cost Forecaster Test Suite
+Model choice and projections for synthetic sparse, seasonal and trending usage.
+"""
+
+import sys
+import sqlite3
+import unittest
+from datetime import datetime, timedelta
+from pathlib import Path
+
+import numpy as np
+
+sys.path.insert(0, str(Path(__file__).parent))
+
+from cost_forecaster import CostForecaster
+
+
+HISTORY_HOURS = 7 * 24
+HORIZON_HOURS = 30 * 24
+
+
+def seasonal_series(hours: int, seed: int = 1) -> np.ndarray:
+    rng = np.random.default_rng(seed)
+    steps = np.arange(hours)
+    return np.clip(2 + 1.5 * np.sin(2 * np.pi * steps / 24) + rng.normal(0, 0.2, hours), 0.0, None)
+
+
+class TestSparseUsage(unittest.TestCase):
+    """A single burst projects its run-rate, wherever it falls in the window"""
+
+    def setUp(self):
+        self.forecaster = CostForecaster()
+
+    def project(self, hours_ago: int):
+        matrix = np.zeros((1, HISTORY_HOURS))
+        matrix[0, HISTORY_HOURS - hours_ago] = 100.0
+        fitted = self.forecaster.fit(matrix, HORIZON_HOURS)
+        projection = fitted['forecast'].sum()
+        margin = 1.96 * fitted['sigma'][0] * np.sqrt(HORIZON_HOURS / 24)
+        return projection, projection - margin, projection + margin, fitted['model'][0]
+
+    def test_projection_does_not_depend_on_burst_recency(self):
+        run_rate = 100.0 / HISTORY_HOURS * HORIZON_HOURS
+        for hours_ago in (3, 24, 72, 150):
+            with self.subTest(hours_ago=hours_ago):
+                projection, lower, upper, model = self.project(hours_ago)
+                self.assertEqual(model, 'mean')
+                self.assertAlmostEqual(projection, run_rate, places=6)
+                self.assertLess(lower, run_rate)
+                self.assertGreater(upper, run_rate)
+
+    def test_no_usage_projects_nothing(self):
+        fitted = self.forecaster.fit(np.zeros((1, HISTORY_HOURS)), HORIZON_HOURS)
+        self.assertEqual(fitted['forecast'].sum(), 0.0)
+        self.assertEqual(fitted['sigma'][0], 0.0)
+
+
+class TestRegularUsage(unittest.TestCase):
+    """Daily seasonal and trending usage"""
+
+    def setUp(self):
+        self.forecaster = CostForecaster()
+
+    def test_seasonal_series_projects_its_future(self):
+        series = seasonal_series(HISTORY_HOURS + HORIZON_HOURS)
+        fitted = self.forecaster.fit(series[None, :HISTORY_HOURS], HORIZON_HOURS)
+        actual = series[HISTORY_HOURS:].sum()
+        margin = 1.96 * fitted['sigma'][0] * np.sqrt(HORIZON_HOURS / 24)
+
+        self.assertAlmostEqual(fitted['forecast'].sum(), actual, delta=0.05 * actual)
+        self.assertLess(abs(fitted['forecast'].sum() - actual), margin)
+
+    def test_growing_series_beats_the_mean_rate(self):
+        steps = np.arange(HISTORY_HOURS + HORIZON_HOURS)
+        series = (0.5 + 0.01 * steps) * (1 + np.sin(2 * np.pi * steps / 24))
+        fitted = self.forecaster.fit(series[None, :HISTORY_HOURS], HORIZON_HOURS)
+
+        self.assertEqual(fitted['model'][0], 'holt_winters')
+        self.assertGreater(fitted['params'][0][1], 0.0)
+        self.assertGreater(fitted['forecast'].sum(), series[:HISTORY_HOURS].mean() * HORIZON_HOURS)
+
+    def test_short_history_uses_the_mean_rate(self):
+        series = seasonal_series(30)
+        fitted = self.forecaster.fit(series[None, :], 48)
+        self.assertEqual(fitted['model'][0], 'mean')
+        self.assertAlmostEqual(fitted['forecast'].sum(), series.mean() * 48)
+
+
+class TestForecast(unittest.TestCase):
+    """End to end over the hourly rollups"""
+
+    def setUp(self):
+        self.conn = sqlite3.connect(':memory:')
+        self.conn.execute('''
+            CREATE TABLE usage_rollups_hourly (
+                hour TEXT NOT NULL, agent_name TEXT NOT NULL, model_name TEXT NOT NULL,
+                session_id TEXT NOT NULL, total_tokens INTEGER NOT NULL, total_cost REAL NOT NULL,
+                requests INTEGER NOT NULL, duration_sum REAL NOT NULL
+            )
+        ''')
+        self.now = datetime(2026, 10, 16, 15, 30)
+
+    def tearDown(self):
+        self.conn.close()
+
+    def add_usage(self, hour: datetime, agent: str, cost: float):
+        self.conn.execute('INSERT INTO usage_rollups_hourly VALUES (?, ?, ?, ?, 0, ?, 1, 0)',
+                          (hour.strftime('%Y-%m-%d %H:00'), agent, 'sonnet', 's1', cost))
+
+    def test_sparse_agent_alongside_regular_usage(self):
+        end_hour = self.now.replace(minute=0)
+        series = seasonal_series(HISTORY_HOURS)
+        for offset, cost in enumerate(series):
+            self.add_usage(end_hour - timedelta(hours=HISTORY_HOURS - offset), 'steady', float(cost))
+        self.add_usage(end_hour - timedelta(hours=3), 'burst', 100.0)
+
+        result = CostForecaster().forecast(self.conn, now=self.now)
+        by_agent = {entry['agent_name']: entry for entry in result['by_agent']}
+
+        self.assertEqual(by_agent['burst']['model'], 'mean')
+        self.assertAlmostEqual(by_agent['burst']['projection'], 100.0 / HISTORY_HOURS * HORIZON_HOURS)
+        self.assertGreater(result['total']['projection'], by_agent['steady']['projection'])
+        self.assertEqual(sum(day['hours'] for day in result['total']['daily']), HORIZON_HOURS)
+        self.assertEqual(result['total']['daily'][0], {**result['total']['daily'][0], 'date': '2026-10-16', 'hours': 9})
+
+
+if __name__ == '__main__':
+    unittest.main()
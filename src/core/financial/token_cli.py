@@ -305,14 +305,14 @@ class TokenCLI:
             
             output_path = args.output or f"token_usage_{datetime.now().strftime('%Y%m%d_%H%M%S')}.{args.format}"
             
-            self.calculator.export_usage_data(
+            row_count = self.calculator.export_usage_data(
                 filepath=output_path,
                 format=args.format,
                 start_date=start_date,
                 end_date=end_date
             )
             
-            self.print_success(f"Data exported to: {output_path}")
+            self.print_success(f"Exported {self.format_number(row_count)} rows to: {output_path}")
             
             # Show file size
             file_size = os.path.getsize(output_path)
@@ -321,6 +321,20 @@ class TokenCLI:
         except Exception as e:
             self.print_error(f"Failed to export data: {e}")
     
+    def cmd_archive(self, args):
+        """Move cold usage into the date-partitioned archive"""
+        try:
+            before_date = date.today() - timedelta(days=args.older_than)
+            self.print_info(f"Archiving usage recorded before {before_date}...")
+            
+            result = self.calculator.archive_usage(before_date)
+            
+            self.print_success(f"Archived {self.format_number(result['rows'])} rows from {result['days']} days")
+            print(f"Archive: {result['archive_dir']}")
+            
+        except Exception as e:
+            self.print_error(f"Failed to archive data: {e}")
+    
     def cmd_report(self, args):
         """Generate comprehensive report"""
         try:
@@ -419,8 +433,17 @@ class TokenCLI:
             
             print(f"Daily Average: {self.format_currency(prediction['daily_average'])}")
             print(f"Monthly Projection: {self.format_currency(prediction['monthly_projection'])}")
+            print(f"Forecast Model: {prediction['method'].replace('_', '-')}")
             print()
             
+            # Next week of the daily forecast
+            if prediction['daily_forecast']:
+                print(f"{self.colorize('Forecast for the Next 7 Days:', 'bold')}")
+                for day in prediction['daily_forecast'][:7]:
+                    partial = f" ({day['hours']}h)" if day.get('hours', 24) < 24 else ''
+                    print(f"  {day['date']}: {self.format_currency(day['cost'])}{partial}")
+                print()
+            
             # Confidence interval
             confidence = prediction['confidence_95']
             print(f"{self.colorize('95% Confidence Interval:', 'bold')}")
@@ -434,7 +457,8 @@ class TokenCLI:
                 for agent in prediction['breakdown_projection']['by_agent'][:5]:
                     name = agent['agent_name']
                     cost = self.format_currency(agent['monthly_cost'])
-                    print(f"  {name}: {cost}")
+                    band = f"{self.format_currency(agent['lower'])} - {self.format_currency(agent['upper'])}"
+                    print(f"  {name}: {cost} ({band})")
                 print()
             
             # Model breakdown
@@ -523,6 +547,7 @@ Examples:
   %(prog)s optimize
   %(prog)s alerts create --type=daily --threshold=25.00
   %(prog)s export --format=csv --output="usage_data.csv"
+  %(prog)s archive --older-than=90
   %(prog)s dashboard --port=8080
   %(prog)s compare --no-scenarios
   %(prog)s predict --days=7
@@ -570,11 +595,15 @@ Examples:
     
     # Export command
     export_parser = subparsers.add_parser('export', help='Export usage data')
-    export_parser.add_argument('--format', choices=['csv', 'json', 'excel'], default='csv', help='Export format')
+    export_parser.add_argument('--format', choices=list(TokenCostCalculator.EXPORT_FORMATS), default='csv', help='Export format')
     export_parser.add_argument('--output', help='Output file path')
     export_parser.add_argument('--start-date', help='Start date (YYYY-MM-DD)')
     export_parser.add_argument('--end-date', help='End date (YYYY-MM-DD)')
     
+    # Archive command
+    archive_parser = subparsers.add_parser('archive', help='Archive cold usage data by date')
+    archive_parser.add_argument('--older-than', type=int, default=90, help='Archive usage older than N days (default: 90)')
+    
     # Report command
     report_parser = subparsers.add_parser('report', help='Generate comprehensive report')
     report_parser.add_argument('--output', help='Output file path')
@@ -4,13 +4,18 @@ Claude Token Usage Calculator & Cost Optimization Engine
 Advanced financial analysis tool for Claude API token tracking and cost management
 """
 
+import os
+import csv
+import copy
+import gzip
 import json
+import atexit
 import sqlite3
 import time
 import threading
 from datetime import datetime, timedelta, date
 from pathlib import Path
-from typing import Dict, List, Optional, Any, Tuple
+from typing import Dict, List, Optional, Any, Tuple, Iterator
 from dataclasses import dataclass, asdict
 from decimal import Decimal, ROUND_HALF_UP
 import matplotlib.pyplot as plt
@@ -19,6 +24,7 @@ import pandas as pd
 import numpy as np
 from collections import defaultdict
 import warnings
+from cost_forecaster import CostForecaster
 warnings.filterwarnings('ignore')
 
 @dataclass
@@ -75,15 +81,52 @@ class OptimizationRecommendation:
 class TokenCostCalculator:
     """Comprehensive token cost tracking and optimization engine"""
     
-    def __init__(self, database_path: Optional[str] = None):
+    EXPORT_FORMATS = ('csv', 'json', 'ndjson', 'parquet', 'excel')
+    
+    def __init__(self, database_path: Optional[str] = None, buffered: bool = False,
+                 flush_interval: float = 0.2, flush_batch_size: int = 500,
+                 archive_dir: Optional[str] = None):
+        """
+        Args:
+            database_path: SQLite database file (default ~/.claude/financial/token_costs.db)
+            buffered: Queue recorded usage and group-commit it from a writer thread;
+                reads see buffered rows after the next flush (at most `flush_interval`)
+            flush_interval: Seconds between group commits in buffered mode
+            flush_batch_size: Pending rows that trigger an early group commit
+            archive_dir: Root of the date-partitioned usage archive
+                (default ~/.claude/financial/archive)
+        """
         self.claude_dir = Path.home() / '.claude'
         self.financial_dir = self.claude_dir / 'financial'
         self.financial_dir.mkdir(parents=True, exist_ok=True)
+        self.archive_dir = Path(archive_dir) if archive_dir else self.financial_dir / 'archive'
         
         # Database setup
         self.db_path = database_path or str(self.financial_dir / 'token_costs.db')
         self.init_database()
         
+        # Ingestion: one persistent WAL connection shared by all writes
+        self._connection = self._open_write_connection()
+        self._write_lock = threading.Lock()      # guards self._connection
+        self._flush_lock = threading.Lock()      # serializes whole flushes
+        self._ingest_lock = threading.Condition()  # guards pending rows and cost counters
+        self._pending: List[TokenUsage] = []
+        self.buffered = buffered
+        self.flush_interval = flush_interval
+        self.flush_batch_size = flush_batch_size
+        
+        # Summary queries: persistent read connection and results memoized
+        # until the ingest watermark (PRAGMA data_version) moves
+        self._read_connection = self._open_read_connection()
+        self._read_lock = threading.Lock()       # guards the read connection and query cache
+        self._query_cache: Dict[Tuple, Any] = {}
+        self._cache_watermark: Optional[int] = None
+        self.query_cache_size = 128
+        
+        # In-memory daily cost totals used for alert evaluation
+        self._daily_costs: Dict[date, Decimal] = defaultdict(Decimal)
+        self._load_cost_counters()
+        
         # Model pricing (as of 2024 - update as needed)
         self.model_pricing = {
             'claude-3-5-sonnet-20241022': ModelPricing(
@@ -128,6 +171,9 @@ class TokenCostCalculator:
             )
         }
         
+        # Forecasts are fitted on the hourly rollups and cached like summaries
+        self.forecaster = CostForecaster()
+        
         # Alert configurations
         self.alerts: List[CostAlert] = []
         self.load_alerts()
@@ -136,6 +182,13 @@ class TokenCostCalculator:
         self.monitoring = True
         self.monitor_thread = threading.Thread(target=self._monitor_costs, daemon=True)
         self.monitor_thread.start()
+        
+        # Group-commit writer for buffered ingestion
+        self.writer_thread = None
+        if self.buffered:
+            self.writer_thread = threading.Thread(target=self._flush_loop, daemon=True)
+            self.writer_thread.start()
+            atexit.register(self.flush)
     
     def init_database(self):
         """Initialize SQLite database for token tracking"""
@@ -198,6 +251,70 @@ class TokenCostCalculator:
                 CREATE INDEX IF NOT EXISTS idx_usage_model ON token_usage(model_name);
                 CREATE INDEX IF NOT EXISTS idx_usage_session ON token_usage(session_id);
                 CREATE INDEX IF NOT EXISTS idx_daily_date ON daily_summaries(date);
+                
+                -- Rollups kept current at insert time; summary queries read these
+                CREATE TABLE IF NOT EXISTS usage_rollups_hourly (
+                    hour TEXT NOT NULL,  -- YYYY-MM-DD HH:00
+                    agent_name TEXT NOT NULL,
+                    model_name TEXT NOT NULL,
+                    session_id TEXT NOT NULL,
+                    total_tokens INTEGER NOT NULL,
+                    total_cost REAL NOT NULL,
+                    requests INTEGER NOT NULL,
+                    duration_sum REAL NOT NULL,
+                    PRIMARY KEY (hour, agent_name, model_name, session_id)
+                );
+                
+                CREATE TABLE IF NOT EXISTS usage_rollups_daily (
+                    date TEXT NOT NULL,  -- YYYY-MM-DD
+                    agent_name TEXT NOT NULL,
+                    model_name TEXT NOT NULL,
+                    session_id TEXT NOT NULL,
+                    total_tokens INTEGER NOT NULL,
+                    total_cost REAL NOT NULL,
+                    requests INTEGER NOT NULL,
+                    duration_sum REAL NOT NULL,
+                    PRIMARY KEY (date, agent_name, model_name, session_id)
+                );
+                
+                -- Cold usage moved out of token_usage into archive files
+                CREATE TABLE IF NOT EXISTS usage_archive_partitions (
+                    date TEXT NOT NULL,  -- YYYY-MM-DD
+                    path TEXT NOT NULL,  -- relative to the archive directory
+                    row_count INTEGER NOT NULL,
+                    total_cost REAL NOT NULL,
+                    archived_at DATETIME DEFAULT CURRENT_TIMESTAMP,
+                    PRIMARY KEY (date, path)
+                );
+            ''')
+            
+            # One-time backfill for databases created before the rollups existed
+            self._backfill_rollups(conn)
+            
+            # Column order of exported and archived rows
+            self.usage_columns = [(row[1], row[2]) for row in conn.execute('PRAGMA table_info(token_usage)')]
+    
+    def _backfill_rollups(self, conn: sqlite3.Connection, only_if_empty: bool = True):
+        """Aggregate stored usage into the rollups
+        
+        By default only tables that are still empty are filled. Otherwise every
+        day that has not been archived is aggregated; the caller must have
+        removed those days from the rollups first.
+        """
+        for table, bucket in (('usage_rollups_hourly', "strftime('%Y-%m-%d %H:00', timestamp)"),
+                              ('usage_rollups_daily', 'DATE(timestamp)')):
+            if only_if_empty:
+                condition = f'NOT EXISTS (SELECT 1 FROM {table})'
+            else:
+                condition = 'DATE(timestamp) NOT IN (SELECT date FROM usage_archive_partitions)'
+            conn.execute(f'''
+                INSERT INTO {table}
+                SELECT {bucket}, agent_name, model_name, session_id,
+                       SUM(total_tokens), SUM(total_cost), COUNT(*),
+                       COALESCE(SUM(duration_seconds), 0)
+                FROM token_usage
+                WHERE {condition}
+                GROUP BY 1, agent_name, model_name, session_id
             ''')
     
     def record_usage(self, session_id: str, agent_name: str, model_name: str,
@@ -245,32 +362,270 @@ class TokenCostCalculator:
             max_tokens=max_tokens
         )
         
-        # Store in database
-        with sqlite3.connect(self.db_path) as conn:
-            conn.execute('''
-                INSERT INTO token_usage (
-                    session_id, agent_name, model_name, timestamp,
-                    input_tokens, output_tokens, total_tokens,
-                    input_cost, output_cost, total_cost,
-                    operation_type, duration_seconds, context_length,
-                    temperature, max_tokens
-                ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-            ''', (
-                usage.session_id, usage.agent_name, usage.model_name, usage.timestamp,
-                usage.input_tokens, usage.output_tokens, usage.total_tokens,
-                float(usage.input_cost), float(usage.output_cost), float(usage.total_cost),
-                usage.operation_type, usage.duration_seconds, usage.context_length,
-                usage.temperature, usage.max_tokens
-            ))
-        
-        # Update daily summary
-        self.update_daily_summary(timestamp.date())
+        # Store in database (daily summary is updated in the same transaction)
+        with self._ingest_lock:
+            if self.buffered:
+                self._pending.append(usage)
+                if len(self._pending) >= self.flush_batch_size:
+                    self._ingest_lock.notify()
+            else:
+                self._write_batch([usage])
+            self._daily_costs[timestamp.date()] += total_cost
         
         # Check alerts
         self.check_cost_alerts()
         
         return usage
     
+    def flush(self):
+        """Write all buffered usage records in one transaction"""
+        with self._flush_lock:
+            with self._ingest_lock:
+                pending, self._pending = self._pending, []
+            if pending:
+                self._write_batch(pending)
+    
+    def _open_write_connection(self) -> sqlite3.Connection:
+        """Open the persistent write connection in WAL mode"""
+        conn = sqlite3.connect(self.db_path, check_same_thread=False, isolation_level=None)
+        conn.execute('PRAGMA journal_mode=WAL')
+        conn.execute('PRAGMA synchronous=NORMAL')
+        conn.execute('PRAGMA busy_timeout=5000')
+        return conn
+    
+    def _open_read_connection(self) -> sqlite3.Connection:
+        """Open the persistent connection used for summary queries"""
+        conn = sqlite3.connect(self.db_path, check_same_thread=False, isolation_level=None)
+        conn.execute('PRAGMA busy_timeout=5000')
+        return conn
+    
+    def _write_batch(self, usages: List[TokenUsage]):
+        """Insert usage rows and fold them into daily summaries in one transaction"""
+        rows = [(
+            usage.session_id, usage.agent_name, usage.model_name, usage.timestamp,
+            usage.input_tokens, usage.output_tokens, usage.total_tokens,
+            float(usage.input_cost), float(usage.output_cost), float(usage.total_cost),
+            usage.operation_type, usage.duration_seconds, usage.context_length,
+            usage.temperature, usage.max_tokens
+        ) for usage in usages]
+        
+        with self._write_lock:
+            conn = self._connection
+            conn.execute('BEGIN IMMEDIATE')
+            try:
+                # Summaries first: new sessions are detected against rows already stored
+                self._apply_daily_summaries(conn, usages)
+                self._apply_rollups(conn, usages)
+                conn.executemany('''
+                    INSERT INTO token_usage (
+                        session_id, agent_name, model_name, timestamp,
+                        input_tokens, output_tokens, total_tokens,
+                        input_cost, output_cost, total_cost,
+                        operation_type, duration_seconds, context_length,
+                        temperature, max_tokens
+                    ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+                ''', rows)
+                conn.execute('COMMIT')
+            except Exception:
+                conn.execute('ROLLBACK')
+                raise
+    
+    def _apply_daily_summaries(self, conn: sqlite3.Connection, usages: List[TokenUsage]):
+        """Add a batch to the running daily summaries
+        
+        A day without a summary row is seeded from token_usage once; after that
+        each batch only adds its own sums. Runs inside the batch transaction, so
+        concurrent writers in other processes cannot interleave.
+        """
+        by_day = defaultdict(list)
+        for usage in usages:
+            by_day[usage.timestamp.date()].append(usage)
+        
+        for target_date, day_usages in by_day.items():
+            summary = self._read_daily_summary(conn, target_date)
+            if summary is None:
+                summary = self._aggregate_day(conn, target_date)
+            
+            day_start = target_date.isoformat()
+            day_end = (target_date + timedelta(days=1)).isoformat()
+            for session_id in {usage.session_id for usage in day_usages}:
+                seen = conn.execute('''
+                    SELECT 1 FROM token_usage
+                    WHERE session_id = ? AND timestamp >= ? AND timestamp < ?
+                    LIMIT 1
+                ''', (session_id, day_start, day_end)).fetchone()
+                if not seen:
+                    summary['session_count'] += 1
+            
+            for usage in day_usages:
+                cost = float(usage.total_cost)
+                summary['total_tokens'] += usage.total_tokens
+                summary['total_cost'] += cost
+                summary['agent_breakdown'][usage.agent_name] += cost
+                summary['model_breakdown'][usage.model_name] += cost
+            
+            self._write_daily_summary(conn, target_date, summary)
+    
+    def _apply_rollups(self, conn: sqlite3.Connection, usages: List[TokenUsage]):
+        """Add a batch to the hourly and daily rollups as per-key deltas"""
+        for table, bucket_format in (('usage_rollups_hourly', '%Y-%m-%d %H:00'),
+                                     ('usage_rollups_daily', '%Y-%m-%d')):
+            deltas = defaultdict(lambda: [0, 0.0, 0, 0.0])
+            for usage in usages:
+                key = (usage.timestamp.strftime(bucket_format), usage.agent_name,
+                       usage.model_name, usage.session_id)
+                delta = deltas[key]
+                delta[0] += usage.total_tokens
+                delta[1] += float(usage.total_cost)
+                delta[2] += 1
+                delta[3] += usage.duration_seconds or 0.0
+            
+            bucket = 'hour' if table == 'usage_rollups_hourly' else 'date'
+            conn.executemany(f'''
+                INSERT INTO {table}
+                ({bucket}, agent_name, model_name, session_id,
+                 total_tokens, total_cost, requests, duration_sum)
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+                ON CONFLICT({bucket}, agent_name, model_name, session_id) DO UPDATE SET
+                    total_tokens = total_tokens + excluded.total_tokens,
+                    total_cost = total_cost + excluded.total_cost,
+                    requests = requests + excluded.requests,
+                    duration_sum = duration_sum + excluded.duration_sum
+            ''', [key + tuple(delta) for key, delta in deltas.items()])
+    
+    def _read_daily_summary(self, conn: sqlite3.Connection, target_date: date) -> Optional[Dict[str, Any]]:
+        row = conn.execute('''
+            SELECT total_tokens, total_cost, session_count, agent_breakdown, model_breakdown
+            FROM daily_summaries WHERE date = ?
+        ''', (target_date,)).fetchone()
+        if row is None:
+            return None
+        
+        return {
+            'total_tokens': row[0] or 0,
+            'total_cost': float(row[1] or 0),
+            'session_count': row[2] or 0,
+            'agent_breakdown': defaultdict(float, json.loads(row[3] or '{}')),
+            'model_breakdown': defaultdict(float, json.loads(row[4] or '{}'))
+        }
+    
+    def _aggregate_day(self, conn: sqlite3.Connection, target_date: date) -> Dict[str, Any]:
+        """Aggregate a day's stored usage from scratch"""
+        day_range = (target_date.isoformat(), (target_date + timedelta(days=1)).isoformat())
+        
+        totals = conn.execute('''
+            SELECT SUM(total_tokens), SUM(total_cost), COUNT(DISTINCT session_id)
+            FROM token_usage WHERE timestamp >= ? AND timestamp < ?
+        ''', day_range).fetchone()
+        
+        breakdowns = {}
+        for column in ('agent_name', 'model_name'):
+            breakdown = defaultdict(float)
+            for name, cost in conn.execute(f'''
+                SELECT {column}, SUM(total_cost) FROM token_usage
+                WHERE timestamp >= ? AND timestamp < ?
+                GROUP BY {column}
+            ''', day_range):
+                breakdown[name] = float(cost or 0)
+            breakdowns[column] = breakdown
+        
+        return {
+            'total_tokens': totals[0] or 0,
+            'total_cost': float(totals[1] or 0),
+            'session_count': totals[2] or 0,
+            'agent_breakdown': breakdowns['agent_name'],
+            'model_breakdown': breakdowns['model_name']
+        }
+    
+    def _write_daily_summary(self, conn: sqlite3.Connection, target_date: date, summary: Dict[str, Any]):
+        conn.execute('''
+            INSERT INTO daily_summaries
+            (date, total_tokens, total_cost, session_count, agent_breakdown, model_breakdown)
+            VALUES (?, ?, ?, ?, ?, ?)
+            ON CONFLICT(date) DO UPDATE SET
+                total_tokens = excluded.total_tokens,
+                total_cost = excluded.total_cost,
+                session_count = excluded.session_count,
+                agent_breakdown = excluded.agent_breakdown,
+                model_breakdown = excluded.model_breakdown
+        ''', (
+            target_date,
+            summary['total_tokens'],
+            summary['total_cost'],
+            summary['session_count'],
+            json.dumps(dict(summary['agent_breakdown'])),
+            json.dumps(dict(summary['model_breakdown']))
+        ))
+    
+    def _flush_loop(self):
+        """Group-commit buffered rows every flush_interval or flush_batch_size rows"""
+        while self.monitoring:
+            with self._ingest_lock:
+                self._ingest_lock.wait_for(
+                    lambda: len(self._pending) >= self.flush_batch_size or not self.monitoring,
+                    timeout=self.flush_interval
+                )
+            try:
+                self.flush()
+            except Exception as e:
+                print(f"Token usage flush error: {e}")
+                time.sleep(self.flush_interval)
+    
+    def _load_cost_counters(self):
+        """Seed in-memory daily costs for the alert windows from the database"""
+        today = date.today()
+        since = min(today - timedelta(days=7), today.replace(day=1))
+        
+        # Rollups rather than token_usage, so archived days still count
+        with sqlite3.connect(self.db_path) as conn:
+            cursor = conn.execute('''
+                SELECT date, SUM(total_cost) FROM usage_rollups_daily
+                WHERE date >= ?
+                GROUP BY date
+            ''', (since.isoformat(),))
+            daily_costs = defaultdict(Decimal)
+            for day, cost in cursor:
+                daily_costs[date.fromisoformat(day)] = Decimal(str(cost or 0))
+        
+        self._daily_costs = daily_costs
+    
+    def _refresh_cost_counters(self):
+        """Re-seed cost counters so usage recorded by other processes is included"""
+        with self._flush_lock:
+            with self._ingest_lock:
+                pending, self._pending = self._pending, []
+                if pending:
+                    self._write_batch(pending)
+                self._load_cost_counters()
+    
+    def _period_cost(self, start_date: date, end_date: date) -> Decimal:
+        with self._ingest_lock:
+            return sum(
+                (cost for day, cost in self._daily_costs.items() if start_date <= day <= end_date),
+                Decimal('0')
+            )
+    
+    def _cached_query(self, key: Tuple, compute):
+        """Run `compute(conn)` once per ingest watermark and return a copy of its result
+        
+        PRAGMA data_version changes whenever any other connection, in this
+        process or another, commits to the database, so cached summaries are
+        dropped as soon as new usage lands.
+        """
+        with self._read_lock:
+            watermark = self._read_connection.execute('PRAGMA data_version').fetchone()[0]
+            if watermark != self._cache_watermark:
+                self._query_cache.clear()
+                self._cache_watermark = watermark
+            
+            if key not in self._query_cache:
+                if len(self._query_cache) >= self.query_cache_size:
+                    self._query_cache.clear()
+                self._query_cache[key] = compute(self._read_connection)
+            result = self._query_cache[key]
+        
+        return copy.deepcopy(result)
+    
     def get_usage_summary(self, start_date: Optional[date] = None, 
                          end_date: Optional[date] = None) -> Dict[str, Any]:
         """Get comprehensive usage summary"""
@@ -280,95 +635,104 @@ class TokenCostCalculator:
         if not end_date:
             end_date = date.today()
         
-        with sqlite3.connect(self.db_path) as conn:
-            # Total costs and tokens
-            total_query = '''
-                SELECT 
-                    SUM(total_tokens) as total_tokens,
-                    SUM(total_cost) as total_cost,
-                    COUNT(*) as total_requests,
-                    COUNT(DISTINCT session_id) as unique_sessions,
-                    COUNT(DISTINCT agent_name) as unique_agents,
-                    AVG(total_cost) as avg_cost_per_request,
-                    AVG(total_tokens) as avg_tokens_per_request
-                FROM token_usage 
-                WHERE DATE(timestamp) BETWEEN ? AND ?
-            '''
-            
-            cursor = conn.execute(total_query, (start_date, end_date))
-            total_stats = dict(zip([d[0] for d in cursor.description], cursor.fetchone()))
-            
-            # Cost by agent
-            agent_query = '''
-                SELECT 
-                    agent_name,
-                    SUM(total_tokens) as tokens,
-                    SUM(total_cost) as cost,
-                    COUNT(*) as requests,
-                    AVG(total_cost) as avg_cost,
-                    AVG(duration_seconds) as avg_duration
-                FROM token_usage 
-                WHERE DATE(timestamp) BETWEEN ? AND ?
-                GROUP BY agent_name
-                ORDER BY cost DESC
-            '''
-            
-            agent_stats = []
-            for row in conn.execute(agent_query, (start_date, end_date)):
-                agent_stats.append({
-                    'agent_name': row[0],
-                    'tokens': row[1] or 0,
-                    'cost': float(row[2] or 0),
-                    'requests': row[3] or 0,
-                    'avg_cost': float(row[4] or 0),
-                    'avg_duration': row[5] or 0
-                })
-            
-            # Cost by model
-            model_query = '''
-                SELECT 
-                    model_name,
-                    SUM(total_tokens) as tokens,
-                    SUM(total_cost) as cost,
-                    COUNT(*) as requests,
-                    AVG(total_cost) as avg_cost
-                FROM token_usage 
-                WHERE DATE(timestamp) BETWEEN ? AND ?
-                GROUP BY model_name
-                ORDER BY cost DESC
-            '''
-            
-            model_stats = []
-            for row in conn.execute(model_query, (start_date, end_date)):
-                model_stats.append({
-                    'model_name': row[0],
-                    'tokens': row[1] or 0,
-                    'cost': float(row[2] or 0),
-                    'requests': row[3] or 0,
-                    'avg_cost': float(row[4] or 0)
-                })
-            
-            # Daily breakdown
-            daily_query = '''
-                SELECT 
-                    DATE(timestamp) as date,
-                    SUM(total_tokens) as tokens,
-                    SUM(total_cost) as cost,
-                    COUNT(*) as requests
-                FROM token_usage 
-                WHERE DATE(timestamp) BETWEEN ? AND ?
-                GROUP BY DATE(timestamp)
-                ORDER BY date
-            '''
-            
-            daily_stats = []
-            for row in conn.execute(daily_query, (start_date, end_date)):
-                daily_stats.append({
-                    'date': row[0],
-                    'tokens': row[1] or 0,
-                    'cost': float(row[2] or 0),
-                    'requests': row[3] or 0
-                })
+        return self._cached_query(
+            ('usage_summary', start_date, end_date),
+            lambda conn: self._query_usage_summary(conn, start_date, end_date)
+        )
+    
+    def _query_usage_summary(self, conn: sqlite3.Connection, start_date: date,
+                             end_date: date) -> Dict[str, Any]:
+        """Build a usage summary from the daily rollups"""
+        period = (start_date.isoformat(), end_date.isoformat())
+        
+        # Total costs and tokens
+        total_query = '''
+            SELECT 
+                SUM(total_tokens) as total_tokens,
+                SUM(total_cost) as total_cost,
+                SUM(requests) as total_requests,
+                COUNT(DISTINCT session_id) as unique_sessions,
+                COUNT(DISTINCT agent_name) as unique_agents,
+                SUM(total_cost) / SUM(requests) as avg_cost_per_request,
+                CAST(SUM(total_tokens) AS REAL) / SUM(requests) as avg_tokens_per_request
+            FROM usage_rollups_daily 
+            WHERE date BETWEEN ? AND ?
+        '''
+        
+        cursor = conn.execute(total_query, period)
+        total_stats = dict(zip([d[0] for d in cursor.description], cursor.fetchone()))
+        
+        # Cost by agent
+        agent_query = '''
+            SELECT 
+                agent_name,
+                SUM(total_tokens) as tokens,
+                SUM(total_cost) as cost,
+                SUM(requests) as requests,
+                SUM(total_cost) / SUM(requests) as avg_cost,
+                SUM(duration_sum) / SUM(requests) as avg_duration
+            FROM usage_rollups_daily 
+            WHERE date BETWEEN ? AND ?
+            GROUP BY agent_name
+            ORDER BY cost DESC
+        '''
+        
+        agent_stats = []
+        for row in conn.execute(agent_query, period):
+            agent_stats.append({
+                'agent_name': row[0],
+                'tokens': row[1] or 0,
+                'cost': float(row[2] or 0),
+                'requests': row[3] or 0,
+                'avg_cost': float(row[4] or 0),
+                'avg_duration': row[5] or 0
+            })
+        
+        # Cost by model
+        model_query = '''
+            SELECT 
+                model_name,
+                SUM(total_tokens) as tokens,
+                SUM(total_cost) as cost,
+                SUM(requests) as requests,
+                SUM(total_cost) / SUM(requests) as avg_cost
+            FROM usage_rollups_daily 
+            WHERE date BETWEEN ? AND ?
+            GROUP BY model_name
+            ORDER BY cost DESC
+        '''
+        
+        model_stats = []
+        for row in conn.execute(model_query, period):
+            model_stats.append({
+                'model_name': row[0],
+                'tokens': row[1] or 0,
+                'cost': float(row[2] or 0),
+                'requests': row[3] or 0,
+                'avg_cost': float(row[4] or 0)
+            })
+        
+        # Daily breakdown
+        daily_query = '''
+            SELECT 
+                date,
+                SUM(total_tokens) as tokens,
+                SUM(total_cost) as cost,
+                SUM(requests) as requests
+            FROM usage_rollups_daily 
+            WHERE date BETWEEN ? AND ?
+            GROUP BY date
+            ORDER BY date
+        '''
+        
+        daily_stats = []
+        for row in conn.execute(daily_query, period):
+            daily_stats.append({
+                'date': row[0],
+                'tokens': row[1] or 0,
+                'cost': float(row[2] or 0),
+                'requests': row[3] or 0
+            })
         
         return {
             'period': {
@@ -396,64 +760,73 @@ class TokenCostCalculator:
         end_date = date.today()
         start_date = end_date - timedelta(days=days)
         
-        with sqlite3.connect(self.db_path) as conn:
-            # Daily trends
-            trend_query = '''
-                SELECT 
-                    DATE(timestamp) as date,
-                    SUM(total_cost) as daily_cost,
-                    SUM(total_tokens) as daily_tokens,
-                    COUNT(*) as daily_requests,
-                    AVG(total_cost) as avg_request_cost
-                FROM token_usage 
-                WHERE DATE(timestamp) BETWEEN ? AND ?
-                GROUP BY DATE(timestamp)
-                ORDER BY date
-            '''
-            
-            trends = []
-            for row in conn.execute(trend_query, (start_date, end_date)):
-                trends.append({
-                    'date': row[0],
-                    'cost': float(row[1] or 0),
-                    'tokens': row[2] or 0,
-                    'requests': row[3] or 0,
-                    'avg_cost': float(row[4] or 0)
-                })
-            
-            # Hour-of-day analysis
-            hourly_query = '''
-                SELECT 
-                    strftime('%H', timestamp) as hour,
-                    AVG(total_cost) as avg_cost,
-                    COUNT(*) as request_count
-                FROM token_usage 
-                WHERE DATE(timestamp) BETWEEN ? AND ?
-                GROUP BY strftime('%H', timestamp)
-                ORDER BY hour
-            '''
+        return self._cached_query(
+            ('cost_trends', start_date, end_date),
+            lambda conn: self._query_cost_trends(conn, start_date, end_date, days)
+        )
+    
+    def _query_cost_trends(self, conn: sqlite3.Connection, start_date: date,
+                           end_date: date, days: int) -> Dict[str, Any]:
+        """Build cost trends from the daily and hourly rollups"""
+        
+        # Daily trends
+        trend_query = '''
+            SELECT 
+                date,
+                SUM(total_cost) as daily_cost,
+                SUM(total_tokens) as daily_tokens,
+                SUM(requests) as daily_requests,
+                SUM(total_cost) / SUM(requests) as avg_request_cost
+            FROM usage_rollups_daily 
+            WHERE date BETWEEN ? AND ?
+            GROUP BY date
+            ORDER BY date
+        '''
+        
+        trends = []
+        for row in conn.execute(trend_query, (start_date.isoformat(), end_date.isoformat())):
+            trends.append({
+                'date': row[0],
+                'cost': float(row[1] or 0),
+                'tokens': row[2] or 0,
+                'requests': row[3] or 0,
+                'avg_cost': float(row[4] or 0)
+            })
+        
+        # Hour-of-day analysis
+        hourly_query = '''
+            SELECT 
+                substr(hour, 12, 2) as hour_of_day,
+                SUM(total_cost) / SUM(requests) as avg_cost,
+                SUM(requests) as request_count
+            FROM usage_rollups_hourly 
+            WHERE hour >= ? AND hour < ?
+            GROUP BY hour_of_day
+            ORDER BY hour_of_day
+        '''
+        
+        hourly_stats = []
+        hour_range = (start_date.isoformat(), (end_date + timedelta(days=1)).isoformat())
+        for row in conn.execute(hourly_query, hour_range):
+            hourly_stats.append({
+                'hour': int(row[0]),
+                'avg_cost': float(row[1] or 0),
+                'requests': row[2] or 0
+            })
+        
+        # Calculate trend metrics
+        if len(trends) >= 7:
+            recent_week = trends[-7:]
+            previous_week = trends[-14:-7] if len(trends) >= 14 else []
             
-            hourly_stats = []
-            for row in conn.execute(hourly_query, (start_date, end_date)):
-                hourly_stats.append({
-                    'hour': int(row[0]),
-                    'avg_cost': float(row[1] or 0),
-                    'requests': row[2] or 0
-                })
+            recent_avg = sum(t['cost'] for t in recent_week) / len(recent_week)
+            previous_avg = sum(t['cost'] for t in previous_week) / len(previous_week) if previous_week else recent_avg
             
-            # Calculate trend metrics
-            if len(trends) >= 7:
-                recent_week = trends[-7:]
-                previous_week = trends[-14:-7] if len(trends) >= 14 else []
-                
-                recent_avg = sum(t['cost'] for t in recent_week) / len(recent_week)
-                previous_avg = sum(t['cost'] for t in previous_week) / len(previous_week) if previous_week else recent_avg
-                
-                trend_direction = "increasing" if recent_avg > previous_avg else "decreasing"
-                trend_percentage = ((recent_avg - previous_avg) / previous_avg * 100) if previous_avg > 0 else 0
-            else:
-                trend_direction = "insufficient_data"
-                trend_percentage = 0
+            trend_direction = "increasing" if recent_avg > previous_avg else "decreasing"
+            trend_percentage = ((recent_avg - previous_avg) / previous_avg * 100) if previous_avg > 0 else 0
+        else:
+            trend_direction = "insufficient_data"
+            trend_percentage = 0
         
         return {
             'daily_trends': trends,
@@ -571,7 +944,7 @@ class TokenCostCalculator:
     def _analyze_repeat_patterns(self) -> float:
         """Analyze potential for caching based on repeat patterns"""
         # Simplified analysis - in production, would use semantic similarity
-        with sqlite3.connect(self.db_path) as conn:
+        def compute(conn: sqlite3.Connection) -> float:
             cursor = conn.execute('''
                 SELECT COUNT(*) as total_requests,
                        COUNT(DISTINCT agent_name || operation_type) as unique_patterns
@@ -582,8 +955,9 @@ class TokenCostCalculator:
             result = cursor.fetchone()
             if result and result[0] > 0:
                 return max(0, (1 - result[1] / result[0]) * 100)
+            return 0
         
-        return 0
+        return self._cached_query(('repeat_patterns', date.today()), compute)
     
     def create_cost_alert(self, alert_type: str, threshold_amount: float,
                          notification_method: str = "console") -> str:
@@ -630,21 +1004,18 @@ class TokenCostCalculator:
             should_trigger = False
             current_amount = Decimal('0')
             
+            # Evaluated against in-memory daily costs, not the database
+            today = date.today()
             if alert.alert_type == "daily":
-                today_summary = self.get_usage_summary(start_date=date.today(), end_date=date.today())
-                current_amount = Decimal(str(today_summary['totals']['cost']))
+                current_amount = self._period_cost(today, today)
                 should_trigger = current_amount >= alert.threshold_amount
             
             elif alert.alert_type == "weekly":
-                week_start = date.today() - timedelta(days=7)
-                week_summary = self.get_usage_summary(start_date=week_start, end_date=date.today())
-                current_amount = Decimal(str(week_summary['totals']['cost']))
+                current_amount = self._period_cost(today - timedelta(days=7), today)
                 should_trigger = current_amount >= alert.threshold_amount
             
             elif alert.alert_type == "monthly":
-                month_start = date.today().replace(day=1)
-                month_summary = self.get_usage_summary(start_date=month_start, end_date=date.today())
-                current_amount = Decimal(str(month_summary['totals']['cost']))
+                current_amount = self._period_cost(today.replace(day=1), today)
                 should_trigger = current_amount >= alert.threshold_amount
             
             if should_trigger:
@@ -665,60 +1036,32 @@ class TokenCostCalculator:
         # Update last triggered time
         alert.last_triggered = datetime.now()
         
-        with sqlite3.connect(self.db_path) as conn:
-            conn.execute('''
+        with self._write_lock:
+            self._connection.execute('''
                 UPDATE cost_alerts 
                 SET last_triggered = ? 
                 WHERE alert_id = ?
             ''', (alert.last_triggered, alert.alert_id))
     
     def update_daily_summary(self, target_date: date):
-        """Update daily summary for given date"""
+        """Rebuild the daily summary for a date from stored usage
         
-        with sqlite3.connect(self.db_path) as conn:
-            # Get daily stats
-            cursor = conn.execute('''
-                SELECT 
-                    SUM(total_tokens) as total_tokens,
-                    SUM(total_cost) as total_cost,
-                    COUNT(DISTINCT session_id) as session_count,
-                    agent_name,
-                    SUM(total_cost) as agent_cost,
-                    model_name,
-                    SUM(total_cost) as model_cost
-                FROM token_usage 
-                WHERE DATE(timestamp) = ?
-                GROUP BY agent_name, model_name
-            ''', (target_date,))
-            
-            # Aggregate by agent and model
-            agent_breakdown = defaultdict(float)
-            model_breakdown = defaultdict(float)
-            total_tokens = 0
-            total_cost = 0.0
-            session_count = 0
-            
-            for row in cursor:
-                if row[0]:  # If we have data
-                    total_tokens = row[0]
-                    total_cost = float(row[1])
-                    session_count = row[2]
-                    agent_breakdown[row[3]] += float(row[4])
-                    model_breakdown[row[5]] += float(row[6])
-            
-            # Insert or update daily summary
-            conn.execute('''
-                INSERT OR REPLACE INTO daily_summaries 
-                (date, total_tokens, total_cost, session_count, agent_breakdown, model_breakdown)
-                VALUES (?, ?, ?, ?, ?, ?)
-            ''', (
-                target_date,
-                total_tokens,
-                total_cost,
-                session_count,
-                json.dumps(dict(agent_breakdown)),
-                json.dumps(dict(model_breakdown))
-            ))
+        Ingestion keeps summaries current incrementally; this is the repair path.
+        Archived days are left alone since their rows are no longer stored.
+        """
+        self.flush()
+        if self._archived_partitions(target_date, target_date):
+            print(f"Skipping daily summary rebuild for archived date {target_date}")
+            return
+        with self._write_lock:
+            conn = self._connection
+            conn.execute('BEGIN IMMEDIATE')
+            try:
+                self._write_daily_summary(conn, target_date, self._aggregate_day(conn, target_date))
+                conn.execute('COMMIT')
+            except Exception:
+                conn.execute('ROLLBACK')
+                raise
     
     def load_alerts(self):
         """Load existing alerts from database"""
@@ -746,6 +1089,7 @@ class TokenCostCalculator:
         
         while self.monitoring:
             try:
+                self._refresh_cost_counters()
                 self.check_cost_alerts()
                 time.sleep(300)  # Check every 5 minutes
             except Exception as e:
@@ -754,31 +1098,240 @@ class TokenCostCalculator:
     
     def export_usage_data(self, filepath: str, format: str = "csv",
                          start_date: Optional[date] = None,
-                         end_date: Optional[date] = None):
-        """Export usage data for external analysis"""
+                         end_date: Optional[date] = None,
+                         chunk_size: int = 10000) -> int:
+        """Export usage data for external analysis
         
+        Rows are streamed from the database and the archive in chunks of
+        `chunk_size`, so CSV, JSON, NDJSON and Parquet exports run in constant
+        memory. Excel is built in memory. Returns the number of rows written.
+        """
+        format = format.lower()
+        if format not in self.EXPORT_FORMATS:
+            raise ValueError(f"Unsupported format: {format}")
+        
+        columns = [name for name, _ in self.usage_columns]
+        chunks = self.iter_usage_chunks(start_date, end_date, chunk_size)
+        
+        # Written beside the target and renamed, so readers never see a partial file
+        temp_path = f"{filepath}.tmp"
+        try:
+            if format == "csv":
+                row_count = self._write_csv(temp_path, columns, chunks)
+            elif format == "json":
+                row_count = self._write_json(temp_path, columns, chunks)
+            elif format == "ndjson":
+                row_count = self._write_ndjson(temp_path, columns, chunks)
+            elif format == "parquet":
+                row_count = self._write_parquet(temp_path, chunks)
+            else:
+                rows = [row for chunk in chunks for row in chunk]
+                pd.DataFrame.from_records(rows, columns=columns).to_excel(temp_path, index=False)
+                row_count = len(rows)
+            os.replace(temp_path, filepath)
+        finally:
+            if os.path.exists(temp_path):
+                os.remove(temp_path)
+        
+        return row_count
+    
+    def iter_usage_chunks(self, start_date: Optional[date] = None, end_date: Optional[date] = None,
+                          chunk_size: int = 10000) -> Iterator[List[Tuple]]:
+        """Yield stored usage rows in `usage_columns` order, a chunk at a time
+        
+        Archived partitions in the range come first, then rows still in
+        token_usage, each in timestamp order.
+        """
         if not start_date:
             start_date = date.today() - timedelta(days=30)
         if not end_date:
             end_date = date.today()
+        self.flush()
         
-        with sqlite3.connect(self.db_path) as conn:
-            query = '''
+        for partition in self._archived_partitions(start_date, end_date):
+            yield from self._read_partition(partition, chunk_size)
+        
+        # A dedicated connection: a long export must not hold the summary read lock
+        conn = sqlite3.connect(self.db_path)
+        try:
+            cursor = conn.execute('''
                 SELECT * FROM token_usage 
-                WHERE DATE(timestamp) BETWEEN ? AND ?
+                WHERE timestamp >= ? AND timestamp < ?
                 ORDER BY timestamp
-            '''
+            ''', (start_date.isoformat(), (end_date + timedelta(days=1)).isoformat()))
             
-            df = pd.read_sql_query(query, conn, params=(start_date, end_date))
-        
-        if format.lower() == "csv":
-            df.to_csv(filepath, index=False)
-        elif format.lower() == "json":
-            df.to_json(filepath, orient='records', date_format='iso')
-        elif format.lower() == "excel":
-            df.to_excel(filepath, index=False)
-        else:
-            raise ValueError(f"Unsupported format: {format}")
+            while True:
+                rows = cursor.fetchmany(chunk_size)
+                if not rows:
+                    break
+                yield rows
+        finally:
+            conn.close()
+    
+    def archive_usage(self, before_date: date, chunk_size: int = 10000) -> Dict[str, Any]:
+        """Move usage recorded before `before_date` into the date-partitioned archive
+        
+        Each day is written to <archive_dir>/date=YYYY-MM-DD/part-<n>.ndjson.gz
+        and then deleted from token_usage. Rollups and daily summaries are kept,
+        so get_usage_summary and get_cost_trends cover archived days unchanged,
+        and exports read archived partitions transparently.
+        """
+        self.flush()
+        with sqlite3.connect(self.db_path) as conn:
+            days = [row[0] for row in conn.execute('''
+                SELECT DISTINCT DATE(timestamp) FROM token_usage
+                WHERE timestamp < ?
+                ORDER BY 1
+            ''', (before_date.isoformat(),))]
+        
+        columns = [name for name, _ in self.usage_columns]
+        id_index = columns.index('id')
+        cost_index = columns.index('total_cost')
+        archived_rows = 0
+        
+        for day in days:
+            day_start = date.fromisoformat(day)
+            day_range = (day_start.isoformat(), (day_start + timedelta(days=1)).isoformat())
+            relative_path = f"date={day}/part-{int(time.time() * 1000)}.ndjson.gz"
+            target = self.archive_dir / relative_path
+            target.parent.mkdir(parents=True, exist_ok=True)
+            
+            # Stream the day into the partition, tracking what was written
+            written = {'rows': 0, 'cost': 0.0, 'max_id': 0}
+            
+            def day_chunks():
+                with sqlite3.connect(self.db_path) as read_conn:
+                    cursor = read_conn.execute('''
+                        SELECT * FROM token_usage
+                        WHERE timestamp >= ? AND timestamp < ?
+                        ORDER BY timestamp
+                    ''', day_range)
+                    while True:
+                        rows = cursor.fetchmany(chunk_size)
+                        if not rows:
+                            break
+                        written['rows'] += len(rows)
+                        written['cost'] += sum(row[cost_index] or 0 for row in rows)
+                        written['max_id'] = max(written['max_id'], max(row[id_index] for row in rows))
+                        yield rows
+            
+            temp_path = f"{target}.tmp"
+            self._write_ndjson(temp_path, columns, day_chunks(), fsync=True)
+            os.replace(temp_path, target)
+            _fsync_directory(target.parent)
+            
+            # Only rows that made it into the file are removed
+            with self._write_lock:
+                conn = self._connection
+                conn.execute('BEGIN IMMEDIATE')
+                try:
+                    conn.execute('''
+                        DELETE FROM token_usage
+                        WHERE timestamp >= ? AND timestamp < ? AND id <= ?
+                    ''', day_range + (written['max_id'],))
+                    conn.execute('''
+                        INSERT INTO usage_archive_partitions (date, path, row_count, total_cost)
+                        VALUES (?, ?, ?, ?)
+                    ''', (day, relative_path, written['rows'], written['cost']))
+                    conn.execute('COMMIT')
+                except Exception:
+                    conn.execute('ROLLBACK')
+                    raise
+            archived_rows += written['rows']
+        
+        return {
+            'before_date': before_date.isoformat(),
+            'days': len(days),
+            'rows': archived_rows,
+            'archive_dir': str(self.archive_dir)
+        }
+    
+    def _archived_partitions(self, start_date: date, end_date: date) -> List[str]:
+        with sqlite3.connect(self.db_path) as conn:
+            return [row[0] for row in conn.execute('''
+                SELECT path FROM usage_archive_partitions
+                WHERE date BETWEEN ? AND ?
+                ORDER BY date, path
+            ''', (start_date.isoformat(), end_date.isoformat()))]
+    
+    def _read_partition(self, relative_path: str, chunk_size: int) -> Iterator[List[Tuple]]:
+        columns = [name for name, _ in self.usage_columns]
+        chunk = []
+        with gzip.open(self.archive_dir / relative_path, 'rt', encoding='utf-8') as f:
+            for line in f:
+                record = json.loads(line)
+                chunk.append(tuple(record.get(column) for column in columns))
+                if len(chunk) >= chunk_size:
+                    yield chunk
+                    chunk = []
+        if chunk:
+            yield chunk
+    
+    @staticmethod
+    def _open_text(path: str):
+        if path.endswith('.gz') or path.endswith('.gz.tmp'):
+            return gzip.open(path, 'wt', encoding='utf-8', newline='')
+        return open(path, 'w', encoding='utf-8', newline='')
+    
+    def _write_csv(self, path: str, columns: List[str], chunks: Iterator[List[Tuple]]) -> int:
+        row_count = 0
+        with self._open_text(path) as f:
+            writer = csv.writer(f)
+            writer.writerow(columns)
+            for chunk in chunks:
+                writer.writerows(chunk)
+                row_count += len(chunk)
+        return row_count
+    
+    def _write_json(self, path: str, columns: List[str], chunks: Iterator[List[Tuple]]) -> int:
+        """A single JSON array of records, written incrementally"""
+        row_count = 0
+        with self._open_text(path) as f:
+            f.write('[')
+            for chunk in chunks:
+                for row in chunk:
+                    f.write(',' if row_count else '')
+                    f.write(json.dumps(dict(zip(columns, row)), default=str))
+                    row_count += 1
+            f.write(']')
+        return row_count
+    
+    def _write_ndjson(self, path: str, columns: List[str], chunks: Iterator[List[Tuple]],
+                      fsync: bool = False) -> int:
+        row_count = 0
+        with self._open_text(path) as f:
+            for chunk in chunks:
+                f.write(''.join(json.dumps(dict(zip(columns, row)), default=str) + '\n' for row in chunk))
+                row_count += len(chunk)
+        if fsync:
+            with open(path, 'rb') as f:
+                os.fsync(f.fileno())
+        return row_count
+    
+    def _write_parquet(self, path: str, chunks: Iterator[List[Tuple]]) -> int:
+        """Parquet, one row group per chunk (requires pyarrow)"""
+        try:
+            import pyarrow as pa
+            import pyarrow.parquet as pq
+        except ImportError:
+            raise ImportError("Parquet export requires pyarrow (pip install pyarrow)")
+        
+        def arrow_type(declared: str):
+            declared = declared.upper()
+            if 'INT' in declared:
+                return pa.int64()
+            if declared.startswith(('REAL', 'DECIMAL', 'FLOAT', 'DOUBLE')):
+                return pa.float64()
+            return pa.string()
+        
+        schema = pa.schema([(name, arrow_type(declared)) for name, declared in self.usage_columns])
+        row_count = 0
+        with pq.ParquetWriter(path, schema) as writer:
+            for chunk in chunks:
+                arrays = [pa.array(column, type=field.type) for field, column in zip(schema, zip(*chunk))]
+                writer.write_table(pa.Table.from_arrays(arrays, schema=schema))
+                row_count += len(chunk)
+        return row_count
     
     def generate_cost_report(self, output_path: str, include_charts: bool = True):
         """Generate comprehensive cost analysis report"""
@@ -951,8 +1504,20 @@ class TokenCostCalculator:
         
         return comparison
     
+    def forecast_costs(self, history_days: int = 7, horizon_days: int = 30) -> Dict[str, Any]:
+        """Forecast total, per-agent and per-model cost `horizon_days` ahead
+        
+        Fitted on the last `history_days` of hourly rollups; the result is
+        cached until new usage lands or the hour rolls over.
+        """
+        current_hour = datetime.now().replace(minute=0, second=0, microsecond=0)
+        return self._cached_query(
+            ('forecast', history_days, horizon_days, current_hour),
+            lambda conn: self.forecaster.forecast(conn, history_days, horizon_days, now=current_hour)
+        )
+    
     def predict_monthly_cost(self, based_on_days: int = 7) -> Dict[str, Any]:
-        """Predict monthly costs based on recent usage"""
+        """Predict monthly costs from Holt-Winters forecasts fitted on recent usage"""
         
         end_date = date.today()
         start_date = end_date - timedelta(days=based_on_days)
@@ -961,47 +1526,82 @@ class TokenCostCalculator:
         daily_avg_cost = recent_summary['totals']['cost'] / based_on_days
         
         # Project to full month (30 days)
-        monthly_projection = daily_avg_cost * 30
-        
-        # Calculate confidence intervals based on daily variance
-        trends = self.get_cost_trends(based_on_days)
-        daily_costs = [d['cost'] for d in trends['daily_trends']]
-        
-        if len(daily_costs) > 1:
-            std_dev = np.std(daily_costs)
-            confidence_95 = {
-                'lower': max(0, monthly_projection - (1.96 * std_dev * np.sqrt(30))),
-                'upper': monthly_projection + (1.96 * std_dev * np.sqrt(30))
-            }
-        else:
-            confidence_95 = {'lower': monthly_projection * 0.7, 'upper': monthly_projection * 1.3}
+        forecast = self.forecast_costs(history_days=based_on_days, horizon_days=30)
+        total = forecast['total']
         
         return {
             'based_on_days': based_on_days,
             'daily_average': daily_avg_cost,
-            'monthly_projection': monthly_projection,
-            'confidence_95': confidence_95,
+            'monthly_projection': total['projection'],
+            'confidence_95': {'lower': total['lower'], 'upper': total['upper']},
+            'method': total['model'],
+            'daily_forecast': total['daily'],
             'breakdown_projection': {
                 'by_agent': [
                     {
                         'agent_name': agent['agent_name'],
-                        'monthly_cost': (agent['cost'] / based_on_days) * 30
+                        'monthly_cost': agent['projection'],
+                        'lower': agent['lower'],
+                        'upper': agent['upper'],
+                        'method': agent['model']
                     }
-                    for agent in recent_summary['by_agent']
+                    for agent in forecast['by_agent']
                 ],
                 'by_model': [
                     {
                         'model_name': model['model_name'],
-                        'monthly_cost': (model['cost'] / based_on_days) * 30
+                        'monthly_cost': model['projection'],
+                        'lower': model['lower'],
+                        'upper': model['upper'],
+                        'method': model['model']
                     }
-                    for model in recent_summary['by_model']
+                    for model in forecast['by_model']
                 ]
             }
         }
     
+    def rebuild_rollups(self):
+        """Rebuild the hourly and daily rollups from stored usage (repair path)"""
+        self.flush()
+        with self._write_lock:
+            conn = self._connection
+            conn.execute('BEGIN IMMEDIATE')
+            try:
+                # Archived days keep their rollups: their rows are no longer stored
+                conn.execute('''
+                    DELETE FROM usage_rollups_hourly
+                    WHERE substr(hour, 1, 10) NOT IN (SELECT date FROM usage_archive_partitions)
+                ''')
+                conn.execute('''
+                    DELETE FROM usage_rollups_daily
+                    WHERE date NOT IN (SELECT date FROM usage_archive_partitions)
+                ''')
+                self._backfill_rollups(conn, only_if_empty=False)
+                conn.execute('COMMIT')
+            except Exception:
+                conn.execute('ROLLBACK')
+                raise
+    
     def cleanup(self):
         """Cleanup resources"""
         self.monitoring = False
+        with self._ingest_lock:
+            self._ingest_lock.notify_all()
+        self.flush()
+
+def _fsync_directory(path: Path):
+    """Make a rename inside `path` durable before anything depends on it"""
+    try:
+        fd = os.open(path, os.O_RDONLY)
+    except OSError:
+        # Directories cannot be opened on every platform (Windows)
+        return
+    try:
+        os.fsync(fd)
+    except OSError:
+        pass
+    finally:
+        os.close(fd)
 
 def main():
     """Main CLI interface"""
@@ -1009,7 +1609,7 @@ def main():
     
     parser = argparse.ArgumentParser(description='Claude Token Cost Calculator')
     parser.add_argument('command', choices=[
-        'record', 'summary', 'trends', 'optimize', 'alerts', 'export', 'report', 'compare', 'predict'
+        'record', 'summary', 'trends', 'optimize', 'alerts', 'export', 'archive', 'report', 'compare', 'predict'
     ], help='Command to execute')
     
     # Record usage arguments
@@ -1026,12 +1626,13 @@ def main():
     
     # Export arguments
     parser.add_argument('--output', help='Output file path')
-    parser.add_argument('--format', choices=['csv', 'json', 'excel'], default='csv', help='Export format')
+    parser.add_argument('--format', choices=list(TokenCostCalculator.EXPORT_FORMATS), default='csv', help='Export format')
     
     # Date range arguments
     parser.add_argument('--start-date', help='Start date (YYYY-MM-DD)')
     parser.add_argument('--end-date', help='End date (YYYY-MM-DD)')
     parser.add_argument('--days', type=int, default=30, help='Number of days for analysis')
+    parser.add_argument('--older-than', type=int, default=90, help='Archive usage older than N days (default: 90)')
     
     args = parser.parse_args()
     
@@ -1090,8 +1691,12 @@ def main():
             start_date = datetime.strptime(args.start_date, '%Y-%m-%d').date() if args.start_date else None
             end_date = datetime.strptime(args.end_date, '%Y-%m-%d').date() if args.end_date else None
             
-            calculator.export_usage_data(args.output, args.format, start_date, end_date)
-            print(f"Data exported to {args.output}")
+            row_count = calculator.export_usage_data(args.output, args.format, start_date, end_date)
+            print(f"{row_count} rows exported to {args.output}")
+        
+        elif args.command == 'archive':
+            result = calculator.archive_usage(date.today() - timedelta(days=args.older_than))
+            print(f"Archived {result['rows']} rows from {result['days']} days to {result['archive_dir']}")
         
         elif args.command == 'report':
             output_path = args.output or f"cost_report_{datetime.now().strftime('%Y%m%d_%H%M%S')}.html"
@@ -23,12 +23,152 @@ from contextlib import asynccontextmanager
 
 from token_cost_calculator import TokenCostCalculator
 
+def merge_patch(previous: Dict[str, Any], current: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+    """JSON merge patch (RFC 7386) that turns `previous` into `current`
+    
+    Nested objects are diffed key by key; lists and scalars are replaced
+    whole and removed keys are sent as null. Since null means removal, a
+    field that is null in `current` cannot be patched in; None is returned
+    then and the caller has to send `current` in full.
+    """
+    patch = {}
+    for key, value in current.items():
+        if key not in previous:
+            if not _null_free(value):
+                return None
+            patch[key] = value
+        elif isinstance(value, dict) and isinstance(previous[key], dict):
+            nested = merge_patch(previous[key], value)
+            if nested is None:
+                return None
+            if nested:
+                patch[key] = nested
+        elif previous[key] != value:
+            if not _null_free(value):
+                return None
+            patch[key] = value
+    for key in previous:
+        if key not in current:
+            patch[key] = None
+    return patch
+
+def _null_free(value: Any) -> bool:
+    # Lists keep their nulls through a merge patch; object members do not
+    if value is None:
+        return False
+    if isinstance(value, dict):
+        return all(_null_free(member) for member in value.values())
+    return True
+
+class _Subscriber:
+    """One WebSocket client with its own bounded frame queue"""
+    
+    def __init__(self, websocket: WebSocket, queue_size: int):
+        self.websocket = websocket
+        self.queue: asyncio.Queue = asyncio.Queue(maxsize=queue_size)
+        self.dropped = 0
+
+class LiveUpdateBroadcaster:
+    """
+    Fans live dashboard updates out to WebSocket clients
+    
+    Each snapshot is diffed against the previous one and serialized once;
+    the same text frame is queued for every subscriber and each client is
+    drained by its own sender task, so a slow client only delays itself.
+    Frames carry a sequence number and deltas name the sequence they apply
+    to. A snapshot that sets a field to null goes out in full, since a
+    merge patch would delete the field instead. When a client's queue is
+    full its oldest frames are dropped, and since the remaining deltas no
+    longer apply they are replaced with one full snapshot.
+    """
+    
+    def __init__(self, queue_size: int = 8, send_timeout: float = 10.0):
+        self.queue_size = queue_size
+        self.send_timeout = send_timeout
+        self.subscribers: List[_Subscriber] = []
+        self.sequence = 0
+        self.snapshot: Optional[Dict[str, Any]] = None
+        self._keyframe: Optional[str] = None
+        
+        self.published = 0
+        self.dropped = 0
+        self.disconnected = 0
+    
+    def publish(self, snapshot: Dict[str, Any]) -> int:
+        """Queue a snapshot for every subscriber; returns the number of clients"""
+        previous = self.snapshot
+        self.sequence += 1
+        self.snapshot = snapshot
+        self._keyframe = None
+        self.published += 1
+        
+        patch = merge_patch(previous, snapshot) if previous is not None else None
+        if patch is None:
+            frame = self._keyframe_frame()
+        else:
+            frame = self._encode({
+                'type': 'live_delta',
+                'seq': self.sequence,
+                'base': self.sequence - 1,
+                'patch': patch
+            })
+        
+        for subscriber in self.subscribers:
+            self._enqueue(subscriber, frame)
+        return len(self.subscribers)
+    
+    async def serve(self, websocket: WebSocket):
+        """Send queued frames to one accepted client until it disconnects"""
+        subscriber = _Subscriber(websocket, self.queue_size)
+        self.subscribers.append(subscriber)
+        if self.snapshot is not None:
+            subscriber.queue.put_nowait(self._keyframe_frame())
+        
+        try:
+            while True:
+                frame = await subscriber.queue.get()
+                await asyncio.wait_for(websocket.send_text(frame), self.send_timeout)
+        except Exception:
+            self.disconnected += 1
+        finally:
+            self.subscribers.remove(subscriber)
+    
+    def get_stats(self) -> Dict[str, Any]:
+        """Get broadcaster statistics"""
+        return {
+            'subscribers': len(self.subscribers),
+            'sequence': self.sequence,
+            'published': self.published,
+            'dropped_frames': self.dropped,
+            'disconnected': self.disconnected
+        }
+    
+    def _enqueue(self, subscriber: _Subscriber, frame: str):
+        if subscriber.queue.full():
+            # Drop the oldest frames; later deltas depend on them, so resync
+            while not subscriber.queue.empty():
+                subscriber.queue.get_nowait()
+                subscriber.dropped += 1
+                self.dropped += 1
+            frame = self._keyframe_frame()
+        subscriber.queue.put_nowait(frame)
+    
+    def _keyframe_frame(self) -> str:
+        # Full snapshots are serialized at most once per sequence
+        if self._keyframe is None:
+            self._keyframe = self._encode({**self.snapshot, 'seq': self.sequence})
+        return self._keyframe
+    
+    @staticmethod
+    def _encode(message: Dict[str, Any]) -> str:
+        return json.dumps(message, separators=(',', ':'), default=str)
+
 class TokenDashboard:
     """Real-time token usage dashboard"""
     
     def __init__(self, calculator: TokenCostCalculator):
         self.calculator = calculator
-        self.active_connections: List[WebSocket] = []
+        self.broadcaster = LiveUpdateBroadcaster()
         self.app = self._create_app()
         
         # Background monitoring
@@ -107,6 +247,12 @@ class TokenDashboard:
             prediction = self.calculator.predict_monthly_cost(days)
             return JSONResponse(prediction)
         
+        @app.get("/api/forecast")
+        async def get_forecast(days: int = 7, horizon: int = 30):
+            """Get per-agent and per-model cost forecasts"""
+            forecast = self.calculator.forecast_costs(history_days=days, horizon_days=horizon)
+            return JSONResponse(forecast)
+        
         @app.post("/api/alerts")
         async def create_alert(alert_data: dict):
             """Create cost alert"""
@@ -175,17 +321,7 @@ class TokenDashboard:
         async def websocket_endpoint(websocket: WebSocket):
             """WebSocket endpoint for real-time updates"""
             await websocket.accept()
-            self.active_connections.append(websocket)
-            
-            try:
-                while True:
-                    # Keep connection alive
-                    await asyncio.sleep(10)
-            except Exception:
-                pass
-            finally:
-                if websocket in self.active_connections:
-                    self.active_connections.remove(websocket)
+            await self.broadcaster.serve(websocket)
         
         @app.get("/api/export")
         async def export_data(
@@ -215,22 +351,9 @@ class TokenDashboard:
         
         while self.monitoring:
             try:
-                if self.active_connections:
-                    # Get live stats
-                    live_stats = await self._get_live_update()
-                    
-                    # Send to all connected clients
-                    disconnected = []
-                    for connection in self.active_connections:
-                        try:
-                            await connection.send_json(live_stats)
-                        except Exception:
-                            disconnected.append(connection)
-                    
-                    # Remove disconnected clients
-                    for conn in disconnected:
-                        if conn in self.active_connections:
-                            self.active_connections.remove(conn)
+                if self.broadcaster.subscribers:
+                    # Computed and serialized once, then queued for every client
+                    self.broadcaster.publish(await self._get_live_update())
                 
                 await asyncio.sleep(5)  # Update every 5 seconds
                 
@@ -239,7 +362,12 @@ class TokenDashboard:
                 await asyncio.sleep(30)
     
     async def _get_live_update(self) -> Dict[str, Any]:
-        """Get data for live updates"""
+        """Get data for live updates without blocking the event loop"""
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(None, self._collect_live_update)
+    
+    def _collect_live_update(self) -> Dict[str, Any]:
+        """Query the data for one live update"""
         
         # Today's stats
         today_summary = self.calculator.get_usage_summary(
@@ -718,6 +846,7 @@ class TokenDashboard:
 
     <script>
         let socket = null;
+        let liveState = null;
         let trendsChart = null;
         let agentsChart = null;
 
@@ -737,8 +866,20 @@ class TokenDashboard:
             socket.onmessage = function(event) {
                 const data = JSON.parse(event.data);
                 if (data.type === 'live_update') {
-                    updateLiveStats(data);
+                    liveState = data;
+                } else if (data.type === 'live_delta') {
+                    if (!liveState || data.base !== liveState.seq) {
+                        // Missed an update; reconnecting delivers a full snapshot
+                        liveState = null;
+                        socket.close();
+                        return;
+                    }
+                    liveState = applyMergePatch(liveState, data.patch);
+                    liveState.seq = data.seq;
+                } else {
+                    return;
                 }
+                updateLiveStats(liveState);
             };
             
             socket.onclose = function() {
@@ -747,6 +888,21 @@ class TokenDashboard:
             };
         }
 
+        function applyMergePatch(target, patch) {
+            const result = Object.assign({}, target);
+            for (const [key, value] of Object.entries(patch)) {
+                if (value === null) {
+                    delete result[key];
+                } else if (typeof value === 'object' && !Array.isArray(value) &&
+                           typeof result[key] === 'object' && result[key] !== null && !Array.isArray(result[key])) {
+                    result[key] = applyMergePatch(result[key], value);
+                } else {
+                    result[key] = value;
+                }
+            }
+            return result;
+        }
+
         async function loadInitialData() {
             try {
                 // Load summary
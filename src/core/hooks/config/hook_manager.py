@@ -295,12 +295,12 @@ class HookManager:
             try:
                 # Cleanup old performance data
                 if self.registry:
-                    for hook_name in list(self.registry.performance_monitor.metrics_history.keys()):
-                        history = self.registry.performance_monitor.metrics_history[hook_name]
-                        # Remove entries older than 24 hours
-                        cutoff_time = datetime.now() - timedelta(hours=24)
-                        while history and history[0].timestamp < cutoff_time:
-                            history.popleft()
+                    monitor = self.registry.performance_monitor
+                    # Remove entries older than 24 hours
+                    cutoff_time = datetime.now() - timedelta(hours=24)
+                    with monitor.lock:
+                        for history in monitor.metrics_history.values():
+                            history.discard_before(cutoff_time)
                 
                 # Cleanup stale executions
                 if self.registry:
@@ -464,7 +464,7 @@ class HookManager:
             return []
         
         try:
-            execution_ids = self.registry.execute_by_trigger(trigger, data, priority)
+            execution_ids = self.registry.execute_by_trigger(trigger, data, priority).execution_ids
             self.stats['hooks_executed'] += len(execution_ids)
             
             logger.info(f"Executed {len(execution_ids)} hooks for trigger: {trigger}")
@@ -712,18 +712,16 @@ class HookManager:
         try:
             # Clear old performance data
             if self.registry:
-                for hook_name in list(self.registry.performance_monitor.metrics_history.keys()):
-                    history = self.registry.performance_monitor.metrics_history[hook_name]
-                    original_size = len(history)
-                    
-                    # Keep only last 100 entries per hook
-                    while len(history) > 100:
-                        history.popleft()
-                    
-                    if len(history) < original_size:
-                        optimization_results['optimizations_applied'].append(
-                            f"Trimmed performance history for {hook_name}: {original_size} -> {len(history)}"
-                        )
+                monitor = self.registry.performance_monitor
+                with monitor.lock:
+                    for hook_name, history in monitor.metrics_history.items():
+                        original_size = len(history)
+                        
+                        # Keep only last 100 entries per hook
+                        if history.trim(100):
+                            optimization_results['optimizations_applied'].append(
+                                f"Trimmed performance history for {hook_name}: {original_size} -> {len(history)}"
+                            )
             
             # Clean up stale executions
             if self.registry:
@@ -812,7 +810,7 @@ class HookManager:
         
         # Clean shutdown of registry
         if self.registry:
-            self.registry.executor.shutdown(wait=True, timeout=10)
+            self.registry.shutdown()
         
         # Trigger system stopped event
         self._trigger_event('system_stopped', {'timestamp': datetime.now()})
@@ -17,7 +17,7 @@ from collections import defaultdict, deque
 from datetime import datetime, timedelta
 from dataclasses import dataclass, field, asdict
 from enum import Enum, IntEnum
-from typing import Dict, List, Optional, Any, Callable, Set, Union, Tuple, NamedTuple
+from typing import Dict, List, Optional, Any, Callable, Set, FrozenSet, Union, Tuple, NamedTuple
 from concurrent.futures import ThreadPoolExecutor, Future, as_completed
 import heapq
 import psutil
@@ -27,10 +27,16 @@ import uuid
 import copy
 
 # Import existing hook registry components
-from hook_registry import (
-    HookMetadata, HookPriority, HookState, TriggerType, 
-    ExecutionContext, PerformanceMetrics, HookRegistryError
-)
+try:
+    from .hook_registry import (
+        HookMetadata, HookPriority, HookState, TriggerType, 
+        ExecutionContext, PerformanceMetrics, HookRegistryError
+    )
+except ImportError:
+    from hook_registry import (
+        HookMetadata, HookPriority, HookState, TriggerType, 
+        ExecutionContext, PerformanceMetrics, HookRegistryError
+    )
 
 
 class ConflictResolutionStrategy(Enum):
@@ -263,6 +269,75 @@ class TopologicalSorter:
         
         return batches
     
+    def sort_indexed(self, dependency_graph: 'IncrementalDependencyGraph',
+                     hook_names: List[str]) -> List[ExecutionBatch]:
+        """Phase-ordered batches for a hook subset of an IncrementalDependencyGraph
+        
+        Produces the same batch layout as sort_with_phases without rebuilding or
+        re-sorting the graph: hooks are visited in the maintained topological
+        order and each gets the level after its deepest same-phase dependency,
+        so the cost is linear in the subset and its edges. Dependencies on hooks
+        of a later phase cannot be honoured and are ignored; hooks still cyclic
+        within the subset share a level.
+        """
+        names = list(dict.fromkeys(hook_names))
+        selected = set(names)
+        component_of = dependency_graph.component_of
+        rank = dependency_graph.rank
+        phases = dependency_graph.phases
+        predecessors = dependency_graph.predecessors
+        default_phase = ExecutionPhase.CORE_PROCESSING
+        
+        ordered = sorted(
+            names, key=lambda hook: rank[component_of[hook]] if hook in component_of else -1
+        )
+        levels: Dict[str, int] = {}
+        phase_levels = defaultdict(lambda: defaultdict(list))
+        
+        position = 0
+        while position < len(ordered):
+            hook = ordered[position]
+            component = component_of.get(hook)
+            if component is None or len(dependency_graph.members[component]) == 1:
+                groups = [[hook]]
+                position += 1
+            else:
+                # Members of one cycle share a rank and are therefore adjacent
+                end = position + 1
+                while end < len(ordered) and component_of.get(ordered[end]) == component:
+                    end += 1
+                groups = dependency_graph.ordered_groups(ordered[position:end])
+                position = end
+            
+            for group in groups:
+                for member in group:
+                    phase = phases.get(member, default_phase)
+                    level = 0
+                    for dep in predecessors.get(member, ()):
+                        if dep in selected and phases[dep] == phase and dep not in group:
+                            if levels[dep] >= level:
+                                level = levels[dep] + 1
+                    levels[member] = level
+                    phase_levels[phase][level].append(member)
+        
+        batches = []
+        for phase in sorted(phase_levels):
+            batch_counter = 0
+            for level in sorted(phase_levels[phase]):
+                group_hooks = phase_levels[phase][level]
+                group_name = f"default_{batch_counter}"
+                batches.append(ExecutionBatch(
+                    batch_id=f"batch_{batch_counter}_{group_name}",
+                    hooks=group_hooks,
+                    phase=phase,
+                    max_parallelism=len(group_hooks),
+                    resource_requirements=self._calculate_batch_resources(group_hooks, None),
+                    estimated_duration_ms=self._estimate_batch_duration(group_hooks)
+                ))
+                batch_counter += 1
+        
+        return batches
+    
     def _sort_phase_hooks(self, hooks: List[str], graph: Dict[str, DependencyNode], 
                          processed: Set[str]) -> List[ExecutionBatch]:
         """Sort hooks within a single phase"""
@@ -317,37 +392,17 @@ class TopologicalSorter:
     def _detect_and_resolve_cycle(self, hooks: List[str], 
                                  graph: Dict[str, DependencyNode]) -> List[str]:
         """Detect and resolve circular dependencies"""
-        # Use DFS to detect cycles
-        visited = set()
-        rec_stack = set()
-        cycle_nodes = []
-        
-        def dfs(node: str, path: List[str]) -> bool:
-            if node in rec_stack:
-                # Found cycle
-                cycle_start = path.index(node)
-                cycle_nodes.extend(path[cycle_start:])
-                return True
-            
-            if node in visited:
-                return False
-            
-            visited.add(node)
-            rec_stack.add(node)
-            
-            for dep in graph[node].dependencies:
-                if dep in hooks:  # Only consider dependencies within this set
-                    if dfs(dep, path + [node]):
-                        return True
-            
-            rec_stack.remove(node)
-            return False
+        # Only consider dependencies within this set
+        hook_set = set(hooks)
+        components = strongly_connected_components(
+            hooks, lambda node: [dep for dep in graph[node].dependencies if dep in hook_set]
+        )
         
-        # Find cycles
-        for hook in hooks:
-            if hook not in visited:
-                if dfs(hook, []):
-                    break
+        cycle_nodes = next(
+            (component for component in components
+             if len(component) > 1 or component[0] in graph[component[0]].dependencies),
+            []
+        )
         
         if not cycle_nodes:
             return []
@@ -393,6 +448,487 @@ class TopologicalSorter:
         return len(hooks) * 1000  # 1 second per hook estimate
 
 
+def strongly_connected_components(nodes: List[str],
+                                  successors: Callable[[str], List[str]]) -> List[List[str]]:
+    """Tarjan's algorithm without recursion
+    
+    Components are returned in reverse topological order: a component comes
+    after every component reachable from it. `successors` must only yield
+    members of `nodes`.
+    """
+    index_of: Dict[str, int] = {}
+    lowlink: Dict[str, int] = {}
+    on_stack: Set[str] = set()
+    stack: List[str] = []
+    components: List[List[str]] = []
+    counter = 0
+    
+    for root in nodes:
+        if root in index_of:
+            continue
+        
+        index_of[root] = lowlink[root] = counter
+        counter += 1
+        stack.append(root)
+        on_stack.add(root)
+        work = [(root, iter(successors(root)))]
+        
+        while work:
+            node, children = work[-1]
+            for child in children:
+                if child not in index_of:
+                    index_of[child] = lowlink[child] = counter
+                    counter += 1
+                    stack.append(child)
+                    on_stack.add(child)
+                    work.append((child, iter(successors(child))))
+                    break
+                if child in on_stack and index_of[child] < lowlink[node]:
+                    lowlink[node] = index_of[child]
+            else:
+                work.pop()
+                if work:
+                    parent = work[-1][0]
+                    if lowlink[node] < lowlink[parent]:
+                        lowlink[parent] = lowlink[node]
+                
+                if lowlink[node] == index_of[node]:
+                    component = []
+                    while True:
+                        member = stack.pop()
+                        on_stack.discard(member)
+                        component.append(member)
+                        if member == node:
+                            break
+                    components.append(component)
+    
+    return components
+
+
+class IncrementalDependencyGraph:
+    """Dependency graph over all registered hooks with an incrementally kept order
+    
+    Edges run from a dependency to its dependent; a dependency names either a
+    hook or a capability from some hook's `provides`. Strongly connected
+    components (dependency cycles) are collapsed and every component carries a
+    topological rank. Adding a hook only reorders the components between the
+    endpoints of each new edge (Pearce-Kelly); removing a hook only re-examines
+    its own component. Creating or splitting a cycle renumbers all components,
+    which only happens when hooks declare circular dependencies.
+    """
+    
+    def __init__(self):
+        self.metadata: Dict[str, HookMetadata] = {}
+        self.phases: Dict[str, ExecutionPhase] = {}
+        self.isolation_levels: Dict[str, int] = {}
+        self.providers: Dict[str, Set[str]] = {}     # dependency key -> hooks satisfying it
+        self.requirers: Dict[str, Set[str]] = {}     # dependency key -> hooks declaring it
+        self.predecessors: Dict[str, Set[str]] = {}  # hook -> hooks it depends on
+        self.successors: Dict[str, Set[str]] = {}    # hook -> hooks depending on it
+        self.component_of: Dict[str, int] = {}
+        self.members: Dict[int, Set[str]] = {}
+        self.rank: Dict[int, int] = {}
+        self.version = 0
+        self._keys: Dict[str, Set[str]] = {}
+        self._dependencies: Dict[str, Set[str]] = {}
+        self._next_component = 0
+        self._next_rank = 0
+    
+    def add_hook(self, metadata: HookMetadata):
+        """Add a hook, or replace it if already present"""
+        name = metadata.name
+        if name in self.metadata:
+            self.remove_hook(name)
+        
+        self.metadata[name] = metadata
+        self.phases[name] = self.determine_execution_phase(metadata)
+        self.isolation_levels[name] = self.determine_isolation_level(metadata)
+        self.predecessors[name] = set()
+        self.successors[name] = set()
+        self._new_component({name})
+        
+        keys = {name, *metadata.provides}
+        dependencies = set(metadata.dependencies) - {name}
+        self._keys[name] = keys
+        self._dependencies[name] = dependencies
+        for key in keys:
+            self.providers.setdefault(key, set()).add(name)
+        for dependency in dependencies:
+            self.requirers.setdefault(dependency, set()).add(name)
+        
+        # The new component has the highest rank, so only outgoing edges can reorder
+        for dependency in dependencies:
+            for provider in self.providers.get(dependency, ()):
+                if provider != name:
+                    self._add_edge(provider, name)
+        for key in keys:
+            for dependent in self.requirers.get(key, ()):
+                if dependent != name:
+                    self._add_edge(name, dependent)
+        
+        self.version += 1
+    
+    def remove_hook(self, name: str):
+        """Remove a hook and all its edges"""
+        if self.metadata.pop(name, None) is None:
+            return
+        
+        for predecessor in self.predecessors.pop(name):
+            self.successors[predecessor].discard(name)
+        for successor in self.successors.pop(name):
+            self.predecessors[successor].discard(name)
+        for key in self._keys.pop(name):
+            self._discard(self.providers, key, name)
+        for dependency in self._dependencies.pop(name):
+            self._discard(self.requirers, dependency, name)
+        del self.phases[name]
+        del self.isolation_levels[name]
+        
+        component = self.component_of.pop(name)
+        members = self.members[component]
+        members.discard(name)
+        if not members:
+            del self.members[component]
+            del self.rank[component]
+        elif len(members) > 1:
+            self._split_component(component)
+        
+        self.version += 1
+    
+    def subgraph(self, hook_names: List[str]) -> Dict[str, DependencyNode]:
+        """DependencyNodes for a hook subset with edges restricted to the subset"""
+        names = list(dict.fromkeys(hook_names))
+        selected = set(names)
+        graph = {}
+        
+        for name in names:
+            if name not in self.metadata:
+                # Create minimal node for unknown hooks
+                graph[name] = DependencyNode(hook_name=name)
+                continue
+            
+            graph[name] = DependencyNode(
+                hook_name=name,
+                dependencies=self.predecessors[name] & selected,
+                dependents=self.successors[name] & selected,
+                phase=self.phases[name],
+                isolation_level=self.isolation_levels[name]
+            )
+        
+        return graph
+    
+    def ordered_groups(self, hook_names: List[str]) -> List[List[str]]:
+        """Order hooks of one component by the edges among them alone
+        
+        A cycle may run through hooks outside the selection; whatever is still
+        cyclic within the selection comes back as one group.
+        """
+        selected = set(hook_names)
+        components = strongly_connected_components(
+            hook_names, lambda hook: [s for s in self.successors[hook] if s in selected]
+        )
+        components.reverse()
+        return components
+    
+    @staticmethod
+    def determine_execution_phase(metadata: HookMetadata) -> ExecutionPhase:
+        """Determine execution phase for a hook"""
+        # Analyze hook tags and triggers to determine phase
+        if 'validation' in metadata.tags:
+            return ExecutionPhase.PRE_VALIDATION
+        elif 'initialization' in metadata.tags or 'setup' in metadata.tags:
+            return ExecutionPhase.INITIALIZATION
+        elif 'cleanup' in metadata.tags:
+            return ExecutionPhase.CLEANUP
+        elif 'finalization' in metadata.tags or 'teardown' in metadata.tags:
+            return ExecutionPhase.FINALIZATION
+        elif 'post_process' in metadata.tags:
+            return ExecutionPhase.POST_PROCESSING
+        else:
+            return ExecutionPhase.CORE_PROCESSING
+    
+    @staticmethod
+    def determine_isolation_level(metadata: HookMetadata) -> int:
+        """Determine isolation level for a hook"""
+        if 'exclusive' in metadata.tags:
+            return 2  # Exclusive execution
+        elif 'isolated' in metadata.tags:
+            return 1  # Isolated execution
+        else:
+            return 0  # Shared execution
+    
+    def _new_component(self, members: Set[str]) -> int:
+        component = self._next_component
+        self._next_component += 1
+        self.members[component] = members
+        for member in members:
+            self.component_of[member] = component
+        self.rank[component] = self._next_rank
+        self._next_rank += 1
+        return component
+    
+    @staticmethod
+    def _discard(index: Dict[str, Set[str]], key: str, name: str):
+        entries = index.get(key)
+        if entries is not None:
+            entries.discard(name)
+            if not entries:
+                del index[key]
+    
+    def _add_edge(self, source: str, target: str):
+        if target in self.successors[source]:
+            return
+        self.successors[source].add(target)
+        self.predecessors[target].add(source)
+        
+        source_component = self.component_of[source]
+        target_component = self.component_of[target]
+        if (source_component != target_component and
+                self.rank[source_component] > self.rank[target_component]):
+            self._reorder(source_component, target_component)
+    
+    def _reorder(self, source: int, target: int):
+        """Restore rank order after adding an edge from `source` back to `target`"""
+        lower, upper = self.rank[target], self.rank[source]
+        forward = self._search(target, upper, forward=True)
+        backward = self._search(source, lower, forward=False)
+        
+        if source in forward:
+            # The edge closes a cycle through every component on both sides
+            self._merge_components(forward & backward)
+            self._renumber()
+            return
+        
+        ordered = sorted(backward, key=self.rank.__getitem__) + sorted(forward, key=self.rank.__getitem__)
+        for component, rank in zip(ordered, sorted(self.rank[c] for c in ordered)):
+            self.rank[component] = rank
+    
+    def _search(self, start: int, bound: int, forward: bool) -> Set[int]:
+        """Components reachable from `start` within the affected rank region"""
+        edges = self.successors if forward else self.predecessors
+        found = {start}
+        stack = [start]
+        
+        while stack:
+            for member in self.members[stack.pop()]:
+                for neighbour in edges[member]:
+                    component = self.component_of[neighbour]
+                    if component in found:
+                        continue
+                    rank = self.rank[component]
+                    if (rank <= bound) if forward else (rank >= bound):
+                        found.add(component)
+                        stack.append(component)
+        
+        return found
+    
+    def _merge_components(self, components: Set[int]):
+        keep = min(components)
+        for component in components - {keep}:
+            for member in self.members.pop(component):
+                self.component_of[member] = keep
+                self.members[keep].add(member)
+            del self.rank[component]
+    
+    def _split_component(self, component: int):
+        members = self.members[component]
+        parts = strongly_connected_components(
+            list(members), lambda hook: [s for s in self.successors[hook] if s in members]
+        )
+        if len(parts) == 1:
+            return
+        
+        del self.members[component]
+        del self.rank[component]
+        for part in parts:
+            self._new_component(set(part))
+        self._renumber()
+    
+    def _renumber(self):
+        """Recompute all ranks from scratch (Kahn's algorithm over components)"""
+        indegree = {component: 0 for component in self.members}
+        edges = {component: set() for component in self.members}
+        for component, members in self.members.items():
+            for member in members:
+                for successor in self.successors[member]:
+                    other = self.component_of[successor]
+                    if other != component and other not in edges[component]:
+                        edges[component].add(other)
+                        indegree[other] += 1
+        
+        ready = deque(sorted((c for c, degree in indegree.items() if degree == 0),
+                             key=self.rank.__getitem__))
+        rank = 0
+        while ready:
+            component = ready.popleft()
+            self.rank[component] = rank
+            rank += 1
+            for other in edges[component]:
+                indegree[other] -= 1
+                if indegree[other] == 0:
+                    ready.append(other)
+        self._next_rank = rank
+
+
+@dataclass
+class ExecutionPlan:
+    """Compiled dependency plan for one trigger and hook set"""
+    trigger: str
+    hooks: FrozenSet[str]
+    batches: List[ExecutionBatch]
+    generation: int
+    compiled_at: datetime = field(default_factory=datetime.now)
+    graph_builder: Optional[Callable[[], Dict[str, DependencyNode]]] = field(
+        default=None, repr=False, compare=False
+    )
+    _graph: Optional[Dict[str, DependencyNode]] = field(default=None, repr=False, compare=False)
+    
+    @property
+    def levels(self) -> List[List[str]]:
+        """Hook names per dependency level; hooks within a level can run in parallel"""
+        return [list(batch.hooks) for batch in self.batches]
+    
+    @property
+    def graph(self) -> Dict[str, DependencyNode]:
+        """Dependency graph of the plan's hooks, built on first access"""
+        if self._graph is None:
+            self._graph = self.graph_builder() if self.graph_builder else {}
+        return self._graph
+
+
+class ExecutionPlanCache:
+    """Memoizes execution plans per (trigger, active hook set)
+    
+    Plans are read from an IncrementalDependencyGraph that mirrors the
+    registry's hooks. HookRegistry passes changed hook metadata to
+    update_hook() and calls invalidate() on activation changes, which only
+    drops the per-trigger shortcuts: a plan for a hook set seen before is
+    reused as-is. HookPrioritySystem reads plans from the registry's cache so
+    both execution paths share the same compiled plans.
+    """
+    
+    def __init__(self, hook_registry=None, sorter: TopologicalSorter = None, max_plans: int = 1024):
+        self.hook_registry = hook_registry
+        self.sorter = sorter or TopologicalSorter()
+        self.dependency_graph = IncrementalDependencyGraph()
+        self.max_plans = max_plans
+        self.plans: Dict[Any, ExecutionPlan] = {}           # (trigger, hook set) -> plan
+        self.trigger_plans: Dict[str, ExecutionPlan] = {}   # trigger -> plan for its active hooks
+        self.generation = 0
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.RLock()
+    
+    def get_plan(self, trigger: str, hook_names: List[str] = None) -> ExecutionPlan:
+        """Get the plan for a trigger
+        
+        Without `hook_names` the plan covers the registry's active hooks for the
+        trigger; otherwise it covers exactly the given hooks.
+        """
+        with self._lock:
+            if hook_names is None:
+                plan = self.trigger_plans.get(trigger)
+                if plan is None:
+                    plan = self._plan_for(trigger, self._active_trigger_hooks(trigger))
+                    self.trigger_plans[trigger] = plan
+                else:
+                    self.hits += 1
+                return plan
+            
+            return self._plan_for(trigger, hook_names)
+    
+    def update_hook(self, metadata: HookMetadata):
+        """Re-index a registered or reloaded hook and drop all plans"""
+        with self._lock:
+            self.dependency_graph.add_hook(metadata)
+            self._clear()
+    
+    def remove_hook(self, hook_name: str):
+        """Forget a hook and drop all plans"""
+        with self._lock:
+            self.dependency_graph.remove_hook(hook_name)
+            self._clear()
+    
+    def invalidate(self):
+        """Drop the per-trigger plans after activation changes"""
+        with self._lock:
+            self.trigger_plans.clear()
+    
+    def get_stats(self) -> Dict[str, Any]:
+        """Get cache statistics"""
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                'plans': len(self.plans),
+                'generation': self.generation,
+                'indexed_hooks': len(self.dependency_graph.metadata),
+                'dependency_components': len(self.dependency_graph.members),
+                'hits': self.hits,
+                'misses': self.misses,
+                'hit_rate': self.hits / lookups if lookups else 0.0
+            }
+    
+    def build_graph(self, hook_names: List[str]) -> Dict[str, DependencyNode]:
+        """Build the dependency graph for a set of hooks
+        
+        A dependency names either another hook or a capability from its
+        `provides`; both are resolved to hooks within the set. Dependencies that
+        nothing in the set satisfies are left out so they cannot stall the sort.
+        """
+        with self._lock:
+            self._sync(hook_names)
+            return self.dependency_graph.subgraph(hook_names)
+    
+    def _plan_for(self, trigger: str, hook_names: List[str]) -> ExecutionPlan:
+        names = list(dict.fromkeys(hook_names))
+        key = (trigger, frozenset(names))
+        plan = self.plans.get(key)
+        if plan is not None:
+            self.hits += 1
+            return plan
+        
+        self.misses += 1
+        self._sync(names)
+        plan = ExecutionPlan(
+            trigger=trigger,
+            hooks=key[1],
+            batches=self.sorter.sort_indexed(self.dependency_graph, names),
+            generation=self.generation,
+            graph_builder=lambda: self.build_graph(names)
+        )
+        
+        if len(self.plans) >= self.max_plans:
+            self.plans.clear()
+        self.plans[key] = plan
+        return plan
+    
+    def _sync(self, hook_names: List[str]):
+        """Index hooks the graph has not seen in their current metadata"""
+        hooks = self.hook_registry.hooks if self.hook_registry else {}
+        indexed = self.dependency_graph.metadata
+        for name in hook_names:
+            metadata = hooks.get(name)
+            if indexed.get(name) is not metadata:
+                if metadata is None:
+                    self.dependency_graph.remove_hook(name)
+                else:
+                    self.dependency_graph.add_hook(metadata)
+    
+    def _clear(self):
+        self.plans.clear()
+        self.trigger_plans.clear()
+        self.generation += 1
+    
+    def _active_trigger_hooks(self, trigger: str) -> List[str]:
+        registry = self.hook_registry
+        if registry is None:
+            return []
+        return [
+            hook_name for hook_name in registry.trigger_mappings.get(trigger, [])
+            if hook_name in registry.hooks and registry.hooks[hook_name].state == HookState.ACTIVE
+        ]
+
+
 class ConflictResolver:
     """Resolves conflicts between competing hooks"""
     
@@ -534,7 +1070,8 @@ class ParallelExecutionOptimizer:
         self.resource_monitor = ResourceMonitor()
         self.load_balancer = LoadBalancer()
     
-    def optimize_execution_plan(self, batches: List[ExecutionBatch]) -> List[ExecutionBatch]:
+    def optimize_execution_plan(self, batches: List[ExecutionBatch],
+                                graph: Dict[str, DependencyNode] = None) -> List[ExecutionBatch]:
         """Optimize execution plan for maximum parallelism"""
         optimized_batches = []
         
@@ -549,7 +1086,7 @@ class ParallelExecutionOptimizer:
                 optimized_batches.append(optimized_batch)
         
         # Merge compatible batches
-        merged_batches = self._merge_compatible_batches(optimized_batches)
+        merged_batches = self._merge_compatible_batches(optimized_batches, graph)
         
         return merged_batches
     
@@ -595,7 +1132,8 @@ class ParallelExecutionOptimizer:
         batch.max_parallelism = max(1, optimal_parallelism)
         return batch
     
-    def _merge_compatible_batches(self, batches: List[ExecutionBatch]) -> List[ExecutionBatch]:
+    def _merge_compatible_batches(self, batches: List[ExecutionBatch],
+                                  graph: Dict[str, DependencyNode] = None) -> List[ExecutionBatch]:
         """Merge compatible batches for better resource utilization"""
         merged = []
         i = 0
@@ -607,7 +1145,7 @@ class ParallelExecutionOptimizer:
             if i + 1 < len(batches):
                 next_batch = batches[i + 1]
                 
-                if self._can_merge_batches(current_batch, next_batch):
+                if self._can_merge_batches(current_batch, next_batch, graph):
                     merged_batch = self._merge_batches(current_batch, next_batch)
                     merged.append(merged_batch)
                     i += 2  # Skip next batch as it's merged
@@ -618,12 +1156,19 @@ class ParallelExecutionOptimizer:
         
         return merged
     
-    def _can_merge_batches(self, batch1: ExecutionBatch, batch2: ExecutionBatch) -> bool:
+    def _can_merge_batches(self, batch1: ExecutionBatch, batch2: ExecutionBatch,
+                           graph: Dict[str, DependencyNode] = None) -> bool:
         """Check if two batches can be merged"""
         # Same phase and compatible resource requirements
         if batch1.phase != batch2.phase:
             return False
         
+        # Hooks depending on the previous batch must stay after it
+        if graph:
+            first_hooks = set(batch1.hooks)
+            if any(graph[hook].dependencies & first_hooks for hook in batch2.hooks if hook in graph):
+                return False
+        
         total_hooks = len(batch1.hooks) + len(batch2.hooks)
         if total_hooks > self.max_workers:
             return False
@@ -900,6 +1445,7 @@ class HookPrioritySystem:
         self.conflict_resolver = ConflictResolver()
         self.execution_optimizer = ParallelExecutionOptimizer()
         self.rollback_manager = RollbackManager()
+        self.plan_cache = self._shared_plan_cache(hook_registry)
         
         # Configuration
         self.default_conflict_strategy = ConflictResolutionStrategy.PRIORITY_BASED
@@ -923,8 +1469,9 @@ class HookPrioritySystem:
         
         context = context or {}
         
-        # Build dependency graph
-        dependency_graph = self._build_dependency_graph(hook_names)
+        # Dependency graph and topological batches come from the shared plan cache
+        plan = self.plan_cache.get_plan(trigger, hook_names)
+        dependency_graph = plan.graph
         
         # Calculate priorities
         priorities = self._calculate_hook_priorities(hook_names, context)
@@ -932,11 +1479,13 @@ class HookPrioritySystem:
         # Resolve conflicts
         resolved_hooks = self._resolve_trigger_conflicts(trigger, hook_names)
         
-        # Perform topological sort with phases
-        execution_batches = self.topological_sorter.sort_with_phases(dependency_graph)
+        # The optimizer adjusts batches in place, so work on a copy of the cached plan
+        execution_batches = copy.deepcopy(plan.batches)
         
         # Optimize for parallel execution
-        optimized_batches = self.execution_optimizer.optimize_execution_plan(execution_batches)
+        optimized_batches = self.execution_optimizer.optimize_execution_plan(
+            execution_batches, dependency_graph
+        )
         
         # Calculate total estimated time
         total_time = sum(batch.estimated_duration_ms for batch in optimized_batches)
@@ -1092,60 +1641,24 @@ class HookPrioritySystem:
             }
         }
     
+    def _shared_plan_cache(self, hook_registry) -> ExecutionPlanCache:
+        """Reuse the registry's plan cache when available"""
+        plan_cache = getattr(hook_registry, 'plan_cache', None) if hook_registry else None
+        if isinstance(plan_cache, ExecutionPlanCache):
+            return plan_cache
+        return ExecutionPlanCache(hook_registry, self.topological_sorter)
+    
     def _build_dependency_graph(self, hook_names: List[str]) -> Dict[str, DependencyNode]:
         """Build dependency graph for hooks"""
-        graph = {}
-        
-        for hook_name in hook_names:
-            if not self.hook_registry or hook_name not in self.hook_registry.hooks:
-                # Create minimal node for unknown hooks
-                graph[hook_name] = DependencyNode(hook_name=hook_name)
-                continue
-            
-            metadata = self.hook_registry.hooks[hook_name]
-            
-            # Create dependency node
-            node = DependencyNode(
-                hook_name=hook_name,
-                dependencies=set(metadata.dependencies),
-                phase=self._determine_execution_phase(metadata),
-                isolation_level=self._determine_isolation_level(metadata)
-            )
-            
-            graph[hook_name] = node
-        
-        # Build reverse dependencies (dependents)
-        for hook_name, node in graph.items():
-            for dep in node.dependencies:
-                if dep in graph:
-                    graph[dep].dependents.add(hook_name)
-        
-        return graph
+        return self.plan_cache.build_graph(hook_names)
     
     def _determine_execution_phase(self, metadata: HookMetadata) -> ExecutionPhase:
         """Determine execution phase for a hook"""
-        # Analyze hook tags and triggers to determine phase
-        if 'validation' in metadata.tags:
-            return ExecutionPhase.PRE_VALIDATION
-        elif 'initialization' in metadata.tags or 'setup' in metadata.tags:
-            return ExecutionPhase.INITIALIZATION
-        elif 'cleanup' in metadata.tags:
-            return ExecutionPhase.CLEANUP
-        elif 'finalization' in metadata.tags or 'teardown' in metadata.tags:
-            return ExecutionPhase.FINALIZATION
-        elif 'post_process' in metadata.tags:
-            return ExecutionPhase.POST_PROCESSING
-        else:
-            return ExecutionPhase.CORE_PROCESSING
+        return IncrementalDependencyGraph.determine_execution_phase(metadata)
     
     def _determine_isolation_level(self, metadata: HookMetadata) -> int:
         """Determine isolation level for a hook"""
-        if 'exclusive' in metadata.tags:
-            return 2  # Exclusive execution
-        elif 'isolated' in metadata.tags:
-            return 1  # Isolated execution
-        else:
-            return 0  # Shared execution
+        return IncrementalDependencyGraph.determine_isolation_level(metadata)
     
     def _calculate_hook_priorities(self, hook_names: List[str], 
                                   context: Dict[str, Any]) -> Dict[str, float]:
@@ -1412,6 +1925,10 @@ __all__ = [
     'ResourceAllocation',
     'AdvancedPriorityCalculator',
     'TopologicalSorter',
+    'IncrementalDependencyGraph',
+    'strongly_connected_components',
+    'ExecutionPlan',
+    'ExecutionPlanCache',
     'ConflictResolver',
     'ParallelExecutionOptimizer',
     'ResourceMonitor',
@@ -5,8 +5,10 @@ Provides metadata storage, trigger mapping, priority queues, dependency resoluti
 LSP bridge interface, hot-reload capabilities, and performance monitoring
 """
 
+import os
 import json
 import time
+import signal
 import asyncio
 import threading
 import weakref
@@ -20,12 +22,25 @@ import heapq
 import re
 import inspect
 import importlib.util
+import hashlib
 import sys
-from concurrent.futures import ThreadPoolExecutor, as_completed
-import psutil
+import math
+import bisect
+import itertools
+import multiprocessing
+from array import array
+from contextlib import contextmanager
+from concurrent.futures import ThreadPoolExecutor, ProcessPoolExecutor, Future, as_completed
+from concurrent.futures import TimeoutError as FutureTimeoutError
+from concurrent.futures.process import BrokenProcessPool
 from watchdog.observers import Observer
 from watchdog.events import FileSystemEventHandler
 
+try:
+    import resource
+except ImportError:  # Not available on Windows
+    resource = None
+
 
 class HookPriority(Enum):
     """Hook execution priority levels"""
@@ -74,6 +89,9 @@ class HookMetadata:
     tags: List[str] = field(default_factory=list)
     lsp_compatible: bool = False
     hot_reload_enabled: bool = True
+    isolation: str = "thread"                   # "thread" or "process"
+    cpu_limit_seconds: Optional[float] = None   # process isolation only
+    memory_limit_mb: Optional[float] = None     # process isolation only
     state: HookState = HookState.UNREGISTERED
     created_at: datetime = field(default_factory=datetime.now)
     updated_at: datetime = field(default_factory=datetime.now)
@@ -108,6 +126,133 @@ class PerformanceMetrics:
     timestamp: datetime = field(default_factory=datetime.now)
 
 
+class TriggerExecution:
+    """Handle for the hooks submitted for one trigger
+    
+    Iterating the handle yields execution ids, so callers that only need the
+    ids keep working. Results can be collected as they complete, gathered all
+    at once, or awaited from asyncio code; executions still pending at the
+    deadline are cancelled and reported as failed. A caller's own, shorter
+    timeout only ends that wait: executions still running are reported
+    with 'pending': True and left to finish, so the handle can be polled.
+    
+    Without a trigger deadline, waiting is bounded by the sum of the hooks'
+    timeouts, the longest the fan-out can take if every hook runs after the
+    other; a hung hook therefore cannot block a caller indefinitely.
+    """
+    
+    def __init__(self, trigger: str, contexts: List[ExecutionContext],
+                 futures: Dict[str, Future], deadline: Optional[float] = None):
+        self.trigger = trigger
+        self.contexts = {context.execution_id: context for context in contexts}
+        self.futures = futures
+        self.deadline = deadline
+        if deadline is None:
+            deadline = sum(context.timeout_seconds for context in contexts)
+        self._deadline_at = time.monotonic() + deadline
+        self._effective_deadline = deadline
+    
+    @property
+    def execution_ids(self) -> List[str]:
+        return list(self.futures)
+    
+    def __iter__(self):
+        return iter(self.futures)
+    
+    def __len__(self) -> int:
+        return len(self.futures)
+    
+    def __await__(self):
+        return self.wait().__await__()
+    
+    def done(self) -> bool:
+        """True when every execution has finished or been cancelled"""
+        return all(future.done() for future in self.futures.values())
+    
+    def cancel(self) -> int:
+        """Cancel executions that have not started; returns how many were cancelled"""
+        return sum(1 for future in self.futures.values() if future.cancel())
+    
+    def as_completed(self, timeout: float = None):
+        """Yield result dicts in completion order, within `timeout` and the deadline"""
+        pending = {future: execution_id for execution_id, future in self.futures.items()}
+        yielded = set()
+        remaining = self._remaining(timeout)
+        wait_timeout = None if self._deadline_first(remaining, timeout) else timeout
+        
+        try:
+            for future in as_completed(pending, timeout=remaining):
+                yielded.add(pending[future])
+                yield self._result_for(pending[future])
+        except FutureTimeoutError:
+            for execution_id in self.futures:
+                if execution_id not in yielded:
+                    if wait_timeout is None:
+                        self.futures[execution_id].cancel()
+                    yield self._result_for(execution_id, wait_timeout)
+    
+    def results(self, timeout: float = None) -> Dict[str, Dict[str, Any]]:
+        """Wait for all executions and return results keyed by execution id"""
+        return {result['execution_id']: result for result in self.as_completed(timeout)}
+    
+    async def wait(self, timeout: float = None) -> Dict[str, Dict[str, Any]]:
+        """Asyncio counterpart of results()"""
+        remaining = self._remaining(timeout)
+        wait_timeout = None if self._deadline_first(remaining, timeout) else timeout
+        if self.futures:
+            await asyncio.wait(
+                [asyncio.wrap_future(future) for future in self.futures.values()],
+                timeout=remaining
+            )
+        
+        if wait_timeout is None:
+            for future in self.futures.values():
+                if not future.done():
+                    future.cancel()
+        
+        return {execution_id: self._result_for(execution_id, wait_timeout) for execution_id in self.futures}
+    
+    def _remaining(self, timeout: Optional[float]) -> float:
+        """Seconds left before the earlier of `timeout` and the trigger deadline"""
+        remaining = max(0.0, self._deadline_at - time.monotonic())
+        return min(timeout, remaining) if timeout is not None else remaining
+    
+    @staticmethod
+    def _deadline_first(remaining: float, timeout: Optional[float]) -> bool:
+        # Whether a wait of `remaining` seconds ends at the trigger deadline
+        # rather than at the caller's timeout
+        return timeout is None or remaining < timeout
+    
+    def _result_for(self, execution_id: str, wait_timeout: Optional[float] = None) -> Dict[str, Any]:
+        """Result of one execution; unfinished ones ran out of `wait_timeout`, or the deadline"""
+        future = self.futures[execution_id]
+        still_running = False
+        
+        if future.done() and not future.cancelled():
+            error = future.exception()
+            if error is None:
+                return future.result()
+            message = str(error)
+        elif future.cancelled():
+            message = 'Execution cancelled'
+        elif wait_timeout is None:
+            message = f"Trigger deadline of {self._effective_deadline:g}s exceeded"
+        else:
+            message = f"Still running after the caller's {wait_timeout:g}s timeout"
+            still_running = True
+        
+        result = {
+            'execution_id': execution_id,
+            'hook_name': self.contexts[execution_id].hook_name,
+            'success': False,
+            'result': None,
+            'error': message
+        }
+        if still_running:
+            result['pending'] = True
+        return result
+
+
 class HookRegistryError(Exception):
     """Hook registry specific exceptions"""
     pass
@@ -155,12 +300,25 @@ class PriorityQueue:
             heapq.heappush(self._queue, (item.priority.value, self._index, item))
             self._index += 1
     
+    def put_many(self, items: List[ExecutionContext]):
+        with self._lock:
+            for item in items:
+                heapq.heappush(self._queue, (item.priority.value, self._index, item))
+                self._index += 1
+    
     def get(self) -> Optional[ExecutionContext]:
         with self._lock:
             if self._queue:
                 return heapq.heappop(self._queue)[2]
             return None
     
+    def drain(self) -> List[ExecutionContext]:
+        """Remove and return all queued items in priority order"""
+        with self._lock:
+            items = [entry[2] for entry in sorted(self._queue)]
+            self._queue.clear()
+            return items
+    
     def qsize(self) -> int:
         with self._lock:
             return len(self._queue)
@@ -240,6 +398,164 @@ class DependencyResolver:
         return issues
 
 
+class HookMetadataScanner:
+    """Extracts hook metadata from source text in a single scan"""
+    
+    # Bump whenever scan() results change; cached metadata from another
+    # version is reparsed instead of trusted
+    VERSION = 1
+    
+    # The value is captured in a lookahead so directives sharing a line are all seen
+    DIRECTIVE_PATTERN = re.compile(
+        r'#\s*@(priority|triggers|depends|provides|tags|lsp|hot_reload|isolation|cpu_limit|memory_limit)'
+        r':(?=\s*(.+))',
+        re.IGNORECASE
+    )
+    DOCSTRING_PATTERNS = (
+        re.compile(r'"""(.*?)"""', re.DOTALL),
+        re.compile(r"'''(.*?)'''", re.DOTALL)
+    )
+    WORD_PATTERN = re.compile(r'\w+')
+    NUMBER_PATTERN = re.compile(r'\d+(?:\.\d+)?')
+    
+    LIST_DIRECTIVES = {
+        'triggers': 'triggers',
+        'depends': 'dependencies',
+        'provides': 'provides',
+        'tags': 'tags'
+    }
+    FLAG_DIRECTIVES = {
+        'lsp': 'lsp_compatible',
+        'hot_reload': 'hot_reload_enabled'
+    }
+    LIMIT_DIRECTIVES = {
+        'cpu_limit': 'cpu_limit_seconds',
+        'memory_limit': 'memory_limit_mb'
+    }
+    ISOLATION_MODES = ('thread', 'process')
+    DIRECTIVE_COUNT = len(LIST_DIRECTIVES) + len(FLAG_DIRECTIVES) + len(LIMIT_DIRECTIVES) + 2
+    
+    LSP_INDICATORS = ('lsp', 'language_server', 'completion', 'hover', 'definition')
+    TRIGGER_KEYWORDS = (
+        (TriggerType.USER_PROMPT, ('user_prompt', 'user_input', 'prompt')),
+        (TriggerType.CLAUDE_RESPONSE, ('claude_response', 'ai_response', 'response')),
+        (TriggerType.AGENT_ACTIVATION, ('agent_activation', 'agent', '@agent')),
+        (TriggerType.MCP_REQUEST, ('mcp_request', 'mcp', 'service')),
+        (TriggerType.FILE_CHANGE, ('file_change', 'file_modified', 'watch')),
+        (TriggerType.SYSTEM_EVENT, ('system_event', 'system', 'event'))
+    )
+    
+    def scan(self, name: str, file_path: str, content: str) -> HookMetadata:
+        """Build hook metadata from source content"""
+        docstring = self._scan_docstring(content)
+        metadata = HookMetadata(
+            name=name,
+            file_path=file_path,
+            description=docstring['description'],
+            author=docstring['author'],
+            version=docstring['version']
+        )
+        
+        self._apply_directives(content, metadata)
+        self._apply_capabilities(content, metadata)
+        
+        return metadata
+    
+    def _scan_docstring(self, content: str) -> Dict[str, str]:
+        """Parse description, author and version from the first docstring"""
+        result = {'description': '', 'author': '', 'version': '1.0.0'}
+        
+        match = None
+        for pattern in self.DOCSTRING_PATTERNS:
+            match = pattern.search(content)
+            if match:
+                break
+        
+        if not match:
+            return result
+        
+        lines = match.group(1).strip().split('\n')
+        result['description'] = lines[0].strip()
+        
+        for line in lines:
+            stripped = line.strip()
+            lowered = stripped.lower()
+            if lowered.startswith('author:'):
+                result['author'] = line.split(':', 1)[1].strip()
+            elif lowered.startswith('version:'):
+                result['version'] = line.split(':', 1)[1].strip()
+        
+        return result
+    
+    def _apply_directives(self, content: str, metadata: HookMetadata):
+        """Apply the first valid occurrence of each @directive comment"""
+        seen = set()
+        
+        for match in self.DIRECTIVE_PATTERN.finditer(content):
+            key = match.group(1).lower()
+            if key in seen:
+                continue
+            
+            value = match.group(2)
+            
+            if key == 'priority':
+                word = self.WORD_PATTERN.match(value)
+                if not word:
+                    continue
+                try:
+                    metadata.priority = HookPriority[word.group(0).upper()]
+                except KeyError:
+                    pass
+            elif key == 'isolation':
+                word = self.WORD_PATTERN.match(value)
+                if not word or word.group(0).lower() not in self.ISOLATION_MODES:
+                    continue
+                metadata.isolation = word.group(0).lower()
+            elif key in self.LIMIT_DIRECTIVES:
+                number = self.NUMBER_PATTERN.match(value)
+                if not number:
+                    continue
+                setattr(metadata, self.LIMIT_DIRECTIVES[key], float(number.group(0)))
+            elif key in self.FLAG_DIRECTIVES:
+                flag = value[:5].lower()
+                if flag.startswith('true'):
+                    setattr(metadata, self.FLAG_DIRECTIVES[key], True)
+                elif flag == 'false':
+                    setattr(metadata, self.FLAG_DIRECTIVES[key], False)
+                else:
+                    continue
+            else:
+                setattr(metadata, self.LIST_DIRECTIVES[key],
+                        [item.strip() for item in value.strip().split(',')])
+            
+            seen.add(key)
+            if len(seen) == self.DIRECTIVE_COUNT:
+                break
+    
+    def _apply_capabilities(self, content: str, metadata: HookMetadata):
+        """Detect entry points, async usage, LSP support and trigger keywords"""
+        # Entry point and async markers are case-sensitive
+        if 'def process_hook(' in content or 'def main(' in content:
+            if 'process_hook' not in metadata.provides:
+                metadata.provides.append('hook_processing')
+        
+        if 'async def' in content or 'await ' in content:
+            metadata.tags.append('async')
+        
+        # Keyword checks share one lowercased copy of the source
+        lowered = content.lower()
+        
+        if any(indicator in lowered for indicator in self.LSP_INDICATORS):
+            metadata.lsp_compatible = True
+            metadata.tags.append('lsp')
+        
+        for trigger_type, keywords in self.TRIGGER_KEYWORDS:
+            if trigger_type.value in metadata.triggers:
+                continue
+            if any(keyword in lowered for keyword in keywords):
+                metadata.triggers.append(trigger_type.value)
+
+
 class LSPHookBridge:
     """Bridge interface for Language Server Protocol integration"""
     
@@ -325,13 +641,298 @@ class LSPHookBridge:
         return capabilities
 
 
+class LatencyHistogram:
+    """Streaming log-bucketed histogram for percentile estimates
+    
+    HDR-style buckets grow geometrically so every estimate is within
+    `relative_error` of the true value. Only occupied buckets are stored,
+    so a histogram over a window of N samples holds at most N counts and
+    record/remove are O(1). Quantile estimates are cached until the next
+    change. Samples can be removed again, which keeps it in step with a
+    sliding window; min and max are not narrowed by removal, so they only
+    bound the estimates.
+    """
+    
+    def __init__(self, relative_error: float = 0.01, min_value: float = 1e-3,
+                 max_value: float = 3.6e6):
+        self.gamma = (1 + relative_error) / (1 - relative_error)
+        self._log_gamma = math.log(self.gamma)
+        self.min_value = min_value
+        self._offset = math.floor(math.log(min_value) / self._log_gamma)
+        self._last_bucket = math.ceil(math.log(max_value) / self._log_gamma) - self._offset
+        self.counts: Dict[int, int] = {}  # bucket -> samples, occupied buckets only
+        self.low_count = 0  # values below min_value
+        self.count = 0
+        self.min = math.inf
+        self.max = 0.0
+        self._cached: Optional[Tuple[Tuple[float, ...], List[float]]] = None
+    
+    def record(self, value: float):
+        """Add a sample"""
+        self._cached = None
+        self.count += 1
+        if value < self.min:
+            self.min = value
+        if value > self.max:
+            self.max = value
+        
+        if value < self.min_value:
+            self.low_count += 1
+        else:
+            bucket = self._bucket(value)
+            self.counts[bucket] = self.counts.get(bucket, 0) + 1
+    
+    def remove(self, value: float):
+        """Remove a sample previously added with record()"""
+        self._cached = None
+        self.count -= 1
+        if value < self.min_value:
+            self.low_count -= 1
+        else:
+            bucket = self._bucket(value)
+            remaining = self.counts[bucket] - 1
+            if remaining:
+                self.counts[bucket] = remaining
+            else:
+                del self.counts[bucket]
+        if not self.count:
+            self.reset()
+    
+    def merge(self, other: 'LatencyHistogram'):
+        """Add all samples of a histogram with the same bucket layout"""
+        self._cached = None
+        counts = self.counts
+        for bucket, count in other.counts.items():
+            counts[bucket] = counts.get(bucket, 0) + count
+        self.low_count += other.low_count
+        self.count += other.count
+        self.min = min(self.min, other.min)
+        self.max = max(self.max, other.max)
+    
+    def reset(self):
+        """Drop every sample"""
+        self._cached = None
+        self.counts = {}
+        self.low_count = 0
+        self.count = 0
+        self.min = math.inf
+        self.max = 0.0
+    
+    def _bucket(self, value: float) -> int:
+        index = math.ceil(math.log(value) / self._log_gamma) - self._offset
+        return min(index, self._last_bucket)
+    
+    def quantiles(self, quantiles: List[float]) -> List[float]:
+        """Estimate several quantiles (0..1) in one pass over the occupied buckets"""
+        if not self.count:
+            return [0.0 for _ in quantiles]
+        
+        key = tuple(quantiles)
+        if self._cached is not None and self._cached[0] == key:
+            return list(self._cached[1])
+        
+        buckets = sorted(self.counts)
+        cumulative = list(itertools.accumulate((self.counts[bucket] for bucket in buckets),
+                                               initial=self.low_count))
+        estimates = []
+        for q in quantiles:
+            rank = q * (self.count - 1)
+            position = bisect.bisect_right(cumulative, rank)
+            if position == 0:
+                estimates.append(self.min)
+                continue
+            
+            index = buckets[position - 1] + self._offset
+            value = 2 * self.gamma ** index / (self.gamma + 1)
+            estimates.append(min(max(value, self.min), self.max))
+        
+        self._cached = (key, estimates)
+        return list(estimates)
+
+
+class MetricsRingBuffer:
+    """Fixed-memory execution history for one hook
+    
+    Samples are stored column-wise in preallocated arrays. Aggregates over the
+    most recent `window` executions are kept current on every record through
+    running sums and monotonic min/max deques, so reading them is O(1). The
+    latency histogram follows the same window, and so does
+    `system_latency`, a histogram shared by all buffers of one monitor.
+    """
+    
+    def __init__(self, capacity: int = 1000, window: int = 100,
+                 system_latency: Optional[LatencyHistogram] = None):
+        self.capacity = capacity
+        self.window = min(window, capacity)
+        self.execution_times = array('d', [0.0]) * capacity
+        self.memory_usage = array('d', [0.0]) * capacity
+        self.cpu_usage = array('d', [0.0]) * capacity
+        self.timestamps = array('d', [0.0]) * capacity
+        self.successes = bytearray(capacity)
+        self.errors: Dict[int, str] = {}  # slot -> error message of failed executions
+        self.latency = LatencyHistogram()
+        self._histograms = [self.latency] if system_latency is None else [self.latency, system_latency]
+        
+        self.count = 0          # samples currently retained
+        self.total = 0          # samples ever recorded (also the next sequence number)
+        self.last_updated: Optional[datetime] = None
+        self._reset_window()
+    
+    def append(self, metrics: PerformanceMetrics):
+        """Record one execution, overwriting the oldest sample when full"""
+        seq = self.total
+        slot = seq % self.capacity
+        
+        if self.window_count == self.window:
+            self._evict_from_window(seq - self.window)
+        else:
+            self.window_count += 1
+        
+        execution_time = metrics.execution_time_ms
+        memory_usage = metrics.memory_usage_mb
+        self.execution_times[slot] = execution_time
+        self.memory_usage[slot] = memory_usage
+        self.cpu_usage[slot] = metrics.cpu_percent
+        self.timestamps[slot] = metrics.timestamp.timestamp()
+        self.successes[slot] = 1 if metrics.success else 0
+        if metrics.error_message:
+            self.errors[slot] = metrics.error_message
+        else:
+            self.errors.pop(slot, None)
+        
+        self._push_to_window(seq, execution_time, memory_usage, metrics.success)
+        for histogram in self._histograms:
+            histogram.record(execution_time)
+        
+        self.total += 1
+        self.count = min(self.count + 1, self.capacity)
+        self.last_updated = metrics.timestamp
+    
+    def stats(self) -> Dict[str, Any]:
+        """Aggregate statistics for the recent window"""
+        if not self.window_count:
+            return {}
+        
+        low, high = self._min_times[0][1], self._max_times[0][1]
+        p50, p95, p99 = (min(max(value, low), high)
+                         for value in self.latency.quantiles([0.5, 0.95, 0.99]))
+        return {
+            'total_executions': self.total,
+            'recent_executions': self.window_count,
+            'avg_execution_time_ms': self.window_time_sum / self.window_count,
+            'max_execution_time_ms': self._max_times[0][1],
+            'min_execution_time_ms': self._min_times[0][1],
+            'p50_execution_time_ms': p50,
+            'p95_execution_time_ms': p95,
+            'p99_execution_time_ms': p99,
+            'avg_memory_usage_mb': self.window_memory_sum / self.window_count,
+            'max_memory_usage_mb': self._max_memory[0][1],
+            'success_rate': (self.window_successes / self.window_count) * 100,
+            'last_updated': self.last_updated
+        }
+    
+    def trim(self, keep: int) -> int:
+        """Drop all but the newest `keep` samples; returns how many were dropped"""
+        dropped = max(0, self.count - max(keep, 0))
+        if dropped:
+            self.count -= dropped
+            self._rebuild_window()
+        return dropped
+    
+    def discard_before(self, cutoff: datetime) -> int:
+        """Drop samples recorded before `cutoff`; returns how many were dropped"""
+        cutoff_ts = cutoff.timestamp()
+        oldest = self.total - self.count
+        expired = 0
+        while expired < self.count and self.timestamps[(oldest + expired) % self.capacity] < cutoff_ts:
+            expired += 1
+        return self.trim(self.count - expired)
+    
+    def __len__(self) -> int:
+        return self.count
+    
+    def __iter__(self):
+        """Yield retained samples as PerformanceMetrics, oldest first"""
+        for seq in range(self.total - self.count, self.total):
+            slot = seq % self.capacity
+            yield PerformanceMetrics(
+                execution_time_ms=self.execution_times[slot],
+                memory_usage_mb=self.memory_usage[slot],
+                cpu_percent=self.cpu_usage[slot],
+                success=bool(self.successes[slot]),
+                error_message=self.errors.get(slot),
+                timestamp=datetime.fromtimestamp(self.timestamps[slot])
+            )
+    
+    def _reset_window(self):
+        self.window_count = 0
+        self.window_time_sum = 0.0
+        self.window_memory_sum = 0.0
+        self.window_successes = 0
+        self._max_times = deque()   # (seq, value), values decreasing
+        self._min_times = deque()   # (seq, value), values increasing
+        self._max_memory = deque()  # (seq, value), values decreasing
+    
+    def _push_to_window(self, seq: int, execution_time: float, memory_usage: float, success: bool):
+        self.window_time_sum += execution_time
+        self.window_memory_sum += memory_usage
+        self.window_successes += 1 if success else 0
+        
+        while self._max_times and self._max_times[-1][1] <= execution_time:
+            self._max_times.pop()
+        self._max_times.append((seq, execution_time))
+        while self._min_times and self._min_times[-1][1] >= execution_time:
+            self._min_times.pop()
+        self._min_times.append((seq, execution_time))
+        while self._max_memory and self._max_memory[-1][1] <= memory_usage:
+            self._max_memory.pop()
+        self._max_memory.append((seq, memory_usage))
+    
+    def _evict_from_window(self, seq: int):
+        # The evicted sample is read before its slot is overwritten
+        slot = seq % self.capacity
+        self.window_time_sum -= self.execution_times[slot]
+        self.window_memory_sum -= self.memory_usage[slot]
+        self.window_successes -= self.successes[slot]
+        for histogram in self._histograms:
+            histogram.remove(self.execution_times[slot])
+        
+        for window_deque in (self._max_times, self._min_times, self._max_memory):
+            if window_deque and window_deque[0][0] == seq:
+                window_deque.popleft()
+    
+    def _rebuild_window(self):
+        # Trimming leaves the slots of the old window intact, so its
+        # samples can still be taken back out of the shared histogram
+        for histogram in self._histograms[1:]:
+            for seq in range(self.total - self.window_count, self.total):
+                histogram.remove(self.execution_times[seq % self.capacity])
+        self._reset_window()
+        self.latency.reset()
+        for seq in range(self.total - min(self.count, self.window), self.total):
+            slot = seq % self.capacity
+            self.window_count += 1
+            self._push_to_window(seq, self.execution_times[slot], self.memory_usage[slot],
+                                 bool(self.successes[slot]))
+            for histogram in self._histograms:
+                histogram.record(self.execution_times[slot])
+
+
 class PerformanceMonitor:
-    """Performance monitoring and metrics collection"""
+    """Performance monitoring and metrics collection
     
-    def __init__(self, max_history=1000):
+    Each hook records into a fixed-size MetricsRingBuffer whose window
+    aggregates, latency histogram included, are maintained incrementally.
+    The buffers also keep one system-wide histogram over all hook windows
+    up to date, so recording is O(1) and system-level queries are
+    O(hooks), independent of history length.
+    """
+    
+    def __init__(self, max_history=1000, stats_window=100):
         self.max_history = max_history
-        self.metrics_history = defaultdict(lambda: deque(maxlen=max_history))
-        self.aggregate_stats = defaultdict(dict)
+        self.stats_window = stats_window
+        self.metrics_history: Dict[str, MetricsRingBuffer] = {}
+        self.system_latency = LatencyHistogram()
         self.monitoring_active = True
         self.lock = threading.RLock()
     
@@ -341,65 +942,47 @@ class PerformanceMonitor:
             return
         
         with self.lock:
-            self.metrics_history[hook_name].append(metrics)
-            self._update_aggregate_stats(hook_name)
-    
-    def _update_aggregate_stats(self, hook_name: str):
-        """Update aggregate statistics for a hook"""
-        history = self.metrics_history[hook_name]
-        if not history:
-            return
-        
-        recent_metrics = list(history)[-100:]  # Last 100 executions
-        
-        execution_times = [m.execution_time_ms for m in recent_metrics]
-        memory_usage = [m.memory_usage_mb for m in recent_metrics]
-        successes = sum(1 for m in recent_metrics if m.success)
-        
-        self.aggregate_stats[hook_name] = {
-            'total_executions': len(history),
-            'recent_executions': len(recent_metrics),
-            'avg_execution_time_ms': sum(execution_times) / len(execution_times),
-            'max_execution_time_ms': max(execution_times),
-            'min_execution_time_ms': min(execution_times),
-            'avg_memory_usage_mb': sum(memory_usage) / len(memory_usage),
-            'max_memory_usage_mb': max(memory_usage),
-            'success_rate': (successes / len(recent_metrics)) * 100,
-            'last_updated': datetime.now()
-        }
+            history = self.metrics_history.get(hook_name)
+            if history is None:
+                history = self.metrics_history[hook_name] = MetricsRingBuffer(
+                    self.max_history, self.stats_window, self.system_latency
+                )
+            history.append(metrics)
     
     def get_hook_stats(self, hook_name: str) -> Dict[str, Any]:
         """Get performance statistics for a hook"""
         with self.lock:
-            return self.aggregate_stats.get(hook_name, {})
+            history = self.metrics_history.get(hook_name)
+            return history.stats() if history else {}
     
     def get_system_stats(self) -> Dict[str, Any]:
         """Get system-wide performance statistics"""
         with self.lock:
-            total_executions = sum(len(history) for history in self.metrics_history.values())
+            histories = [h for h in self.metrics_history.values() if h.window_count]
+            total_executions = sum(h.total for h in self.metrics_history.values())
             
             if total_executions == 0:
                 return {'total_executions': 0}
             
-            # Aggregate across all hooks
-            all_recent_metrics = []
-            for history in self.metrics_history.values():
-                all_recent_metrics.extend(list(history)[-50:])  # Last 50 from each hook
-            
-            if not all_recent_metrics:
+            if not histories:
                 return {'total_executions': total_executions}
             
-            execution_times = [m.execution_time_ms for m in all_recent_metrics]
-            memory_usage = [m.memory_usage_mb for m in all_recent_metrics]
-            successes = sum(1 for m in all_recent_metrics if m.success)
+            recent = sum(h.window_count for h in histories)
+            low = min(h._min_times[0][1] for h in histories)
+            high = max(h._max_times[0][1] for h in histories)
+            p50, p95, p99 = (min(max(value, low), high)
+                             for value in self.system_latency.quantiles([0.5, 0.95, 0.99]))
             
             return {
                 'total_executions': total_executions,
                 'active_hooks': len(self.metrics_history),
-                'system_avg_execution_time_ms': sum(execution_times) / len(execution_times),
-                'system_max_execution_time_ms': max(execution_times),
-                'system_avg_memory_usage_mb': sum(memory_usage) / len(memory_usage),
-                'system_success_rate': (successes / len(all_recent_metrics)) * 100,
+                'system_avg_execution_time_ms': sum(h.window_time_sum for h in histories) / recent,
+                'system_max_execution_time_ms': high,
+                'system_p50_execution_time_ms': p50,
+                'system_p95_execution_time_ms': p95,
+                'system_p99_execution_time_ms': p99,
+                'system_avg_memory_usage_mb': sum(h.window_memory_sum for h in histories) / recent,
+                'system_success_rate': (sum(h.window_successes for h in histories) / recent) * 100,
                 'monitoring_active': self.monitoring_active,
                 'last_updated': datetime.now()
             }
@@ -409,43 +992,411 @@ class PerformanceMonitor:
         insights = []
         
         with self.lock:
-            for hook_name, stats in self.aggregate_stats.items():
-                if stats['recent_executions'] < 10:
+            for hook_name, history in self.metrics_history.items():
+                if history.window_count < 10:
                     continue
                 
+                avg_execution_time_ms = history.window_time_sum / history.window_count
+                avg_memory_usage_mb = history.window_memory_sum / history.window_count
+                success_rate = (history.window_successes / history.window_count) * 100
+                
                 # Slow execution detection
-                if stats['avg_execution_time_ms'] > 5000:  # 5 seconds
+                if avg_execution_time_ms > 5000:  # 5 seconds
                     insights.append({
                         'type': 'performance_warning',
                         'hook_name': hook_name,
                         'issue': 'slow_execution',
-                        'details': f"Average execution time: {stats['avg_execution_time_ms']:.1f}ms",
+                        'details': f"Average execution time: {avg_execution_time_ms:.1f}ms",
                         'recommendation': 'Consider optimizing hook logic or adding timeout'
                     })
                 
                 # High memory usage detection
-                if stats['avg_memory_usage_mb'] > 100:  # 100 MB
+                if avg_memory_usage_mb > 100:  # 100 MB
                     insights.append({
                         'type': 'resource_warning',
                         'hook_name': hook_name,
                         'issue': 'high_memory_usage',
-                        'details': f"Average memory usage: {stats['avg_memory_usage_mb']:.1f}MB",
+                        'details': f"Average memory usage: {avg_memory_usage_mb:.1f}MB",
                         'recommendation': 'Review memory allocation and cleanup'
                     })
                 
                 # Low success rate detection
-                if stats['success_rate'] < 90:
+                if success_rate < 90:
                     insights.append({
                         'type': 'reliability_warning',
                         'hook_name': hook_name,
                         'issue': 'low_success_rate',
-                        'details': f"Success rate: {stats['success_rate']:.1f}%",
+                        'details': f"Success rate: {success_rate:.1f}%",
                         'recommendation': 'Review error handling and dependencies'
                     })
         
         return insights
 
 
+class ResourceSampler:
+    """Cheap per-execution timing and resource sampling
+    
+    start() and finish() must run on the thread executing the hook: where
+    the platform has RUSAGE_THREAD (Linux) CPU time is that thread's alone,
+    so hooks running side by side do not count each other's work. Elsewhere
+    it falls back to process-wide usage. Coroutine hooks run on the async
+    runner's loop thread, which reads cpu_seconds() around them instead.
+    """
+    
+    def __init__(self, enabled: bool = True):
+        self.enabled = enabled
+        # ru_maxrss is reported in bytes on macOS and kilobytes elsewhere
+        self._maxrss_per_mb = 1024 * 1024 if sys.platform == 'darwin' else 1024
+        self._who = getattr(resource, 'RUSAGE_THREAD', resource.RUSAGE_SELF) if resource else None
+    
+    def start(self) -> Tuple[int, Any]:
+        """Take a sample at the start of an execution"""
+        usage = resource.getrusage(self._who) if self.enabled and resource else None
+        return time.perf_counter_ns(), usage
+    
+    def cpu_seconds(self) -> Optional[float]:
+        """CPU time used so far by the calling thread, or None when not sampling"""
+        if not self.enabled or not resource:
+            return None
+        usage = resource.getrusage(self._who)
+        return usage.ru_utime + usage.ru_stime
+    
+    def finish(self, sample: Tuple[int, Any]) -> Tuple[float, float, float]:
+        """Return (execution_time_ms, memory_delta_mb, cpu_percent) since `sample`"""
+        start_ns, start_usage = sample
+        elapsed_ns = time.perf_counter_ns() - start_ns
+        execution_time_ms = elapsed_ns / 1_000_000
+        
+        if start_usage is None:
+            return execution_time_ms, 0.0, 0.0
+        
+        end_usage = resource.getrusage(self._who)
+        cpu_seconds = ((end_usage.ru_utime - start_usage.ru_utime) +
+                       (end_usage.ru_stime - start_usage.ru_stime))
+        cpu_percent = (cpu_seconds / (elapsed_ns / 1e9)) * 100 if elapsed_ns else 0.0
+        memory_mb = max(0, end_usage.ru_maxrss - start_usage.ru_maxrss) / self._maxrss_per_mb
+        
+        return execution_time_ms, memory_mb, max(0.0, cpu_percent)
+
+
+class AsyncHookRunner:
+    """Runs coroutine hooks on one long-lived event loop thread"""
+    
+    def __init__(self):
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._thread: Optional[threading.Thread] = None
+        self._lock = threading.Lock()
+    
+    def run(self, hook_function: Callable, *args, timeout: float = 30.0,
+            sampler: Optional[ResourceSampler] = None,
+            usage: Optional[Dict[str, float]] = None) -> Any:
+        """Run a coroutine function on the shared loop and wait for its result
+        
+        With a `sampler`, the loop thread's CPU seconds over the coroutine
+        are stored in `usage['cpu_seconds']`, whether it succeeds or not.
+        Coroutines overlapping on the loop count toward each other's time.
+        """
+        loop = self._ensure_loop()
+        future = asyncio.run_coroutine_threadsafe(
+            self._run_with_timeout(hook_function, args, timeout, sampler, usage), loop
+        )
+        return future.result()
+    
+    @staticmethod
+    async def _run_with_timeout(hook_function: Callable, args: Tuple, timeout: float,
+                                sampler: Optional[ResourceSampler] = None,
+                                usage: Optional[Dict[str, float]] = None) -> Any:
+        before = sampler.cpu_seconds() if sampler is not None and usage is not None else None
+        try:
+            return await asyncio.wait_for(hook_function(*args), timeout=timeout)
+        finally:
+            if before is not None:
+                usage['cpu_seconds'] = sampler.cpu_seconds() - before
+    
+    def _ensure_loop(self) -> asyncio.AbstractEventLoop:
+        """Start the loop thread on first use, or restart it if it died"""
+        with self._lock:
+            if self._loop is None or self._thread is None or not self._thread.is_alive():
+                loop = asyncio.new_event_loop()
+                ready = threading.Event()
+                thread = threading.Thread(
+                    target=self._run_loop, args=(loop, ready),
+                    name="hook-registry-async", daemon=True
+                )
+                thread.start()
+                ready.wait()
+                self._loop, self._thread = loop, thread
+            return self._loop
+    
+    @staticmethod
+    def _run_loop(loop: asyncio.AbstractEventLoop, ready: threading.Event):
+        asyncio.set_event_loop(loop)
+        loop.call_soon(ready.set)
+        try:
+            loop.run_forever()
+        finally:
+            pending = asyncio.all_tasks(loop)
+            for task in pending:
+                task.cancel()
+            if pending:
+                loop.run_until_complete(asyncio.gather(*pending, return_exceptions=True))
+            loop.close()
+    
+    def is_running(self) -> bool:
+        return self._thread is not None and self._thread.is_alive()
+    
+    def shutdown(self, timeout: float = 5.0):
+        """Stop the loop thread, cancelling any coroutines still running"""
+        with self._lock:
+            loop, thread = self._loop, self._thread
+            self._loop, self._thread = None, None
+        
+        if loop is not None and thread is not None and thread.is_alive():
+            loop.call_soon_threadsafe(loop.stop)
+            thread.join(timeout)
+
+
+class HookResourceLimitError(HookRegistryError):
+    """Raised inside a worker process when a hook exceeds its CPU or memory limit"""
+    pass
+
+
+# Hook modules imported by this pool worker: hook name -> (file mtime_ns, module)
+_worker_modules: Dict[str, Tuple[int, Any]] = {}
+
+
+def _process_worker_init(preload: Tuple[Tuple[str, str], ...]):
+    """Pool initializer: install the CPU limit handler and import hook modules once"""
+    if hasattr(signal, 'SIGXCPU'):
+        signal.signal(signal.SIGXCPU, _raise_cpu_limit_exceeded)
+    
+    for hook_name, file_path in preload:
+        try:
+            _load_worker_module(hook_name, file_path)
+        except Exception:
+            pass  # Reported when the hook actually runs
+
+
+def _raise_cpu_limit_exceeded(signum, frame):
+    raise HookResourceLimitError("CPU time limit exceeded")
+
+
+def _raise_deadline_exceeded(signum, frame):
+    raise HookResourceLimitError("Execution timeout exceeded")
+
+
+@contextmanager
+def _worker_deadline(seconds: Optional[float]):
+    """Interrupt a hook blocked past its timeout, so it gives its worker back
+    
+    Hooks run on the worker's main thread, where SIGALRM is delivered; a hook
+    stuck where signals are not checked is left to ProcessHookRunner, which
+    replaces the pool once the grace period after the deadline is over.
+    """
+    if not seconds or not hasattr(signal, 'setitimer'):
+        yield
+        return
+    
+    previous = signal.signal(signal.SIGALRM, _raise_deadline_exceeded)
+    signal.setitimer(signal.ITIMER_REAL, seconds)
+    try:
+        yield
+    finally:
+        signal.setitimer(signal.ITIMER_REAL, 0)
+        signal.signal(signal.SIGALRM, previous)
+
+
+def _load_worker_module(hook_name: str, file_path: str) -> Any:
+    """Import a hook module in the worker, re-importing when the file changed"""
+    mtime_ns = os.stat(file_path).st_mtime_ns
+    cached = _worker_modules.get(hook_name)
+    if cached and cached[0] == mtime_ns:
+        return cached[1]
+    
+    spec = importlib.util.spec_from_file_location(hook_name, file_path)
+    if spec is None or spec.loader is None:
+        raise HookRegistryError(f"Cannot load spec for {hook_name}")
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    
+    _worker_modules[hook_name] = (mtime_ns, module)
+    return module
+
+
+def _address_space_bytes() -> Optional[int]:
+    try:
+        with open('/proc/self/statm') as statm:
+            return int(statm.read().split()[0]) * os.sysconf('SC_PAGE_SIZE')
+    except (OSError, ValueError, AttributeError):
+        return None
+
+
+@contextmanager
+def _worker_limits(cpu_seconds: Optional[float], memory_mb: Optional[float]):
+    """Temporarily cap this worker's CPU time and address space around one hook call
+    
+    RLIMIT_CPU counts the worker's lifetime CPU time, so the soft limit is set
+    relative to the time already used; exceeding it delivers SIGXCPU, which
+    the initializer turns into HookResourceLimitError. The memory limit caps
+    address space growth and surfaces as MemoryError.
+    """
+    if resource is None:
+        yield
+        return
+    
+    restore = []
+    try:
+        if cpu_seconds and hasattr(resource, 'RLIMIT_CPU'):
+            usage = resource.getrusage(resource.RUSAGE_SELF)
+            soft, hard = resource.getrlimit(resource.RLIMIT_CPU)
+            limit = math.ceil(usage.ru_utime + usage.ru_stime + cpu_seconds)
+            if hard != resource.RLIM_INFINITY:
+                limit = min(limit, hard)
+            resource.setrlimit(resource.RLIMIT_CPU, (limit, hard))
+            restore.append((resource.RLIMIT_CPU, (soft, hard)))
+        
+        current = _address_space_bytes() if memory_mb and hasattr(resource, 'RLIMIT_AS') else None
+        if current is not None:
+            soft, hard = resource.getrlimit(resource.RLIMIT_AS)
+            limit = current + int(memory_mb * 1024 * 1024)
+            if hard != resource.RLIM_INFINITY:
+                limit = min(limit, hard)
+            resource.setrlimit(resource.RLIMIT_AS, (limit, hard))
+            restore.append((resource.RLIMIT_AS, (soft, hard)))
+        
+        yield
+    finally:
+        for limit_type, previous in reversed(restore):
+            resource.setrlimit(limit_type, previous)
+
+
+def _run_in_worker(hook_name: str, file_path: str, trigger: str, data: Dict[str, Any],
+                   cpu_seconds: Optional[float], memory_mb: Optional[float],
+                   timeout: Optional[float] = None) -> Tuple[Any, float, float]:
+    """Pool task: run one hook and return (result, cpu seconds, peak RSS growth in MB)"""
+    with _worker_deadline(timeout):
+        module = _load_worker_module(hook_name, file_path)
+        hook_function = getattr(module, 'process_hook', None) or getattr(module, 'main', None)
+        if hook_function is None:
+            raise HookRegistryError(f"No entry point found in hook {hook_name}")
+        
+        before = resource.getrusage(resource.RUSAGE_SELF) if resource else None
+        with _worker_limits(cpu_seconds, memory_mb):
+            if asyncio.iscoroutinefunction(hook_function):
+                value = asyncio.run(hook_function(trigger, data))
+            else:
+                value = hook_function(trigger, data)
+    
+    if before is None:
+        return value, 0.0, 0.0
+    after = resource.getrusage(resource.RUSAGE_SELF)
+    cpu_seconds_used = (after.ru_utime - before.ru_utime) + (after.ru_stime - before.ru_stime)
+    rss_scale = 1024 * 1024 if sys.platform == 'darwin' else 1024
+    return value, cpu_seconds_used, max(0, after.ru_maxrss - before.ru_maxrss) / rss_scale
+
+
+def _worker_ping() -> int:
+    return os.getpid()
+
+
+class ProcessHookRunner:
+    """Runs `# @isolation: process` hooks in a warm ProcessPoolExecutor
+    
+    Workers import the process-isolated hook modules in their initializer and
+    keep them across calls, so a CPU-heavy hook runs on its own core without
+    holding the registry's GIL. Each call is bounded by the hook's CPU and
+    memory limits; the CPU limit defaults to the execution timeout so a
+    runaway hook cannot keep a worker busy indefinitely.
+    
+    A timed-out call is interrupted inside its worker as well. If the worker
+    has not let go `timeout_grace` seconds later it is unresponsive, and the
+    whole pool is terminated and replaced; other calls still running on it
+    fail as if their worker had died.
+    """
+    
+    timeout_grace = 1.0
+    
+    def __init__(self, max_workers: int = None):
+        self.max_workers = max_workers or os.cpu_count() or 1
+        self._pool: Optional[ProcessPoolExecutor] = None
+        self._preload: Tuple[Tuple[str, str], ...] = ()
+        self._lock = threading.Lock()
+    
+    def preload(self, hooks: List[HookMetadata]):
+        """Set the hook modules new workers import, warming the pool if needed
+        
+        Running workers are kept; they import any hook they have not seen yet
+        on first use (and re-import hooks whose file changed).
+        """
+        preload = tuple(sorted((metadata.name, metadata.file_path) for metadata in hooks))
+        with self._lock:
+            self._preload = preload
+        if preload:
+            self.warm_up()
+    
+    def warm_up(self):
+        """Start all workers now instead of on the first execution"""
+        pool = self._ensure_pool()
+        for _ in range(self.max_workers):
+            pool.submit(_worker_ping)
+    
+    def run(self, metadata: HookMetadata, trigger: str, data: Dict[str, Any],
+            timeout: float = 30.0) -> Tuple[Any, float, float]:
+        """Run a hook in a worker and wait for (result, cpu seconds, memory MB)"""
+        pool = self._ensure_pool()
+        cpu_seconds = metadata.cpu_limit_seconds or timeout
+        try:
+            future = pool.submit(
+                _run_in_worker, metadata.name, metadata.file_path, trigger, data,
+                cpu_seconds, metadata.memory_limit_mb, timeout
+            )
+            return future.result(timeout=timeout)
+        except FutureTimeoutError:
+            if not future.cancel():
+                try:
+                    future.exception(timeout=self.timeout_grace)
+                except FutureTimeoutError:
+                    self._discard_pool(pool, terminate=True)
+            raise HookRegistryError(f"Hook {metadata.name} timed out after {timeout}s")
+        except BrokenProcessPool:
+            self._discard_pool(pool)
+            raise HookRegistryError(f"Worker process running hook {metadata.name} died")
+    
+    def is_running(self) -> bool:
+        return self._pool is not None
+    
+    def shutdown(self):
+        """Stop all workers, cancelling executions that have not started"""
+        with self._lock:
+            pool, self._pool = self._pool, None
+        if pool is not None:
+            pool.shutdown(wait=True, cancel_futures=True)
+    
+    def _ensure_pool(self) -> ProcessPoolExecutor:
+        with self._lock:
+            if self._pool is None:
+                # forkserver avoids forking the registry's threads into workers
+                methods = multiprocessing.get_all_start_methods()
+                context = multiprocessing.get_context(
+                    'forkserver' if 'forkserver' in methods else 'spawn'
+                )
+                self._pool = ProcessPoolExecutor(
+                    max_workers=self.max_workers, mp_context=context,
+                    initializer=_process_worker_init, initargs=(self._preload,)
+                )
+            return self._pool
+    
+    def _discard_pool(self, pool: ProcessPoolExecutor, terminate: bool = False):
+        with self._lock:
+            if self._pool is pool:
+                self._pool = None
+        if terminate:
+            # ProcessPoolExecutor has no public way to stop a busy worker
+            for process in list((getattr(pool, '_processes', None) or {}).values()):
+                process.terminate()
+        pool.shutdown(wait=False, cancel_futures=True)
+
+
 class HookRegistry:
     """Comprehensive hook registry system"""
     
@@ -456,6 +1407,7 @@ class HookRegistry:
         self.trigger_mappings: Dict[str, List[str]] = defaultdict(list)
         self.execution_queue = PriorityQueue()
         self.dependency_resolver = DependencyResolver()
+        self.metadata_scanner = HookMetadataScanner()
         self.lsp_bridge = LSPHookBridge(self)
         self.performance_monitor = PerformanceMonitor()
         
@@ -466,12 +1418,20 @@ class HookRegistry:
         
         # Execution management
         self.executor = ThreadPoolExecutor(max_workers=4)
+        self.async_runner = AsyncHookRunner()
+        self.process_runner = ProcessHookRunner()
+        self.resource_sampler = ResourceSampler(enabled=True)
         self.execution_lock = threading.RLock()
         self.active_executions: Dict[str, ExecutionContext] = {}
+        self.result_futures: Dict[str, Future] = {}  # queued executions awaiting a worker
+        self.trigger_deadlines: Dict[str, float] = {}  # per-trigger deadline in seconds
+        self._execution_counter = itertools.count(1)
+        self._plan_cache = None  # created on first use, see plan_cache
         
         # System state
         self.initialized = False
         self.metadata_cache_file = self.hooks_directory / "hook_registry_cache.json"
+        self.discovery_index: Dict[str, Dict[str, Any]] = {}  # file path -> stat/hash fingerprint
         
         # Initialize system
         self._initialize_system()
@@ -502,138 +1462,77 @@ class HookRegistry:
     def _discover_hooks(self):
         """Discover all Python hooks in the hooks directory"""
         hook_files = list(self.hooks_directory.glob("*.py"))
+        seen_paths = set()
+        index_before = {path: dict(entry) for path, entry in self.discovery_index.items()}
         
         for hook_file in hook_files:
             if hook_file.name.startswith('__') or hook_file.name == 'hook_registry.py':
                 continue
             
             try:
-                metadata = self._extract_hook_metadata(hook_file)
+                seen_paths.add(str(hook_file))
+                metadata = self._discover_hook_file(hook_file)
                 if metadata:
-                    self.register_hook(metadata)
+                    self.register_hook(metadata, persist=False)
             except Exception as e:
                 print(f"Failed to discover hook {hook_file.name}: {e}")
+        
+        # Drop index entries for hook files that no longer exist
+        for stale_path in set(self.discovery_index) - seen_paths:
+            del self.discovery_index[stale_path]
+        
+        # Persist once for the whole discovery pass, and only if something changed
+        if self.discovery_index != index_before:
+            self._save_metadata_cache()
     
-    def _extract_hook_metadata(self, hook_file: Path) -> Optional[HookMetadata]:
+    def _discover_hook_file(self, hook_file: Path) -> Optional[HookMetadata]:
+        """Get metadata for a hook file, reusing the discovery index when unchanged"""
+        file_key = str(hook_file)
+        stat = hook_file.stat()
+        entry = self.discovery_index.get(file_key)
+        cached = self.hooks.get(hook_file.stem)
+        
+        if cached is not None and cached.file_path != file_key:
+            cached = None
+        
+        # Fast path: same mtime and size, never touch the file contents
+        if (entry and cached is not None and
+                entry.get('mtime_ns') == stat.st_mtime_ns and entry.get('size') == stat.st_size):
+            return cached
+        
+        raw = hook_file.read_bytes()
+        content_hash = hashlib.sha256(raw).hexdigest()
+        
+        # Touched but not modified (checkout, copy): refresh the fingerprint only
+        if entry and cached is not None and entry.get('content_hash') == content_hash:
+            metadata = cached
+        else:
+            metadata = self._extract_hook_metadata(hook_file, raw.decode('utf-8'))
+            if metadata is None:
+                return None
+        
+        self.discovery_index[file_key] = {
+            'mtime_ns': stat.st_mtime_ns,
+            'size': stat.st_size,
+            'content_hash': content_hash
+        }
+        return metadata
+    
+    def _extract_hook_metadata(self, hook_file: Path, content: str = None) -> Optional[HookMetadata]:
         """Extract metadata from a hook file"""
         try:
             # Read the file
-            content = hook_file.read_text(encoding='utf-8')
-            
-            # Extract docstring
-            module_doc = self._extract_module_docstring(content)
-            
-            # Create basic metadata
-            metadata = HookMetadata(
-                name=hook_file.stem,
-                file_path=str(hook_file),
-                description=module_doc.get('description', ''),
-                author=module_doc.get('author', ''),
-                version=module_doc.get('version', '1.0.0')
-            )
-            
-            # Parse metadata from docstring or comments
-            metadata = self._parse_hook_metadata(content, metadata)
+            if content is None:
+                content = hook_file.read_text(encoding='utf-8')
             
-            # Analyze code for capabilities
-            metadata = self._analyze_hook_capabilities(content, metadata)
-            
-            return metadata
+            # Docstring, directives and capabilities in a single scan
+            return self.metadata_scanner.scan(hook_file.stem, str(hook_file), content)
             
         except Exception as e:
             print(f"Failed to extract metadata from {hook_file.name}: {e}")
             return None
     
-    def _extract_module_docstring(self, content: str) -> Dict[str, str]:
-        """Extract module docstring and parse metadata"""
-        result = {'description': '', 'author': '', 'version': '1.0.0'}
-        
-        # Find module docstring
-        match = re.search(r'"""(.*?)"""', content, re.DOTALL)
-        if not match:
-            match = re.search(r"'''(.*?)'''", content, re.DOTALL)
-        
-        if match:
-            docstring = match.group(1).strip()
-            lines = docstring.split('\n')
-            
-            if lines:
-                result['description'] = lines[0].strip()
-            
-            # Look for author and version in docstring
-            for line in lines:
-                if line.strip().lower().startswith('author:'):
-                    result['author'] = line.split(':', 1)[1].strip()
-                elif line.strip().lower().startswith('version:'):
-                    result['version'] = line.split(':', 1)[1].strip()
-        
-        return result
-    
-    def _parse_hook_metadata(self, content: str, metadata: HookMetadata) -> HookMetadata:
-        """Parse metadata from hook content"""
-        # Look for metadata comments
-        metadata_patterns = {
-            'priority': r'#\s*@priority:\s*(\w+)',
-            'triggers': r'#\s*@triggers:\s*(.+)',
-            'dependencies': r'#\s*@depends:\s*(.+)',
-            'provides': r'#\s*@provides:\s*(.+)',
-            'tags': r'#\s*@tags:\s*(.+)',
-            'lsp_compatible': r'#\s*@lsp:\s*(true|false)',
-            'hot_reload': r'#\s*@hot_reload:\s*(true|false)'
-        }
-        
-        for key, pattern in metadata_patterns.items():
-            matches = re.findall(pattern, content, re.IGNORECASE)
-            if matches:
-                value = matches[0].strip()
-                
-                if key == 'priority':
-                    try:
-                        metadata.priority = HookPriority[value.upper()]
-                    except KeyError:
-                        pass
-                elif key in ['triggers', 'dependencies', 'provides', 'tags']:
-                    setattr(metadata, key, [item.strip() for item in value.split(',')])
-                elif key in ['lsp_compatible', 'hot_reload']:
-                    setattr(metadata, key, value.lower() == 'true')
-        
-        return metadata
-    
-    def _analyze_hook_capabilities(self, content: str, metadata: HookMetadata) -> HookMetadata:
-        """Analyze hook code to determine capabilities"""
-        # Check for function patterns
-        if 'def process_hook(' in content or 'def main(' in content:
-            if 'process_hook' not in metadata.provides:
-                metadata.provides.append('hook_processing')
-        
-        # Check for async patterns
-        if 'async def' in content or 'await ' in content:
-            metadata.tags.append('async')
-        
-        # Check for LSP patterns
-        lsp_indicators = ['lsp', 'language_server', 'completion', 'hover', 'definition']
-        if any(indicator in content.lower() for indicator in lsp_indicators):
-            metadata.lsp_compatible = True
-            metadata.tags.append('lsp')
-        
-        # Check for trigger patterns
-        trigger_patterns = {
-            TriggerType.USER_PROMPT: ['user_prompt', 'user_input', 'prompt'],
-            TriggerType.CLAUDE_RESPONSE: ['claude_response', 'ai_response', 'response'],
-            TriggerType.AGENT_ACTIVATION: ['agent_activation', 'agent', '@agent'],
-            TriggerType.MCP_REQUEST: ['mcp_request', 'mcp', 'service'],
-            TriggerType.FILE_CHANGE: ['file_change', 'file_modified', 'watch'],
-            TriggerType.SYSTEM_EVENT: ['system_event', 'system', 'event']
-        }
-        
-        for trigger_type, keywords in trigger_patterns.items():
-            if any(keyword in content.lower() for keyword in keywords):
-                if trigger_type.value not in metadata.triggers:
-                    metadata.triggers.append(trigger_type.value)
-        
-        return metadata
-    
-    def register_hook(self, metadata: HookMetadata) -> bool:
+    def register_hook(self, metadata: HookMetadata, persist: bool = True) -> bool:
         """Register a hook with the registry"""
         try:
             # Validate metadata
@@ -659,8 +1558,11 @@ class HookRegistry:
                 if metadata.name not in self.trigger_mappings[trigger]:
                     self.trigger_mappings[trigger].append(metadata.name)
             
+            self.invalidate_execution_plans(metadata)
+            
             # Save metadata cache
-            self._save_metadata_cache()
+            if persist:
+                self._save_metadata_cache()
             
             print(f"Registered hook: {metadata.name}")
             return True
@@ -677,6 +1579,17 @@ class HookRegistry:
         metadata = self.hooks[hook_name]
         
         try:
+            if metadata.isolation == 'process':
+                # Module-level code only ever runs in the sandboxed workers;
+                # here the source is just checked to compile
+                with open(metadata.file_path, 'rb') as source:
+                    compile(source.read(), metadata.file_path, 'exec')
+                self.loaded_hooks[hook_name] = None
+                metadata.state = HookState.LOADED
+                metadata.updated_at = datetime.now()
+                print(f"Loaded hook: {hook_name} (process isolation)")
+                return True
+            
             # Load the module
             spec = importlib.util.spec_from_file_location(hook_name, metadata.file_path)
             if spec is None or spec.loader is None:
@@ -714,6 +1627,10 @@ class HookRegistry:
         metadata = self.hooks[hook_name]
         metadata.state = HookState.ACTIVE
         metadata.updated_at = datetime.now()
+        self.invalidate_execution_plans()
+        
+        if metadata.isolation == 'process':
+            self._refresh_process_hooks()
         
         print(f"Activated hook: {hook_name}")
         return True
@@ -726,6 +1643,7 @@ class HookRegistry:
         metadata = self.hooks[hook_name]
         metadata.state = HookState.DISABLED
         metadata.updated_at = datetime.now()
+        self.invalidate_execution_plans()
         
         # Remove from active executions if running
         with self.execution_lock:
@@ -792,15 +1710,94 @@ class HookRegistry:
             print(f"Failed to hot reload hook {hook_name}: {e}")
             if hook_name in self.hooks:
                 self.hooks[hook_name].state = HookState.ERROR
+        
+        finally:
+            self.invalidate_execution_plans(self.hooks.get(hook_name))
+    
+    @property
+    def plan_cache(self):
+        """Execution plan cache, shared with HookPrioritySystem"""
+        if self._plan_cache is None:
+            # Deferred import: hook_priority_system imports this module
+            try:
+                from .hook_priority_system import ExecutionPlanCache
+            except ImportError:
+                from hook_priority_system import ExecutionPlanCache
+            self._plan_cache = ExecutionPlanCache(self)
+        return self._plan_cache
+    
+    def get_execution_plan(self, trigger: str):
+        """Get the cached dependency plan for a trigger's active hooks"""
+        return self.plan_cache.get_plan(trigger)
+    
+    def _refresh_process_hooks(self):
+        """Preload active process-isolated hooks into the worker pool"""
+        self.process_runner.preload([
+            metadata for metadata in self.hooks.values()
+            if metadata.isolation == 'process' and metadata.state == HookState.ACTIVE
+        ])
+    
+    def invalidate_execution_plans(self, metadata: HookMetadata = None):
+        """Drop compiled execution plans after hook or activation changes
+        
+        Pass the hook's metadata when its dependencies may have changed so the
+        dependency graph is updated; activation changes only need the call.
+        """
+        if self._plan_cache is not None:
+            if metadata is None:
+                self._plan_cache.invalidate()
+            else:
+                self._plan_cache.update_hook(metadata)
     
     def execute_hook(self, hook_name: str, trigger: str, data: Dict[str, Any], 
                     priority: HookPriority = None, timeout: float = 30.0) -> str:
         """Execute a hook with the given parameters"""
+        context = self._create_execution_context(hook_name, trigger, data, priority, timeout)
+        self._submit_contexts([context])
+        return context.execution_id
+    
+    def execute_by_trigger(self, trigger: str, data: Dict[str, Any], 
+                          priority: HookPriority = None, timeout: float = 30.0,
+                          deadline: float = None) -> TriggerExecution:
+        """Execute all hooks registered for a trigger
+        
+        Hooks run in the order of the trigger's cached execution plan: each
+        dependency level is queued as one batch once the previous level has
+        finished. `deadline` (or the trigger's entry in `trigger_deadlines`)
+        bounds the whole fan-out in seconds and caps each hook's timeout.
+        """
+        if deadline is None:
+            deadline = self.trigger_deadlines.get(trigger)
+        if deadline is not None:
+            timeout = min(timeout, deadline)
+        
+        levels = []
+        for level in self.get_execution_plan(trigger).levels:
+            contexts = []
+            for hook_name in level:
+                try:
+                    context = self._create_execution_context(
+                        hook_name, trigger, data, priority, timeout
+                    )
+                    context.dependencies_resolved = True
+                    contexts.append(context)
+                except Exception as e:
+                    print(f"Failed to execute hook {hook_name} for trigger {trigger}: {e}")
+            if contexts:
+                levels.append(contexts)
+        
+        futures = self._submit_levels(levels)
+        return TriggerExecution(trigger, [c for level in levels for c in level], futures, deadline)
+    
+    def _create_execution_context(self, hook_name: str, trigger: str, data: Dict[str, Any],
+                                  priority: HookPriority = None,
+                                  timeout: float = 30.0) -> ExecutionContext:
+        """Validate a hook and build its execution context"""
         if hook_name not in self.hooks or self.hooks[hook_name].state != HookState.ACTIVE:
             raise HookRegistryError(f"Hook {hook_name} is not active")
         
         metadata = self.hooks[hook_name]
-        execution_id = f"{hook_name}_{int(time.time() * 1000)}"
+        execution_id = f"{hook_name}_{int(time.time() * 1000)}_{next(self._execution_counter)}"
         
         # Determine priority
         if priority is None:
@@ -817,60 +1814,79 @@ class HookRegistry:
             timeout_seconds=timeout
         )
         
-        # Resolve dependencies
-        try:
-            dependency_order = self.dependency_resolver.resolve_dependencies(hook_name, self.hooks)
-            context.dependencies_resolved = True
-        except HookRegistryError as e:
-            print(f"Dependency resolution failed for {hook_name}: {e}")
-            context.dependencies_resolved = False
-        
-        # Add to execution queue
-        self.execution_queue.put(context)
+        return context
+    
+    def _submit_levels(self, levels: List[List[ExecutionContext]]) -> Dict[str, Future]:
+        """Queue dependency levels in order; returns a result future per execution
         
-        # Execute immediately if possible
-        self._process_execution_queue()
+        Level N+1 is queued from the completion callback of the last execution
+        in level N, so the caller never blocks.
+        """
+        futures = {context.execution_id: Future() for level in levels for context in level}
         
-        return execution_id
+        def release(index: int):
+            if index >= len(levels):
+                return
+            level = levels[index]
+            pending = [len(level)]
+            pending_lock = threading.Lock()
+            
+            def on_done(_future):
+                with pending_lock:
+                    pending[0] -= 1
+                    finished = pending[0] == 0
+                if finished:
+                    release(index + 1)
+            
+            self._submit_contexts(level, futures)
+            for context in level:
+                futures[context.execution_id].add_done_callback(on_done)
+        
+        release(0)
+        return futures
     
-    def execute_by_trigger(self, trigger: str, data: Dict[str, Any], 
-                          priority: HookPriority = None) -> List[str]:
-        """Execute all hooks registered for a trigger"""
-        if trigger not in self.trigger_mappings:
-            return []
+    def _submit_contexts(self, contexts: List[ExecutionContext],
+                         futures: Dict[str, Future] = None) -> Dict[str, Future]:
+        """Queue a batch of contexts and start them; returns a result future per execution"""
+        if futures is None:
+            futures = {context.execution_id: Future() for context in contexts}
+        with self.execution_lock:
+            for context in contexts:
+                self.result_futures[context.execution_id] = futures[context.execution_id]
         
-        execution_ids = []
-        hook_names = self.trigger_mappings[trigger]
+        # Add to execution queue
+        self.execution_queue.put_many(contexts)
         
-        for hook_name in hook_names:
-            if hook_name in self.hooks and self.hooks[hook_name].state == HookState.ACTIVE:
-                try:
-                    execution_id = self.execute_hook(hook_name, trigger, data, priority)
-                    execution_ids.append(execution_id)
-                except Exception as e:
-                    print(f"Failed to execute hook {hook_name} for trigger {trigger}: {e}")
+        # Execute immediately if possible
+        self._process_execution_queue()
         
-        return execution_ids
+        return futures
     
     def _process_execution_queue(self):
         """Process the execution queue"""
-        while not self.execution_queue.empty():
-            context = self.execution_queue.get()
-            
-            if context is None:
-                break
-            
-            # Submit for execution
-            future = self.executor.submit(self._execute_hook_context, context)
+        for context in self.execution_queue.drain():
+            with self.execution_lock:
+                result_future = self.result_futures.pop(context.execution_id, None) or Future()
             
             # Don't wait for completion to allow parallel execution
+            self.executor.submit(self._run_queued_context, context, result_future)
+    
+    def _run_queued_context(self, context: ExecutionContext, result_future: Future):
+        """Worker entry point linking an execution to its result future"""
+        if not result_future.set_running_or_notify_cancel():
+            return  # Cancelled before a worker picked it up
+        
+        try:
+            result_future.set_result(self._execute_hook_context(context))
+        except BaseException as e:
+            result_future.set_exception(e)
     
     def _execute_hook_context(self, context: ExecutionContext) -> Dict[str, Any]:
         """Execute a hook in the given context"""
         hook_name = context.hook_name
-        start_time = time.time()
-        start_memory = self._get_memory_usage()
-        start_cpu = psutil.cpu_percent()
+        sample = self.resource_sampler.start()
+        process_usage = None
+        loop_usage: Dict[str, float] = {}
         
         result = {
             'execution_id': context.execution_id,
@@ -891,34 +1907,37 @@ class HookRegistry:
             if hook_name not in self.loaded_hooks:
                 raise HookRegistryError(f"Hook {hook_name} not loaded")
             
-            hook_module = self.loaded_hooks[hook_name]
-            
-            # Find the hook function
-            hook_function = None
-            if hasattr(hook_module, 'process_hook'):
-                hook_function = hook_module.process_hook
-            elif hasattr(hook_module, 'main'):
-                hook_function = hook_module.main
-            else:
-                raise HookRegistryError(f"No entry point found in hook {hook_name}")
-            
             # Execute with timeout
-            if asyncio.iscoroutinefunction(hook_function):
-                # Async execution
-                loop = asyncio.new_event_loop()
-                asyncio.set_event_loop(loop)
-                try:
-                    result['result'] = loop.run_until_complete(
-                        asyncio.wait_for(
-                            hook_function(context.trigger, context.data),
-                            timeout=context.timeout_seconds
-                        )
-                    )
-                finally:
-                    loop.close()
+            if self.hooks[hook_name].isolation == 'process':
+                # Out-of-process execution in the warm worker pool, which
+                # imports the module and finds its entry point itself
+                value, cpu_seconds, memory_mb = self.process_runner.run(
+                    self.hooks[hook_name], context.trigger, context.data,
+                    timeout=context.timeout_seconds
+                )
+                result['result'] = value
+                process_usage = (cpu_seconds, memory_mb)
             else:
-                # Sync execution
-                result['result'] = hook_function(context.trigger, context.data)
+                hook_module = self.loaded_hooks[hook_name]
+                
+                # Find the hook function
+                if hasattr(hook_module, 'process_hook'):
+                    hook_function = hook_module.process_hook
+                elif hasattr(hook_module, 'main'):
+                    hook_function = hook_module.main
+                else:
+                    raise HookRegistryError(f"No entry point found in hook {hook_name}")
+                
+                if asyncio.iscoroutinefunction(hook_function):
+                    # Async execution on the shared event loop
+                    result['result'] = self.async_runner.run(
+                        hook_function, context.trigger, context.data,
+                        timeout=context.timeout_seconds,
+                        sampler=self.resource_sampler, usage=loop_usage
+                    )
+                else:
+                    # Sync execution
+                    result['result'] = hook_function(context.trigger, context.data)
             
             result['success'] = True
             
@@ -928,7 +1947,7 @@ class HookRegistry:
             metadata.last_executed = datetime.now()
             metadata.average_execution_time = (
                 (metadata.average_execution_time * (metadata.execution_count - 1) + 
-                 (time.time() - start_time) * 1000) / metadata.execution_count
+                 (time.perf_counter_ns() - sample[0]) / 1_000_000) / metadata.execution_count
             )
             metadata.success_rate = (
                 (metadata.success_rate * (metadata.execution_count - 1) + 100) / 
@@ -951,13 +1970,23 @@ class HookRegistry:
         
         finally:
             # Calculate metrics
-            end_time = time.time()
-            end_memory = self._get_memory_usage()
-            end_cpu = psutil.cpu_percent()
-            
-            result['execution_time_ms'] = (end_time - start_time) * 1000
-            result['memory_usage_mb'] = max(0, end_memory - start_memory)
-            result['cpu_percent'] = max(0, end_cpu - start_cpu)
+            (result['execution_time_ms'],
+             result['memory_usage_mb'],
+             result['cpu_percent']) = self.resource_sampler.finish(sample)
+            
+            if process_usage and self.resource_sampler.enabled:
+                # Report the worker's usage rather than the registry's
+                cpu_seconds, result['memory_usage_mb'] = process_usage
+                result['cpu_percent'] = (
+                    cpu_seconds * 100_000 / result['execution_time_ms']
+                    if result['execution_time_ms'] > 0 else 0.0
+                )
+            elif 'cpu_seconds' in loop_usage:
+                # Coroutines run on the loop thread while this one waits
+                result['cpu_percent'] = (
+                    loop_usage['cpu_seconds'] * 100_000 / result['execution_time_ms']
+                    if result['execution_time_ms'] > 0 else 0.0
+                )
             
             # Record performance metrics
             metrics = PerformanceMetrics(
@@ -1055,7 +2084,8 @@ class HookRegistry:
             'hot_reload_enabled': self.hot_reload_enabled,
             'lsp_endpoints': len(self.lsp_bridge.lsp_endpoints),
             'active_lsp_connections': len(self.lsp_bridge.active_connections),
-            'queue_size': self.execution_queue.qsize()
+            'queue_size': self.execution_queue.qsize(),
+            'execution_plans': self._plan_cache.get_stats() if self._plan_cache else {}
         }
     
     def _setup_hot_reload(self):
@@ -1107,6 +2137,12 @@ class HookRegistry:
                 metadata = HookMetadata(**hook_data)
                 self.hooks[metadata.name] = metadata
             
+            # Fingerprints only vouch for metadata parsed by this scanner
+            if cache_data.get('scanner_version') == HookMetadataScanner.VERSION:
+                self.discovery_index = cache_data.get('discovery_index', {})
+            else:
+                self.discovery_index = {}
+            
             print(f"Loaded {len(self.hooks)} hooks from cache")
             
         except Exception as e:
@@ -1117,8 +2153,10 @@ class HookRegistry:
         try:
             cache_data = {
                 'timestamp': datetime.now().isoformat(),
-                'version': '1.0.0',
-                'hooks': []
+                'version': '1.1.0',
+                'scanner_version': HookMetadataScanner.VERSION,
+                'hooks': [],
+                'discovery_index': self.discovery_index
             }
             
             for metadata in self.hooks.values():
@@ -1141,13 +2179,15 @@ class HookRegistry:
         except Exception as e:
             print(f"Failed to save metadata cache: {e}")
     
-    def _get_memory_usage(self) -> float:
-        """Get current memory usage in MB"""
-        try:
-            process = psutil.Process()
-            return process.memory_info().rss / 1024 / 1024
-        except:
-            return 0.0
+    def shutdown(self):
+        """Stop file watching, the worker pools and the async hook loop"""
+        if self.file_observer.is_alive():
+            self.file_observer.stop()
+            self.file_observer.join()
+        
+        self.executor.shutdown(wait=True)
+        self.async_runner.shutdown()
+        self.process_runner.shutdown()
     
     def __del__(self):
         """Cleanup resources"""
@@ -1158,6 +2198,12 @@ class HookRegistry:
             
             if hasattr(self, 'executor'):
                 self.executor.shutdown(wait=True)
+            
+            if hasattr(self, 'async_runner'):
+                self.async_runner.shutdown()
+            
+            if hasattr(self, 'process_runner'):
+                self.process_runner.shutdown()
         except:
             pass
 
@@ -1181,7 +2227,15 @@ __all__ = [
     'HookState',
     'TriggerType',
     'ExecutionContext',
+    'TriggerExecution',
     'PerformanceMetrics',
     'HookRegistryError',
+    'HookMetadataScanner',
+    'LatencyHistogram',
+    'MetricsRingBuffer',
+    'ResourceSampler',
+    'AsyncHookRunner',
+    'ProcessHookRunner',
+    'HookResourceLimitError',
     'get_hook_registry'
 ]
\ No newline at end of file
@@ -347,14 +347,27 @@ class HookRegistryAPI:
             if priority:
                 priority = HookPriority[priority.upper()]
             
-            execution_ids = self.registry.execute_by_trigger(trigger, hook_data, priority)
+            execution = self.registry.execute_by_trigger(
+                trigger, hook_data, priority, deadline=data.get('deadline')
+            )
+            execution_ids = execution.execution_ids
             
-            return jsonify({
+            response = {
                 'message': f'Executed {len(execution_ids)} hooks for trigger {trigger}',
                 'trigger': trigger,
                 'execution_ids': execution_ids,
                 'hooks_executed': len(execution_ids)
-            })
+            }
+            
+            # Optionally block until the hooks finish (bounded by the deadline)
+            if data.get('wait'):
+                response['results'] = [
+                    {key: result.get(key) for key in ('execution_id', 'hook_name', 'success',
+                                                      'error', 'execution_time_ms')}
+                    for result in execution.as_completed()
+                ]
+            
+            return jsonify(response)
             
         except Exception as e:
             return jsonify({'error': f'Execution failed: {str(e)}'}), 400
@@ -624,6 +637,7 @@ class HookRegistryAPI:
             'hot_reload_enabled': self.registry.hot_reload_enabled,
             'max_workers': self.registry.executor._max_workers,
             'performance_monitoring': self.registry.performance_monitor.monitoring_active,
+            'resource_sampling': self.registry.resource_sampler.enabled,
             'lsp_bridge_active': len(self.registry.lsp_bridge.active_connections) > 0,
             'cache_file': str(self.registry.metadata_cache_file)
         }
@@ -652,6 +666,11 @@ class HookRegistryAPI:
             self.registry.performance_monitor.monitoring_active = config['performance_monitoring']
             updated.append('performance_monitoring')
         
+        # Update per-execution resource sampling
+        if 'resource_sampling' in config:
+            self.registry.resource_sampler.enabled = bool(config['resource_sampling'])
+            updated.append('resource_sampling')
+        
         return jsonify({
             'message': 'Configuration updated',
             'updated_settings': updated,
@@ -712,12 +731,11 @@ class HookRegistryAPI:
         # Performance optimizations
         if optimization_type in ['standard', 'performance']:
             # Clear old performance data
-            for hook_name in self.registry.hooks.keys():
-                history = self.registry.performance_monitor.metrics_history[hook_name]
-                if len(history) > 100:  # Keep only last 100 records
-                    while len(history) > 100:
-                        history.popleft()
-                    optimizations_applied.append(f'Trimmed performance history for {hook_name}')
+            monitor = self.registry.performance_monitor
+            with monitor.lock:
+                for hook_name, history in monitor.metrics_history.items():
+                    if history.trim(100):  # Keep only last 100 records
+                        optimizations_applied.append(f'Trimmed performance history for {hook_name}')
         
         # Memory optimizations
         if optimization_type in ['standard', 'memory']:
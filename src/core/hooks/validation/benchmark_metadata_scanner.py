@@ -0,0 +1,168 @@
+#!/usr/bin/env python3
+"""
+Hook Metadata Scanner Microbenchmark
+Compares HookMetadataScanner against the previous multi-pass extraction
+(one regex per directive, one lowercase copy per trigger type) and checks
+that both produce the same HookMetadata.
+
+Usage:
+    python benchmark_metadata_scanner.py --hooks 500 --rounds 5
+"""
+
+import re
+import sys
+import time
+import shutil
+import tempfile
+import statistics
+from dataclasses import asdict
+from pathlib import Path
+from typing import Dict, List, Tuple
+
+sys.path.insert(0, str(Path(__file__).parent.parent / "config"))
+sys.path.insert(0, str(Path(__file__).parent))
+
+from hook_registry import HookMetadata, HookMetadataScanner, HookPriority, TriggerType
+from benchmark_hook_discovery import generate_hook_corpus
+
+
+def legacy_extract_metadata(name: str, file_path: str, content: str) -> HookMetadata:
+    """Multi-pass extraction as implemented before HookMetadataScanner
+
+    The @hot_reload directive is mapped onto hot_reload_enabled here, matching
+    the scanner; the old code set an unused `hot_reload` attribute instead.
+    """
+    result = {'description': '', 'author': '', 'version': '1.0.0'}
+    match = re.search(r'"""(.*?)"""', content, re.DOTALL)
+    if not match:
+        match = re.search(r"'''(.*?)'''", content, re.DOTALL)
+    if match:
+        lines = match.group(1).strip().split('\n')
+        result['description'] = lines[0].strip()
+        for line in lines:
+            if line.strip().lower().startswith('author:'):
+                result['author'] = line.split(':', 1)[1].strip()
+            elif line.strip().lower().startswith('version:'):
+                result['version'] = line.split(':', 1)[1].strip()
+
+    metadata = HookMetadata(name=name, file_path=file_path, description=result['description'],
+                            author=result['author'], version=result['version'])
+
+    metadata_patterns = {
+        'priority': r'#\s*@priority:\s*(\w+)',
+        'triggers': r'#\s*@triggers:\s*(.+)',
+        'dependencies': r'#\s*@depends:\s*(.+)',
+        'provides': r'#\s*@provides:\s*(.+)',
+        'tags': r'#\s*@tags:\s*(.+)',
+        'lsp_compatible': r'#\s*@lsp:\s*(true|false)',
+        'hot_reload_enabled': r'#\s*@hot_reload:\s*(true|false)'
+    }
+    for key, pattern in metadata_patterns.items():
+        matches = re.findall(pattern, content, re.IGNORECASE)
+        if matches:
+            value = matches[0].strip()
+            if key == 'priority':
+                try:
+                    metadata.priority = HookPriority[value.upper()]
+                except KeyError:
+                    pass
+            elif key in ['triggers', 'dependencies', 'provides', 'tags']:
+                setattr(metadata, key, [item.strip() for item in value.split(',')])
+            else:
+                setattr(metadata, key, value.lower() == 'true')
+
+    if 'def process_hook(' in content or 'def main(' in content:
+        if 'process_hook' not in metadata.provides:
+            metadata.provides.append('hook_processing')
+    if 'async def' in content or 'await ' in content:
+        metadata.tags.append('async')
+    lsp_indicators = ['lsp', 'language_server', 'completion', 'hover', 'definition']
+    if any(indicator in content.lower() for indicator in lsp_indicators):
+        metadata.lsp_compatible = True
+        metadata.tags.append('lsp')
+    trigger_patterns = {
+        TriggerType.USER_PROMPT: ['user_prompt', 'user_input', 'prompt'],
+        TriggerType.CLAUDE_RESPONSE: ['claude_response', 'ai_response', 'response'],
+        TriggerType.AGENT_ACTIVATION: ['agent_activation', 'agent', '@agent'],
+        TriggerType.MCP_REQUEST: ['mcp_request', 'mcp', 'service'],
+        TriggerType.FILE_CHANGE: ['file_change', 'file_modified', 'watch'],
+        TriggerType.SYSTEM_EVENT: ['system_event', 'system', 'event']
+    }
+    for trigger_type, keywords in trigger_patterns.items():
+        if any(keyword in content.lower() for keyword in keywords):
+            if trigger_type.value not in metadata.triggers:
+                metadata.triggers.append(trigger_type.value)
+
+    return metadata
+
+
+def _comparable(metadata: HookMetadata) -> Dict:
+    data = asdict(metadata)
+    for volatile in ('created_at', 'updated_at'):
+        data.pop(volatile)
+    return data
+
+
+def _time_extraction(extract, corpus: List[Tuple[str, str, str]], rounds: int) -> float:
+    timings = []
+    for _ in range(rounds):
+        start = time.perf_counter()
+        for name, file_path, content in corpus:
+            extract(name, file_path, content)
+        timings.append((time.perf_counter() - start) * 1000)
+    return statistics.median(timings)
+
+
+def run_benchmark(hook_count: int = 500, rounds: int = 5) -> Dict[str, float]:
+    """Time legacy and single-pass extraction over a generated corpus"""
+    work_dir = Path(tempfile.mkdtemp(prefix="metadata_scanner_bench_"))
+
+    try:
+        corpus = [
+            (hook_file.stem, str(hook_file), hook_file.read_text(encoding='utf-8'))
+            for hook_file in generate_hook_corpus(work_dir, hook_count)
+        ]
+    finally:
+        shutil.rmtree(work_dir, ignore_errors=True)
+
+    scanner = HookMetadataScanner()
+
+    mismatches = [
+        name for name, file_path, content in corpus
+        if _comparable(scanner.scan(name, file_path, content)) !=
+        _comparable(legacy_extract_metadata(name, file_path, content))
+    ]
+
+    legacy_ms = _time_extraction(legacy_extract_metadata, corpus, rounds)
+    scanner_ms = _time_extraction(scanner.scan, corpus, rounds)
+
+    return {
+        'hooks': hook_count,
+        'mismatches': len(mismatches),
+        'legacy_ms': legacy_ms,
+        'scanner_ms': scanner_ms,
+        'speedup': legacy_ms / max(scanner_ms, 1e-6)
+    }
+
+
+def main():
+    """Benchmark entry point"""
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Hook metadata scanner microbenchmark")
+    parser.add_argument('--hooks', type=int, default=500, help='Number of generated hook files')
+    parser.add_argument('--rounds', type=int, default=5, help='Timing rounds')
+    args = parser.parse_args()
+
+    results = run_benchmark(args.hooks, args.rounds)
+
+    print(f"Metadata scanner benchmark ({results['hooks']} hooks)")
+    print("=" * 50)
+    print(f"Legacy multi-pass:   {results['legacy_ms']:10.2f} ms")
+    print(f"Single-pass scanner: {results['scanner_ms']:10.2f} ms")
+    print(f"Speedup:             {results['speedup']:10.1f}x")
+    print(f"Metadata mismatches: {results['mismatches']:10d}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,157 @@
+#!/usr/bin/env python3
+"""
+Execution Plan Compilation Benchmark
+Compares rebuilding the dependency graph and sorting it on every lookup
+against ExecutionPlanCache, which keeps an incrementally ordered graph and
+memoizes plans per (trigger, active hook set).
+
+Usage:
+    python benchmark_plan_compilation.py --hooks 1000 2000 5000 --rounds 5
+"""
+
+import sys
+import time
+import random
+import statistics
+from pathlib import Path
+from types import SimpleNamespace
+from typing import Dict, List
+
+sys.path.insert(0, str(Path(__file__).parent.parent / "config"))
+
+from hook_registry import HookMetadata, HookState
+from hook_priority_system import ExecutionPlanCache, TopologicalSorter
+
+
+TRIGGERS = ['user_prompt', 'claude_response', 'agent_activation', 'mcp_request',
+            'file_change', 'system_event', 'session_start', 'session_end',
+            'tool_use', 'notification']
+
+
+def generate_registry(hook_count: int, seed: int = 7) -> SimpleNamespace:
+    """Build a registry stand-in with a random dependency DAG across triggers"""
+    rng = random.Random(seed)
+    hooks = {}
+    trigger_mappings = {trigger: [] for trigger in TRIGGERS}
+
+    for index in range(hook_count):
+        name = f"hook_{index:05d}"
+        dependencies = []
+        if index:
+            for _ in range(rng.randint(0, 3)):
+                target = rng.randrange(max(0, index - 50), index)
+                dependencies.append(f"hook_{target:05d}" if rng.random() < 0.5 else f"capability_{target}")
+        triggers = rng.sample(TRIGGERS, rng.randint(1, 2))
+
+        hooks[name] = HookMetadata(
+            name=name,
+            file_path=f"/hooks/{name}.py",
+            dependencies=dependencies,
+            provides=[f"capability_{index}"],
+            triggers=triggers,
+            tags=['validation'] if index % 17 == 0 else [],
+            state=HookState.ACTIVE
+        )
+        for trigger in triggers:
+            trigger_mappings[trigger].append(name)
+
+    return SimpleNamespace(hooks=hooks, trigger_mappings=trigger_mappings)
+
+
+def _median_ms(operation, rounds: int) -> float:
+    timings = []
+    for _ in range(rounds):
+        start = time.perf_counter()
+        operation()
+        timings.append((time.perf_counter() - start) * 1000)
+    return statistics.median(timings)
+
+
+def run_benchmark(hook_count: int = 1000, rounds: int = 5) -> Dict[str, float]:
+    """Time legacy and incremental plan compilation for one registry size"""
+    registry = generate_registry(hook_count)
+    sorter = TopologicalSorter()
+    trigger = max(TRIGGERS, key=lambda name: len(registry.trigger_mappings[name]))
+    trigger_hooks = list(registry.trigger_mappings[trigger])
+
+    def legacy_plan():
+        # Fresh graph every time, as calculate_execution_order used to do
+        cache = ExecutionPlanCache(registry)
+        sorter.sort_with_phases(cache.build_graph(trigger_hooks))
+
+    legacy_ms = _median_ms(legacy_plan, rounds)
+
+    cache = ExecutionPlanCache(registry)
+    start = time.perf_counter()
+    cache.build_graph(list(registry.hooks))
+    index_ms = (time.perf_counter() - start) * 1000
+
+    def cold_plan():
+        cache.plans.clear()
+        cache.trigger_plans.clear()
+        cache.get_plan(trigger)
+
+    cold_ms = _median_ms(cold_plan, rounds)
+
+    cache.get_plan(trigger)
+    warm_us = _median_ms(lambda: [cache.get_plan(trigger) for _ in range(1000)], rounds)
+
+    def reactivated_plan():
+        cache.invalidate()
+        cache.get_plan(trigger)
+
+    reactivated_ms = _median_ms(reactivated_plan, rounds)
+
+    # Re-register a hook with changed dependencies (hot reload)
+    rng = random.Random(hook_count)
+    names = list(registry.hooks)
+    update_timings = []
+    for _ in range(max(rounds, 20)):
+        name = rng.choice(names[1:])
+        position = names.index(name)
+        original = registry.hooks[name]
+        changed = HookMetadata(
+            name=name, file_path=original.file_path,
+            dependencies=[rng.choice(names[:position])], provides=original.provides,
+            triggers=original.triggers, state=HookState.ACTIVE
+        )
+        registry.hooks[name] = changed
+        start = time.perf_counter()
+        cache.update_hook(changed)
+        update_timings.append((time.perf_counter() - start) * 1000)
+
+    return {
+        'hooks': hook_count,
+        'trigger_hooks': len(trigger_hooks),
+        'legacy_ms': legacy_ms,
+        'index_ms': index_ms,
+        'cold_ms': cold_ms,
+        'warm_us': warm_us,
+        'reactivated_ms': reactivated_ms,
+        'update_ms': statistics.median(update_timings)
+    }
+
+
+def main():
+    """Benchmark entry point"""
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Execution plan compilation benchmark")
+    parser.add_argument('--hooks', type=int, nargs='+', default=[1000, 2000, 5000],
+                        help='Registry sizes to benchmark')
+    parser.add_argument('--rounds', type=int, default=5, help='Timing rounds')
+    args = parser.parse_args()
+
+    print("Execution plan compilation benchmark")
+    print("=" * 96)
+    print(f"{'hooks':>6} {'trigger':>8} {'legacy ms':>10} {'index ms':>10} {'cold ms':>10} "
+          f"{'warm us':>10} {'reactivate':>11} {'update ms':>10}")
+    for hook_count in args.hooks:
+        results = run_benchmark(hook_count, args.rounds)
+        print(f"{results['hooks']:>6} {results['trigger_hooks']:>8} {results['legacy_ms']:>10.2f} "
+              f"{results['index_ms']:>10.2f} {results['cold_ms']:>10.2f} {results['warm_us']:>10.2f} "
+              f"{results['reactivated_ms']:>11.3f} {results['update_ms']:>10.3f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,738 @@
+#!/usr/bin/env python3
+"""
+Hook Registry Test Suite
+Tests for hook discovery, metadata caching and execution in the hook registry.
+"""
+
+import io
+import asyncio
+import os
+import random
+import signal
+import sys
+import time
+import json
+import threading
+import unittest
+import tempfile
+import shutil
+from contextlib import redirect_stdout
+from datetime import datetime, timedelta
+from pathlib import Path
+from unittest.mock import patch
+
+try:
+    import resource as resource_module
+except ImportError:
+    resource_module = None
+
+sys.path.insert(0, str(Path(__file__).parent.parent / "config"))
+
+from hook_registry import (
+    HookRegistry, HookPriority, HookMetadataScanner, ExecutionContext, ResourceSampler,
+    PerformanceMetrics, PerformanceMonitor, MetricsRingBuffer, LatencyHistogram
+)
+
+
+ASYNC_HOOK = '''"""
+Async hook for registry tests
+"""
+
+# @triggers: user_prompt
+
+import asyncio
+import threading
+import time
+
+
+async def process_hook(trigger, data):
+    await asyncio.sleep(data.get('delay', 0))
+    deadline = time.perf_counter() + data.get('spin', 0)
+    while time.perf_counter() < deadline:
+        pass
+    return {'loop': id(asyncio.get_running_loop()), 'thread': threading.current_thread().name}
+'''
+
+SLOW_HOOK = '''"""
+Slow hook {index} for registry tests
+"""
+
+# @triggers: batch_trigger
+
+import time
+
+
+def process_hook(trigger, data):
+    time.sleep(data.get('delay', 0))
+    return {index}
+'''
+
+SAMPLE_HOOK = '''#!/usr/bin/env python3
+"""
+Sample hook for registry tests
+
+Author: Test Suite
+Version: 2.0.0
+"""
+
+# @priority: high
+# @triggers: user_prompt
+# @tags: sample
+
+
+def process_hook(trigger, data):
+    return {'trigger': trigger, 'echo': data}
+'''
+
+PROCESS_HOOK = '''"""
+Process-isolated hook for registry tests
+"""
+
+# @triggers: isolated_trigger
+# @isolation: process
+# @cpu_limit: 1
+# @memory_limit: 64
+
+import os
+import signal
+import time
+
+os.environ['ISOLATED_HOOK_IMPORTED_IN'] = str(os.getpid())
+
+
+def process_hook(trigger, data):
+    if data.get('ignore_deadline'):
+        signal.pthread_sigmask(signal.SIG_BLOCK, {signal.SIGALRM})
+    if data.get('sleep'):
+        time.sleep(data['sleep'])
+    if data.get('spin'):
+        while True:
+            pass
+    if data.get('allocate_mb'):
+        return len(bytearray(data['allocate_mb'] * 1024 * 1024))
+    return {'pid': os.getpid()}
+'''
+
+PLAN_HOOK = '''"""
+Plan hook {name} for registry tests
+"""
+
+# @triggers: plan_trigger
+# @depends: {depends}
+# @provides: {provides}
+
+import time
+
+
+def process_hook(trigger, data):
+    start = time.monotonic()
+    time.sleep(data.get('delay', 0))
+    return {{'start': start, 'end': time.monotonic()}}
+'''
+
+
+class RegistryTestCase(unittest.TestCase):
+    """Base class creating a registry over a temporary hooks directory"""
+
+    def setUp(self):
+        self.temp_dir = Path(tempfile.mkdtemp())
+        (self.temp_dir / "sample_hook.py").write_text(SAMPLE_HOOK, encoding='utf-8')
+        self.registries = []
+
+    def tearDown(self):
+        for registry in self.registries:
+            registry.shutdown()
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+
+    def create_registry(self) -> HookRegistry:
+        with redirect_stdout(io.StringIO()):
+            registry = HookRegistry(str(self.temp_dir))
+        self.registries.append(registry)
+        return registry
+
+
+class TestDiscoveryIndex(RegistryTestCase):
+    """Test cases for the persistent discovery index"""
+
+    def test_cold_start_builds_index(self):
+        """Discovery records a fingerprint for every hook file"""
+        registry = self.create_registry()
+
+        hook_path = str(self.temp_dir / "sample_hook.py")
+        self.assertIn(hook_path, registry.discovery_index)
+        self.assertIn('content_hash', registry.discovery_index[hook_path])
+
+        metadata = registry.hooks['sample_hook']
+        self.assertEqual(metadata.priority, HookPriority.HIGH)
+        self.assertEqual(metadata.version, '2.0.0')
+        self.assertIn('user_prompt', metadata.triggers)
+
+        cache_data = json.loads(registry.metadata_cache_file.read_text())
+        self.assertIn(hook_path, cache_data['discovery_index'])
+
+    def test_warm_start_skips_parsing(self):
+        """Unchanged hook files are served from the cache without re-parsing"""
+        self.create_registry()
+
+        with patch.object(HookRegistry, '_extract_hook_metadata') as extract:
+            registry = self.create_registry()
+            extract.assert_not_called()
+
+        self.assertEqual(registry.hooks['sample_hook'].priority, HookPriority.HIGH)
+
+    def test_touched_file_with_same_content_is_not_reparsed(self):
+        """A new mtime with identical content only refreshes the fingerprint"""
+        registry = self.create_registry()
+        hook_path = str(self.temp_dir / "sample_hook.py")
+        old_mtime = registry.discovery_index[hook_path]['mtime_ns']
+
+        hook_file = self.temp_dir / "sample_hook.py"
+        hook_file.write_text(SAMPLE_HOOK, encoding='utf-8')
+        os.utime(hook_file, ns=(old_mtime + 10**9, old_mtime + 10**9))
+
+        with patch.object(HookRegistry, '_extract_hook_metadata') as extract:
+            registry = self.create_registry()
+            extract.assert_not_called()
+
+        self.assertEqual(registry.discovery_index[hook_path]['mtime_ns'], old_mtime + 10**9)
+
+    def test_modified_file_is_reparsed(self):
+        """Changed content invalidates the cached metadata"""
+        self.create_registry()
+
+        hook_file = self.temp_dir / "sample_hook.py"
+        hook_file.write_text(SAMPLE_HOOK.replace('@priority: high', '@priority: low'),
+                             encoding='utf-8')
+
+        registry = self.create_registry()
+        self.assertEqual(registry.hooks['sample_hook'].priority, HookPriority.LOW)
+
+    def test_scanner_version_change_reparses_everything(self):
+        """Metadata cached by another scanner version is not trusted"""
+        registry = self.create_registry()
+        cache_data = json.loads(registry.metadata_cache_file.read_text())
+        self.assertEqual(cache_data['scanner_version'], HookMetadataScanner.VERSION)
+
+        cache_data['scanner_version'] = HookMetadataScanner.VERSION - 1
+        registry.metadata_cache_file.write_text(json.dumps(cache_data))
+
+        with patch.object(HookRegistry, '_extract_hook_metadata',
+                          wraps=registry._extract_hook_metadata) as extract:
+            registry = self.create_registry()
+            self.assertEqual(extract.call_count, 1)
+
+        cache_data = json.loads(registry.metadata_cache_file.read_text())
+        self.assertEqual(cache_data['scanner_version'], HookMetadataScanner.VERSION)
+
+    def test_removed_file_is_dropped_from_index(self):
+        """Index entries for deleted hook files are pruned"""
+        self.create_registry()
+        (self.temp_dir / "sample_hook.py").unlink()
+
+        registry = self.create_registry()
+        self.assertNotIn(str(self.temp_dir / "sample_hook.py"), registry.discovery_index)
+
+
+class TestHookMetadataScanner(unittest.TestCase):
+    """Test cases for single-pass metadata extraction"""
+
+    def setUp(self):
+        self.scanner = HookMetadataScanner()
+
+    def test_docstring_and_directives(self):
+        """Docstring fields and @directives are extracted together"""
+        metadata = self.scanner.scan('sample_hook', '/tmp/sample_hook.py', SAMPLE_HOOK)
+
+        self.assertEqual(metadata.description, 'Sample hook for registry tests')
+        self.assertEqual(metadata.author, 'Test Suite')
+        self.assertEqual(metadata.version, '2.0.0')
+        self.assertEqual(metadata.priority, HookPriority.HIGH)
+        self.assertEqual(metadata.triggers[0], 'user_prompt')
+        self.assertEqual(metadata.tags, ['sample'])
+        self.assertIn('hook_processing', metadata.provides)
+
+    def test_first_valid_directive_wins(self):
+        """Invalid directive values fall through to the next occurrence"""
+        content = (
+            "# @priority: -\n"
+            "# @lsp: maybe\n"
+            "# @priority: critical\n"
+            "# @lsp: false\n"
+            "# @hot_reload: false\n"
+        )
+        metadata = self.scanner.scan('h', '/tmp/h.py', content)
+
+        self.assertEqual(metadata.priority, HookPriority.CRITICAL)
+        self.assertFalse(metadata.hot_reload_enabled)
+
+    def test_directives_sharing_a_line(self):
+        """A directive embedded after another on the same line is still found"""
+        content = "# @tags: a, b # @priority: low\n"
+        metadata = self.scanner.scan('h', '/tmp/h.py', content)
+
+        self.assertEqual(metadata.priority, HookPriority.LOW)
+        self.assertEqual(metadata.tags, ['a', 'b # @priority: low'])
+
+    def test_capability_keywords(self):
+        """Async markers, LSP indicators and trigger keywords are detected"""
+        content = (
+            '"""Watches files"""\n'
+            "async def main(event):\n"
+            "    await Hover(event)\n"
+        )
+        metadata = self.scanner.scan('h', '/tmp/h.py', content)
+
+        self.assertIn('async', metadata.tags)
+        self.assertIn('lsp', metadata.tags)
+        self.assertTrue(metadata.lsp_compatible)
+        self.assertEqual(metadata.triggers, ['file_change', 'system_event'])
+
+
+class TestHookExecution(RegistryTestCase):
+    """Test cases for hook execution and resource sampling"""
+
+    def setUp(self):
+        super().setUp()
+        (self.temp_dir / "async_hook.py").write_text(ASYNC_HOOK, encoding='utf-8')
+        self.registry = self.create_registry()
+        with redirect_stdout(io.StringIO()):
+            self.registry.activate_hook('async_hook')
+            self.registry.activate_hook('sample_hook')
+
+    def _context(self, hook_name, data=None, timeout=5.0):
+        return ExecutionContext(
+            hook_name=hook_name, trigger='user_prompt', data=data or {},
+            priority=HookPriority.NORMAL, timestamp=datetime.now(),
+            execution_id=f"{hook_name}_test", timeout_seconds=timeout
+        )
+
+    def test_async_hooks_share_one_event_loop(self):
+        """Coroutine hooks run on the registry's long-lived loop thread"""
+        first = self.registry._execute_hook_context(self._context('async_hook'))
+        second = self.registry._execute_hook_context(self._context('async_hook'))
+
+        self.assertTrue(first['success'], first['error'])
+        self.assertEqual(first['result']['loop'], second['result']['loop'])
+        self.assertEqual(first['result']['thread'], 'hook-registry-async')
+        self.assertTrue(self.registry.async_runner.is_running())
+
+    def test_async_hook_timeout(self):
+        """Async hooks still honour the execution timeout"""
+        result = self.registry._execute_hook_context(
+            self._context('async_hook', {'delay': 1}, timeout=0.05)
+        )
+        self.assertFalse(result['success'])
+
+    def test_async_hook_cpu_is_sampled_on_the_loop_thread(self):
+        """CPU-bound coroutines report the loop thread's CPU, not the idle caller's"""
+        result = self.registry._execute_hook_context(self._context('async_hook', {'spin': 0.2}))
+
+        self.assertTrue(result['success'], result['error'])
+        self.assertGreater(result['cpu_percent'], 50)
+
+    def test_sync_hook_records_metrics(self):
+        """Sync hooks record timing metrics with sampling enabled or disabled"""
+        result = self.registry._execute_hook_context(self._context('sample_hook', {'x': 1}))
+        self.assertTrue(result['success'])
+        self.assertEqual(result['result']['echo'], {'x': 1})
+        self.assertGreater(result['execution_time_ms'], 0)
+
+        self.registry.resource_sampler.enabled = False
+        result = self.registry._execute_hook_context(self._context('sample_hook'))
+        self.assertEqual(result['memory_usage_mb'], 0.0)
+        self.assertEqual(result['cpu_percent'], 0.0)
+
+    def test_resource_sampler_measures_cpu(self):
+        """The sampler reports non-negative CPU and memory deltas"""
+        sampler = ResourceSampler()
+        sample = sampler.start()
+        sum(i * i for i in range(200000))
+        elapsed_ms, memory_mb, cpu_percent = sampler.finish(sample)
+
+        self.assertGreater(elapsed_ms, 0)
+        self.assertGreaterEqual(memory_mb, 0)
+        self.assertGreaterEqual(cpu_percent, 0)
+
+    @unittest.skipUnless(hasattr(resource_module, 'RUSAGE_THREAD'), "needs RUSAGE_THREAD")
+    def test_resource_sampler_ignores_other_threads(self):
+        """CPU spent by concurrently running hooks is not attributed to this one"""
+        stop = threading.Event()
+        spinner = threading.Thread(target=lambda: [None for _ in iter(stop.is_set, True)])
+        spinner.start()
+        try:
+            sampler = ResourceSampler()
+            sample = sampler.start()
+            time.sleep(0.3)
+            _, _, cpu_percent = sampler.finish(sample)
+        finally:
+            stop.set()
+            spinner.join()
+
+        self.assertLess(cpu_percent, 20)
+
+
+class TestTriggerExecution(RegistryTestCase):
+    """Test cases for batched trigger fan-out and result handles"""
+
+    def setUp(self):
+        super().setUp()
+        for index in range(6):
+            (self.temp_dir / f"slow_hook_{index}.py").write_text(
+                SLOW_HOOK.format(index=index), encoding='utf-8'
+            )
+        self.registry = self.create_registry()
+        with redirect_stdout(io.StringIO()):
+            for index in range(6):
+                self.registry.activate_hook(f"slow_hook_{index}")
+
+    def test_handle_iterates_execution_ids(self):
+        """The handle still behaves like the old list of execution ids"""
+        execution = self.registry.execute_by_trigger('batch_trigger', {})
+
+        self.assertEqual(len(execution), 6)
+        self.assertEqual(list(execution), execution.execution_ids)
+        self.assertEqual(len(set(execution.execution_ids)), 6)
+        execution.results()
+
+    def test_results_and_as_completed(self):
+        """Results can be gathered or consumed in completion order"""
+        execution = self.registry.execute_by_trigger('batch_trigger', {})
+        results = execution.results(timeout=5)
+
+        self.assertTrue(execution.done())
+        self.assertEqual(sorted(r['result'] for r in results.values()), list(range(6)))
+        self.assertTrue(all(r['success'] for r in results.values()))
+
+        streamed = list(self.registry.execute_by_trigger('batch_trigger', {}).as_completed())
+        self.assertEqual(len(streamed), 6)
+
+    def test_handle_is_awaitable(self):
+        """The handle can be awaited from asyncio code"""
+        async def run():
+            return await self.registry.execute_by_trigger('batch_trigger', {})
+
+        results = asyncio.run(run())
+        self.assertEqual(len(results), 6)
+        self.assertTrue(all(r['success'] for r in results.values()))
+
+    def test_deadline_cancels_pending_executions(self):
+        """Executions not finished by the trigger deadline are reported as failed"""
+        execution = self.registry.execute_by_trigger(
+            'batch_trigger', {'delay': 0.3}, deadline=0.05
+        )
+        results = execution.results()
+
+        self.assertEqual(len(results), 6)
+        self.assertFalse(any(r['success'] for r in results.values()))
+        cancelled = [r for r in results.values() if r['error'] == 'Execution cancelled']
+        self.assertGreaterEqual(len(cancelled), 2)  # 4 workers busy, the rest never started
+
+    def test_caller_timeout_does_not_cancel(self):
+        """A short caller timeout polls: unfinished executions keep running"""
+        execution = self.registry.execute_by_trigger('batch_trigger', {'delay': 0.2})
+        polled = execution.results(timeout=0.05)
+
+        self.assertEqual(len(polled), 6)
+        pending = [r for r in polled.values() if r.get('pending')]
+        self.assertEqual(len(pending), 6)
+        self.assertEqual(pending[0]['error'], "Still running after the caller's 0.05s timeout")
+
+        async def poll():
+            return await execution.wait(timeout=0.01)
+
+        self.assertTrue(all(r.get('pending') or r['success'] for r in asyncio.run(poll()).values()))
+
+        results = execution.results(timeout=5)
+        self.assertTrue(all(r['success'] for r in results.values()))
+
+    def test_wait_is_bounded_by_hook_timeouts(self):
+        """Without a deadline, waiting stops once every hook's timeout could have passed"""
+        execution = self.registry.execute_by_trigger('batch_trigger', {'delay': 2}, timeout=0.05)
+
+        async def run():
+            return await execution.wait()
+
+        started = time.monotonic()
+        results = asyncio.run(run())
+        self.assertLess(time.monotonic() - started, 1.0)
+        self.assertFalse(any(r['success'] for r in results.values()))
+        self.assertIn('Trigger deadline of 0.3s exceeded', {r['error'] for r in results.values()})
+
+    def test_cancel(self):
+        """Queued executions can be cancelled through the handle"""
+        execution = self.registry.execute_by_trigger('batch_trigger', {'delay': 0.2})
+        cancelled = execution.cancel()
+        self.assertGreaterEqual(cancelled, 2)
+        results = execution.results()
+        self.assertEqual(sum(1 for r in results.values() if r['success']), 6 - cancelled)
+
+
+class TestPerformanceMonitor(unittest.TestCase):
+    """Test cases for ring-buffer metrics and streaming percentiles"""
+
+    def _metrics(self, rng, timestamp=None):
+        return PerformanceMetrics(
+            execution_time_ms=rng.uniform(0.5, 500), memory_usage_mb=rng.uniform(0, 50),
+            cpu_percent=rng.uniform(0, 100), success=rng.random() > 0.2,
+            timestamp=timestamp or datetime.now()
+        )
+
+    def test_window_aggregates_match_recent_samples(self):
+        """Incremental window stats equal a recomputation over the last samples"""
+        rng = random.Random(7)
+        buffer = MetricsRingBuffer(capacity=50, window=20)
+        recorded = [self._metrics(rng) for _ in range(237)]
+        for metrics in recorded:
+            buffer.append(metrics)
+
+        recent = recorded[-20:]
+        stats = buffer.stats()
+        self.assertEqual(len(buffer), 50)
+        self.assertEqual(stats['total_executions'], 237)
+        self.assertEqual(stats['recent_executions'], 20)
+        self.assertAlmostEqual(stats['avg_execution_time_ms'],
+                               sum(m.execution_time_ms for m in recent) / 20)
+        self.assertEqual(stats['max_execution_time_ms'], max(m.execution_time_ms for m in recent))
+        self.assertEqual(stats['min_execution_time_ms'], min(m.execution_time_ms for m in recent))
+        self.assertEqual(stats['max_memory_usage_mb'], max(m.memory_usage_mb for m in recent))
+        self.assertAlmostEqual(stats['success_rate'], sum(m.success for m in recent) / 20 * 100)
+        self.assertEqual([m.execution_time_ms for m in buffer],
+                         [m.execution_time_ms for m in recorded[-50:]])
+
+    def test_histogram_percentiles_within_relative_error(self):
+        """Percentile estimates stay within the histogram's relative error"""
+        rng = random.Random(11)
+        histogram = LatencyHistogram(relative_error=0.01)
+        values = [rng.lognormvariate(3, 1.5) for _ in range(20000)]
+        for value in values:
+            histogram.record(value)
+
+        values.sort()
+        for q, estimate in zip([0.5, 0.95, 0.99], histogram.quantiles([0.5, 0.95, 0.99])):
+            exact = values[int(q * (len(values) - 1))]
+            self.assertAlmostEqual(estimate / exact, 1.0, delta=0.02)
+
+    def test_percentiles_follow_the_window(self):
+        """Latency percentiles cover the same recent window as the other stats"""
+        monitor = PerformanceMonitor(max_history=100, stats_window=20)
+        for _ in range(50):
+            monitor.record_execution('hook', PerformanceMetrics(1000.0, 1.0, 5.0, True))
+        for _ in range(20):
+            monitor.record_execution('hook', PerformanceMetrics(10.0, 1.0, 5.0, True))
+        buffer = monitor.metrics_history['hook']
+
+        self.assertEqual(buffer.stats()['p99_execution_time_ms'], 10.0)
+        self.assertEqual(monitor.get_system_stats()['system_p99_execution_time_ms'], 10.0)
+        self.assertEqual(monitor.system_latency.count, 20)
+
+        monitor.record_execution('hook', PerformanceMetrics(500.0, 1.0, 5.0, True))
+        self.assertEqual(buffer.trim(1), 70)
+        self.assertEqual(buffer.latency.count, 1)
+        self.assertEqual(monitor.system_latency.count, 1)
+        self.assertEqual(buffer.stats()['p50_execution_time_ms'], 500.0)
+        self.assertEqual(monitor.get_system_stats()['system_p50_execution_time_ms'], 500.0)
+
+    def test_system_histogram_tracks_every_hook_window(self):
+        """The shared histogram matches merging the per-hook window histograms"""
+        rng = random.Random(5)
+        monitor = PerformanceMonitor(max_history=50, stats_window=10)
+        for _ in range(300):
+            monitor.record_execution(f'hook_{rng.randrange(5)}',
+                                     PerformanceMetrics(rng.lognormvariate(3, 1), 1.0, 5.0, True))
+
+        merged = LatencyHistogram()
+        for history in monitor.metrics_history.values():
+            merged.merge(history.latency)
+        self.assertEqual(monitor.system_latency.counts, merged.counts)
+        self.assertEqual(monitor.system_latency.count, 50)
+        quantiles = monitor.system_latency.quantiles([0.5, 0.99])
+        self.assertEqual(quantiles, merged.quantiles([0.5, 0.99]))
+
+    def test_trim_and_discard_rebuild_window(self):
+        """Trimming history keeps window aggregates consistent"""
+        rng = random.Random(3)
+        buffer = MetricsRingBuffer(capacity=100, window=50)
+        start = datetime.now() - timedelta(hours=1)
+        recorded = [self._metrics(rng, start + timedelta(seconds=i)) for i in range(80)]
+        for metrics in recorded:
+            buffer.append(metrics)
+
+        self.assertEqual(buffer.discard_before(start + timedelta(seconds=60)), 60)
+        self.assertEqual(buffer.stats()['recent_executions'], 20)
+        self.assertEqual(buffer.stats()['max_execution_time_ms'],
+                         max(m.execution_time_ms for m in recorded[60:]))
+
+        self.assertEqual(buffer.trim(5), 15)
+        buffer.append(recorded[0])
+        self.assertEqual(buffer.stats()['recent_executions'], 6)
+
+    def test_system_stats_and_insights(self):
+        """System statistics aggregate per-hook windows"""
+        monitor = PerformanceMonitor(max_history=100, stats_window=10)
+        for i in range(30):
+            monitor.record_execution('fast_hook', PerformanceMetrics(10.0, 1.0, 5.0, True))
+            monitor.record_execution('failing_hook', PerformanceMetrics(30.0, 1.0, 5.0, i % 2 == 0))
+
+        stats = monitor.get_system_stats()
+        self.assertEqual(stats['total_executions'], 60)
+        self.assertEqual(stats['active_hooks'], 2)
+        self.assertAlmostEqual(stats['system_avg_execution_time_ms'], 20.0)
+        self.assertEqual(stats['system_max_execution_time_ms'], 30.0)
+        self.assertAlmostEqual(stats['system_success_rate'], 75.0)
+        self.assertAlmostEqual(stats['system_p99_execution_time_ms'], 30.0, delta=0.6)
+
+        issues = {(i['hook_name'], i['issue']) for i in monitor.get_performance_insights()}
+        self.assertEqual(issues, {('failing_hook', 'low_success_rate')})
+
+
+class TestProcessIsolation(RegistryTestCase):
+    """Test cases for out-of-process hook execution"""
+
+    def setUp(self):
+        super().setUp()
+        (self.temp_dir / "isolated_hook.py").write_text(PROCESS_HOOK, encoding='utf-8')
+        self.registry = self.create_registry()
+        self.registry.process_runner.max_workers = 2
+        with redirect_stdout(io.StringIO()):
+            self.registry.activate_hook('isolated_hook')
+
+    def _run(self, data, timeout=10.0):
+        context = ExecutionContext(
+            hook_name='isolated_hook', trigger='isolated_trigger', data=data,
+            priority=HookPriority.NORMAL, timestamp=datetime.now(),
+            execution_id='isolated_test', timeout_seconds=timeout
+        )
+        with redirect_stdout(io.StringIO()):
+            return self.registry._execute_hook_context(context)
+
+    def test_directives_are_parsed(self):
+        """Isolation mode and resource limits come from @directives"""
+        metadata = self.registry.hooks['isolated_hook']
+
+        self.assertEqual(metadata.isolation, 'process')
+        self.assertEqual(metadata.cpu_limit_seconds, 1.0)
+        self.assertEqual(metadata.memory_limit_mb, 64.0)
+        self.assertEqual(self.registry.hooks['sample_hook'].isolation, 'thread')
+
+    def test_runs_in_warm_worker_process(self):
+        """Process hooks run outside the registry process on reused workers"""
+        pids = {self._run({})['result']['pid'] for _ in range(6)}
+
+        self.assertNotIn(os.getpid(), pids)
+        self.assertLessEqual(len(pids), 2)
+
+    def test_module_is_not_imported_by_the_registry(self):
+        """Module-level code of a process hook only runs in the workers"""
+        self.assertIsNone(self.registry.loaded_hooks['isolated_hook'])
+        self.assertNotEqual(os.environ.get('ISOLATED_HOOK_IMPORTED_IN'), str(os.getpid()))
+
+    @unittest.skipUnless(hasattr(signal, 'setitimer'), "needs SIGALRM")
+    def test_timeout_interrupts_blocked_hook(self):
+        """A blocked hook gives its worker back once it times out"""
+        self.registry.process_runner.max_workers = 1
+        self.registry.process_runner.shutdown()
+        pid = self._run({})['result']['pid']
+
+        result = self._run({'sleep': 30}, timeout=0.5)
+        self.assertFalse(result['success'])
+        self.assertIn('timed out', result['error'])
+        self.assertEqual(self._run({})['result']['pid'], pid)
+
+    @unittest.skipUnless(hasattr(signal, 'pthread_sigmask'), "needs signal masks")
+    def test_unresponsive_worker_is_replaced(self):
+        """A worker that ignores its deadline is terminated with its pool"""
+        self.registry.process_runner.max_workers = 1
+        self.registry.process_runner.shutdown()
+        pid = self._run({})['result']['pid']
+
+        started = time.monotonic()
+        result = self._run({'ignore_deadline': True, 'sleep': 30}, timeout=0.5)
+        self.assertFalse(result['success'])
+        self.assertLess(time.monotonic() - started, 5)
+
+        self.assertNotEqual(self._run({})['result']['pid'], pid)
+
+    def test_memory_limit(self):
+        """Allocations beyond the memory limit fail without killing the worker"""
+        result = self._run({'allocate_mb': 256})
+        self.assertFalse(result['success'])
+
+        self.assertEqual(self._run({'allocate_mb': 8})['result'], 8 * 1024 * 1024)
+
+    def test_cpu_limit(self):
+        """A spinning hook is stopped once it exhausts its CPU budget"""
+        result = self._run({'spin': True})
+
+        self.assertFalse(result['success'])
+        self.assertIn('CPU time limit', result['error'])
+        self.assertTrue(self._run({})['success'])
+
+
+class TestExecutionPlans(RegistryTestCase):
+    """Test cases for cached per-trigger dependency plans"""
+
+    HOOKS = {
+        'plan_source': ('none', 'raw_data'),
+        'plan_left': ('raw_data', 'left_data'),
+        'plan_right': ('raw_data', 'right_data'),
+        'plan_sink': ('left_data, plan_right', 'report'),
+    }
+
+    def setUp(self):
+        super().setUp()
+        for name, (depends, provides) in self.HOOKS.items():
+            (self.temp_dir / f"{name}.py").write_text(
+                PLAN_HOOK.format(name=name, depends=depends, provides=provides), encoding='utf-8'
+            )
+        self.registry = self.create_registry()
+        with redirect_stdout(io.StringIO()):
+            for name in self.HOOKS:
+                self.registry.activate_hook(name)
+
+    def test_plan_levels_follow_dependencies(self):
+        """Capabilities and hook names both resolve to dependency levels"""
+        plan = self.registry.get_execution_plan('plan_trigger')
+
+        self.assertEqual([sorted(level) for level in plan.levels],
+                         [['plan_source'], ['plan_left', 'plan_right'], ['plan_sink']])
+
+    def test_plan_is_cached_until_activation_changes(self):
+        """Plans are reused and only recompiled after invalidation"""
+        plan = self.registry.get_execution_plan('plan_trigger')
+        self.assertIs(self.registry.get_execution_plan('plan_trigger'), plan)
+
+        with redirect_stdout(io.StringIO()):
+            self.registry.deactivate_hook('plan_right')
+        updated = self.registry.get_execution_plan('plan_trigger')
+
+        self.assertIsNot(updated, plan)
+        self.assertNotIn('plan_right', updated.hooks)
+        self.assertEqual(self.registry.plan_cache.get_stats()['hits'], 1)
+
+    def test_levels_execute_in_order(self):
+        """Each level starts after the previous one finished; a level runs in parallel"""
+        results = self.registry.execute_by_trigger('plan_trigger', {'delay': 0.1}).results(timeout=5)
+        by_hook = {r['hook_name']: r['result'] for r in results.values()}
+
+        self.assertEqual(len(by_hook), 4)
+        self.assertGreaterEqual(by_hook['plan_left']['start'], by_hook['plan_source']['end'])
+        self.assertGreaterEqual(by_hook['plan_sink']['start'], by_hook['plan_right']['end'])
+        self.assertLess(by_hook['plan_left']['start'], by_hook['plan_right']['end'])
+
+    def test_priority_system_shares_plan_cache(self):
+        """HookPrioritySystem reads plans from the registry's cache"""
+        from hook_priority_system import create_hook_priority_system
+
+        system = create_hook_priority_system(self.registry)
+        try:
+            self.assertIs(system.plan_cache, self.registry.plan_cache)
+            hook_names = list(self.HOOKS)
+            system.calculate_execution_order('plan_trigger', hook_names)
+            system.calculate_execution_order('plan_trigger', hook_names)
+            self.assertEqual(self.registry.plan_cache.get_stats()['hits'], 1)
+        finally:
+            system.shutdown()
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -10,6 +10,7 @@ Version: 1.0.0
 import unittest
 import json
 import time
+import random
 import tempfile
 import shutil
 from pathlib import Path
@@ -19,7 +20,9 @@ from typing import Dict, List, Any
 # Import the hook priority system components
 from hook_priority_system import (
     HookPrioritySystem, ConflictResolutionStrategy, ExecutionPhase, 
-    RollbackScope, PriorityWeight, create_hook_priority_system
+    RollbackScope, PriorityWeight, create_hook_priority_system,
+    IncrementalDependencyGraph, TopologicalSorter, DependencyNode,
+    strongly_connected_components
 )
 from hook_registry import (
     HookMetadata, HookPriority, HookState, TriggerType, HookRegistry
@@ -521,6 +524,93 @@ class TestPrioritySystemAPI(unittest.TestCase):
         self.assertIn(trends['performance_trend'], ['improving', 'declining', 'stable'])
 
 
+class TestIncrementalDependencyGraph(unittest.TestCase):
+    """Test cases for the incrementally maintained dependency graph"""
+    
+    def _metadata(self, name, dependencies=(), provides=(), tags=()):
+        return HookMetadata(
+            name=name, file_path=f"/tmp/{name}.py", dependencies=list(dependencies),
+            provides=list(provides), tags=list(tags)
+        )
+    
+    def _assert_consistent(self, graph):
+        """Ranks respect every edge and components equal the graph's SCCs"""
+        for source, targets in graph.successors.items():
+            for target in targets:
+                source_component = graph.component_of[source]
+                target_component = graph.component_of[target]
+                if source_component != target_component:
+                    self.assertLess(graph.rank[source_component], graph.rank[target_component])
+        
+        expected = strongly_connected_components(
+            list(graph.metadata), lambda hook: list(graph.successors[hook])
+        )
+        actual = [sorted(members) for members in graph.members.values()]
+        self.assertEqual(sorted(sorted(c) for c in expected), sorted(actual))
+        self.assertEqual(len(set(graph.rank.values())), len(graph.rank))
+    
+    def test_random_updates_keep_order_and_components(self):
+        """Random adds, replacements and removals keep the invariants"""
+        rng = random.Random(42)
+        graph = IncrementalDependencyGraph()
+        names = [f"hook_{i}" for i in range(40)]
+        
+        for _ in range(400):
+            name = rng.choice(names)
+            if name in graph.metadata and rng.random() < 0.3:
+                graph.remove_hook(name)
+            else:
+                dependencies = rng.sample(names, rng.randint(0, 3))
+                provides = [f"cap_{rng.randint(0, 15)}"] if rng.random() < 0.5 else []
+                if rng.random() < 0.5:
+                    dependencies.append(f"cap_{rng.randint(0, 15)}")
+                graph.add_hook(self._metadata(name, dependencies, provides))
+            self._assert_consistent(graph)
+    
+    def test_cycle_merges_and_splits(self):
+        """Closing a cycle merges components; removing a member splits them"""
+        graph = IncrementalDependencyGraph()
+        graph.add_hook(self._metadata('a', ['c']))
+        graph.add_hook(self._metadata('b', ['a']))
+        graph.add_hook(self._metadata('c', ['b']))
+        self.assertEqual(len(graph.members), 1)
+        
+        graph.remove_hook('b')
+        self.assertEqual(len(graph.members), 2)
+        self._assert_consistent(graph)
+    
+    def test_sort_indexed_matches_dependencies(self):
+        """Indexed batches respect dependencies within each phase"""
+        graph = IncrementalDependencyGraph()
+        graph.add_hook(self._metadata('notifier', ['processing']))
+        graph.add_hook(self._metadata('processor', ['authentication'], ['processing']))
+        graph.add_hook(self._metadata('authenticator', ['validation'], ['authentication']))
+        graph.add_hook(self._metadata('validator', [], ['validation'], ['validation']))
+        graph.add_hook(self._metadata('logger', ['processing']))
+        
+        batches = TopologicalSorter().sort_indexed(
+            graph, ['validator', 'authenticator', 'processor', 'notifier', 'logger']
+        )
+        
+        self.assertEqual([sorted(batch.hooks) for batch in batches],
+                         [['validator'], ['authenticator'], ['processor'], ['logger', 'notifier']])
+        self.assertEqual(batches[0].phase, ExecutionPhase.PRE_VALIDATION)
+        
+        # A subset only honours edges inside the subset
+        batches = TopologicalSorter().sort_indexed(graph, ['notifier', 'authenticator'])
+        self.assertEqual([sorted(batch.hooks) for batch in batches], [['authenticator', 'notifier']])
+    
+    def test_cycle_detection_is_iterative(self):
+        """Cycle detection handles dependency chains deeper than the recursion limit"""
+        depth = 5000
+        graph = {
+            f"h{i}": DependencyNode(hook_name=f"h{i}", dependencies={f"h{(i + 1) % depth}"})
+            for i in range(depth)
+        }
+        resolved = TopologicalSorter()._detect_and_resolve_cycle(list(graph), graph)
+        self.assertEqual(len(resolved), 1)
+
+
 class TestIntegrationScenarios(unittest.TestCase):
     """Integration test scenarios"""
     
@@ -721,6 +811,7 @@ def run_comprehensive_tests():
         TestHookPrioritySystem,
         TestConfigurationManager,
         TestPrioritySystemAPI,
+        TestIncrementalDependencyGraph,
         TestIntegrationScenarios
     ]
     
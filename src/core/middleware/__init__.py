@@ -16,7 +16,10 @@ from .lsp_hook_bridge import (
     LanguageServerConfig,
     LSPEventType,
     HookExecutionMode,
-    HookExecutionContext
+    HookExecutionContext,
+    TextDocumentSyncKind,
+    TextDocument,
+    DocumentStore
 )
 
 from .websocket_lsp_gateway import (
@@ -71,6 +74,9 @@ __all__ = [
     "LSPEventType",
     "HookExecutionMode",
     "HookExecutionContext",
+    "TextDocumentSyncKind",
+    "TextDocument",
+    "DocumentStore",
     
     # WebSocket Gateway
     "WebSocketLSPGateway",
@@ -0,0 +1,167 @@
+#!/usr/bin/env python3
+"""
+StdioTransport Benchmark
+Streams textDocument/didChange notifications to several language servers at
+once and measures how fast the matching publishDiagnostics come back, along
+with the worst event loop stall seen meanwhile.
+
+The servers are this script started with --serve: a minimal language server
+answering every didChange with a publishDiagnostics. Payloads carry
+non-ASCII text, so a Content-Length counted in characters would corrupt the
+framing.
+
+Usage:
+    python benchmark_stdio_transport.py --servers 5 --messages 2000
+"""
+
+import sys
+import json
+import time
+import asyncio
+from pathlib import Path
+from typing import Dict
+
+sys.path.insert(0, str(Path(__file__).parent))
+
+SAMPLE_TEXT = "def naïve_sum(values):  # — Σ of values ✓\n    return sum(values)\n"
+
+
+def serve() -> None:
+    """Minimal language server: one publishDiagnostics per didChange"""
+    stdin, stdout = sys.stdin.buffer, sys.stdout.buffer
+    
+    while True:
+        headers = {}
+        while True:
+            line = stdin.readline()
+            if not line:
+                return
+            line = line.strip()
+            if not line:
+                break
+            key, _, value = line.partition(b':')
+            headers[key.strip().lower()] = value.strip()
+        
+        message = json.loads(stdin.read(int(headers[b'content-length'])))
+        if message.get('method') != 'textDocument/didChange':
+            continue
+        
+        document = message['params']['textDocument']
+        reply = json.dumps({
+            'jsonrpc': '2.0',
+            'method': 'textDocument/publishDiagnostics',
+            'params': {
+                'uri': document['uri'],
+                'version': document['version'],
+                'diagnostics': [{
+                    'range': {'start': {'line': 0, 'character': 4}, 'end': {'line': 0, 'character': 13}},
+                    'severity': 3,
+                    'message': "Nom « naïve_sum » : préférez ‘naive_sum’ ✓"
+                }]
+            }
+        }, ensure_ascii=False).encode('utf-8')
+        stdout.write(b'Content-Length: %d\r\n\r\n' % len(reply) + reply)
+        stdout.flush()
+
+
+async def start_server(index: int):
+    """Start one benchmark server behind a StdioTransport"""
+    from lsp_hook_bridge import StdioTransport
+    
+    transport = StdioTransport([sys.executable, str(Path(__file__).resolve()), '--serve'])
+    if not await transport.connect():
+        raise RuntimeError(f"server {index} failed to start")
+    return transport
+
+
+async def stream(transport, index: int, messages: int) -> int:
+    """Send `messages` didChange notifications and collect the matching diagnostics"""
+    uri = f"file:///bench/server{index}/module.py"
+    
+    async def send():
+        for version in range(1, messages + 1):
+            await transport.send_message({
+                'jsonrpc': '2.0',
+                'method': 'textDocument/didChange',
+                'params': {
+                    'textDocument': {'uri': uri, 'version': version},
+                    'contentChanges': [{'text': SAMPLE_TEXT * 4}]
+                }
+            })
+    
+    async def receive():
+        versions = []
+        while len(versions) < messages:
+            message = await transport.receive_message()
+            if message is None:
+                break
+            versions.append(message['params']['version'])
+        return versions
+    
+    _, versions = await asyncio.gather(send(), receive())
+    if versions != list(range(1, messages + 1)):
+        raise RuntimeError(f"server {index} returned {len(versions)} of {messages} diagnostics, or out of order")
+    return 2 * messages
+
+
+async def run_benchmark(servers: int = 5, messages: int = 2000) -> Dict[str, float]:
+    """Stream to all servers concurrently while a heartbeat task samples event loop lag"""
+    transports = [await start_server(index) for index in range(servers)]
+    max_lag = 0.0
+    stop = asyncio.Event()
+    
+    async def heartbeat(interval: float = 0.005):
+        nonlocal max_lag
+        while not stop.is_set():
+            expected = time.perf_counter() + interval
+            await asyncio.sleep(interval)
+            max_lag = max(max_lag, time.perf_counter() - expected)
+    
+    try:
+        monitor = asyncio.create_task(heartbeat())
+        start = time.perf_counter()
+        counts = await asyncio.gather(*[
+            stream(transport, index, messages) for index, transport in enumerate(transports)
+        ])
+        elapsed = time.perf_counter() - start
+        stop.set()
+        await monitor
+    finally:
+        for transport in transports:
+            await transport.disconnect()
+    
+    return {
+        'servers': servers,
+        'messages': sum(counts),
+        'elapsed_s': elapsed,
+        'messages_per_second': sum(counts) / elapsed,
+        'max_loop_lag_ms': max_lag * 1000
+    }
+
+
+def main():
+    """Benchmark entry point"""
+    import argparse
+    
+    parser = argparse.ArgumentParser(description="StdioTransport throughput benchmark")
+    parser.add_argument('--servers', type=int, default=5, help='Concurrent language servers')
+    parser.add_argument('--messages', type=int, default=2000, help='didChange notifications per server')
+    parser.add_argument('--serve', action='store_true', help=argparse.SUPPRESS)
+    args = parser.parse_args()
+    
+    if args.serve:
+        serve()
+        return
+    
+    results = asyncio.run(run_benchmark(args.servers, args.messages))
+    
+    print(f"StdioTransport benchmark ({results['servers']} servers, {args.messages} didChange each)")
+    print("=" * 60)
+    print(f"{'messages (didChange + publishDiagnostics)':<44}{results['messages']:>16}")
+    print(f"{'elapsed seconds':<44}{results['elapsed_s']:>16.2f}")
+    print(f"{'messages/second':<44}{results['messages_per_second']:>16.0f}")
+    print(f"{'worst event loop stall (ms)':<44}{results['max_loop_lag_ms']:>16.1f}")
+
+
+if __name__ == "__main__":
+    main()
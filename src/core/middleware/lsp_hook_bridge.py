@@ -11,12 +11,13 @@ import time
 import threading
 import websocket
 import weakref
-from datetime import datetime, timedelta
+from datetime import datetime
 from pathlib import Path
 from typing import Dict, List, Optional, Any, Callable, Set, Union, Tuple
 from dataclasses import dataclass, field, asdict
 from enum import Enum
-from collections import defaultdict, deque
+from collections import OrderedDict, defaultdict, deque
+from bisect import bisect_left
 import concurrent.futures
 import socket
 import ssl
@@ -47,6 +48,7 @@ class LSPEventType(Enum):
     SERVER_INITIALIZE = "initialize"
     SERVER_SHUTDOWN = "shutdown"
     WORKSPACE_CHANGE = "workspace/didChangeWatchedFiles"
+    DOCUMENT_CHANGE = "textDocument/didChange"
     SEMANTIC_TOKENS = "textDocument/semanticTokens/full"
 
 
@@ -66,6 +68,13 @@ class LSPMessageType(Enum):
     ERROR = "error"
 
 
+class TextDocumentSyncKind(Enum):
+    """How a server wants document changes delivered"""
+    NONE = 0
+    FULL = 1
+    INCREMENTAL = 2
+
+
 @dataclass
 class LSPMessage:
     """LSP message structure"""
@@ -111,21 +120,37 @@ class CacheEntry:
     """Cache entry for performance optimization"""
     key: str
     value: Any
-    timestamp: datetime
+    expires_at: float              # time.monotonic() deadline
     ttl_seconds: float
+    uri: Optional[str] = None      # document the entry was derived from
     access_count: int = 0
-    last_accessed: Optional[datetime] = None
 
 
 class LSPCacheManager:
-    """Performance optimization cache for LSP responses"""
+    """Performance optimization cache for LSP responses
+    
+    Entries live in an OrderedDict kept in recency order, so lookups,
+    inserts and LRU eviction are O(1). Each distinct TTL has its own queue
+    in insertion order, which is also expiry order, so expired entries are
+    purged from the queue fronts without scanning; they go before any live
+    entry is evicted. Entries tagged with a document URI are indexed by it
+    for per-document invalidation. TTLs use the monotonic clock.
+    """
     
     def __init__(self, max_size: int = 1000, default_ttl: float = 300.0):
         self.max_size = max_size
         self.default_ttl = default_ttl
-        self.cache: Dict[str, CacheEntry] = {}
+        self.cache: "OrderedDict[str, CacheEntry]" = OrderedDict()
+        self._expiry_queues: Dict[float, "OrderedDict[str, None]"] = {}
+        self._keys_by_uri: Dict[str, Set[str]] = defaultdict(set)
         self._lock = threading.RLock()
         
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+        self.invalidations = 0
+        
         # Start cleanup thread
         self._cleanup_thread = threading.Thread(target=self._cleanup_loop, daemon=True)
         self._cleanup_thread.start()
@@ -133,78 +158,341 @@ class LSPCacheManager:
     def get(self, key: str) -> Optional[Any]:
         """Get cached value"""
         with self._lock:
-            if key not in self.cache:
+            entry = self.cache.get(key)
+            if entry is None:
+                self.misses += 1
                 return None
             
-            entry = self.cache[key]
-            
             # Check if expired
-            if datetime.now() > (entry.timestamp + timedelta(seconds=entry.ttl_seconds)):
-                del self.cache[key]
+            if time.monotonic() >= entry.expires_at:
+                self._remove(key)
+                self.expirations += 1
+                self.misses += 1
                 return None
             
             # Update access stats
+            self.cache.move_to_end(key)
             entry.access_count += 1
-            entry.last_accessed = datetime.now()
-            
+            self.hits += 1
             return entry.value
     
-    def set(self, key: str, value: Any, ttl: Optional[float] = None) -> None:
-        """Set cached value"""
+    def set(self, key: str, value: Any, ttl: Optional[float] = None, uri: Optional[str] = None) -> None:
+        """Set cached value, optionally tagged with the document URI it belongs to"""
+        ttl = ttl or self.default_ttl
         with self._lock:
-            # Evict if at capacity
+            if key in self.cache:
+                self._remove(key)
+            
+            # Evict if at capacity: expired entries first, then least recently used
             if len(self.cache) >= self.max_size:
-                self._evict_lru()
+                self.purge_expired()
+            while len(self.cache) >= self.max_size:
+                self._remove(next(iter(self.cache)))
+                self.evictions += 1
             
             self.cache[key] = CacheEntry(
                 key=key,
                 value=value,
-                timestamp=datetime.now(),
-                ttl_seconds=ttl or self.default_ttl,
-                last_accessed=datetime.now()
+                expires_at=time.monotonic() + ttl,
+                ttl_seconds=ttl,
+                uri=uri
             )
+            expiry_queue = self._expiry_queues.get(ttl)
+            if expiry_queue is None:
+                expiry_queue = self._expiry_queues[ttl] = OrderedDict()
+            expiry_queue[key] = None
+            if uri is not None:
+                self._keys_by_uri[uri].add(key)
     
     def invalidate(self, pattern: str = None) -> None:
-        """Invalidate cache entries"""
+        """Invalidate cache entries whose key contains pattern, or all entries"""
         with self._lock:
             if pattern is None:
+                self.invalidations += len(self.cache)
                 self.cache.clear()
+                self._expiry_queues.clear()
+                self._keys_by_uri.clear()
                 return
             
             # Pattern-based invalidation
             keys_to_remove = [key for key in self.cache.keys() if pattern in key]
             for key in keys_to_remove:
-                del self.cache[key]
+                self._remove(key)
+            self.invalidations += len(keys_to_remove)
     
-    def _evict_lru(self) -> None:
-        """Evict least recently used entry"""
-        if not self.cache:
-            return
-        
-        # Find LRU entry
-        lru_key = min(
-            self.cache.keys(),
-            key=lambda k: self.cache[k].last_accessed or datetime.min
-        )
-        del self.cache[lru_key]
+    def invalidate_document(self, uri: str) -> int:
+        """Invalidate every entry tagged with a document URI; returns the number removed"""
+        with self._lock:
+            keys = self._keys_by_uri.pop(uri, None)
+            if not keys:
+                return 0
+            for key in list(keys):
+                self._remove(key)
+            self.invalidations += len(keys)
+            return len(keys)
+    
+    def purge_expired(self) -> int:
+        """Drop expired entries; returns the number removed"""
+        now = time.monotonic()
+        removed = 0
+        with self._lock:
+            for expiry_queue in list(self._expiry_queues.values()):
+                while expiry_queue:
+                    key = next(iter(expiry_queue))
+                    if self.cache[key].expires_at > now:
+                        break
+                    self._remove(key)
+                    removed += 1
+            self.expirations += removed
+        return removed
+    
+    def get_stats(self) -> Dict[str, Any]:
+        """Get cache size and effectiveness statistics"""
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "size": len(self.cache),
+                "max_size": self.max_size,
+                "documents": len(self._keys_by_uri),
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": self.hits / lookups if lookups else 0.0,
+                "evictions": self.evictions,
+                "expirations": self.expirations,
+                "invalidations": self.invalidations
+            }
+    
+    def _remove(self, key: str) -> None:
+        """Remove an entry from the cache and its indexes"""
+        entry = self.cache.pop(key)
+        expiry_queue = self._expiry_queues[entry.ttl_seconds]
+        del expiry_queue[key]
+        if not expiry_queue:
+            del self._expiry_queues[entry.ttl_seconds]
+        if entry.uri is not None:
+            keys = self._keys_by_uri.get(entry.uri)
+            if keys is not None:
+                keys.discard(key)
+                if not keys:
+                    del self._keys_by_uri[entry.uri]
     
     def _cleanup_loop(self) -> None:
         """Background cleanup of expired entries"""
         while True:
             try:
                 time.sleep(60)  # Check every minute
-                with self._lock:
-                    current_time = datetime.now()
-                    expired_keys = [
-                        key for key, entry in self.cache.items()
-                        if current_time > (entry.timestamp + timedelta(seconds=entry.ttl_seconds))
-                    ]
-                    for key in expired_keys:
-                        del self.cache[key]
+                self.purge_expired()
             except Exception as e:
                 logger.error(f"Cache cleanup error: {e}")
 
 
+class PieceTable:
+    """Document text as slices over immutable buffers
+    
+    The original text and every inserted string are buffers, each with its
+    newline offsets computed once. The document is a list of pieces
+    (buffer, newlines, start, end) over them, so an edit splits at most two
+    pieces and splices in one without copying text, and a line is found by
+    counting newlines per piece with bisect. Once there are more than
+    MAX_PIECES pieces they are merged back into a single buffer, which
+    bounds the per-edit walk. Lines end at "\\n".
+    """
+    
+    MAX_PIECES = 512
+    
+    def __init__(self, text: str = ""):
+        self._reset(text)
+    
+    def __len__(self) -> int:
+        return self._length
+    
+    @property
+    def text(self) -> str:
+        """Full text, cached until the next edit"""
+        if self._text is None:
+            self._text = ''.join(buffer[start:end] for buffer, _, start, end in self._pieces)
+        return self._text
+    
+    @property
+    def line_count(self) -> int:
+        return self._line_breaks + 1
+    
+    def line_start(self, line: int) -> int:
+        """Offset of the first character of a line, or the text length past the last line"""
+        if line <= 0:
+            return 0
+        seen = offset = 0
+        for buffer, newlines, start, end in self._pieces:
+            first = bisect_left(newlines, start)
+            count = bisect_left(newlines, end) - first
+            if seen + count >= line:
+                return offset + newlines[first + line - seen - 1] - start + 1
+            seen += count
+            offset += end - start
+        return self._length
+    
+    def line_end(self, line: int) -> int:
+        """Offset just past the last character of a line, excluding its newline"""
+        if line + 1 >= self.line_count:
+            return self._length
+        return self.line_start(line + 1) - 1
+    
+    def slice(self, start: int, end: int) -> str:
+        """Text between two offsets"""
+        parts = []
+        offset = 0
+        for buffer, _, piece_start, piece_end in self._pieces:
+            size = piece_end - piece_start
+            if offset + size > start and offset < end:
+                parts.append(buffer[piece_start + max(0, start - offset):piece_start + min(size, end - offset)])
+            offset += size
+            if offset >= end:
+                break
+        return ''.join(parts)
+    
+    def replace(self, start: int, end: int, text: str) -> None:
+        """Replace the text between two offsets"""
+        first = self._split(start)
+        last = self._split(end)
+        
+        for buffer, newlines, piece_start, piece_end in self._pieces[first:last]:
+            self._line_breaks -= bisect_left(newlines, piece_end) - bisect_left(newlines, piece_start)
+        inserted = []
+        if text:
+            newlines = _newline_offsets(text)
+            inserted.append((text, newlines, 0, len(text)))
+            self._line_breaks += len(newlines)
+        
+        self._pieces[first:last] = inserted
+        self._length += len(text) - (end - start)
+        self._text = None
+        if len(self._pieces) > self.MAX_PIECES:
+            self._reset(self.text)
+    
+    def _reset(self, text: str) -> None:
+        newlines = _newline_offsets(text)
+        self._pieces: List[Tuple[str, List[int], int, int]] = [(text, newlines, 0, len(text))] if text else []
+        self._length = len(text)
+        self._line_breaks = len(newlines)
+        self._text: Optional[str] = text
+    
+    def _split(self, offset: int) -> int:
+        """Ensure a piece boundary at offset; returns the index of the piece starting there"""
+        position = 0
+        for index, (buffer, newlines, start, end) in enumerate(self._pieces):
+            if position == offset:
+                return index
+            if position + end - start > offset:
+                middle = start + offset - position
+                self._pieces[index:index + 1] = [(buffer, newlines, start, middle), (buffer, newlines, middle, end)]
+                return index + 1
+            position += end - start
+        return len(self._pieces)
+
+
+def _newline_offsets(text: str) -> List[int]:
+    offsets = []
+    position = text.find('\n')
+    while position != -1:
+        offsets.append(position)
+        position = text.find('\n', position + 1)
+    return offsets
+
+
+class TextDocument:
+    """An open document: its text, language and LSP version"""
+    
+    def __init__(self, uri: str, language_id: str, version: int, text: str):
+        self.uri = uri
+        self.language_id = language_id
+        self.version = version
+        self._content = PieceTable(text)
+    
+    @property
+    def text(self) -> str:
+        return self._content.text
+    
+    @property
+    def line_count(self) -> int:
+        return self._content.line_count
+    
+    def get_line(self, line: int) -> str:
+        """Text of one line without its newline"""
+        return self._content.slice(self._content.line_start(line), self._content.line_end(line))
+    
+    def offset_at(self, position: Dict[str, int]) -> int:
+        """Text offset of an LSP position, whose character counts UTF-16 code units"""
+        line = position["line"]
+        if line >= self._content.line_count:
+            return len(self._content)
+        
+        start = self._content.line_start(line)
+        character = position["character"]
+        segment = self._content.slice(start, min(self._content.line_end(line), start + character))
+        if segment.isascii():
+            return start + len(segment)
+        
+        # Characters outside the BMP take two UTF-16 code units
+        units = 0
+        for index, char in enumerate(segment):
+            if units >= character:
+                return start + index
+            units += 2 if ord(char) > 0xFFFF else 1
+        return start + len(segment)
+    
+    def apply_changes(self, changes: List[Dict[str, Any]], version: int) -> None:
+        """Apply LSP content changes in order and move to version
+        
+        A change with a range replaces that range; one without replaces the
+        whole text. Versions must increase.
+        """
+        if version <= self.version:
+            raise ValueError(f"Stale version {version} for {self.uri} (at {self.version})")
+        
+        for change in changes:
+            if "range" in change:
+                start = self.offset_at(change["range"]["start"])
+                end = self.offset_at(change["range"]["end"])
+                self._content.replace(start, max(start, end), change["text"])
+            else:
+                self._content = PieceTable(change["text"])
+        self.version = version
+
+
+class DocumentStore:
+    """Open documents by URI, as the bridge last synchronized them"""
+    
+    def __init__(self):
+        self.documents: Dict[str, TextDocument] = {}
+    
+    def __contains__(self, uri: str) -> bool:
+        return uri in self.documents
+    
+    def __len__(self) -> int:
+        return len(self.documents)
+    
+    def get(self, uri: str) -> Optional[TextDocument]:
+        return self.documents.get(uri)
+    
+    def open(self, uri: str, language_id: str, text: str, version: int = 1) -> TextDocument:
+        """Start tracking a document, replacing any earlier copy"""
+        document = TextDocument(uri, language_id, version, text)
+        self.documents[uri] = document
+        return document
+    
+    def change(self, uri: str, changes: List[Dict[str, Any]], version: int) -> TextDocument:
+        """Apply content changes to an open document"""
+        document = self.documents.get(uri)
+        if document is None:
+            raise KeyError(f"Document not open: {uri}")
+        document.apply_changes(changes, version)
+        return document
+    
+    def close(self, uri: str) -> Optional[TextDocument]:
+        """Stop tracking a document"""
+        return self.documents.pop(uri, None)
+
+
 class LSPTransport(ABC):
     """Abstract base class for LSP transport protocols"""
     
@@ -230,26 +518,34 @@ class LSPTransport(ABC):
 
 
 class StdioTransport(LSPTransport):
-    """Standard I/O transport for LSP servers"""
+    """Standard I/O transport for LSP servers
+    
+    The server runs under asyncio.create_subprocess_exec and messages are
+    framed on its byte streams, so waiting for output suspends only the
+    reading task instead of the event loop shared with other servers and
+    the gateway. Content-Length counts UTF-8 bytes, as the protocol
+    requires. stderr is drained in the background so a chatty server
+    cannot block on a full pipe.
+    """
     
     def __init__(self, command: List[str], cwd: Optional[str] = None):
         self.command = command
         self.cwd = cwd
-        self.process: Optional[subprocess.Popen] = None
+        self.process: Optional[asyncio.subprocess.Process] = None
+        self._stderr_task: Optional[asyncio.Task] = None
         self._connected = False
     
     async def connect(self) -> bool:
         """Start LSP server process"""
         try:
-            self.process = subprocess.Popen(
-                self.command,
-                stdin=subprocess.PIPE,
-                stdout=subprocess.PIPE,
-                stderr=subprocess.PIPE,
-                cwd=self.cwd,
-                text=True,
-                bufsize=0
+            self.process = await asyncio.create_subprocess_exec(
+                *self.command,
+                stdin=asyncio.subprocess.PIPE,
+                stdout=asyncio.subprocess.PIPE,
+                stderr=asyncio.subprocess.PIPE,
+                cwd=self.cwd
             )
+            self._stderr_task = asyncio.create_task(self._drain_stderr())
             self._connected = True
             logger.info(f"Started LSP server: {' '.join(self.command)}")
             return True
@@ -262,11 +558,15 @@ class StdioTransport(LSPTransport):
         if not self.process or not self._connected:
             raise RuntimeError("Transport not connected")
         
-        content = json.dumps(message, separators=(',', ':'))
-        message_str = f"Content-Length: {len(content)}\r\n\r\n{content}"
+        content = json.dumps(message, separators=(',', ':'), ensure_ascii=False).encode('utf-8')
+        header = f"Content-Length: {len(content)}\r\n\r\n".encode('ascii')
         
-        self.process.stdin.write(message_str)
-        self.process.stdin.flush()
+        # One write per message keeps frames whole when several tasks send at once
+        self.process.stdin.write(header + content)
+        await self.process.stdin.drain()
+        # drain() returns without suspending below the high-water mark; yield
+        # anyway so a burst of sends cannot monopolize the shared loop
+        await asyncio.sleep(0)
     
     async def receive_message(self) -> Optional[Dict[str, Any]]:
         """Receive JSON-RPC message from server"""
@@ -277,7 +577,7 @@ class StdioTransport(LSPTransport):
             # Read headers
             headers = {}
             while True:
-                line = self.process.stdout.readline()
+                line = await self.process.stdout.readline()
                 if not line:
                     return None
                 
@@ -285,21 +585,20 @@ class StdioTransport(LSPTransport):
                 if not line:
                     break
                 
-                if ':' in line:
-                    key, value = line.split(':', 1)
+                if b':' in line:
+                    key, value = line.split(b':', 1)
                     headers[key.strip().lower()] = value.strip()
             
             # Read content
-            content_length = int(headers.get('content-length', 0))
+            content_length = int(headers.get(b'content-length', 0))
             if content_length == 0:
                 return None
             
-            content = self.process.stdout.read(content_length)
-            if not content:
-                return None
-            
+            content = await self.process.stdout.readexactly(content_length)
             return json.loads(content)
             
+        except asyncio.IncompleteReadError:
+            return None
         except Exception as e:
             logger.error(f"Error receiving message: {e}")
             return None
@@ -307,17 +606,32 @@ class StdioTransport(LSPTransport):
     async def disconnect(self) -> None:
         """Stop LSP server process"""
         if self.process:
-            self.process.terminate()
-            try:
-                self.process.wait(timeout=5)
-            except subprocess.TimeoutExpired:
-                self.process.kill()
-                self.process.wait()
+            if self.process.returncode is None:
+                try:
+                    self.process.terminate()
+                    await asyncio.wait_for(self.process.wait(), timeout=5)
+                except ProcessLookupError:
+                    pass
+                except asyncio.TimeoutError:
+                    self.process.kill()
+                    await self.process.wait()
             self.process = None
+        if self._stderr_task:
+            self._stderr_task.cancel()
+            self._stderr_task = None
         self._connected = False
     
     def is_connected(self) -> bool:
-        return self._connected and self.process and self.process.poll() is None
+        return self._connected and self.process is not None and self.process.returncode is None
+    
+    async def _drain_stderr(self) -> None:
+        """Forward server stderr to the debug log"""
+        stderr = self.process.stderr
+        while True:
+            line = await stderr.readline()
+            if not line:
+                break
+            logger.debug(f"[{self.command[0]}] {line.decode('utf-8', 'replace').rstrip()}")
 
 
 class WebSocketTransport(LSPTransport):
@@ -547,6 +861,13 @@ class LanguageServerConnection:
         self.capabilities: Dict[str, Any] = {}
         self.initialized = False
         self.running = False
+        # The single task reading this connection's transport
+        self._message_task: Optional[asyncio.Task] = None
+        
+        # Document sync: negotiated kind, and the version of each document
+        # this server has been sent
+        self.sync_kind = TextDocumentSyncKind.FULL
+        self.open_documents: Dict[str, int] = {}
         
         # Event handlers
         self.event_handlers: Dict[str, List[Callable]] = defaultdict(list)
@@ -576,14 +897,16 @@ class LanguageServerConnection:
             if not await self.transport.connect():
                 return False
             
+            # Start message loop first: it delivers the initialize response
+            self.running = True
+            self._message_task = asyncio.create_task(self._message_loop())
+            
             # Initialize
             if not await self._initialize():
+                self.running = False
+                await self.transport.disconnect()
                 return False
             
-            # Start message loop
-            self.running = True
-            asyncio.create_task(self._message_loop())
-            
             logger.info(f"Language server '{self.config.name}' started successfully")
             return True
             
@@ -605,6 +928,16 @@ class LanguageServerConnection:
             
             await self.transport.disconnect()
         
+        # Only one reader may wait on the transport, so the loop goes with
+        # it. When stop() runs inside the loop (via _restart) the loop
+        # returns on its own once the replacement is started.
+        task, self._message_task = self._message_task, None
+        if task is not None and task is not asyncio.current_task() and not task.done():
+            task.cancel()
+        
+        # A restarted server starts with no open documents
+        self.open_documents.clear()
+        
         # Cancel pending requests
         for future in self.pending_requests.values():
             if not future.done():
@@ -653,6 +986,53 @@ class LanguageServerConnection:
         
         await self.transport.send_message(message)
     
+    async def open_document(self, document: TextDocument) -> None:
+        """Send didOpen with the document's current text"""
+        if self.sync_kind == TextDocumentSyncKind.NONE:
+            return
+        
+        await self.send_notification("textDocument/didOpen", {
+            "textDocument": {
+                "uri": document.uri,
+                "languageId": document.language_id,
+                "version": document.version,
+                "text": document.text
+            }
+        })
+        self.open_documents[document.uri] = document.version
+    
+    async def change_document(self, document: TextDocument, changes: List[Dict[str, Any]]) -> None:
+        """Send didChange for changes already applied to document
+        
+        Servers that negotiated incremental sync get the range edits as
+        given; others get the full text. A document this server has not
+        seen yet is opened at its current version instead. Hooks are not
+        run here: the bridge dispatches each edit once, whatever the
+        number of servers.
+        """
+        if self.sync_kind == TextDocumentSyncKind.NONE:
+            return
+        if document.uri not in self.open_documents:
+            await self.open_document(document)
+            return
+        
+        incremental = all("range" in change for change in changes)
+        if self.sync_kind == TextDocumentSyncKind.INCREMENTAL and incremental:
+            content_changes = changes
+        else:
+            content_changes = [{"text": document.text}]
+        
+        await self.send_notification("textDocument/didChange", {
+            "textDocument": {"uri": document.uri, "version": document.version},
+            "contentChanges": content_changes
+        })
+        self.open_documents[document.uri] = document.version
+    
+    async def close_document(self, uri: str) -> None:
+        """Send didClose if this server has the document open"""
+        if self.open_documents.pop(uri, None) is not None:
+            await self.send_notification("textDocument/didClose", {"textDocument": {"uri": uri}})
+    
     async def _initialize(self) -> bool:
         """Initialize language server"""
         try:
@@ -661,7 +1041,9 @@ class LanguageServerConnection:
                 "processId": None,
                 "rootUri": self.config.root_uri,
                 "capabilities": {
+                    "general": {"positionEncodings": ["utf-16"]},
                     "textDocument": {
+                        "synchronization": {"dynamicRegistration": False, "didSave": False},
                         "publishDiagnostics": {"relatedInformation": True},
                         "hover": {"contentFormat": ["markdown", "plaintext"]},
                         "completion": {"completionItem": {"snippetSupport": True}},
@@ -683,6 +1065,7 @@ class LanguageServerConnection:
             # Send initialize request
             response = await self.send_request("initialize", init_params)
             self.capabilities = response.get("capabilities", {})
+            self.sync_kind = self._negotiated_sync_kind()
             
             # Send initialized notification
             await self.send_notification("initialized", {})
@@ -694,6 +1077,16 @@ class LanguageServerConnection:
             logger.error(f"Language server initialization failed: {e}")
             return False
     
+    def _negotiated_sync_kind(self) -> TextDocumentSyncKind:
+        """Sync kind from the server's textDocumentSync capability"""
+        sync = self.capabilities.get("textDocumentSync", TextDocumentSyncKind.NONE.value)
+        if isinstance(sync, dict):
+            sync = sync.get("change", TextDocumentSyncKind.NONE.value)
+        try:
+            return TextDocumentSyncKind(sync)
+        except ValueError:
+            return TextDocumentSyncKind.FULL
+    
     async def _message_loop(self) -> None:
         """Main message processing loop"""
         while self.running and self.transport and self.transport.is_connected():
@@ -703,19 +1096,19 @@ class LanguageServerConnection:
                     if self.config.auto_restart and self.restart_count < self.max_restarts:
                         logger.warning(f"Language server connection lost, attempting restart...")
                         await self._restart()
-                    else:
-                        break
-                    continue
+                    # A successful restart owns a new loop; this one is done
+                    return
                 
                 await self._process_message(message)
                 self.last_heartbeat = datetime.now()
                 
+            except asyncio.CancelledError:
+                raise
             except Exception as e:
                 logger.error(f"Message loop error: {e}")
                 if self.config.auto_restart and self.restart_count < self.max_restarts:
                     await self._restart()
-                else:
-                    break
+                return
     
     async def _process_message(self, message: Dict[str, Any]) -> None:
         """Process incoming LSP message"""
@@ -798,58 +1191,11 @@ class LanguageServerConnection:
     
     async def _trigger_hooks_for_method(self, method: str, message: LSPMessage) -> None:
         """Trigger appropriate hooks for LSP method"""
-        # Map LSP methods to event types
-        method_mapping = {
-            "textDocument/publishDiagnostics": LSPEventType.DIAGNOSTICS_PUBLISHED,
-            "textDocument/completion": LSPEventType.COMPLETION_TRIGGERED,
-            "textDocument/hover": LSPEventType.HOVER_REQUEST,
-            "textDocument/definition": LSPEventType.DEFINITION_REQUEST,
-            "textDocument/documentSymbol": LSPEventType.DOCUMENT_SYMBOL,
-            "workspace/symbol": LSPEventType.WORKSPACE_SYMBOL,
-            "textDocument/codeAction": LSPEventType.CODE_ACTION,
-            "textDocument/references": LSPEventType.REFERENCES,
-            "textDocument/rename": LSPEventType.RENAME,
-            "textDocument/formatting": LSPEventType.FORMATTING,
-            "workspace/didChangeWatchedFiles": LSPEventType.WORKSPACE_CHANGE,
-        }
-        
-        event_type = method_mapping.get(method)
-        if not event_type:
-            return
-        
-        # Import hook registry
-        try:
-            from core.hooks.hook_registry import get_hook_registry
-            registry = get_hook_registry()
-            
-            # Get hooks that can handle this event
-            compatible_hooks = []
-            for hook_name, metadata in registry.hooks.items():
-                if (metadata.lsp_compatible and 
-                    metadata.state.value == "active" and
-                    event_type.value in metadata.triggers):
-                    compatible_hooks.append(hook_name)
-            
-            # Execute hooks
-            for hook_name in compatible_hooks:
-                context = HookExecutionContext(
-                    hook_name=hook_name,
-                    lsp_event=event_type,
-                    message=message,
-                    execution_id=f"{hook_name}_{int(time.time() * 1000)}",
-                    mode=HookExecutionMode.ASYNCHRONOUS,  # Default to async for LSP events
-                    metadata={
-                        'language_server': self.config.name,
-                        'method': method,
-                        'file_extensions': self.config.file_extensions
-                    }
-                )
-                
-                # Execute hook asynchronously
-                asyncio.create_task(self.hook_executor.execute_hook(context))
-                
-        except Exception as e:
-            logger.error(f"Error triggering hooks for {method}: {e}")
+        await trigger_lsp_hooks(self.hook_executor, method, message, {
+            'language_server': self.config.name,
+            'method': method,
+            'file_extensions': self.config.file_extensions
+        })
     
     async def _restart(self) -> None:
         """Restart language server connection"""
@@ -865,6 +1211,60 @@ class LanguageServerConnection:
             logger.error(f"Failed to restart language server '{self.config.name}'")
 
 
+async def trigger_lsp_hooks(hook_executor: HookExecutor, method: str, message: LSPMessage,
+                            metadata: Dict[str, Any]) -> None:
+    """Run the active LSP hooks registered for the event `method` maps to"""
+    # Map LSP methods to event types
+    method_mapping = {
+        "textDocument/publishDiagnostics": LSPEventType.DIAGNOSTICS_PUBLISHED,
+        "textDocument/completion": LSPEventType.COMPLETION_TRIGGERED,
+        "textDocument/hover": LSPEventType.HOVER_REQUEST,
+        "textDocument/definition": LSPEventType.DEFINITION_REQUEST,
+        "textDocument/documentSymbol": LSPEventType.DOCUMENT_SYMBOL,
+        "workspace/symbol": LSPEventType.WORKSPACE_SYMBOL,
+        "textDocument/codeAction": LSPEventType.CODE_ACTION,
+        "textDocument/references": LSPEventType.REFERENCES,
+        "textDocument/rename": LSPEventType.RENAME,
+        "textDocument/formatting": LSPEventType.FORMATTING,
+        "workspace/didChangeWatchedFiles": LSPEventType.WORKSPACE_CHANGE,
+        "textDocument/didChange": LSPEventType.DOCUMENT_CHANGE,
+    }
+    
+    event_type = method_mapping.get(method)
+    if not event_type:
+        return
+    
+    # Import hook registry
+    try:
+        from core.hooks.hook_registry import get_hook_registry
+        registry = get_hook_registry()
+        
+        # Get hooks that can handle this event
+        compatible_hooks = []
+        for hook_name, hook_metadata in registry.hooks.items():
+            if (hook_metadata.lsp_compatible and 
+                hook_metadata.state.value == "active" and
+                event_type.value in hook_metadata.triggers):
+                compatible_hooks.append(hook_name)
+        
+        # Execute hooks
+        for hook_name in compatible_hooks:
+            context = HookExecutionContext(
+                hook_name=hook_name,
+                lsp_event=event_type,
+                message=message,
+                execution_id=f"{hook_name}_{int(time.time() * 1000)}",
+                mode=HookExecutionMode.ASYNCHRONOUS,  # Default to async for LSP events
+                metadata=dict(metadata)
+            )
+            
+            # Execute hook asynchronously
+            asyncio.create_task(hook_executor.execute_hook(context))
+            
+    except Exception as e:
+        logger.error(f"Error triggering hooks for {method}: {e}")
+
+
 class LSPHookBridge:
     """Main LSP-Hook Bridge system"""
     
@@ -873,6 +1273,7 @@ class LSPHookBridge:
         self.language_servers: Dict[str, LanguageServerConnection] = {}
         self.hook_executor = HookExecutor(max_workers=6)
         self.cache_manager = LSPCacheManager()
+        self.documents = DocumentStore()
         self.running = False
         
         # Configuration
@@ -1009,6 +1410,69 @@ class LSPHookBridge:
         logger.info(f"Removed language server: {name}")
         return True
     
+    def _servers_for(self, uri: str) -> List[LanguageServerConnection]:
+        """Language servers handling a document, by file extension"""
+        suffix = Path(uri).suffix
+        return [server for server in self.language_servers.values()
+                if suffix in server.config.file_extensions]
+    
+    async def open_document(self, uri: str, language_id: str, text: str, version: int = 1) -> None:
+        """Start tracking a document and open it on the servers that handle it"""
+        document = self.documents.open(uri, language_id, text, version)
+        self.cache_manager.invalidate_document(uri)
+        
+        for server in self._servers_for(uri):
+            try:
+                await server.open_document(document)
+            except Exception as e:
+                logger.error(f"didOpen failed for {server.config.name}: {e}")
+    
+    async def change_document(self, uri: str, changes: List[Dict[str, Any]], version: int) -> None:
+        """Apply LSP content changes to an open document and forward them
+        
+        Raises KeyError for a document that is not open and ValueError for a
+        version that does not increase.
+        """
+        document = self.documents.change(uri, changes, version)
+        self.cache_manager.invalidate_document(uri)
+        
+        # Hooks run once per edit, with or without servers for the file, and
+        # see the edits, never a full-text copy of the document
+        servers = self._servers_for(uri)
+        incremental = all("range" in change for change in changes)
+        await trigger_lsp_hooks(self.hook_executor, "textDocument/didChange", LSPMessage(
+            id=None,
+            method="textDocument/didChange",
+            params={
+                "textDocument": {"uri": document.uri, "version": document.version},
+                "contentChanges": changes if incremental else [],
+                "textReplaced": not incremental,
+                "lineCount": document.line_count
+            },
+            message_type=LSPMessageType.NOTIFICATION
+        ), {
+            'language_servers': [server.config.name for server in servers],
+            'method': "textDocument/didChange",
+            'file_extensions': [Path(uri).suffix]
+        })
+        
+        for server in servers:
+            try:
+                await server.change_document(document, changes)
+            except Exception as e:
+                logger.error(f"didChange failed for {server.config.name}: {e}")
+    
+    async def close_document(self, uri: str) -> None:
+        """Stop tracking a document and close it on every server"""
+        self.documents.close(uri)
+        self.cache_manager.invalidate_document(uri)
+        
+        for server in self.language_servers.values():
+            try:
+                await server.close_document(uri)
+            except Exception as e:
+                logger.error(f"didClose failed for {server.config.name}: {e}")
+    
     async def _auto_discover_servers(self) -> None:
         """Auto-discover common language servers"""
         # Common language server configurations
@@ -1065,10 +1529,12 @@ class LSPHookBridge:
             "timestamp": datetime.now().isoformat()
         }
         
-        # Cache diagnostics for performance
+        # Cache diagnostics for performance; new diagnostics mean the document
+        # changed, so entries derived from its previous state are dropped
         if self.config["cache_enabled"]:
+            self.cache_manager.invalidate_document(uri)
             cache_key = f"diagnostics:{uri}"
-            self.cache_manager.set(cache_key, enhanced_data, ttl=300)  # 5 minute TTL
+            self.cache_manager.set(cache_key, enhanced_data, ttl=300, uri=uri)  # 5 minute TTL
     
     async def _handle_completion(self, params: Dict[str, Any]) -> None:
         """Handle completion requests"""
@@ -1083,7 +1549,7 @@ class LSPHookBridge:
                 "position": position,
                 "timestamp": datetime.now().isoformat()
             }
-            self.cache_manager.set(cache_key, completion_context, ttl=60)  # 1 minute TTL
+            self.cache_manager.set(cache_key, completion_context, ttl=60, uri=uri)  # 1 minute TTL
     
     async def _health_monitor(self) -> None:
         """Monitor health of language servers"""
@@ -1113,6 +1579,8 @@ class LSPHookBridge:
                 "restart_count": server.restart_count,
                 "last_heartbeat": server.last_heartbeat.isoformat(),
                 "capabilities": len(server.capabilities),
+                "sync_kind": server.sync_kind.name,
+                "open_documents": len(server.open_documents),
                 "file_extensions": server.config.file_extensions
             }
         
@@ -1121,10 +1589,8 @@ class LSPHookBridge:
             "config": self.config,
             "language_servers": server_status,
             "hook_executor_stats": self.hook_executor.get_execution_stats(),
-            "cache_stats": {
-                "size": len(self.cache_manager.cache),
-                "max_size": self.cache_manager.max_size
-            },
+            "cache_stats": self.cache_manager.get_stats(),
+            "open_documents": len(self.documents),
             "system_resources": {
                 "memory_usage_mb": psutil.Process().memory_info().rss / 1024 / 1024,
                 "cpu_percent": psutil.Process().cpu_percent()
@@ -1152,17 +1618,14 @@ class LSPHookBridge:
                         results[f"{name}_symbols"] = symbols
                     
                     if analysis_type in ["full", "diagnostics"]:
-                        # Diagnostics are usually sent automatically, but we can request them
-                        # by opening the document
-                        open_params = {
-                            "textDocument": {
-                                "uri": f"file://{file_path}",
-                                "languageId": name,
-                                "version": 1,
-                                "text": Path(file_path).read_text()
-                            }
-                        }
-                        await server.send_notification("textDocument/didOpen", open_params)
+                        # Diagnostics are published for open documents; one already
+                        # open is kept current by change_document
+                        uri = f"file://{file_path}"
+                        document = self.documents.get(uri)
+                        if document is None:
+                            document = self.documents.open(uri, name, Path(file_path).read_text())
+                        if uri not in server.open_documents:
+                            await server.open_document(document)
                         
                 except Exception as e:
                     logger.error(f"Manual analysis failed for {name}: {e}")
@@ -1189,5 +1652,8 @@ __all__ = [
     'LanguageServerConfig',
     'LSPEventType',
     'HookExecutionMode',
-    'HookExecutionContext'
+    'HookExecutionContext',
+    'TextDocumentSyncKind',
+    'TextDocument',
+    'DocumentStore'
 ]
\ No newline at end of file
@@ -62,9 +62,8 @@ class SemanticAnalysisBackend:
             # Parse symbols
             symbols = parser.parse(code, file_id_obj, self.symbol_counter)
             
-            # Add symbols to index
-            for symbol in symbols:
-                self.symbol_index.add_symbol(symbol)
+            # Replace the file's symbols from any earlier parse
+            self.symbol_index.reindex_file(file_id_obj, symbols)
             
             # Extract relationships if requested
             relationships = []
@@ -248,13 +247,21 @@ class SemanticAnalysisBackend:
             List of matching symbols
         """
         try:
-            # Use the symbol index to search
+            # Use the symbol index to search: exact names, then prefixes, then similar names
             results = []
+            match_types = {}
             
-            # Simple name-based search (would be more sophisticated in practice)
             if query:
-                symbols = self.symbol_index.find_symbols_by_name(query)
-                results.extend(symbols)
+                max_results = options.get('maxResults', 100)
+                candidates = [(symbol, 'exact') for symbol in self.symbol_index.find_symbols_by_name(query)]
+                candidates += [(symbol, 'prefix') for symbol in self.symbol_index.find_symbols_by_prefix(query, max_results)]
+                if options.get('fuzzy', True):
+                    candidates += [(symbol, 'fuzzy') for symbol, _ in self.symbol_index.find_symbols_fuzzy(query, max_results)]
+                
+                for symbol, match_type in candidates:
+                    if symbol.id not in match_types:
+                        match_types[symbol.id] = match_type
+                        results.append(symbol)
             
             # Apply filters
             if filters.get('language'):
@@ -290,7 +297,7 @@ class SemanticAnalysisBackend:
                     },
                     'match': {
                         'score': self._calculate_match_score(symbol, query),
-                        'type': 'exact' if symbol.name == query else 'partial',
+                        'type': match_types[symbol.id],
                         'highlightRanges': []
                     }
                 })
@@ -9,9 +9,12 @@ Based on codanna's Symbol, SymbolKind, and related structures.
 """
 
 from abc import ABC, abstractmethod
+from bisect import bisect_left
 from dataclasses import dataclass, field
-from typing import Optional, List, Dict, Any, Union
+from itertools import chain
+from typing import Optional, List, Dict, Any, FrozenSet, Set, Tuple, Union
 from enum import Enum, auto
+import math
 import uuid
 
 
@@ -328,38 +331,108 @@ class SymbolIndex:
     """In-memory symbol index for fast lookups.
     
     Provides fast symbol lookup capabilities based on codanna's
-    indexing patterns.
+    indexing patterns. Besides the exact name, file and kind indexes it
+    keeps:
+    
+    - a sorted list of case-folded names for prefix search, re-sorted
+      lazily after additions (cheap, since it is nearly sorted);
+    - a trigram index over case-folded names, partitioned by each name's
+      trigram count, for fuzzy search;
+    - source and target adjacency lists for relationships.
+    
+    Removing a symbol also drops the relationships it takes part in, so a
+    file can be re-indexed by removing its symbols and adding new ones.
     """
     
     def __init__(self):
         self._symbols: Dict[SymbolId, Symbol] = {}
-        self._by_name: Dict[str, List[Symbol]] = {}
-        self._by_file: Dict[FileId, List[Symbol]] = {}
-        self._by_kind: Dict[SymbolKind, List[Symbol]] = {}
-        self._relationships: List[SymbolRelationship] = []
+        # Buckets are dicts keyed by symbol ID: insertion-ordered with O(1) removal
+        self._by_name: Dict[str, Dict[SymbolId, Symbol]] = {}
+        self._by_file: Dict[FileId, Dict[SymbolId, Symbol]] = {}
+        self._by_kind: Dict[SymbolKind, Dict[SymbolId, Symbol]] = {}
+        
+        # Case-folded name -> exact names, with the sorted and trigram views on top
+        self._names_by_key: Dict[str, Set[str]] = {}
+        self._sorted_keys: List[str] = []
+        self._sorted_dirty = False
+        self._dead_keys: Set[str] = set()
+        self._by_trigram: Dict[int, Dict[str, Set[str]]] = {}
+        
+        self._outgoing: Dict[SymbolId, List[SymbolRelationship]] = {}
+        self._incoming: Dict[SymbolId, List[SymbolRelationship]] = {}
+        self._relationship_count = 0
     
     def add_symbol(self, symbol: Symbol):
-        """Add a symbol to the index."""
+        """Add a symbol to the index, replacing any symbol with the same ID."""
+        if symbol.id in self._symbols:
+            self._remove_from_buckets(self._symbols[symbol.id])
         self._symbols[symbol.id] = symbol
         
-        # Index by name
-        if symbol.name not in self._by_name:
-            self._by_name[symbol.name] = []
-        self._by_name[symbol.name].append(symbol)
-        
-        # Index by file
-        if symbol.file_id not in self._by_file:
-            self._by_file[symbol.file_id] = []
-        self._by_file[symbol.file_id].append(symbol)
+        self._by_name.setdefault(symbol.name, {})[symbol.id] = symbol
+        self._by_file.setdefault(symbol.file_id, {})[symbol.id] = symbol
+        self._by_kind.setdefault(symbol.kind, {})[symbol.id] = symbol
         
-        # Index by kind
-        if symbol.kind not in self._by_kind:
-            self._by_kind[symbol.kind] = []
-        self._by_kind[symbol.kind].append(symbol)
+        # Index the name for prefix and fuzzy search
+        key = symbol.name.lower()
+        names = self._names_by_key.get(key)
+        if names is None:
+            names = self._names_by_key[key] = set()
+            if key in self._dead_keys:
+                self._dead_keys.discard(key)  # still in the sorted list
+            else:
+                self._sorted_keys.append(key)
+                self._sorted_dirty = True
+            trigrams = _trigrams(key)
+            postings = self._by_trigram.setdefault(len(trigrams), {})
+            for trigram in trigrams:
+                postings.setdefault(trigram, set()).add(key)
+        names.add(symbol.name)
     
     def add_relationship(self, relationship: SymbolRelationship):
         """Add a relationship to the index."""
-        self._relationships.append(relationship)
+        self._outgoing.setdefault(relationship.source, []).append(relationship)
+        self._incoming.setdefault(relationship.target, []).append(relationship)
+        self._relationship_count += 1
+    
+    def remove_symbol(self, symbol_id: SymbolId) -> bool:
+        """Remove a symbol and the relationships it takes part in.
+        
+        Returns:
+            True if the symbol was indexed
+        """
+        symbol = self._symbols.pop(symbol_id, None)
+        if symbol is None:
+            return False
+        self._remove_from_buckets(symbol)
+        self._remove_relationships({symbol_id})
+        return True
+    
+    def remove_file_symbols(self, file_id: FileId) -> int:
+        """Remove every symbol of a file and the relationships they take part in.
+        
+        Returns:
+            Number of symbols removed
+        """
+        symbols = list(self._by_file.get(file_id, {}).values())
+        for symbol in symbols:
+            del self._symbols[symbol.id]
+            self._remove_from_buckets(symbol)
+        self._remove_relationships({symbol.id for symbol in symbols})
+        return len(symbols)
+    
+    def reindex_file(self, file_id: FileId, symbols: List[Symbol],
+                     relationships: Optional[List[SymbolRelationship]] = None) -> int:
+        """Replace a file's symbols and relationships with a fresh extraction.
+        
+        Returns:
+            Number of symbols removed
+        """
+        removed = self.remove_file_symbols(file_id)
+        for symbol in symbols:
+            self.add_symbol(symbol)
+        for relationship in relationships or []:
+            self.add_relationship(relationship)
+        return removed
     
     def get_symbol(self, symbol_id: SymbolId) -> Optional[Symbol]:
         """Get symbol by ID."""
@@ -367,24 +440,97 @@ class SymbolIndex:
     
     def find_symbols_by_name(self, name: str) -> List[Symbol]:
         """Find symbols by name."""
-        return self._by_name.get(name, []).copy()
+        return list(self._by_name.get(name, {}).values())
+    
+    def find_symbols_by_prefix(self, prefix: str, limit: int = 100) -> List[Symbol]:
+        """Find symbols whose name starts with prefix, ignoring case.
+        
+        Results are ordered by case-folded name.
+        """
+        if self._sorted_dirty:
+            self._sorted_keys.sort()
+            self._sorted_dirty = False
+        
+        prefix = prefix.lower()
+        results: List[Symbol] = []
+        position = bisect_left(self._sorted_keys, prefix)
+        while position < len(self._sorted_keys) and len(results) < limit:
+            key = self._sorted_keys[position]
+            if not key.startswith(prefix):
+                break
+            for name in sorted(self._names_by_key.get(key, ())):
+                results.extend(self._by_name[name].values())
+            position += 1
+        return results[:limit]
+    
+    def find_symbols_fuzzy(self, query: str, limit: int = 20,
+                           min_similarity: float = 0.3) -> List[Tuple[Symbol, float]]:
+        """Find symbols whose name is similar to query, ignoring case.
+        
+        Similarity is the Jaccard index of the names' trigram sets. Only
+        names with a trigram count that can reach min_similarity are
+        considered, and for each count the number of trigrams a name must
+        share with the query is fixed, so candidates are collected from the
+        rarest postings alone and checked against the rest.
+        
+        Returns:
+            (symbol, similarity) pairs, most similar first
+        """
+        query_trigrams = _trigrams(query.lower())
+        query_size = len(query_trigrams)
+        min_similarity = max(min_similarity, 1e-9)
+        
+        scored = []
+        for size in range(math.ceil(min_similarity * query_size), int(query_size / min_similarity) + 1):
+            by_trigram = self._by_trigram.get(size)
+            if not by_trigram:
+                continue
+            # |q & k| / |q | k| >= t  <=>  |q & k| >= t * (|q| + |k|) / (1 + t)
+            needed = max(1, math.ceil(min_similarity * (query_size + size) / (1 + min_similarity) - 1e-9))
+            if needed > min(query_size, size):
+                continue
+            postings = sorted((by_trigram.get(trigram, _NO_KEYS) for trigram in query_trigrams), key=len)
+            
+            # A name missing all of the rarest len - needed + 1 postings cannot reach `needed`
+            candidates: Set[str] = set()
+            for posting in postings[:query_size - needed + 1]:
+                candidates.update(posting)
+            
+            for key in candidates:
+                shared = sum(1 for posting in postings if key in posting)
+                if shared >= needed:
+                    scored.append((shared / (query_size + size - shared), key))
+        scored.sort(key=lambda item: (-item[0], item[1]))
+        
+        results: List[Tuple[Symbol, float]] = []
+        for similarity, key in scored:
+            for name in sorted(self._names_by_key[key]):
+                results.extend((symbol, similarity) for symbol in self._by_name[name].values())
+            if len(results) >= limit:
+                break
+        return results[:limit]
     
     def find_symbols_by_file(self, file_id: FileId) -> List[Symbol]:
         """Find symbols in a file."""
-        return self._by_file.get(file_id, []).copy()
+        return list(self._by_file.get(file_id, {}).values())
     
     def find_symbols_by_kind(self, kind: SymbolKind) -> List[Symbol]:
         """Find symbols by kind."""
-        return self._by_kind.get(kind, []).copy()
+        return list(self._by_kind.get(kind, {}).values())
     
     def find_relationships(self, source: Optional[SymbolId] = None, 
                           target: Optional[SymbolId] = None,
                           relationship_type: Optional[str] = None) -> List[SymbolRelationship]:
         """Find relationships matching criteria."""
+        if source is not None:
+            candidates = self._outgoing.get(source, [])
+        elif target is not None:
+            candidates = self._incoming.get(target, [])
+        else:
+            candidates = chain.from_iterable(self._outgoing.values())
+        
         results = []
-        for rel in self._relationships:
-            if source is not None and rel.source != source:
-                continue
+        for rel in candidates:
             if target is not None and rel.target != target:
                 continue
             if relationship_type is not None and rel.relationship_type != relationship_type:
@@ -402,7 +548,14 @@ class SymbolIndex:
         self._by_name.clear()
         self._by_file.clear()
         self._by_kind.clear()
-        self._relationships.clear()
+        self._names_by_key.clear()
+        self._sorted_keys.clear()
+        self._sorted_dirty = False
+        self._dead_keys.clear()
+        self._by_trigram.clear()
+        self._outgoing.clear()
+        self._incoming.clear()
+        self._relationship_count = 0
     
     def symbol_count(self) -> int:
         """Get total number of symbols."""
@@ -410,4 +563,63 @@ class SymbolIndex:
     
     def relationship_count(self) -> int:
         """Get total number of relationships."""
-        return len(self._relationships)
\ No newline at end of file
+        return self._relationship_count
+    
+    def _remove_from_buckets(self, symbol: Symbol):
+        for index, key in ((self._by_name, symbol.name), (self._by_file, symbol.file_id),
+                           (self._by_kind, symbol.kind)):
+            bucket = index[key]
+            del bucket[symbol.id]
+            if not bucket:
+                del index[key]
+        
+        if symbol.name in self._by_name:
+            return
+        key = symbol.name.lower()
+        names = self._names_by_key[key]
+        names.discard(symbol.name)
+        if names:
+            return
+        del self._names_by_key[key]
+        trigrams = _trigrams(key)
+        postings = self._by_trigram[len(trigrams)]
+        for trigram in trigrams:
+            keys = postings[trigram]
+            keys.discard(key)
+            if not keys:
+                del postings[trigram]
+        if not postings:
+            del self._by_trigram[len(trigrams)]
+        
+        # Left in the sorted list until dead keys outnumber live ones
+        self._dead_keys.add(key)
+        if len(self._dead_keys) > len(self._names_by_key):
+            self._sorted_keys = [live for live in self._sorted_keys if live not in self._dead_keys]
+            self._dead_keys.clear()
+    
+    def _remove_relationships(self, symbol_ids: Set[SymbolId]):
+        """Drop every relationship with a source or target in symbol_ids."""
+        for adjacency, opposite, far_end in ((self._outgoing, self._incoming, 'target'),
+                                             (self._incoming, self._outgoing, 'source')):
+            for symbol_id in symbol_ids:
+                for rel in adjacency.pop(symbol_id, ()):
+                    other = getattr(rel, far_end)
+                    if other in symbol_ids:
+                        # Both ends removed: counted once, on the outgoing pass
+                        self._relationship_count -= adjacency is self._outgoing
+                        continue
+                    self._relationship_count -= 1
+                    remaining = [kept for kept in opposite.get(other, ()) if kept is not rel]
+                    if remaining:
+                        opposite[other] = remaining
+                    else:
+                        opposite.pop(other, None)
+
+
+_NO_KEYS: FrozenSet[str] = frozenset()
+
+
+def _trigrams(key: str) -> Set[str]:
+    """Trigrams of a case-folded name, padded so short names and word edges count."""
+    padded = f"  {key} "
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
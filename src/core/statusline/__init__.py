@@ -17,8 +17,9 @@ from .segments import (
     CustomSegment
 )
 from .config import StatuslineConfig, ConfigManager
-from .themes import Theme, DefaultTheme, MinimalTheme, PowerlineTheme
+from .themes import Theme, DefaultTheme, MinimalTheme, PowerlineTheme, ThemeManager
 from .utils import TerminalUtils, ColorUtils, GitUtils
+from .daemon import StatuslineDaemon, default_socket_path
 
 __version__ = "1.0.0"
 __all__ = [
@@ -37,7 +38,10 @@ __all__ = [
     "DefaultTheme",
     "MinimalTheme", 
     "PowerlineTheme",
+    "ThemeManager",
     "TerminalUtils",
     "ColorUtils",
-    "GitUtils"
+    "GitUtils",
+    "StatuslineDaemon",
+    "default_socket_path"
 ]
\ No newline at end of file
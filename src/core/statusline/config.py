@@ -23,6 +23,7 @@ class SegmentConfig:
     priority: int = 100
     cache_timeout: float = 1.0
     max_width: Optional[int] = None
+    render_timeout: Optional[float] = None  # Overrides StatuslineConfig.segment_timeout
     config: Dict[str, Any] = field(default_factory=dict)
 
 
@@ -38,6 +39,7 @@ class StatuslineConfig:
     # Update and performance settings
     update_interval: float = 1.0
     cache_timeout: float = 1.0
+    segment_timeout: float = 0.5  # Per-segment render deadline in seconds
     max_width: Optional[int] = None
     truncate_mode: str = 'ellipsis'  # ellipsis, fade, cut
     
@@ -121,7 +123,7 @@ class ConfigManager:
         
         # Update basic settings
         for key in ['layout', 'position', 'separator', 'padding', 'update_interval',
-                   'cache_timeout', 'max_width', 'truncate_mode', 'live_updates',
+                   'cache_timeout', 'segment_timeout', 'max_width', 'truncate_mode', 'live_updates',
                    'color_support', 'unicode_support', 'debug', 'log_file']:
             if key in data:
                 setattr(config, key, data[key])
@@ -149,6 +151,7 @@ class ConfigManager:
                 priority=segment_data.get('priority', 100),
                 cache_timeout=segment_data.get('cache_timeout', 1.0),
                 max_width=segment_data.get('max_width'),
+                render_timeout=segment_data.get('render_timeout'),
                 config=segment_data.get('config', {})
             )
             config.segments.append(segment_config)
@@ -212,6 +215,7 @@ class ConfigManager:
             'padding': config.padding,
             'update_interval': config.update_interval,
             'cache_timeout': config.cache_timeout,
+            'segment_timeout': config.segment_timeout,
             'truncate_mode': config.truncate_mode,
             'live_updates': config.live_updates,
             'color_support': config.color_support,
@@ -244,6 +248,9 @@ class ConfigManager:
             if segment.max_width:
                 segment_data['max_width'] = segment.max_width
             
+            if segment.render_timeout is not None:
+                segment_data['render_timeout'] = segment.render_timeout
+            
             if segment.config:
                 segment_data['config'] = segment.config
             
@@ -285,6 +292,9 @@ class ConfigManager:
         if config.cache_timeout < 0:
             issues.append("cache_timeout must be non-negative")
         
+        if config.segment_timeout <= 0:
+            issues.append("segment_timeout must be positive")
+        
         if config.padding < 0:
             issues.append("padding must be non-negative")
         
@@ -304,6 +314,9 @@ class ConfigManager:
             
             if segment.max_width is not None and segment.max_width <= 0:
                 issues.append(f"Segment {i}: max_width must be positive if specified")
+            
+            if segment.render_timeout is not None and segment.render_timeout <= 0:
+                issues.append(f"Segment {i}: render_timeout must be positive if specified")
         
         return issues
     
@@ -320,6 +333,7 @@ class ConfigManager:
             'padding': 1,
             'update_interval': 1.0,
             'cache_timeout': 1.0,
+            'segment_timeout': 0.5,
             'max_width': 120,
             'truncate_mode': 'ellipsis',
             'live_updates': True,
@@ -381,6 +395,7 @@ class ConfigManager:
                     'type': 'network',
                     'enabled': True,
                     'priority': 45,
+                    'render_timeout': 1.0,
                     'config': {
                         'show_connectivity': True,
                         'show_tunnel_status': True
@@ -0,0 +1,324 @@
+"""
+Statusline Daemon
+
+Long-running statusline server that keeps renderers and segment caches warm
+and serves pre-rendered lines to thin clients over a Unix domain socket.
+
+Protocol: one tab-separated request per line.
+    render<TAB>width<TAB>cwd      -> one rendered line
+    subscribe<TAB>width<TAB>cwd   -> a line now and after every change
+    stats                         -> daemon statistics as JSON
+    shutdown                      -> "ok", then the daemon exits
+"""
+
+import os
+import sys
+import json
+import time
+import socket
+import threading
+import socketserver
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from typing import Callable, Dict, List, Optional
+
+from .config import StatuslineConfig
+from .renderer import StatuslineRenderer
+from .segments import SystemInfoSegment, NetworkSegment, TimeSegment
+
+
+def default_socket_path() -> str:
+    """Socket path shared by the daemon and the thin client in bin/statusline.py"""
+    override = os.environ.get('CLAUDE_STATUSLINE_SOCKET')
+    if override:
+        return override
+    
+    runtime_dir = os.environ.get('XDG_RUNTIME_DIR') or os.environ.get('TMPDIR') or '/tmp'
+    return os.path.join(runtime_dir, f"claude-statusline-{os.getuid()}.sock")
+
+
+@dataclass
+class DirectoryState:
+    """Rendered state for one working directory"""
+    path: str
+    renderer: Optional[StatuslineRenderer] = None
+    segments: List[str] = field(default_factory=list)
+    layouts: Dict[int, str] = field(default_factory=dict)  # width -> line for current segments
+    version: int = 0
+    subscribers: int = 0
+    last_request: float = 0.0
+    ready: threading.Event = field(default_factory=threading.Event)
+
+
+class _DaemonRequestHandler(socketserver.StreamRequestHandler):
+    """Handles one client connection"""
+    
+    def handle(self):
+        daemon = self.server.statusline_daemon
+        
+        for raw_request in self.rfile:
+            command, _, arguments = raw_request.decode('utf-8', 'replace').rstrip('\r\n').partition('\t')
+            
+            try:
+                if command == 'render':
+                    width, cwd = self._parse_target(arguments)
+                    self._send(daemon.render_line(cwd, width))
+                elif command == 'subscribe':
+                    width, cwd = self._parse_target(arguments)
+                    daemon.stream(cwd, width, self._send)
+                    return
+                elif command == 'stats':
+                    self._send(json.dumps(daemon.get_stats()))
+                elif command == 'shutdown':
+                    self._send('ok')
+                    threading.Thread(target=daemon.shutdown, daemon=True).start()
+                    return
+                else:
+                    self._send(f"error\tunknown command: {command}")
+            except (BrokenPipeError, ConnectionResetError):
+                return
+            except ValueError as e:
+                self._send(f"error\t{e}")
+    
+    @staticmethod
+    def _parse_target(arguments: str):
+        width, _, cwd = arguments.partition('\t')
+        if not cwd:
+            raise ValueError("expected width and working directory")
+        return max(int(width), 1), os.path.realpath(cwd)
+    
+    def _send(self, line: str):
+        self.wfile.write(line.replace('\n', ' ').encode('utf-8') + b'\n')
+        self.wfile.flush()
+
+
+if hasattr(socketserver, 'UnixStreamServer'):
+    class _DaemonServer(socketserver.ThreadingMixIn, socketserver.UnixStreamServer):
+        daemon_threads = True
+        block_on_close = False
+else:  # No Unix domain sockets (older Windows builds)
+    _DaemonServer = None
+
+
+class StatuslineDaemon:
+    """
+    Serves pre-rendered statuslines for every working directory in use
+    
+    A single collector thread renders each tracked directory once per
+    interval, so any number of terminals in the same directory share one
+    data-collection pass. Segments that do not depend on the directory
+    (system info, network, time) are shared across all directories.
+    Render requests are answered from the last collected segments;
+    subscribers are pushed a new line whenever their directory changes.
+    """
+    
+    SHARED_SEGMENTS = (SystemInfoSegment, NetworkSegment, TimeSegment)
+    
+    def __init__(self, config: StatuslineConfig, socket_path: Optional[str] = None,
+                 interval: Optional[float] = None, color: Optional[bool] = None,
+                 max_directories: int = 32, idle_timeout: float = 300.0,
+                 first_render_timeout: float = 2.0):
+        self.config = config
+        self.socket_path = socket_path or default_socket_path()
+        self.interval = interval or config.update_interval
+        self.color = color
+        self.max_directories = max_directories
+        self.idle_timeout = idle_timeout
+        self.first_render_timeout = first_render_timeout
+        
+        self._directories: 'OrderedDict[str, DirectoryState]' = OrderedDict()
+        self._template: Optional[StatuslineRenderer] = None
+        self._condition = threading.Condition()
+        self._wakeup = threading.Event()
+        self._stop_event = threading.Event()
+        self._server: Optional[socketserver.BaseServer] = None
+        self._collector: Optional[threading.Thread] = None
+        
+        self.started_at = time.time()
+        self.requests = 0
+        self.collections = 0
+        self.last_collection_time = 0.0
+    
+    def serve_forever(self):
+        """Bind the socket and serve until shutdown() is called"""
+        if _DaemonServer is None:
+            raise RuntimeError("The statusline daemon requires Unix domain sockets")
+        
+        self._remove_stale_socket()
+        self._server = _DaemonServer(self.socket_path, _DaemonRequestHandler)
+        self._server.statusline_daemon = self
+        os.chmod(self.socket_path, 0o600)
+        
+        self._stop_event.clear()
+        self._collector = threading.Thread(target=self._collect_loop, name='statusline-collector', daemon=True)
+        self._collector.start()
+        
+        if self.config.debug:
+            print(f"Statusline daemon listening on {self.socket_path}", file=sys.stderr)
+        
+        try:
+            self._server.serve_forever(poll_interval=0.5)
+        finally:
+            self._stop_event.set()
+            self._wakeup.set()
+            with self._condition:
+                self._condition.notify_all()
+            self._server.server_close()
+            try:
+                os.unlink(self.socket_path)
+            except OSError:
+                pass
+    
+    def shutdown(self):
+        """Stop serving; must not be called from the serve_forever() thread"""
+        self._stop_event.set()
+        self._wakeup.set()
+        with self._condition:
+            self._condition.notify_all()
+        if self._server:
+            self._server.shutdown()
+    
+    def render_line(self, cwd: str, width: int) -> str:
+        """Get the current line for a directory, waiting for its first collection"""
+        state = self._track(cwd)
+        if not state.ready.is_set():
+            self._wakeup.set()
+            state.ready.wait(self.first_render_timeout)
+        
+        with self._condition:
+            return self._layout(state, width)
+    
+    def stream(self, cwd: str, width: int, send: Callable[[str], None]):
+        """Push the line for a directory to `send` now and after every change"""
+        state = self._track(cwd, subscribe=True)
+        if not state.ready.is_set():
+            self._wakeup.set()
+            state.ready.wait(self.first_render_timeout)
+        
+        try:
+            sent_version = None
+            while not self._stop_event.is_set():
+                with self._condition:
+                    while state.version == sent_version and not self._stop_event.is_set():
+                        self._condition.wait()
+                    if self._stop_event.is_set():
+                        return
+                    sent_version = state.version
+                    line = self._layout(state, width)
+                send(line)
+        finally:
+            with self._condition:
+                state.subscribers -= 1
+    
+    def collect(self):
+        """Render every tracked directory once and notify subscribers of changes"""
+        start_time = time.perf_counter()
+        with self._condition:
+            self._evict_idle_directories()
+            directories = list(self._directories.values())
+        
+        for state in directories:
+            if not os.path.isdir(state.path):
+                state.ready.set()
+                continue
+            
+            # Segments are bound to the directory rather than the process cwd,
+            # so deadlines apply: a slow segment cannot hold up other directories
+            if state.renderer is None:
+                state.renderer = self._create_renderer(state.path)
+            segments = state.renderer.render_segments()
+            
+            with self._condition:
+                if segments != state.segments:
+                    state.segments = segments
+                    state.layouts.clear()
+                    state.version += 1
+                    self._condition.notify_all()
+            state.ready.set()
+        
+        self.collections += 1
+        self.last_collection_time = time.perf_counter() - start_time
+    
+    def get_stats(self) -> Dict[str, object]:
+        """Get daemon statistics"""
+        with self._condition:
+            return {
+                'socket': self.socket_path,
+                'uptime_seconds': round(time.time() - self.started_at, 1),
+                'directories': len(self._directories),
+                'subscribers': sum(state.subscribers for state in self._directories.values()),
+                'requests': self.requests,
+                'collections': self.collections,
+                'last_collection_ms': round(self.last_collection_time * 1000, 2),
+                'interval': self.interval
+            }
+    
+    def _track(self, cwd: str, subscribe: bool = False) -> DirectoryState:
+        with self._condition:
+            self.requests += 1
+            state = self._directories.get(cwd)
+            if state is None:
+                state = DirectoryState(path=cwd)
+                self._directories[cwd] = state
+            self._directories.move_to_end(cwd)
+            state.last_request = time.monotonic()
+            if subscribe:
+                state.subscribers += 1
+            return state
+    
+    def _layout(self, state: DirectoryState, width: int) -> str:
+        line = state.layouts.get(width)
+        if line is None:
+            line = state.renderer.layout(state.segments, width) if state.renderer else ""
+            state.layouts[width] = line
+        return line
+    
+    def _create_renderer(self, cwd: str) -> StatuslineRenderer:
+        renderer = StatuslineRenderer(self.config, cwd=cwd)
+        if self.color is not None:
+            renderer.color_utils.color_support = self.color
+        
+        if self._template is None:
+            self._template = renderer
+        else:
+            # Renderers share the configuration, so their segments line up by position
+            renderer.segments = [
+                shared if isinstance(own, self.SHARED_SEGMENTS) else own
+                for own, shared in zip(renderer.segments, self._template.segments)
+            ]
+        return renderer
+    
+    def _collect_loop(self):
+        while not self._stop_event.is_set():
+            try:
+                self.collect()
+            except Exception as e:
+                if self.config.debug:
+                    print(f"Error collecting statusline data: {e}", file=sys.stderr)
+            
+            self._wakeup.wait(self.interval)
+            self._wakeup.clear()
+    
+    def _evict_idle_directories(self):
+        now = time.monotonic()
+        for path, state in list(self._directories.items()):
+            idle = now - state.last_request > self.idle_timeout
+            over_limit = len(self._directories) > self.max_directories
+            if state.subscribers == 0 and (idle or over_limit):
+                del self._directories[path]
+                if state.renderer is not None and state.renderer is not self._template:
+                    state.renderer.close()
+    
+    def _remove_stale_socket(self):
+        if not os.path.exists(self.socket_path):
+            return
+        
+        probe = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        try:
+            probe.connect(self.socket_path)
+        except OSError:
+            os.unlink(self.socket_path)
+        else:
+            raise RuntimeError(f"A statusline daemon is already running on {self.socket_path}")
+        finally:
+            probe.close()
@@ -9,6 +9,7 @@ import sys
 import os
 import time
 import threading
+from concurrent.futures import Future, ThreadPoolExecutor, TimeoutError as FutureTimeoutError
 from typing import List, Dict, Any, Optional, Callable
 from dataclasses import dataclass
 from datetime import datetime
@@ -26,6 +27,7 @@ class RendererStats:
     last_render_time: float = 0.0
     average_render_time: float = 0.0
     error_count: int = 0
+    timeout_count: int = 0
     cache_hits: int = 0
     cache_misses: int = 0
 
@@ -35,8 +37,9 @@ class StatuslineRenderer:
     Main statusline renderer that coordinates segments and handles terminal output
     """
     
-    def __init__(self, config: StatuslineConfig):
+    def __init__(self, config: StatuslineConfig, cwd: Optional[str] = None):
         self.config = config
+        self.cwd = cwd  # Directory the segments describe; None follows the process
         self.segments: List[BaseSegment] = []
         self.theme = config.theme
         self.terminal = TerminalUtils()
@@ -53,6 +56,12 @@ class StatuslineRenderer:
         self._stop_event = threading.Event()
         self._lock = threading.Lock()
         
+        # Parallel segment collection
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._executor_size = 0
+        self._pending: Dict[str, Future] = {}     # segment id -> in-flight render
+        self._last_good: Dict[str, str] = {}      # segment id -> last completed output
+        
         # Terminal state
         self._terminal_width = self.terminal.get_width()
         self._last_output = ""
@@ -82,7 +91,9 @@ class StatuslineRenderer:
             segment_type = segment_config.type
             if segment_type in segment_classes:
                 segment_class = segment_classes[segment_type]
-                segment = segment_class(segment_config.config, self.color_utils, self.theme)
+                segment = segment_class(segment_config.config, self.color_utils, self.theme, cwd=self.cwd)
+                if segment_config.render_timeout is not None:
+                    segment.render_timeout = segment_config.render_timeout
                 self.segments.append(segment)
     
     def add_segment(self, segment: BaseSegment):
@@ -124,29 +135,9 @@ class StatuslineRenderer:
                 self._terminal_width = terminal_width
                 force_refresh = True
             
-            # Render each segment
-            rendered_segments = []
-            total_length = 0
-            
-            with self._lock:
-                for segment in self.segments:
-                    if not segment.enabled:
-                        continue
-                    
-                    try:
-                        segment_output = segment.render(force_refresh)
-                        if segment_output:
-                            rendered_segments.append(segment_output)
-                            # Calculate approximate display length (ignoring color codes)
-                            display_length = len(self.color_utils.strip_ansi(segment_output))
-                            total_length += display_length
-                    except Exception as e:
-                        self.stats.error_count += 1
-                        if self.config.debug:
-                            print(f"Error rendering segment {segment.id}: {e}", file=sys.stderr)
-            
-            # Apply layout and spacing
-            output = self._apply_layout(rendered_segments, total_length, terminal_width)
+            # Render each segment, then apply layout and spacing
+            rendered_segments = self.render_segments(force_refresh)
+            output = self.layout(rendered_segments, terminal_width)
             
             # Cache the result
             self._cache['rendered_output'] = output
@@ -171,6 +162,92 @@ class StatuslineRenderer:
                 print(f"Error in statusline render: {e}", file=sys.stderr)
             return self._get_error_output(str(e))
     
+    def render_segments(self, force_refresh: bool = False) -> List[str]:
+        """
+        Render every enabled segment without applying a layout
+        
+        Segments render concurrently on a thread pool. A segment that misses
+        its deadline (render_timeout, or the configured segment_timeout)
+        contributes its last completed output instead, and keeps running in
+        the background; the next render waits on that same in-flight call
+        rather than starting another one.
+        
+        Args:
+            force_refresh: If True, bypasses segment caches
+            
+        Returns:
+            Non-empty segment outputs in configuration order
+        """
+        with self._lock:
+            segments = [segment for segment in self.segments if segment.enabled]
+            if not segments:
+                return []
+            
+            executor = self._get_executor(len(segments))
+            futures = []
+            for segment in segments:
+                future = self._pending.get(segment.id)
+                if future is None or future.done():
+                    future = executor.submit(segment.render, force_refresh)
+                    future.add_done_callback(
+                        lambda done, segment_id=segment.id: self._record_segment(segment_id, done)
+                    )
+                    self._pending[segment.id] = future
+                futures.append(future)
+        
+        started = time.monotonic()
+        rendered_segments = []
+        
+        for segment, future in zip(segments, futures):
+            deadline = segment.render_timeout or self.config.segment_timeout
+            timeout = max(0.0, started + deadline - time.monotonic())
+            
+            try:
+                segment_output = future.result(timeout)
+            except FutureTimeoutError:
+                self.stats.timeout_count += 1
+                segment_output = self._last_good.get(segment.id, '')
+                if self.config.debug:
+                    print(f"Segment {segment.id} missed its deadline, using cached output", file=sys.stderr)
+            except Exception as e:
+                self.stats.error_count += 1
+                segment_output = self._last_good.get(segment.id, '')
+                if self.config.debug:
+                    print(f"Error rendering segment {segment.id}: {e}", file=sys.stderr)
+            
+            if segment_output:
+                rendered_segments.append(segment_output)
+        
+        return rendered_segments
+    
+    def _get_executor(self, segment_count: int) -> ThreadPoolExecutor:
+        """Thread pool with a worker per segment, so a stuck segment cannot starve the others"""
+        if self._executor is None or segment_count > self._executor_size:
+            if self._executor is not None:
+                self._executor.shutdown(wait=False)
+            self._executor = ThreadPoolExecutor(
+                max_workers=segment_count,
+                thread_name_prefix='statusline-segment'
+            )
+            self._executor_size = segment_count
+        return self._executor
+    
+    def has_pending(self) -> bool:
+        """Whether a segment that missed its deadline is still rendering"""
+        with self._lock:
+            return any(not future.done() for future in self._pending.values())
+    
+    def _record_segment(self, segment_id: str, future: Future):
+        """Remember the output of a completed render, including late ones"""
+        if not future.cancelled() and future.exception() is None:
+            self._last_good[segment_id] = future.result()
+    
+    def layout(self, segments: List[str], terminal_width: int) -> str:
+        """Arrange rendered segments for a terminal of the given width"""
+        # Calculate approximate display length (ignoring color codes)
+        total_length = sum(len(self.color_utils.strip_ansi(segment)) for segment in segments)
+        return self._apply_layout(segments, total_length, terminal_width)
+    
     def _apply_layout(self, segments: List[str], total_length: int, terminal_width: int) -> str:
         """Apply layout strategy to arrange segments"""
         if not segments:
@@ -330,12 +407,22 @@ class StatuslineRenderer:
         """Clear the renderer cache"""
         with self._lock:
             self._cache.clear()
+            self._last_good.clear()
+    
+    def close(self):
+        """Stop live updates and release the segment thread pool"""
+        self.stop_live_updates()
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+            self._executor_size = 0
     
     def update_config(self, new_config: StatuslineConfig):
         """Update configuration and reinitialize segments"""
         self.config = new_config
         self.theme = new_config.theme
         self.segments.clear()
+        self._pending.clear()
         self._setup_segments()
         self.clear_cache()
     
@@ -362,4 +449,4 @@ class StatuslineRenderer:
     
     def __exit__(self, exc_type, exc_val, exc_tb):
         """Context manager exit - cleanup resources"""
-        self.stop_live_updates()
\ No newline at end of file
+        self.close()
\ No newline at end of file
@@ -18,8 +18,9 @@ from ..themes import Theme
 class AgentStatusSegment(BaseSegment):
     """Segment that displays Claude Code agent status information"""
     
-    def __init__(self, config: Dict[str, Any], color_utils: ColorUtils, theme: Theme):
-        super().__init__(config, color_utils, theme)
+    def __init__(self, config: Dict[str, Any], color_utils: ColorUtils, theme: Theme,
+                 cwd: Optional[str] = None):
+        super().__init__(config, color_utils, theme, cwd)
         
         # Configuration options
         self.show_active_agents = config.get('show_active_agents', True)
@@ -40,7 +41,7 @@ class AgentStatusSegment(BaseSegment):
     
     def _find_agent_registry_paths(self) -> List[str]:
         """Find possible paths for agent registry files"""
-        base_path = os.getcwd()
+        base_path = self.working_directory
         
         possible_paths = [
             os.path.join(base_path, "agent-registry.json"),
@@ -196,8 +197,8 @@ class AgentStatusSegment(BaseSegment):
         try:
             # Check for agent status files
             status_paths = [
-                os.path.join(os.getcwd(), ".claude", "agent_status.json"),
-                os.path.join(os.getcwd(), "logs", "agent_status.json"),
+                os.path.join(self.working_directory, ".claude", "agent_status.json"),
+                os.path.join(self.working_directory, "logs", "agent_status.json"),
                 "/tmp/claude_agent_status.json"
             ]
             
@@ -238,7 +239,7 @@ class AgentStatusSegment(BaseSegment):
             
             # Check status files
             status_paths = [
-                os.path.join(os.getcwd(), ".claude", "current_agent.json"),
+                os.path.join(self.working_directory, ".claude", "current_agent.json"),
                 "/tmp/claude_current_agent.json"
             ]
             
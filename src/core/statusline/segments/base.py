@@ -5,6 +5,7 @@ Abstract base class for all statusline segments, defining the interface
 and common functionality for segment implementation.
 """
 
+import os
 import time
 from abc import ABC, abstractmethod
 from typing import Dict, Any, Optional
@@ -36,7 +37,8 @@ class BaseSegment(ABC):
     4. Providing status information
     """
     
-    def __init__(self, config: Dict[str, Any], color_utils: ColorUtils, theme: Theme):
+    def __init__(self, config: Dict[str, Any], color_utils: ColorUtils, theme: Theme,
+                 cwd: Optional[str] = None):
         """
         Initialize segment with configuration
         
@@ -44,8 +46,10 @@ class BaseSegment(ABC):
             config: Segment-specific configuration
             color_utils: Color utility instance
             theme: Theme instance for styling
+            cwd: Directory the segment describes; None follows the process
         """
         self.config = config
+        self.cwd = cwd
         self.color_utils = color_utils
         self.theme = theme
         
@@ -55,6 +59,7 @@ class BaseSegment(ABC):
         self.priority = config.get('priority', 100)
         self.cache_timeout = config.get('cache_timeout', 1.0)
         self.max_width = config.get('max_width')
+        self.render_timeout = config.get('render_timeout')  # None: renderer default
         
         # Cache management
         self._cache: Dict[str, Any] = {}
@@ -66,6 +71,11 @@ class BaseSegment(ABC):
         self._render_count = 0
         self._total_render_time = 0.0
     
+    @property
+    def working_directory(self) -> str:
+        """Directory this segment reports on"""
+        return self.cwd or os.getcwd()
+    
     def _generate_id(self) -> str:
         """Generate unique ID for this segment"""
         base_name = self.__class__.__name__.lower().replace('segment', '')
@@ -287,8 +297,9 @@ class CachedSegment(BaseSegment):
     - Smart invalidation
     """
     
-    def __init__(self, config: Dict[str, Any], color_utils: ColorUtils, theme: Theme):
-        super().__init__(config, color_utils, theme)
+    def __init__(self, config: Dict[str, Any], color_utils: ColorUtils, theme: Theme,
+                 cwd: Optional[str] = None):
+        super().__init__(config, color_utils, theme, cwd)
         
         # Multi-level cache
         self._memory_cache: Dict[str, Any] = {}
@@ -341,8 +352,9 @@ class AsyncSegment(BaseSegment):
     the main render loop.
     """
     
-    def __init__(self, config: Dict[str, Any], color_utils: ColorUtils, theme: Theme):
-        super().__init__(config, color_utils, theme)
+    def __init__(self, config: Dict[str, Any], color_utils: ColorUtils, theme: Theme,
+                 cwd: Optional[str] = None):
+        super().__init__(config, color_utils, theme, cwd)
         
         self._async_data: Optional[SegmentData] = None
         self._async_pending = False
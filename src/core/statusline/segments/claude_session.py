@@ -6,21 +6,26 @@ session duration, and active conversation status.
 """
 
 import os
+import re
 import time
 import json
 from datetime import datetime, timedelta
 from typing import Dict, Any, Optional
 
 from .base import BaseSegment, SegmentData
-from ..utils import ColorUtils, format_duration
+from ..utils import ColorUtils, LogTailer, format_duration
 from ..themes import Theme
 
 
 class ClaudeSessionSegment(BaseSegment):
     """Segment that displays Claude session information"""
     
-    def __init__(self, config: Dict[str, Any], color_utils: ColorUtils, theme: Theme):
-        super().__init__(config, color_utils, theme)
+    # Pattern: "tokens: 1234/5000"
+    TOKEN_PATTERN = re.compile(rb'tokens?[:\s]+(\d+)[/,\s]+(\d+)', re.IGNORECASE)
+    
+    def __init__(self, config: Dict[str, Any], color_utils: ColorUtils, theme: Theme,
+                 cwd: Optional[str] = None):
+        super().__init__(config, color_utils, theme, cwd)
         
         # Configuration options
         self.show_token_usage = config.get('show_token_usage', True)
@@ -35,6 +40,7 @@ class ClaudeSessionSegment(BaseSegment):
         self.session_start_time = time.time()
         self._last_token_check = 0
         self._token_cache = {}
+        self._log_tailer = LogTailer(self.TOKEN_PATTERN, keyword=b'tokens')
         
         # Claude session paths
         self.claude_config_path = self._find_claude_config()
@@ -44,8 +50,8 @@ class ClaudeSessionSegment(BaseSegment):
         possible_paths = [
             os.path.expanduser("~/.config/claude-code"),
             os.path.expanduser("~/.claude"),
-            os.path.join(os.getcwd(), ".claude"),
-            os.path.join(os.getcwd(), "config"),
+            os.path.join(self.working_directory, ".claude"),
+            os.path.join(self.working_directory, "config"),
         ]
         
         for path in possible_paths:
@@ -260,37 +266,20 @@ class ClaudeSessionSegment(BaseSegment):
         return 0
     
     def _parse_token_from_logs(self) -> Dict[str, Any]:
-        """Parse token usage from log files"""
-        try:
-            log_paths = [
-                os.path.join(os.getcwd(), "logs", "claude.log"),
-                os.path.expanduser("~/.claude/logs/session.log"),
-                "/tmp/claude-session.log"
-            ]
-            
-            for log_path in log_paths:
-                if os.path.exists(log_path):
-                    # Read last few lines of log file
-                    with open(log_path, 'r') as f:
-                        lines = f.readlines()
-                        
-                    # Look for token usage patterns in recent lines
-                    for line in reversed(lines[-50:]):  # Check last 50 lines
-                        if 'tokens' in line.lower():
-                            # Try to extract token information
-                            # This is a simplified parser - could be enhanced
-                            import re
-                            
-                            # Pattern: "tokens: 1234/5000"
-                            pattern = r'tokens?[:\s]+(\d+)[/,\s]+(\d+)'
-                            match = re.search(pattern, line, re.IGNORECASE)
-                            if match:
-                                return {
-                                    'used_tokens': int(match.group(1)),
-                                    'total_tokens': int(match.group(2))
-                                }
-        except Exception:
-            pass
+        """Parse token usage from the newest matching line of the session logs"""
+        log_paths = [
+            os.path.join(self.working_directory, "logs", "claude.log"),
+            os.path.expanduser("~/.claude/logs/session.log"),
+            "/tmp/claude-session.log"
+        ]
+        
+        for log_path in log_paths:
+            match = self._log_tailer.latest(log_path)
+            if match:
+                return {
+                    'used_tokens': int(match[0]),
+                    'total_tokens': int(match[1])
+                }
         
         return {}
     
@@ -21,8 +21,9 @@ from ..themes import Theme
 class CustomSegment(BaseSegment):
     """Segment that allows custom data sources and formatting"""
     
-    def __init__(self, config: Dict[str, Any], color_utils: ColorUtils, theme: Theme):
-        super().__init__(config, color_utils, theme)
+    def __init__(self, config: Dict[str, Any], color_utils: ColorUtils, theme: Theme,
+                 cwd: Optional[str] = None):
+        super().__init__(config, color_utils, theme, cwd)
         
         # Data source configuration
         self.data_source_type = config.get('data_source_type', 'command')
@@ -32,7 +33,7 @@ class CustomSegment(BaseSegment):
         # Command-specific options
         self.command_timeout = config.get('command_timeout', 10)
         self.command_shell = config.get('command_shell', True)
-        self.command_cwd = config.get('command_cwd', os.getcwd())
+        self.command_cwd = config.get('command_cwd', self.working_directory)
         
         # File-specific options
         self.file_path = config.get('file_path', '')
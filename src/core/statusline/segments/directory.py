@@ -7,7 +7,7 @@ and home directory replacement.
 
 import os
 from pathlib import Path
-from typing import Dict, Any
+from typing import Dict, Any, Optional
 
 from .base import BaseSegment, SegmentData
 from ..utils import ColorUtils, truncate_path
@@ -17,8 +17,9 @@ from ..themes import Theme
 class DirectorySegment(BaseSegment):
     """Segment that displays the current working directory"""
     
-    def __init__(self, config: Dict[str, Any], color_utils: ColorUtils, theme: Theme):
-        super().__init__(config, color_utils, theme)
+    def __init__(self, config: Dict[str, Any], color_utils: ColorUtils, theme: Theme,
+                 cwd: Optional[str] = None):
+        super().__init__(config, color_utils, theme, cwd)
         
         # Configuration options
         self.max_depth = config.get('max_depth', 3)
@@ -33,7 +34,7 @@ class DirectorySegment(BaseSegment):
     
     def _collect_data(self) -> SegmentData:
         """Collect current directory information"""
-        current_path = os.getcwd()
+        current_path = self.working_directory
         
         # Check if path has changed
         if current_path != self._last_path:
@@ -190,7 +191,7 @@ class DirectorySegment(BaseSegment):
     
     def get_current_path(self) -> str:
         """Get the current working directory"""
-        return os.getcwd()
+        return self.working_directory
     
     def get_path_info(self) -> Dict[str, Any]:
         """Get detailed information about current path"""
@@ -232,7 +233,10 @@ class DirectorySegment(BaseSegment):
             abs_path = os.path.abspath(expanded_path)
             
             if os.path.isdir(abs_path):
-                os.chdir(abs_path)
+                if self.cwd is None:
+                    os.chdir(abs_path)
+                else:
+                    self.cwd = abs_path
                 self.clear_cache()  # Force refresh
                 return True
             
@@ -15,8 +15,9 @@ from ..themes import Theme
 class GitSegment(BaseSegment):
     """Segment that displays git repository information"""
     
-    def __init__(self, config: Dict[str, Any], color_utils: ColorUtils, theme: Theme):
-        super().__init__(config, color_utils, theme)
+    def __init__(self, config: Dict[str, Any], color_utils: ColorUtils, theme: Theme,
+                 cwd: Optional[str] = None):
+        super().__init__(config, color_utils, theme, cwd)
         
         # Configuration options
         self.show_branch = config.get('show_branch', True)
@@ -42,7 +43,7 @@ class GitSegment(BaseSegment):
                 tooltip="Git not available"
             )
         
-        current_path = os.getcwd()
+        current_path = self.working_directory
         
         # Get git repository info
         repo_info = self.git_utils.get_repo_info(current_path, use_cache=True)
@@ -322,7 +323,7 @@ class GitSegment(BaseSegment):
     
     def get_repository_info(self) -> Dict[str, Any]:
         """Get detailed repository information"""
-        return self.git_utils.get_repo_info(use_cache=False)
+        return self.git_utils.get_repo_info(self.working_directory, use_cache=False)
     
     def refresh_git_info(self):
         """Force refresh of git information"""
@@ -338,6 +339,7 @@ class GitSegment(BaseSegment):
             import subprocess
             result = subprocess.run(
                 ['git', 'branch', '-a'],
+                cwd=self.working_directory,
                 capture_output=True,
                 text=True,
                 timeout=5
@@ -373,6 +375,7 @@ class GitSegment(BaseSegment):
             import subprocess
             result = subprocess.run(
                 ['git', 'log', f'-{count}', '--oneline', '--decorate'],
+                cwd=self.working_directory,
                 capture_output=True,
                 text=True,
                 timeout=5
@@ -20,8 +20,9 @@ from ..themes import Theme
 class NetworkSegment(BaseSegment):
     """Segment that displays network connectivity and tunnel status"""
     
-    def __init__(self, config: Dict[str, Any], color_utils: ColorUtils, theme: Theme):
-        super().__init__(config, color_utils, theme)
+    def __init__(self, config: Dict[str, Any], color_utils: ColorUtils, theme: Theme,
+                 cwd: Optional[str] = None):
+        super().__init__(config, color_utils, theme, cwd)
         
         # Configuration options
         self.show_connectivity = config.get('show_connectivity', True)
@@ -39,8 +40,8 @@ class NetworkSegment(BaseSegment):
         # Tunnel configuration
         self.tunnel_types = config.get('tunnel_types', ['ngrok', 'cloudflare', 'ssh'])
         self.tunnel_status_paths = config.get('tunnel_status_paths', [
-            os.path.join(os.getcwd(), '.ngrok', 'status.json'),
-            os.path.join(os.getcwd(), 'logs', 'tunnel_status.json'),
+            os.path.join(self.working_directory, '.ngrok', 'status.json'),
+            os.path.join(self.working_directory, 'logs', 'tunnel_status.json'),
             '/tmp/tunnel_status.json'
         ])
         
@@ -17,8 +17,9 @@ from ..themes import Theme
 class SystemInfoSegment(BaseSegment):
     """Segment that displays system performance information"""
     
-    def __init__(self, config: Dict[str, Any], color_utils: ColorUtils, theme: Theme):
-        super().__init__(config, color_utils, theme)
+    def __init__(self, config: Dict[str, Any], color_utils: ColorUtils, theme: Theme,
+                 cwd: Optional[str] = None):
+        super().__init__(config, color_utils, theme, cwd)
         
         # Configuration options
         self.show_cpu = config.get('show_cpu', True)
@@ -17,8 +17,9 @@ from ..themes import Theme
 class TimeSegment(BaseSegment):
     """Segment that displays current time and date"""
     
-    def __init__(self, config: Dict[str, Any], color_utils: ColorUtils, theme: Theme):
-        super().__init__(config, color_utils, theme)
+    def __init__(self, config: Dict[str, Any], color_utils: ColorUtils, theme: Theme,
+                 cwd: Optional[str] = None):
+        super().__init__(config, color_utils, theme, cwd)
         
         # Configuration options
         self.time_format = config.get('format', '%H:%M:%S')
@@ -0,0 +1,112 @@
+#!/usr/bin/env python3
+"""
+Log Tailer Test Suite
+Incremental scans for the newest matching line of growing, truncated and rotated logs.
+"""
+
+import os
+import re
+import sys
+import shutil
+import tempfile
+import unittest
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from statusline.utils import LogTailer
+
+
+TOKEN_PATTERN = re.compile(rb'tokens?[:\s]+(\d+)[/,\s]+(\d+)', re.IGNORECASE)
+
+
+class LogTailerTestCase(unittest.TestCase):
+    """Base class with a tailer over a log in a temporary directory"""
+
+    def setUp(self):
+        self.temp_dir = tempfile.mkdtemp()
+        self.path = os.path.join(self.temp_dir, 'session.log')
+        self.tailer = LogTailer(TOKEN_PATTERN, keyword=b'tokens', max_lines=50, block_size=64)
+
+    def tearDown(self):
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+
+    def append(self, text: str):
+        with open(self.path, 'a', encoding='utf-8') as f:
+            f.write(text)
+
+    def noise(self, count: int) -> str:
+        return ''.join(f'noise line {index}\n' for index in range(count))
+
+
+class TestIncrementalScan(LogTailerTestCase):
+    """Refreshes read only what was appended, and all of it"""
+
+    def test_missing_file(self):
+        self.assertIsNone(self.tailer.latest(self.path))
+
+    def test_newest_match_wins(self):
+        self.append('tokens: 1/10\n' + self.noise(3) + 'tokens: 2/20\n' + self.noise(3))
+        self.assertEqual(self.tailer.latest(self.path), ('2', '20'))
+
+    def test_match_survives_refresh_without_matches(self):
+        self.append('tokens: 5/10\n')
+        self.assertEqual(self.tailer.latest(self.path), ('5', '10'))
+        self.append(self.noise(10))
+        self.assertEqual(self.tailer.latest(self.path), ('5', '10'))
+
+    def test_appended_match_is_found_behind_many_lines(self):
+        self.append('tokens: 5/10\n')
+        self.assertEqual(self.tailer.latest(self.path), ('5', '10'))
+        self.append('tokens: 9/99\n' + self.noise(60))
+        self.assertEqual(self.tailer.latest(self.path), ('9', '99'))
+
+    def test_first_scan_is_capped(self):
+        self.append('tokens: 5/10\n' + self.noise(60))
+        self.assertIsNone(self.tailer.latest(self.path))
+
+
+class TestPartialLines(LogTailerTestCase):
+    """A line still being written is only read once it is complete"""
+
+    def test_partial_last_line_is_read_when_completed(self):
+        self.append('tokens: 1/10\ntokens: 2/')
+        self.assertEqual(self.tailer.latest(self.path), ('1', '10'))
+        self.append('20\n')
+        self.assertEqual(self.tailer.latest(self.path), ('2', '20'))
+
+    def test_partial_line_alone_in_the_appended_bytes(self):
+        self.append('tokens: 1/10\n')
+        self.assertEqual(self.tailer.latest(self.path), ('1', '10'))
+        self.append('tokens: 3')
+        self.assertEqual(self.tailer.latest(self.path), ('1', '10'))
+        self.append('/30\n')
+        self.assertEqual(self.tailer.latest(self.path), ('3', '30'))
+
+
+class TestReplacedFiles(LogTailerTestCase):
+    """Truncated and rotated logs are scanned again from their new end"""
+
+    def test_truncation_rescans(self):
+        self.append('tokens: 1/10\n' + self.noise(5))
+        self.assertEqual(self.tailer.latest(self.path), ('1', '10'))
+        with open(self.path, 'w', encoding='utf-8') as f:
+            f.write('tokens: 2/20\n')
+        self.assertEqual(self.tailer.latest(self.path), ('2', '20'))
+
+    def test_rotation_rescans(self):
+        self.append('tokens: 1/10\n' + self.noise(5))
+        self.assertEqual(self.tailer.latest(self.path), ('1', '10'))
+        os.rename(self.path, self.path + '.1')
+        self.append('tokens: 2/20\n' + self.noise(20))
+        self.assertEqual(self.tailer.latest(self.path), ('2', '20'))
+
+    def test_removed_file_is_forgotten(self):
+        self.append('tokens: 1/10\n')
+        self.assertEqual(self.tailer.latest(self.path), ('1', '10'))
+        os.remove(self.path)
+        self.assertIsNone(self.tailer.latest(self.path))
+
+
+if __name__ == '__main__':
+    unittest.main()
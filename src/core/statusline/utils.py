@@ -8,6 +8,7 @@ git operations, and cross-platform compatibility.
 import os
 import sys
 import re
+import time
 import subprocess
 import platform
 import shutil
@@ -329,10 +330,19 @@ class ColorUtils:
 class GitUtils:
     """Utilities for git repository operations"""
     
+    # Files whose mtimes change whenever the status output can change through
+    # git itself: staging, commits, checkouts, stashes and fetches
+    GIT_DIR_STAMPS = ('index', 'HEAD', os.path.join('logs', 'HEAD'))
+    COMMON_DIR_STAMPS = ('packed-refs', 'FETCH_HEAD', os.path.join('logs', 'refs', 'stash'))
+    
     def __init__(self):
         self.git_available = self._check_git_availability()
         self._repo_cache: Dict[str, Dict[str, Any]] = {}
-        self._cache_timeout = 2.0  # 2 seconds
+        # Edits to tracked or untracked files leave .git untouched, so a
+        # repository with an unchanged fingerprint is still re-read this often
+        self._cache_timeout = 10.0
+        # Cleared once git turns out to predate `status --show-stash` (2.35)
+        self._show_stash = True
     
     def _check_git_availability(self) -> bool:
         """Check if git is available in PATH"""
@@ -349,22 +359,57 @@ class GitUtils:
         """Check if path is inside a git repository"""
         if not self.git_available:
             return False
+        return self.find_git_dirs(path or os.getcwd()) is not None
+    
+    @staticmethod
+    def find_git_dirs(path: str) -> Optional[Tuple[str, str]]:
+        """
+        Locate the git directory for a path without running git
         
-        try:
-            cmd = ['git', 'rev-parse', '--git-dir']
-            result = subprocess.run(cmd, 
-                                  cwd=path, 
-                                  capture_output=True, 
-                                  check=True, 
-                                  timeout=2)
-            return result.returncode == 0
-        except:
-            return False
+        Returns:
+            (git_dir, common_dir), or None outside a repository. They differ
+            for linked worktrees, whose `.git` is a file pointing at the
+            per-worktree directory.
+        """
+        current = os.path.abspath(path)
+        while True:
+            candidate = os.path.join(current, '.git')
+            if os.path.isdir(candidate):
+                return candidate, candidate
+            
+            if os.path.isfile(candidate):
+                try:
+                    with open(candidate, 'r', encoding='utf-8') as f:
+                        pointer = f.read().strip()
+                except OSError:
+                    return None
+                if not pointer.startswith('gitdir:'):
+                    return None
+                
+                git_dir = os.path.normpath(os.path.join(current, pointer[len('gitdir:'):].strip()))
+                common_dir = git_dir
+                try:
+                    with open(os.path.join(git_dir, 'commondir'), 'r', encoding='utf-8') as f:
+                        common_dir = os.path.normpath(os.path.join(git_dir, f.read().strip()))
+                except OSError:
+                    pass
+                return git_dir, common_dir
+            
+            parent = os.path.dirname(current)
+            if parent == current:
+                return None
+            current = parent
     
     def get_repo_info(self, path: Optional[str] = None, use_cache: bool = True) -> Dict[str, Any]:
         """
         Get comprehensive git repository information
         
+        Everything comes from a single `git status --porcelain=v2 --branch
+        --show-stash` call. Older git rejects --show-stash; it is then dropped
+        and the stash is counted from its reflog instead. Cached results are reused until the mtimes of the
+        repository's index, HEAD, stash log or refs change, or the cache
+        timeout passes.
+        
         Args:
             path: Repository path (current dir if None)
             use_cache: Whether to use cached results
@@ -376,14 +421,109 @@ class GitUtils:
             return {}
         
         repo_path = path or os.getcwd()
+        info = self._empty_repo_info()
+        
+        git_dirs = self.find_git_dirs(repo_path)
+        if git_dirs is None:
+            self._repo_cache.pop(repo_path, None)
+            return info
+        
+        fingerprint = self._fingerprint(*git_dirs)
         
         # Check cache
-        if use_cache and repo_path in self._repo_cache:
-            cache_entry = self._repo_cache[repo_path]
-            if (time.time() - cache_entry['timestamp']) < self._cache_timeout:
-                return cache_entry['data']
+        cache_entry = self._repo_cache.get(repo_path)
+        if (use_cache and cache_entry and cache_entry['fingerprint'] == fingerprint
+                and (time.time() - cache_entry['timestamp']) < self._cache_timeout):
+            return cache_entry['data']
         
-        info = {
+        try:
+            result = self._run_status(repo_path, self._show_stash)
+            if result.returncode != 0 and self._show_stash:
+                retry = self._run_status(repo_path, False)
+                if retry.returncode == 0:
+                    self._show_stash = False
+                    result = retry
+            if result.returncode == 0:
+                info = self.parse_porcelain_v2(result.stdout)
+                if not self._show_stash:
+                    info['stashed'] = self._count_stashes(git_dirs[1])
+        except (OSError, subprocess.SubprocessError):
+            pass
+        
+        # Cache the result
+        self._repo_cache[repo_path] = {
+            'data': info,
+            'fingerprint': fingerprint,
+            'timestamp': time.time()
+        }
+        
+        return info
+    
+    @staticmethod
+    def _run_status(repo_path: str, show_stash: bool) -> subprocess.CompletedProcess:
+        # Optional locks off: status must not rewrite the index, which
+        # would change the fingerprint it is cached under
+        command = ['git', '--no-optional-locks', 'status', '--porcelain=v2', '--branch']
+        if show_stash:
+            command.append('--show-stash')
+        return subprocess.run(command, cwd=repo_path, capture_output=True, text=True, timeout=2)
+    
+    @staticmethod
+    def _count_stashes(common_dir: str) -> int:
+        """Number of stash entries, one per line of the stash reflog"""
+        try:
+            with open(os.path.join(common_dir, 'logs', 'refs', 'stash'), 'rb') as f:
+                return sum(1 for line in f if line.strip())
+        except OSError:
+            return 0
+    
+    @classmethod
+    def parse_porcelain_v2(cls, output: str) -> Dict[str, Any]:
+        """Parse `git status --porcelain=v2 --branch --show-stash` output in one pass"""
+        info = cls._empty_repo_info()
+        info['is_repo'] = True
+        
+        for line in output.splitlines():
+            if not line:
+                continue
+            
+            kind = line[0]
+            if kind == '#':
+                header, _, value = line[2:].partition(' ')
+                if header == 'branch.head':
+                    info['branch'] = 'HEAD' if value == '(detached)' else value
+                elif header == 'branch.ab':
+                    ahead, _, behind = value.partition(' ')
+                    info['ahead'] = int(ahead.lstrip('+'))
+                    info['behind'] = int(behind.lstrip('-'))
+                elif header == 'stash':
+                    info['stashed'] = int(value)
+            elif kind in '12':
+                status_code = line[2:4]
+                if 'M' in status_code:
+                    info['modified'] += 1
+                if 'A' in status_code:
+                    info['added'] += 1
+                if 'D' in status_code:
+                    info['deleted'] += 1
+            elif kind == 'u':
+                info['conflicted'] += 1
+            elif kind == '?':
+                info['untracked'] += 1
+        
+        # Determine overall status
+        if info['conflicted']:
+            info['status'] = 'conflict'
+        elif info['modified'] or info['added'] or info['deleted'] or info['untracked']:
+            info['status'] = 'dirty'
+        else:
+            info['status'] = 'clean'
+        
+        return info
+    
+    @staticmethod
+    def _empty_repo_info() -> Dict[str, Any]:
+        return {
             'is_repo': False,
             'branch': None,
             'status': 'unknown',
@@ -393,97 +533,20 @@ class GitUtils:
             'added': 0,
             'deleted': 0,
             'untracked': 0,
+            'conflicted': 0,
             'stashed': 0
         }
-        
-        try:
-            # Check if it's a repo
-            if not self.is_git_repo(repo_path):
-                return info
-            
-            info['is_repo'] = True
-            
-            # Get current branch
-            try:
-                result = subprocess.run(['git', 'branch', '--show-current'], 
-                                      cwd=repo_path, 
-                                      capture_output=True, 
-                                      text=True, 
-                                      timeout=2)
-                if result.returncode == 0:
-                    info['branch'] = result.stdout.strip() or 'HEAD'
-            except:
-                pass
-            
-            # Get status
-            try:
-                result = subprocess.run(['git', 'status', '--porcelain'], 
-                                      cwd=repo_path, 
-                                      capture_output=True, 
-                                      text=True, 
-                                      timeout=2)
-                if result.returncode == 0:
-                    status_lines = result.stdout.strip().split('\n')
-                    for line in status_lines:
-                        if not line:
-                            continue
-                        
-                        status_code = line[:2]
-                        if 'M' in status_code:
-                            info['modified'] += 1
-                        if 'A' in status_code:
-                            info['added'] += 1
-                        if 'D' in status_code:
-                            info['deleted'] += 1
-                        if '?' in status_code:
-                            info['untracked'] += 1
-                    
-                    # Determine overall status
-                    if info['modified'] or info['added'] or info['deleted'] or info['untracked']:
-                        info['status'] = 'dirty'
-                    else:
-                        info['status'] = 'clean'
-            except:
-                pass
-            
-            # Get ahead/behind info
-            try:
-                result = subprocess.run(['git', 'rev-list', '--count', '--left-right', 'HEAD...@{upstream}'], 
-                                      cwd=repo_path, 
-                                      capture_output=True, 
-                                      text=True, 
-                                      timeout=2)
-                if result.returncode == 0:
-                    counts = result.stdout.strip().split('\t')
-                    if len(counts) == 2:
-                        info['ahead'] = int(counts[0])
-                        info['behind'] = int(counts[1])
-            except:
-                pass
-            
-            # Get stash count
-            try:
-                result = subprocess.run(['git', 'stash', 'list'], 
-                                      cwd=repo_path, 
-                                      capture_output=True, 
-                                      text=True, 
-                                      timeout=2)
-                if result.returncode == 0:
-                    info['stashed'] = len([line for line in result.stdout.strip().split('\n') if line])
-            except:
-                pass
-        
-        except Exception:
-            pass
-        
-        # Cache the result
-        import time
-        self._repo_cache[repo_path] = {
-            'data': info,
-            'timestamp': time.time()
-        }
-        
-        return info
+    
+    def _fingerprint(self, git_dir: str, common_dir: str) -> Tuple[int, ...]:
+        """Modification times of the files git touches when status can change"""
+        stamps = []
+        for directory, names in ((git_dir, self.GIT_DIR_STAMPS), (common_dir, self.COMMON_DIR_STAMPS)):
+            for name in names:
+                try:
+                    stamps.append(os.stat(os.path.join(directory, name)).st_mtime_ns)
+                except OSError:
+                    stamps.append(0)
+        return tuple(stamps)
     
     def get_branch_name(self, path: Optional[str] = None) -> Optional[str]:
         """Get current git branch name"""
@@ -500,6 +563,107 @@ class GitUtils:
         self._repo_cache.clear()
 
 
+class LogTailer:
+    """
+    Finds the most recent log line matching a pattern without rereading logs
+    
+    Each file's byte offset is remembered, so a refresh reads only what was
+    appended since the previous one. That region is scanned backwards from
+    EOF in fixed-size blocks and the scan stops at the newest match, so a
+    refresh costs no more than the bytes appended. Only the first scan of a
+    file, which starts from its end with no offset to go on, gives up after
+    `max_lines` lines. The last match is kept as a running value and
+    survives refreshes that append no matching lines. Rotated or truncated
+    files are rescanned from their new end.
+    """
+    
+    def __init__(self, pattern: 're.Pattern', keyword: Optional[bytes] = None,
+                 max_lines: int = 50, block_size: int = 64 * 1024):
+        """
+        Args:
+            pattern: Compiled bytes pattern searched in each line
+            keyword: Cheap lowercase substring a line must contain before the pattern runs
+            max_lines: Most recent lines inspected when a file is first scanned
+            block_size: Bytes read per backward step
+        """
+        self.pattern = pattern
+        self.keyword = keyword
+        self.max_lines = max_lines
+        self.block_size = block_size
+        self._files: Dict[str, Dict[str, Any]] = {}
+    
+    def latest(self, path: str) -> Optional[Tuple[str, ...]]:
+        """Groups of the newest matching line in `path`, or None"""
+        try:
+            stat = os.stat(path)
+        except OSError:
+            self._files.pop(path, None)
+            return None
+        
+        identity = (stat.st_dev, stat.st_ino)
+        state = self._files.get(path)
+        if state is None or state['identity'] != identity or stat.st_size < state['offset']:
+            state = {'identity': identity, 'offset': 0, 'match': None}
+            self._files[path] = state
+        
+        if stat.st_size > state['offset']:
+            # Appended bytes are all scanned; only a fresh file is capped
+            max_lines = self.max_lines if state['offset'] == 0 else None
+            try:
+                with open(path, 'rb') as f:
+                    match, consumed_end = self._scan_backwards(f, state['offset'], stat.st_size, max_lines)
+            except OSError:
+                return state['match']
+            
+            state['offset'] = consumed_end
+            if match is not None:
+                state['match'] = match
+        
+        return state['match']
+    
+    def _scan_backwards(self, f, start: int, end: int, max_lines: Optional[int] = None):
+        """Newest match among complete lines in [start, end) and the end of the last complete line"""
+        position = end
+        carry = b''
+        consumed_end = None
+        lines_left = max_lines if max_lines is not None else float('inf')
+        
+        while position > start and lines_left > 0:
+            size = min(self.block_size, position - start)
+            position -= size
+            f.seek(position)
+            lines = (f.read(size) + carry).split(b'\n')
+            
+            if consumed_end is None:
+                # A trailing line without its newline is still being written
+                partial = lines.pop()
+                if not lines and position > start:
+                    carry = partial
+                    continue
+                consumed_end = end - len(partial)
+            
+            # The first piece continues in the previous block unless we hit `start`
+            carry = lines.pop(0) if position > start and lines else b''
+            
+            for line in reversed(lines):
+                if self.keyword is None or self.keyword in line.lower():
+                    match = self.pattern.search(line)
+                    if match:
+                        return tuple(group.decode('utf-8', 'replace') for group in match.groups()), consumed_end
+                lines_left -= 1
+                if lines_left <= 0:
+                    break
+        
+        return None, consumed_end if consumed_end is not None else start
+    
+    def forget(self, path: Optional[str] = None):
+        """Drop remembered offsets for one file or for all files"""
+        if path is None:
+            self._files.clear()
+        else:
+            self._files.pop(path, None)
+
+
 class SystemUtils:
     """Utilities for system information"""
     